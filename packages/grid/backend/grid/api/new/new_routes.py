@@ -91,9 +91,10 @@ def make_routes(worker: Worker) -> APIRouter:
         else:
             return handle_syft_new_api(user_verify_key)
 
-    def handle_new_api_call(data: bytes) -> Response:
+    async def handle_new_api_call(data: bytes) -> Response:
         obj_msg = deserialize(blob=data, from_bytes=True)
-        result = worker.handle_api_call(api_call=obj_msg)
+        # async service methods are awaited here, the others run in the threadpool
+        result = await worker.async_handle_api_call(api_call=obj_msg)
         return Response(
             serialize(result, to_bytes=True),
             media_type="application/octet-stream",
@@ -101,7 +102,7 @@ def make_routes(worker: Worker) -> APIRouter:
 
     # make a request to the SyftAPI
     @router.post("/api_call")
-    def syft_new_api_call(
+    async def syft_new_api_call(
         request: Request, data: bytes = Depends(get_body)
     ) -> Response:
         if TRACE_MODE:
@@ -110,9 +111,9 @@ def make_routes(worker: Worker) -> APIRouter:
                 context=extract(request.headers),
                 kind=trace.SpanKind.SERVER,
             ):
-                return handle_new_api_call(data)
+                return await handle_new_api_call(data)
         else:
-            return handle_new_api_call(data)
+            return await handle_new_api_call(data)
 
     def handle_login(email: str, password: str, node: NewNode) -> Any:
         try:
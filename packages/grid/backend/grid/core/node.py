@@ -24,6 +24,8 @@ mongo_store_config = MongoStoreConfig(client_config=mongo_client_config)
 client_config = SQLiteStoreClientConfig(path="/storage/")
 sql_store_config = SQLiteStoreConfig(client_config=client_config)
 worker = Worker(
-    action_store_config=sql_store_config, document_store_config=mongo_store_config
+    action_store_config=sql_store_config,
+    document_store_config=mongo_store_config,
+    ingest_root=settings.INGEST_ROOT,
 )
 create_worker_metadata(worker)
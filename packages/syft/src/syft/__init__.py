@@ -40,6 +40,7 @@ from . import gevent_patch  # noqa: F401
 from . import jax_settings  # noqa: F401
 from . import logger  # noqa: F401
 from .core.node.new import NOTHING  # noqa: F401
+from .core.node.new.action_batch import deferred  # noqa: F401
 from .core.node.new.action_object import ActionObject  # noqa: F401
 from .core.node.new.client import connect  # noqa: F401
 from .core.node.new.client import login  # noqa: F401
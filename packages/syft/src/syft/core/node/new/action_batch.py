@@ -0,0 +1,196 @@
+# stdlib
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# third party
+from result import Err
+from result import Ok
+from result import Result
+
+# relative
+from .action_lifecycle import release_tracker
+from .response import SyftError
+from .response import SyftException
+from .uid import UID
+
+
+def action_inputs(action: Any) -> List[UID]:
+    """Uids of the objects an Action reads, self first"""
+    inputs = [] if action.remote_self is None else [action.remote_self.id]
+    inputs += [arg.id for arg in action.args]
+    inputs += [arg.id for arg in action.kwargs.values()]
+    return inputs
+
+
+def topological_order(actions: List[Any]) -> Result[List[Any], str]:
+    """The Actions of a batch ordered so each one comes after the actions whose
+    results it reads, otherwise in the order they were given"""
+    by_result: Dict[UID, Any] = {}
+    for action in actions:
+        uid = action.result_id.id
+        if uid in by_result:
+            return Err(f"More than one action has the result {uid}")
+        by_result[uid] = action
+
+    dependents: Dict[UID, List[UID]] = {uid: [] for uid in by_result}
+    waiting: Dict[UID, int] = {}
+    for uid, action in by_result.items():
+        dependencies = {dep for dep in action_inputs(action) if dep in by_result}
+        waiting[uid] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(uid)
+
+    ready = deque(uid for uid, count in waiting.items() if count == 0)
+    order = []
+    while ready:
+        uid = ready.popleft()
+        order.append(by_result[uid])
+        for dependent in dependents[uid]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+    if len(order) < len(by_result):
+        return Err("The actions of the batch have a cycle")
+    return Ok(order)
+
+
+class DeferredActions:
+    """Actions of remote result pointers, held back while deferred and sent per
+    node in one `action.execute_batch` call
+
+    While deferred, an operation on a pointer returns the result pointer right
+    away and only queues its Action. On flush, the results that still have a
+    live pointer are the outputs of the batch, the node keeps the others in
+    memory only. A flush happens when the outermost `deferred` block exits, on
+    `flush` and before any other call to the same node, so what the node is
+    asked about, like `action.get` of a result, always exists.
+
+    Deferring is per thread and asyncio task, the queue is shared. Batches that
+    don't reach the node are queued again, batches the node rejects are kept in
+    `failed`. Either is reported by the flush, and raised as a SyftException
+    when the outermost `deferred` block exits.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._depth: ContextVar[int] = ContextVar("deferred_depth", default=0)
+        self._pending: Dict[UID, List[Any]] = {}
+        self._failed: Dict[UID, List[Any]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._depth.get() > 0
+
+    def add(self, node_uid: UID, action: Any) -> None:
+        with self._lock:
+            self._pending.setdefault(node_uid, []).append(action)
+
+    def pending(self) -> Dict[UID, List[Any]]:
+        with self._lock:
+            return {
+                node_uid: list(actions) for node_uid, actions in self._pending.items()
+            }
+
+    def failed(self) -> Dict[UID, List[Any]]:
+        """The actions of the batches the node rejected, by node"""
+        with self._lock:
+            return {
+                node_uid: list(actions) for node_uid, actions in self._failed.items()
+            }
+
+    def discard(self, node_uid: Optional[UID] = None) -> None:
+        """Drop the pending and failed actions of `node_uid`, or of every node"""
+        with self._lock:
+            for queue in [self._pending, self._failed]:
+                if node_uid is None:
+                    queue.clear()
+                else:
+                    queue.pop(node_uid, None)
+
+    def flush(self, node_uid: Optional[UID] = None) -> Union[List[Any], SyftError]:
+        """Send the queued actions of `node_uid`, or of every node, returns the
+        pointers to the outputs"""
+        if not self._pending:
+            return []
+        # relative
+        from .api import APIRegistry
+        from .api import SyftAPICall
+
+        with self._lock:
+            if node_uid is None:
+                batches, self._pending = self._pending, {}
+            elif node_uid in self._pending:
+                batches = {node_uid: self._pending.pop(node_uid)}
+            else:
+                return []
+
+        outputs, errors = [], []
+        for batch_node_uid, actions in batches.items():
+            result_ids = [action.result_id.id for action in actions]
+            requested = [
+                uid
+                for uid in result_ids
+                if release_tracker.is_tracked(node_uid=batch_node_uid, uid=uid)
+            ]
+            # intermediates never reach the node, so there is nothing to release
+            release_tracker.discard(node_uid=batch_node_uid, uids=result_ids)
+
+            try:
+                api = APIRegistry.api_for(node_uid=batch_node_uid)
+                result = api.make_call(
+                    SyftAPICall(
+                        node_uid=batch_node_uid,
+                        path="action.execute_batch",
+                        args=[],
+                        kwargs={"actions": actions, "outputs": requested},
+                    )
+                )
+            except Exception as e:
+                # the node wasn't reached, the batch goes out with the next flush
+                with self._lock:
+                    self._pending[batch_node_uid] = actions + self._pending.get(
+                        batch_node_uid, []
+                    )
+                errors.append(f"{len(actions)} actions queued again: {e}")
+                continue
+            if isinstance(result, list):
+                outputs += result
+            else:
+                with self._lock:
+                    self._failed.setdefault(batch_node_uid, []).extend(actions)
+                errors.append(f"{len(actions)} actions failed: {result}")
+        if len(errors) > 0:
+            return SyftError(message=f"Deferred actions failed: {errors}")
+        return outputs
+
+    @contextmanager
+    def deferred(self) -> Iterator["DeferredActions"]:
+        token = self._depth.set(self._depth.get() + 1)
+        raised = True
+        try:
+            yield self
+            raised = False
+        finally:
+            self._depth.reset(token)
+            if self._depth.get() == 0:
+                flushed = self.flush()
+                # an exception of the block itself isn't replaced
+                if isinstance(flushed, SyftError) and not raised:
+                    raise SyftException(flushed.message)
+
+
+deferred_actions = DeferredActions()
+
+
+def deferred() -> Any:
+    """Context manager building the operations on remote pointers locally,
+    sent as one batch per node when it exits or on `.flush()`"""
+    return deferred_actions.deferred()
@@ -0,0 +1,255 @@
+# stdlib
+from collections import OrderedDict
+import copy
+from enum import Enum
+import sys
+import threading
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Tuple
+
+# third party
+from pydantic import BaseModel
+
+# relative
+from .base import SyftBaseModel
+from .serializable import serializable
+
+# keys share a generation counter per stripe, a write to one can only make a
+# concurrent read of another key skip caching
+GENERATION_STRIPES = 1024
+
+
+@serializable()
+class CachePolicy(Enum):
+    LRU = "lru"
+    LFU = "lfu"
+
+
+@serializable()
+class ActionCacheConfig(SyftBaseModel):
+    """In-memory cache of deserialized action store payloads
+
+    Parameters:
+        `max_bytes`: int
+            Upper bound of the estimated size of all cached payloads. Default 1 GiB
+        `policy`: CachePolicy
+            Which payload is evicted first: the least recently (LRU, default) or
+            the least frequently (LFU) used one
+        `max_entry_bytes`: Optional[int]
+            Payloads larger than this aren't cached. Default None, up to `max_bytes`
+    """
+
+    max_bytes: int = 1024**3
+    policy: CachePolicy = CachePolicy.LRU
+    max_entry_bytes: Optional[int] = None
+
+
+def estimate_size(obj: Any) -> int:
+    """Approximate memory size of a payload, from the arrays it wraps when it
+    has any"""
+    data = getattr(obj, "syft_action_data", obj)
+    nbytes = getattr(data, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(data, "memory_usage", None)
+    if callable(memory_usage):
+        # pandas, a Series for a DataFrame and an int for a Series
+        try:
+            usage = memory_usage(deep=True)
+            return int(getattr(usage, "sum", lambda: usage)())
+        except Exception:  # nosec
+            pass
+    return sys.getsizeof(data)
+
+
+IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, frozenset)
+
+
+def shallow_copy(obj: Any) -> Any:
+    """Copy of a model sharing its field values, so a caller setting fields of
+    a cached object doesn't change the cache. The `_copy_and_set_values` of
+    pydantic is used directly, ActionObject forwards `copy` to its data."""
+    if not isinstance(obj, BaseModel):
+        return obj
+    return obj._copy_and_set_values(
+        dict(obj.__dict__), set(obj.__fields_set__), deep=False
+    )
+
+
+def copy_cached(obj: Any) -> Any:
+    """Copy of a cached payload, so a caller changing its data in place, like an
+    inplace operation on an array, doesn't change the cache. The data of an
+    ActionObject is deep copied, immutable values are shared."""
+    data = getattr(obj, "syft_action_data", obj)
+    if isinstance(data, IMMUTABLE_TYPES):
+        return shallow_copy(obj)
+    if data is obj:
+        return copy.deepcopy(obj)
+    obj = shallow_copy(obj)
+    obj.syft_action_data = copy.deepcopy(data)
+    return obj
+
+
+class ActionObjectCache:
+    """Bounded by bytes, thread safe cache of deserialized payloads
+
+    LRU keeps the entries in access order. LFU keeps one LRU ordered bucket per
+    access count and evicts from the lowest count, the oldest entry first, so
+    both policies evict in O(1).
+
+    Invalidations bump the generation of the key's stripe. A reader takes the
+    `generation` before it reads the backing store and passes it to `put`, which
+    doesn't cache the value when the key was invalidated in between, so a read
+    racing a write can't cache the overwritten value.
+
+    Parameters:
+        `config`: ActionCacheConfig
+            Size bound and eviction policy
+    """
+
+    def __init__(self, config: ActionCacheConfig) -> None:
+        self.config = config
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[Any, int, int]] = {}
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._buckets: Dict[int, "OrderedDict[Hashable, None]"] = {}
+        self._min_count = 0
+        self._generations = [0] * GENERATION_STRIPES
+        self.size = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def lfu(self) -> bool:
+        return self.config.policy == CachePolicy.LFU
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch(key)
+            return entry[0]
+
+    def generation(self, key: Hashable) -> int:
+        with self._lock:
+            return self._generations[self._stripe(key)]
+
+    def put(
+        self, key: Hashable, value: Any, size: int, generation: Optional[int] = None
+    ) -> bool:
+        """Cache `value`, returns False when it is too large to be cached or the
+        key was invalidated since `generation`"""
+        max_entry_bytes = self.config.max_entry_bytes or self.config.max_bytes
+        with self._lock:
+            if (
+                generation is not None
+                and generation != self._generations[self._stripe(key)]
+            ):
+                return False
+            self._remove(key)
+            if size > min(max_entry_bytes, self.config.max_bytes):
+                return False
+            while self.size + size > self.config.max_bytes:
+                self._evict()
+            self._entries[key] = (value, size, 0)
+            self.size += size
+            if self.lfu:
+                self._bucket(0)[key] = None
+                self._min_count = 0
+            else:
+                self._order[key] = None
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generations[self._stripe(key)] += 1
+            if self._remove(key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generations = [gen + 1 for gen in self._generations]
+            self._entries.clear()
+            self._order.clear()
+            self._buckets.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "policy": self.config.policy.value,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.config.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    @staticmethod
+    def _stripe(key: Hashable) -> int:
+        return hash(key) % GENERATION_STRIPES
+
+    def _bucket(self, count: int) -> "OrderedDict[Hashable, None]":
+        if count not in self._buckets:
+            self._buckets[count] = OrderedDict()
+        return self._buckets[count]
+
+    def _touch(self, key: Hashable) -> None:
+        if not self.lfu:
+            self._order.move_to_end(key)
+            return
+        value, size, count = self._entries[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if len(bucket) == 0:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._bucket(count + 1)[key] = None
+        self._entries[key] = (value, size, count + 1)
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, size, count = entry
+        self.size -= size
+        if self.lfu:
+            bucket = self._buckets[count]
+            del bucket[key]
+            if len(bucket) == 0:
+                del self._buckets[count]
+        else:
+            del self._order[key]
+        return True
+
+    def _evict(self) -> None:
+        if self.lfu:
+            if self._min_count not in self._buckets:
+                self._min_count = min(self._buckets)
+            key = next(iter(self._buckets[self._min_count]))
+        else:
+            key = next(iter(self._order))
+        self._remove(key)
+        self.evictions += 1
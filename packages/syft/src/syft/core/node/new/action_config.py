@@ -0,0 +1,37 @@
+# stdlib
+from typing import Optional
+
+# relative
+from .action_cache import ActionCacheConfig
+from .action_lifecycle import ActionLifecycleConfig
+from .action_memo import ActionMemoConfig
+from .base import SyftBaseModel
+from .serializable import serializable
+from .twin_evaluation import TwinEvaluationConfig
+
+
+@serializable()
+class ActionConfig(SyftBaseModel):
+    """How the action store and the ActionService of a node handle action
+    objects, independently of the backend in the action store's StoreConfig
+
+    Parameters:
+        `cache`: Optional[ActionCacheConfig]
+            If set, the action store keeps recently read payloads in memory, up
+            to a total size. Default None.
+        `lifecycle`: Optional[ActionLifecycleConfig]
+            If set, the results of actions are leased by the action store and
+            deleted once released or expired. Default None, results are kept.
+        `memo`: Optional[ActionMemoConfig]
+            If set, the ActionService reuses the stored result of an identical
+            earlier action instead of executing it again. Only supported by
+            in-memory action stores. Default None.
+        `twin_evaluation`: Optional[TwinEvaluationConfig]
+            How the ActionService evaluates the private and mock sides of twins.
+            Default None, both sides run concurrently on a small thread pool.
+    """
+
+    cache: Optional[ActionCacheConfig] = None
+    lifecycle: Optional[ActionLifecycleConfig] = None
+    memo: Optional[ActionMemoConfig] = None
+    twin_evaluation: Optional[TwinEvaluationConfig] = None
@@ -0,0 +1,246 @@
+# stdlib
+import atexit
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# third party
+from result import Ok
+from result import Result
+
+# relative
+from .base import SyftBaseModel
+from .serializable import serializable
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .syft_object import SyftObject
+from .uid import UID
+
+
+@serializable()
+class ActionLifecycleConfig(SyftBaseModel):
+    """Lifetime of the intermediate results of the action store
+
+    Parameters:
+        `ttl`: Optional[float]
+            Seconds an intermediate result is kept without its lease being
+            renewed, even if it is still referenced. None keeps referenced
+            results until they are released. Default one day
+        `interval`: float
+            Seconds between two runs of the ActionGarbageCollector. Default 60
+        `batch_size`: int
+            Objects deleted per batch of the collector. Default 100
+    """
+
+    ttl: Optional[float] = 24 * 3600.0
+    interval: float = 60.0
+    batch_size: int = 100
+
+
+@serializable()
+class ActionObjectLease(SyftObject):
+    """Lease of an intermediate result, kept next to it in the action store
+
+    Parameters:
+        `id`: UID
+            Action store uid of the result
+        `references`: Dict[str, int]
+            Client references still held per verify key, a client can only drop
+            its own. The result is unreachable once none are left
+        `expires_at`: Optional[float]
+            Unix timestamp after which the result is collected anyway
+    """
+
+    __canonical_name__ = "ActionObjectLease"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    references: Dict[str, int] = {}
+    expires_at: Optional[float] = None
+
+    @property
+    def refcount(self) -> int:
+        return sum(self.references.values())
+
+    def is_collectable(self, now: float) -> bool:
+        if self.refcount <= 0:
+            return True
+        return self.expires_at is not None and self.expires_at <= now
+
+
+class ActionGarbageCollector:
+    """Deletes the unreachable intermediate results of an action store
+
+    Each run deletes the results whose lease is released or expired, in batches
+    of `batch_size`, then removes the blob files no object refers to anymore.
+    Runs every `interval` seconds in a background thread once started.
+
+    Parameters:
+        `store`: KeyValueActionStore
+            Action store with a `lifecycle` in its ActionConfig
+        `interval`: Optional[float]
+            Seconds between two runs, default from the lifecycle config
+        `batch_size`: Optional[int]
+            Objects deleted per batch, default from the lifecycle config
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        interval: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        config = store.action_config.lifecycle or ActionLifecycleConfig()
+        self.store = store
+        self.interval = interval if interval is not None else config.interval
+        self.batch_size = batch_size if batch_size is not None else config.batch_size
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.collected = 0
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def collect(self) -> Result[int, str]:
+        """Delete every collectable result now, returns how many were deleted"""
+        collected = 0
+        while not self._stop.is_set():
+            result = self.store.collect_unreachable(limit=self.batch_size)
+            if result.is_err():
+                self.last_error = result.err()
+                return result
+            collected += result.ok()
+            if result.ok() < self.batch_size:
+                break
+        self.collected += collected
+
+        blobs = self.store.collect_garbage()
+        if blobs.is_err():
+            self.last_error = blobs.err()
+            return blobs
+        self.last_error = None
+        return Ok(collected)
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.collect()
+
+    def start(self) -> None:
+        """Collect in a background thread every `interval` seconds"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="syft-action-gc", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+
+class PointerReleaseTracker:
+    """Client side references to the intermediate results of remote actions
+
+    Result pointers are tracked by Python object, counted per (node uid, result
+    uid). When the last tracked pointer of a result is garbage collected, its
+    uid is queued and sent to `action.release` with the next batch. Batches go
+    out when a new result is tracked, on `flush` and at exit, never from the
+    finalizer itself.
+
+    Parameters:
+        `batch_size`: int
+            Queued releases that trigger a flush on the next tracked result
+    """
+
+    def __init__(self, batch_size: int = 100) -> None:
+        self.batch_size = batch_size
+        # the finalizers can run in the middle of a tracker call of the same thread
+        self._lock = threading.RLock()
+        self._objects: Dict[int, Tuple[UID, UID]] = {}
+        self._counts: Dict[Tuple[UID, UID], int] = {}
+        self._pending: Dict[UID, List[UID]] = {}
+
+    def track(self, obj: Any, node_uid: UID, uid: UID) -> None:
+        with self._lock:
+            key = (node_uid, uid)
+            previous = self._objects.get(id(obj))
+            if previous == key:
+                return
+            if previous is not None:
+                self._drop(previous)
+            self._objects[id(obj)] = key
+            self._counts[key] = self._counts.get(key, 0) + 1
+            pending = sum(len(uids) for uids in self._pending.values())
+        if pending >= self.batch_size:
+            self.flush()
+
+    def drop(self, obj: Any) -> None:
+        """Called from the finalizer of a tracked pointer"""
+        with self._lock:
+            key = self._objects.pop(id(obj), None)
+            if key is not None:
+                self._drop(key)
+
+    def _drop(self, key: Tuple[UID, UID]) -> None:
+        count = self._counts.get(key, 0) - 1
+        if count > 0:
+            self._counts[key] = count
+            return
+        self._counts.pop(key, None)
+        node_uid, uid = key
+        self._pending.setdefault(node_uid, []).append(uid)
+
+    def is_tracked(self, node_uid: UID, uid: UID) -> bool:
+        with self._lock:
+            return (node_uid, uid) in self._counts
+
+    def discard(self, node_uid: UID, uids: List[UID]) -> None:
+        """Unqueue the releases of `uids`, results that were never stored"""
+        with self._lock:
+            if node_uid in self._pending:
+                discarded = set(uids)
+                self._pending[node_uid] = [
+                    uid for uid in self._pending[node_uid] if uid not in discarded
+                ]
+
+    def pending(self) -> Dict[UID, List[UID]]:
+        with self._lock:
+            return {node_uid: list(uids) for node_uid, uids in self._pending.items()}
+
+    def flush(self) -> None:
+        """Send the queued releases, one call per node"""
+        # relative
+        from .api import APIRegistry
+        from .api import SyftAPICall
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for node_uid, uids in pending.items():
+            try:
+                api = APIRegistry.api_for(node_uid=node_uid)
+                api.make_call(
+                    SyftAPICall(
+                        node_uid=node_uid,
+                        path="action.release",
+                        args=[],
+                        kwargs={"uids": uids},
+                    )
+                )
+            except Exception:  # nosec
+                # not logged in or the node is gone, the leases expire on their own
+                pass
+
+
+release_tracker = PointerReleaseTracker()
+
+
+@atexit.register
+def _flush_release_tracker() -> None:
+    try:
+        release_tracker.flush()
+    except Exception:  # nosec
+        pass
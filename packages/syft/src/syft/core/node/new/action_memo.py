@@ -0,0 +1,174 @@
+# stdlib
+from collections import OrderedDict
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+# relative
+from .action_batch import action_inputs
+from .base import SyftBaseModel
+from .serializable import serializable
+from .uid import UID
+
+# ops changing the object they are called on, their results are never reused
+# and the entries reading the object are dropped when they run
+MUTATING_OPS = {
+    "__setitem__",
+    "__delitem__",
+    "__setattr__",
+    "__delattr__",
+    "__iadd__",
+    "__isub__",
+    "__imul__",
+    "__imatmul__",
+    "__itruediv__",
+    "__ifloordiv__",
+    "__imod__",
+    "__ipow__",
+    "__iand__",
+    "__ior__",
+    "__ixor__",
+    "__ilshift__",
+    "__irshift__",
+    "add",
+    "append",
+    "clear",
+    "discard",
+    "extend",
+    "fill",
+    "insert",
+    "itemset",
+    "pop",
+    "popitem",
+    "put",
+    "remove",
+    "resize",
+    "reverse",
+    "setdefault",
+    "setflags",
+    "sort",
+    "update",
+}
+
+MemoKey = Tuple[Any, ...]
+
+
+@serializable()
+class ActionMemoConfig(SyftBaseModel):
+    """Reuse of the results of identical actions by the ActionService
+
+    Parameters:
+        `max_entries`: int
+            Actions remembered, the least recently used are forgotten first.
+            Default 10000
+    """
+
+    max_entries: int = 10_000
+
+
+def is_mutating(action: Any) -> bool:
+    return action.op in MUTATING_OPS or "inplace" in action.kwargs
+
+
+def memo_key(action: Any) -> MemoKey:
+    """Identity of an Action: its history hash, op and the uids it reads"""
+    kwargs = tuple(sorted((key, arg.id) for key, arg in action.kwargs.items()))
+    remote_self = None if action.remote_self is None else action.remote_self.id
+    return (
+        action.syft_history_hash,
+        action.path,
+        action.op,
+        remote_self,
+        tuple(arg.id for arg in action.args),
+        kwargs,
+    )
+
+
+class ActionMemo:
+    """Result uids of the actions executed, by `memo_key`
+
+    An entry is dropped when the action store writes or deletes one of the
+    objects the action read or its result, and when a mutating op runs on one
+    of them. A hit is only counted when the caller can read the result.
+    """
+
+    def __init__(self, config: Optional[ActionMemoConfig] = None) -> None:
+        self.config = config if config is not None else ActionMemoConfig()
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[MemoKey, UID]" = OrderedDict()
+        self._keys_by_uid: Dict[UID, Set[MemoKey]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(
+        self, action: Any, readable: Optional[Callable[[UID], bool]] = None
+    ) -> Optional[UID]:
+        """Result uid of an earlier identical action, if `readable` by the caller"""
+        if is_mutating(action):
+            return None
+        key = memo_key(action)
+        with self._lock:
+            result_id = self._results.get(key)
+        if result_id is not None and (readable is None or readable(result_id)):
+            with self._lock:
+                if key in self._results:
+                    self._results.move_to_end(key)
+                self.hits += 1
+            return result_id
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, action: Any, result_id: UID) -> None:
+        if is_mutating(action):
+            return
+        key = memo_key(action)
+        with self._lock:
+            if key in self._results:
+                self._forget(key)
+            self._results[key] = result_id
+            for uid in action_inputs(action) + [result_id]:
+                self._keys_by_uid.setdefault(uid, set()).add(key)
+            while len(self._results) > self.config.max_entries:
+                self._forget(next(iter(self._results)))
+
+    def _forget(self, key: MemoKey) -> None:
+        result_id = self._results.pop(key, None)
+        if result_id is None:
+            return
+        _, _, _, remote_self, args, kwargs = key
+        uids = [remote_self, result_id, *args, *(uid for _, uid in kwargs)]
+        for uid in uids:
+            keys = self._keys_by_uid.get(uid)
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self._keys_by_uid[uid]
+
+    def invalidate(self, uid: UID) -> None:
+        """Drop the entries reading or resulting in `uid`"""
+        with self._lock:
+            for key in list(self._keys_by_uid.get(uid, ())):
+                self._forget(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._keys_by_uid.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._results),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -3,15 +3,16 @@ from __future__ import annotations
 
 # stdlib
 import inspect
-import types
+import itertools
 from typing import Any
 from typing import Callable
 from typing import ClassVar
+from typing import Collection
 from typing import Dict
+from typing import Iterable
 from typing import KeysView
 from typing import List
 from typing import Optional
-from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
@@ -21,10 +22,13 @@ import pydantic
 from typing_extensions import Self
 
 # relative
+from .action_batch import deferred_actions
 from .action_data_empty import ActionDataEmpty
+from .action_lifecycle import release_tracker
 from .action_types import action_type_for_type
 from .action_types import action_types
 from .client import SyftClient
+from .response import SyftError
 from .response import SyftException
 from .serializable import serializable
 from .syft_object import SYFT_OBJECT_VERSION_1
@@ -109,6 +113,7 @@ passthrough_attrs = [
     "send",  # syft
     "_copy_and_set_values",  # pydantic
     "get_from",  # syft
+    "_repr_debug_",  # syft
 ]
 dont_wrap_output_attrs = [
     "__repr__",
@@ -138,6 +143,180 @@ action_data_empty_must_run = [
 show_print = False
 
 
+_hook_versions = itertools.count(1)
+
+
+class HookRegistry(dict):
+    """Hooks of the ActionObject ops by op name
+
+    The hooks of an op are kept in a tuple, so every change goes through the
+    registry and moves the shared `version` on, which tells the dispatch tables
+    built from the registries that their hooks are stale.
+    """
+
+    version = 0
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _changed() -> None:
+        HookRegistry.version = next(_hook_versions)
+
+    def __setitem__(self, name: str, hooks: Iterable[Callable]) -> None:
+        super().__setitem__(name, tuple(hooks))
+        self._changed()
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._changed()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for name, hooks in dict(*args, **kwargs).items():
+            self[name] = hooks
+
+    def setdefault(self, name: str, hooks: Iterable[Callable] = ()) -> Tuple:
+        if name not in self:
+            self[name] = hooks
+        return self[name]
+
+    def pop(self, name: str, *default: Any) -> Any:
+        hooks = super().pop(name, *default)
+        self._changed()
+        return hooks
+
+    def popitem(self) -> Tuple[str, Tuple]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def add(self, name: str, hook: Callable) -> None:
+        """Append `hook` to the hooks of `name` unless it is there already"""
+        hooks = self.get(name, ())
+        if hook not in hooks:
+            self[name] = hooks + (hook,)
+
+
+class HookDispatch:
+    """Hooks run before and after one op of an ActionObject class"""
+
+    __slots__ = ("pre", "post", "wrap_output")
+
+    def __init__(
+        self, pre: Tuple[Callable, ...], post: Tuple[Callable, ...], wrap_output: bool
+    ) -> None:
+        self.pre = pre
+        self.post = post
+        self.wrap_output = wrap_output
+
+
+class DispatchTable:
+    """What `ActionObject.__getattribute__` looks up for a class, computed once
+
+    The passthrough and not wrapped attrs, the hooks of each op, dropped when a
+    HookRegistry changes, and which attrs of the data types are properties.
+
+    Parameters:
+        `cls`: Type[ActionObject]
+            Class the table is for
+    """
+
+    def __init__(self, cls: Type[ActionObject]) -> None:
+        self.passthrough = frozenset(
+            passthrough_attrs + class_default(cls, "syft_passthrough_attrs")
+        )
+        self.dont_wrap = frozenset(
+            dont_wrap_output_attrs + class_default(cls, "syft_dont_wrap_attrs")
+        )
+        self.pre_hooks = cls._syft_pre_hooks__
+        self.post_hooks = cls._syft_post_hooks__
+        # subclasses deciding per instance, like on the columns of a DataFrame
+        self.custom_properties = (
+            cls.syft_is_property is not ActionObject.syft_is_property
+        )
+        self.version = HookRegistry.version
+        self.hooks: Dict[str, HookDispatch] = {}
+        self.properties: Dict[Tuple[type, str], bool] = {}
+
+    def dispatch(self, name: str) -> HookDispatch:
+        if self.version != HookRegistry.version:
+            self.version = HookRegistry.version
+            self.hooks = {}
+        entry = self.hooks.get(name)
+        if entry is None:
+            wrap_output = name not in self.dont_wrap
+            pre = self.pre_hooks.get(name, ())
+            post = self.post_hooks.get(name, ())
+            if wrap_output:
+                pre += self.pre_hooks.get(HOOK_ALWAYS, ())
+                post += self.post_hooks.get(HOOK_ALWAYS, ())
+            entry = HookDispatch(tuple(pre), tuple(post), wrap_output)
+            self.hooks[name] = entry
+        return entry
+
+    def is_property(self, obj: ActionObject, context_self: Any, name: str) -> bool:
+        if self.custom_properties:
+            return obj.syft_is_property(context_self, name)
+        key = (type(context_self), name)
+        is_property = self.properties.get(key)
+        if is_property is None:
+            is_property = obj.syft_is_property(context_self, name)
+            self.properties[key] = is_property
+        return is_property
+
+
+_dispatch_tables: Dict[type, DispatchTable] = {}
+
+
+def dispatch_table(cls: Type[ActionObject]) -> DispatchTable:
+    table = _dispatch_tables.get(cls)
+    if table is None:
+        table = _dispatch_tables[cls] = DispatchTable(cls)
+    return table
+
+
+def class_default(cls: type, name: str) -> List[str]:
+    field = getattr(cls, "__fields__", {}).get(name)
+    if field is not None and field.default is not None:
+        return list(field.default)
+    return list(getattr(cls, name, []))
+
+
+class ActionObjectOp:
+    # Returned by `ActionObject.__getattribute__` for the ops of its data,
+    # calling it runs the op between the hooks of the class dispatch table.
+    # The docstring and signature are the op's, read only when asked for.
+
+    __slots__ = ("obj", "name", "func")
+
+    def __init__(self, obj: ActionObject, name: str, func: Optional[Callable]) -> None:
+        self.obj = obj
+        self.name = name
+        self.func = func
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.obj._syft_call_op__(self.name, self.func, args, kwargs)
+
+    @property
+    def __doc__(self) -> Optional[str]:  # type: ignore
+        return getattr(self.func, "__doc__", None)
+
+    @property
+    def __ipython_inspector_signature_override__(self) -> inspect.Signature:
+        try:
+            return inspect.signature(self.func)
+        except (TypeError, ValueError) as e:
+            raise AttributeError(f"{self.name} has no signature") from e
+
+    def __repr__(self) -> str:
+        return f"<ActionObject op {self.name} of {self.func!r}>"
+
+
 def debug_original_func(name: str, func: Callable) -> None:
     print(f"{name} func is:")
     print("inspect.isdatadescriptor", inspect.isdatadescriptor(func))
@@ -174,12 +353,19 @@ def send_action_side_effect(context: PreHookContext, *args: Any, **kwargs: Any)
                     )
                     context.action = action
 
+                if deferred_actions.enabled:
+                    # sent with the next batch, the result pointer is made locally
+                    deferred_actions.add(context.obj.syft_node_uid, action)
+                    context.node_uid = context.obj.syft_node_uid
+                    context.result_id = action.result_id.id
+                    return context, args, kwargs
+
                 action_result = context.obj.syft_execute_action(action, sync=True)
                 if not isinstance(action_result, ActionObject):
                     print("Got back unexpected response", action_result)
                 else:
                     context.node_uid = action_result.syft_node_uid
-                    context.result_id = action.result_id
+                    context.result_id = action.result_id.id
                     print("IGNORING: got action result", action_result)
             else:
                 # 🟡 TODO
@@ -280,8 +466,8 @@ class ActionObject(SyftObject):
     syft_history_hash: Optional[int]
     syft_internal_type: ClassVar[Type[Any]]
     syft_node_uid: Optional[UID]
-    _syft_pre_hooks__: Dict[str, Set] = {}
-    _syft_post_hooks__: Dict[str, Set] = {}
+    _syft_pre_hooks__: HookRegistry = HookRegistry()
+    _syft_post_hooks__: HookRegistry = HookRegistry()
 
     @property
     def syft_lineage_id(self) -> LineageID:
@@ -306,6 +492,18 @@ class ActionObject(SyftObject):
     def syft_point_to(self, node_uid: UID) -> None:
         self.syft_node_uid = node_uid
 
+    def _syft_track_result(self) -> None:
+        # the node leases the result until this pointer is garbage collected
+        if self.syft_node_uid is not None:
+            release_tracker.track(self, node_uid=self.syft_node_uid, uid=self.id)
+
+    def __del__(self) -> None:
+        try:
+            release_tracker.drop(self)
+        except Exception:  # nosec
+            # interpreter shutdown
+            pass
+
     def syft_get_property(self, obj: Any, method: str) -> Any:
         klass_method = getattr(type(obj), method, None)
         if klass_method is None:
@@ -322,6 +520,14 @@ class ActionObject(SyftObject):
         return client.api.services.action.set(self)
 
     def get_from(self, client: SyftClient) -> Any:
+        if hasattr(client.api.services, "transfer"):
+            # relative
+            from .transfer import download_object
+
+            result = download_object(client.api, self.id)
+            if isinstance(result, SyftError):
+                return result
+            return result.syft_action_data
         return client.api.services.action.get(self.id).syft_action_data
 
     @staticmethod
@@ -359,14 +565,10 @@ class ActionObject(SyftObject):
         return action_object
 
     def __post_init__(self) -> None:
-        if HOOK_ALWAYS not in self._syft_pre_hooks__:
-            self._syft_pre_hooks__[HOOK_ALWAYS] = set()
-        self._syft_pre_hooks__[HOOK_ALWAYS].add(make_action_side_effect)
-        self._syft_pre_hooks__[HOOK_ALWAYS].add(send_action_side_effect)
-
-        if HOOK_ALWAYS not in self._syft_post_hooks__:
-            self._syft_post_hooks__[HOOK_ALWAYS] = set()
-        self._syft_post_hooks__[HOOK_ALWAYS].add(propagate_node_uid)
+        # the action is made before it is sent
+        self._syft_pre_hooks__.add(HOOK_ALWAYS, make_action_side_effect)
+        self._syft_pre_hooks__.add(HOOK_ALWAYS, send_action_side_effect)
+        self._syft_post_hooks__.add(HOOK_ALWAYS, propagate_node_uid)
 
         if isinstance(self.syft_action_data, ActionObject):
             raise Exception("Nested ActionObjects", self.syft_action_data)
@@ -378,18 +580,10 @@ class ActionObject(SyftObject):
     ) -> Tuple[PreHookContext, Tuple[Any, ...], Dict[str, Any]]:
         try:
             result_args, result_kwargs = args, kwargs
-            if name in self._syft_pre_hooks__:
-                for hook in self._syft_pre_hooks__[name]:
-                    context, result_args, result_kwargs = hook(
-                        context, *result_args, **result_kwargs
-                    )
-
-            if name not in self._syft_dont_wrap_attrs():
-                if HOOK_ALWAYS in self._syft_pre_hooks__:
-                    for hook in self._syft_pre_hooks__[HOOK_ALWAYS]:
-                        context, result_args, result_kwargs = hook(
-                            context, *result_args, **result_kwargs
-                        )
+            for hook in dispatch_table(type(self)).dispatch(name).pre:
+                context, result_args, result_kwargs = hook(
+                    context, *result_args, **result_kwargs
+                )
         except Exception as e:
             print("Exception in pre hooks", e)
         return context, result_args, result_kwargs
@@ -398,14 +592,8 @@ class ActionObject(SyftObject):
         self, context: PreHookContext, name: str, result: Any
     ) -> Any:
         new_result = result
-        if name in self._syft_post_hooks__:
-            for hook in self._syft_post_hooks__[name]:
-                new_result = hook(context, name, new_result)
-
-        if name not in self._syft_dont_wrap_attrs():
-            if HOOK_ALWAYS in self._syft_post_hooks__:
-                for hook in self._syft_post_hooks__[HOOK_ALWAYS]:
-                    new_result = hook(context, name, new_result)
+        for hook in dispatch_table(type(self)).dispatch(name).post:
+            new_result = hook(context, name, new_result)
         return new_result
 
     def _syft_output_action_object(
@@ -421,18 +609,53 @@ class ActionObject(SyftObject):
 
         return result
 
-    def _syft_passthrough_attrs(self) -> List[str]:
-        return passthrough_attrs + getattr(self, "syft_passthrough_attrs", [])
+    def _syft_passthrough_attrs(self) -> Collection[str]:
+        return dispatch_table(type(self)).passthrough
 
-    def _syft_dont_wrap_attrs(self) -> List[str]:
-        return dont_wrap_output_attrs + getattr(self, "syft_dont_wrap_attrs", [])
+    def _syft_dont_wrap_attrs(self) -> Collection[str]:
+        return dispatch_table(type(self)).dont_wrap
+
+    def _syft_call_op__(
+        self,
+        name: str,
+        original_func: Optional[Callable],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        context = PreHookContext(obj=self, op_name=name)
+        context, pre_hook_args, pre_hook_kwargs = self._syft_run_pre_hooks__(
+            context, name, args, kwargs
+        )
+
+        if original_func is not None and not has_action_data_empty(
+            args=args, kwargs=kwargs
+        ):
+            original_args, original_kwargs = debox_args_and_kwargs(
+                pre_hook_args, pre_hook_kwargs
+            )
+
+            result = original_func(*original_args, **original_kwargs)
+        else:
+            result = ActionDataEmpty(syft_internal_type=self.syft_internal_type)
+
+        post_result = self._syft_run_post_hooks__(context, name, result)
+        if name not in self._syft_dont_wrap_attrs():
+            post_result = self._syft_output_action_object(post_result)
+            if context.action is not None:
+                post_result.syft_history_hash = context.action.syft_history_hash
+            post_result.syft_node_uid = context.node_uid
+            if context.result_id is not None:
+                post_result.id = context.result_id
+                post_result._syft_track_result()
+        return post_result
 
     def __getattribute__(self, name: str) -> Any:
         # bypass certain attrs to prevent recursion issues
         if name.startswith("_syft") or name.startswith("syft"):
             return object.__getattribute__(self, name)
 
-        if name in self._syft_passthrough_attrs():
+        table = dispatch_table(type(self))
+        if name in table.passthrough:
             return object.__getattribute__(self, name)
         defined_on_self = name in self.__dict__ or name in self.__private_attributes__
         if show_print:
@@ -461,113 +684,33 @@ class ActionObject(SyftObject):
 
             return __wrapper__bool__
 
-        if self.syft_is_property(context_self, name):
+        if table.is_property(self, context_self, name):
             if show_print:
                 print("Property detected: ", name)
-            if self.syft_is_property(context_self, name):
-                context = PreHookContext(obj=self, op_name=name)
-                context, _, _ = self._syft_run_pre_hooks__(context, name, (), {})
-                # no input needs to propagate
-                result = self._syft_run_post_hooks__(
-                    context, name, self.syft_get_property(context_self, name)
-                )
-                if name not in self._syft_dont_wrap_attrs():
-                    result = self._syft_output_action_object(result)
-                    if context.action is not None:
-                        result.syft_history_hash = context.action.syft_history_hash
-                return result
+            context = PreHookContext(obj=self, op_name=name)
+            context, _, _ = self._syft_run_pre_hooks__(context, name, (), {})
+            # no input needs to propagate
+            result = self._syft_run_post_hooks__(
+                context, name, self.syft_get_property(context_self, name)
+            )
+            if name not in table.dont_wrap:
+                result = self._syft_output_action_object(result)
+                if context.action is not None:
+                    result.syft_history_hash = context.action.syft_history_hash
+            return result
 
         # check for other types that aren't methods, functions etc
-        def fake_func(*args: Any, **kwargs: Any) -> Any:
-            return ActionDataEmpty(syft_internal_type=self.syft_internal_type)
-
         if (
             isinstance(self.syft_action_data, ActionDataEmpty)
             and name not in action_data_empty_must_run
         ):
-            original_func = fake_func
+            original_func = None
         else:
             original_func = getattr(self.syft_action_data, name)
 
-        if show_print:
+        if show_print and original_func is not None:
             debug_original_func(name, original_func)
-        if inspect.ismethod(original_func) or inspect.ismethoddescriptor(original_func):
-            if show_print:
-                print("Running method: ", name)
-
-            def wrapper(_self: Any, *args: Any, **kwargs: Any) -> Any:
-                context = PreHookContext(obj=self, op_name=name)
-                context, pre_hook_args, pre_hook_kwargs = self._syft_run_pre_hooks__(
-                    context, name, args, kwargs
-                )
-
-                if not has_action_data_empty(args=args, kwargs=kwargs):
-                    original_args, original_kwargs = debox_args_and_kwargs(
-                        pre_hook_args, pre_hook_kwargs
-                    )
-
-                    result = original_func(*original_args, **original_kwargs)
-                else:
-                    result = fake_func(*args, **kwargs)
-
-                post_result = self._syft_run_post_hooks__(context, name, result)
-                if name not in self._syft_dont_wrap_attrs():
-                    post_result = self._syft_output_action_object(
-                        post_result,
-                    )
-                    if context.action is not None:
-                        post_result.syft_history_hash = context.action.syft_history_hash
-                    post_result.syft_node_uid = context.node_uid
-                    if context.result_id is not None:
-                        post_result.id = context.result_id
-                return post_result
-
-            wrapper = types.MethodType(wrapper, type(self))
-        else:
-            if show_print:
-                print("Running non-method: ", name)
-
-            def wrapper(*args: Any, **kwargs: Any) -> Any:
-                context = PreHookContext(obj=self, op_name=name)
-                context, pre_hook_args, pre_hook_kwargs = self._syft_run_pre_hooks__(
-                    context, name, args, kwargs
-                )
-
-                if not has_action_data_empty(args=args, kwargs=kwargs):
-                    original_args, original_kwargs = debox_args_and_kwargs(
-                        pre_hook_args, pre_hook_kwargs
-                    )
-
-                    result = original_func(*original_args, **original_kwargs)
-                else:
-                    result = fake_func(*args, **kwargs)
-
-                post_result = self._syft_run_post_hooks__(context, name, result)
-                if name not in self._syft_dont_wrap_attrs():
-                    post_result = self._syft_output_action_object(post_result)
-                    if context.action is not None:
-                        post_result.syft_history_hash = context.action.syft_history_hash
-                    post_result.syft_node_uid = context.node_uid
-                    if context.result_id is not None:
-                        post_result.id = context.result_id
-                return post_result
-
-        try:
-            wrapper.__doc__ = original_func.__doc__
-            if show_print:
-                print(
-                    "Found original signature for ",
-                    name,
-                    inspect.signature(original_func),
-                )
-            wrapper.__ipython_inspector_signature_override__ = inspect.signature(
-                original_func
-            )
-        except Exception:
-            if show_print:
-                print("name", name, "has no signature")
-
-        return wrapper
+        return ActionObjectOp(self, name, original_func)
 
     def syft_execute_action(
         self, action: Action, sync: bool = True
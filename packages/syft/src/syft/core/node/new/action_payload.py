@@ -0,0 +1,88 @@
+# stdlib
+import hashlib
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Type
+
+# relative
+from .action_cache import shallow_copy
+from .action_data_empty import ActionDataEmpty
+from .serializable import serializable
+from .serialize import _serialize
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .uid import UID
+
+
+@serializable()
+class ActionPayloadRef(ActionDataEmpty):
+    """Stands in for the data of an ActionObject whose payload is stored once
+    under its digest in the action store
+
+    Parameters:
+        `digest`: str
+            SHA-256 of the serialized `syft_action_data`
+    """
+
+    __canonical_name__ = "ActionPayloadRef"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    syft_internal_type: Optional[Type] = None
+    digest: str
+
+
+def serialize_payload(data: Any) -> Tuple[str, bytes]:
+    """Digest and serialized form of the data of an ActionObject"""
+    blob = _serialize(data, to_bytes=True)
+    return hashlib.sha256(blob).hexdigest(), blob
+
+
+def payload_uid(digest: str) -> UID:
+    """Backing store key of a payload, the first 16 bytes of its digest"""
+    return UID(bytes.fromhex(digest)[:16])
+
+
+def payload_sides(obj: Any) -> Dict[str, Any]:
+    """The ActionObjects of `obj` holding a payload, by action store side"""
+    # relative
+    from .action_object import ActionObject
+    from .twin_object import TwinObject
+
+    if isinstance(obj, TwinObject):
+        return {"data": obj.private_obj, "mock": obj.mock_obj}
+    if isinstance(obj, ActionObject):
+        return {"data": obj}
+    return {}
+
+
+def skip_known_payloads(api: Any, obj: Any) -> Any:
+    """Copy of `obj` with the data the node already holds replaced by its
+    ActionPayloadRef, so only new payloads are uploaded. `obj` isn't changed."""
+    # relative
+    from .twin_object import TwinObject
+
+    sides = payload_sides(obj)
+    digests = {
+        name: serialize_payload(side.syft_action_data)[0]
+        for name, side in sides.items()
+        if not isinstance(side.syft_action_data, ActionDataEmpty)
+    }
+    if len(digests) == 0 or not hasattr(api.services.action, "has_payloads"):
+        return obj
+    known = api.services.action.has_payloads(digests=list(digests.values()))
+    if not isinstance(known, list) or len(known) == 0:
+        return obj
+
+    copies = {}
+    for name, side in sides.items():
+        if digests.get(name) in known:
+            side = shallow_copy(side)
+            side.syft_action_data = ActionPayloadRef(digest=digests[name])
+        copies[name] = side
+    if isinstance(obj, TwinObject):
+        obj = shallow_copy(obj)
+        obj.private_obj = copies["data"]
+        obj.mock_obj = copies["mock"]
+        return obj
+    return copies["data"]
@@ -1,9 +1,13 @@
 # stdlib
+import copy
 from enum import Enum
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Union
+import weakref
 
 # third party
 import numpy as np
@@ -12,13 +16,22 @@ from result import Ok
 from result import Result
 
 # relative
+from .action_batch import action_inputs
+from .action_batch import topological_order
+from .action_cache import shallow_copy
+from .action_lifecycle import ActionGarbageCollector
+from .action_memo import ActionMemo
+from .action_memo import is_mutating
 from .action_object import Action
 from .action_object import ActionObject
 from .action_object import ActionObjectPointer
 from .action_object import AnyActionObject
+from .action_store import ActionObjectMetadata
+from .action_store import ActionObjectREAD
 from .action_store import ActionStore
 from .action_types import action_type_for_type
 from .context import AuthedServiceContext
+from .dict_document_store import DictStoreConfig
 from .numpy import NumpyArrayObject
 from .pandas import PandasDataFrameObject  # noqa: F401
 from .pandas import PandasSeriesObject  # noqa: F401
@@ -29,10 +42,14 @@ from .service import AbstractService
 from .service import SERVICE_TO_TYPES
 from .service import TYPE_TO_SERVICE
 from .service import service_method
+from .twin_evaluation import SideResult
+from .twin_evaluation import TwinEvaluator
 from .twin_object import TwinObject
+from .uid import LineageID
 from .uid import UID
 from .user_code import UserCode
 from .user_code import execute_byte_code
+from .user_roles import ADMIN_ROLE_LEVEL
 from .user_roles import GUEST_ROLE_LEVEL
 
 
@@ -45,8 +62,42 @@ class TwinMode(Enum):
 
 @serializable()
 class ActionService(AbstractService):
+    # the twin evaluator and its threads aren't serialized, copies create their own
+    __serde_overrides__: Dict[str, Any] = {
+        "_twin_evaluator": (lambda _: None, lambda _: None)
+    }
+
     def __init__(self, store: ActionStore) -> None:
         self.store = store
+        action_config = getattr(store, "action_config", None)
+        self.memo: Optional[ActionMemo] = None
+        memo_config = getattr(action_config, "memo", None)
+        if memo_config is not None:
+            # writes of other processes sharing a backend would leave it stale
+            store_config = getattr(store, "store_config", None)
+            if not isinstance(store_config, DictStoreConfig):
+                raise ValueError(
+                    "The action memo needs an in-memory action store, not "
+                    f"{type(store_config).__name__}"
+                )
+            self.memo = ActionMemo(memo_config)
+            store.write_listeners.append(self.memo.invalidate)
+        self._twin_evaluator: Optional[TwinEvaluator] = None
+
+    @property
+    def twin_evaluator(self) -> TwinEvaluator:
+        """Created on first use, its threads are stopped by `shutdown` or when
+        the service is garbage collected"""
+        if getattr(self, "_twin_evaluator", None) is None:
+            action_config = getattr(self.store, "action_config", None)
+            evaluator = TwinEvaluator(getattr(action_config, "twin_evaluation", None))
+            weakref.finalize(self, evaluator.shutdown)
+            self._twin_evaluator = evaluator
+        return self._twin_evaluator
+
+    def shutdown(self) -> None:
+        if getattr(self, "_twin_evaluator", None) is not None:
+            self._twin_evaluator.shutdown()
 
     @service_method(path="action.np_array", name="np_array")
     def np_array(self, context: AuthedServiceContext, data: Any) -> Any:
@@ -95,6 +146,18 @@ class ActionService(AbstractService):
             return Ok(SyftSuccess(message=f"{type(action_object)} saved"))
         return result.err()
 
+    @service_method(
+        path="action.has_payloads", name="has_payloads", roles=GUEST_ROLE_LEVEL
+    )
+    def has_payloads(
+        self, context: AuthedServiceContext, digests: List[str]
+    ) -> Result[List[str], str]:
+        """The payload digests already stored and readable, their objects can be
+        uploaded with an ActionPayloadRef in place of the data"""
+        return Ok(
+            self.store.has_payloads(digests=digests, credentials=context.credentials)
+        )
+
     @service_method(path="action.get", name="get", roles=GUEST_ROLE_LEVEL)
     def get(
         self,
@@ -106,24 +169,53 @@ class ActionService(AbstractService):
         """Get an object from the action store"""
         # TODO 🟣 Temporarily added skip permission arguments for enclave
         # until permissions are fully integrated
-        result = self.store.get(
+        # only the requested side of a twin is read from the store
+        if twin_mode == TwinMode.PRIVATE:
+            get = self.store.get_private
+        elif twin_mode == TwinMode.MOCK:
+            get = self.store.get_mock
+        else:
+            get = self.store.get
+        result = get(
             uid=uid, credentials=context.credentials, skip_permission=skip_permission
         )
         if result.is_ok():
             obj = result.ok()
             if isinstance(obj, TwinObject):
-                if twin_mode == TwinMode.PRIVATE:
-                    obj = obj.private
-                    obj.syft_point_to(context.node.id)
-                elif twin_mode == TwinMode.MOCK:
-                    obj = obj.mock
-                    obj.syft_point_to(context.node.id)
-                else:
-                    obj.mock.syft_point_to(context.node.id)
-                    obj.private.syft_point_to(context.node.id)
+                obj.mock.syft_point_to(context.node.id)
+                obj.private.syft_point_to(context.node.id)
+            elif twin_mode != TwinMode.NONE:
+                obj.syft_point_to(context.node.id)
             return Ok(obj)
         return Err(result.err())
 
+    @service_method(path="action.get_many", name="get_many", roles=GUEST_ROLE_LEVEL)
+    def get_many(
+        self, context: AuthedServiceContext, uids: List[UID]
+    ) -> Result[Dict[UID, Union[ActionObject, TwinObject]], str]:
+        """Get many objects from the action store with one permission check,
+        twins with both their sides like `get` with TwinMode.NONE"""
+        result = self.store.get_many(
+            uids=[to_uid(uid) for uid in uids], credentials=context.credentials
+        )
+        if result.is_err():
+            return result
+        objs = result.ok()
+        for obj in objs.values():
+            if isinstance(obj, TwinObject):
+                obj.mock.syft_point_to(context.node.id)
+                obj.private.syft_point_to(context.node.id)
+        return Ok(objs)
+
+    @service_method(
+        path="action.get_metadata", name="get_metadata", roles=GUEST_ROLE_LEVEL
+    )
+    def get_metadata(
+        self, context: AuthedServiceContext, uid: UID
+    ) -> Result[ActionObjectMetadata, str]:
+        """Get the type and twin ids of an object, without its data"""
+        return self.store.get_metadata(uid=uid, credentials=context.credentials)
+
     @service_method(
         path="action.get_pointer", name="get_pointer", roles=GUEST_ROLE_LEVEL
     )
@@ -140,8 +232,14 @@ class ActionService(AbstractService):
 
     # not a public service endpoint
     def _user_code_execute(
-        self, context: AuthedServiceContext, code_item: UserCode, kwargs: Dict[str, Any]
+        self,
+        context: AuthedServiceContext,
+        code_item: UserCode,
+        kwargs: Dict[str, Any],
+        twin_mode: TwinMode = TwinMode.NONE,
     ) -> Result[ActionObjectPointer, Err]:
+        """Run user code on its inputs, with twin inputs only the side of
+        `twin_mode` is evaluated, both sides for TwinMode.NONE"""
         filtered_kwargs = code_item.input_policy.filter_kwargs(
             kwargs=kwargs, context=context, code_item_id=code_item.id
         )
@@ -157,6 +255,19 @@ class ActionService(AbstractService):
 
         result_id = UID()
 
+        def side(mode: TwinMode) -> Callable[[], Any]:
+            side_kwargs = filter_twin_kwargs(
+                kwargs, twin_mode=mode, copy_shared=twin_mode == TwinMode.NONE
+            )
+
+            def run() -> Any:
+                exec_result = execute_byte_code(code_item, side_kwargs)
+                if exec_result is None:
+                    raise Exception(f"{code_item.unique_func_name} failed")
+                return exec_result.result
+
+            return run
+
         try:
             if not has_twin_inputs:
                 # no twins
@@ -167,23 +278,15 @@ class ActionService(AbstractService):
                 )
             else:
                 # twins
-                private_kwargs = filter_twin_kwargs(kwargs, twin_mode=TwinMode.PRIVATE)
-                private_exec_result = execute_byte_code(code_item, private_kwargs)
-                result_action_object_private = wrap_result(
-                    code_item.id, result_id, private_exec_result.result
-                )
-
-                mock_kwargs = filter_twin_kwargs(kwargs, twin_mode=TwinMode.MOCK)
-                mock_exec_result = execute_byte_code(code_item, mock_kwargs)
-                result_action_object_mock = wrap_result(
-                    code_item.id, result_id, mock_exec_result.result
-                )
-
-                result_action_object = TwinObject(
-                    id=result_id,
-                    private_obj=result_action_object_private,
-                    mock_obj=result_action_object_mock,
+                result_action_object = self._evaluate_twin(
+                    side,
+                    twin_mode=twin_mode,
+                    result_id=result_id,
+                    wrap=lambda result: wrap_result(code_item.id, result_id, result),
                 )
+                if result_action_object.is_err():
+                    return result_action_object
+                result_action_object = result_action_object.ok()
         except Exception as e:
             print("what is this exception", e)
             return Err("_user_code_execute failed")
@@ -195,6 +298,7 @@ class ActionService(AbstractService):
         )
         if set_result.is_err():
             return set_result.err()
+        # not leased, user code results are kept like any uploaded object
 
         if isinstance(result_action_object, TwinObject):
             result_action_object = result_action_object.mock
@@ -202,57 +306,115 @@ class ActionService(AbstractService):
 
         return Ok(result_action_object)
 
-    @service_method(path="action.execute", name="execute", roles=GUEST_ROLE_LEVEL)
-    def execute(
-        self, context: AuthedServiceContext, action: Action
-    ) -> Result[ActionObjectPointer, Err]:
-        """Execute an operation on objects in the action store"""
-        resolved_self = self.get(
-            context=context, uid=action.remote_self, twin_mode=TwinMode.NONE
+    def _resolve_many(
+        self,
+        context: AuthedServiceContext,
+        uids: List[UID],
+        resolved: Optional[Dict[UID, Any]] = None,
+    ) -> Result[Dict[UID, Union[ActionObject, TwinObject]], str]:
+        """The objects of `uids`, read from `resolved` if there, the others
+        from the action store in one batch"""
+        resolved = resolved if resolved is not None else {}
+        uids = [to_uid(uid) for uid in uids]
+        objs = {uid: resolved[uid] for uid in uids if uid in resolved}
+        missing = [uid for uid in uids if uid not in objs]
+        if len(missing) > 0:
+            stored = self.get_many(context=context, uids=missing)
+            if stored.is_err():
+                return stored
+            objs.update(stored.ok())
+        return Ok(objs)
+
+    def _evaluate_twin(
+        self,
+        side: Callable[[TwinMode], Callable[[], Any]],
+        twin_mode: TwinMode,
+        result_id: UID,
+        wrap: Callable[[Any], ActionObject],
+    ) -> Result[Union[ActionObject, TwinObject], str]:
+        """Evaluate the sides of a twin operation `twin_mode` asks for, `side`
+        builds the call of a side in the request thread"""
+        private = side(TwinMode.PRIVATE) if twin_mode != TwinMode.MOCK else None
+        mock = side(TwinMode.MOCK) if twin_mode != TwinMode.PRIVATE else None
+        private_result, mock_result = self.twin_evaluator.evaluate(
+            private=private, mock=mock
         )
-        if resolved_self.is_err():
-            return resolved_self.err()
-        resolved_self = resolved_self.ok()
+        return twin_result(result_id, private_result, mock_result, wrap)
 
-        if isinstance(resolved_self, TwinObject):
-            private_result = execute_object(
-                self, context, resolved_self.private, action, twin_mode=TwinMode.PRIVATE
-            )
-            if private_result.is_err():
-                return private_result.err()
-            mock_result = execute_object(
-                self, context, resolved_self.mock, action, twin_mode=TwinMode.MOCK
-            )
-            if mock_result.is_err():
-                return mock_result.err()
-
-            private_result = private_result.ok()
-            mock_result = mock_result.ok()
-
-            result_action_object = Ok(
-                TwinObject(
-                    id=action.result_id,
-                    private_obj=private_result,
-                    private_obj_id=action.result_id,
-                    mock_obj=mock_result,
-                    mock_obj_id=action.result_id,
-                )
-            )
-        else:
-            result_action_object = execute_object(self, context, resolved_self, action)
+    def _memoized(
+        self, context: AuthedServiceContext, action: Action
+    ) -> Optional[Union[ActionObject, TwinObject]]:
+        if self.memo is None:
+            return None
+        # reused only by the users allowed to read the earlier result
+        result_id = self.memo.get(
+            action,
+            readable=lambda uid: self.store.has_permission(
+                ActionObjectREAD(uid=uid, credentials=context.credentials)
+            ),
+        )
+        if result_id is None:
+            return None
+        result = self.get(context=context, uid=result_id, twin_mode=TwinMode.NONE)
+        if result.is_err():
+            return None
+        return with_result_id(result.ok(), action.result_id.id)
+
+    def _execute(
+        self,
+        context: AuthedServiceContext,
+        action: Action,
+        resolved: Optional[Dict[UID, Any]] = None,
+        twin_mode: TwinMode = TwinMode.NONE,
+    ) -> Result[Union[ActionObject, TwinObject], str]:
+        """Result of an Action, the objects in `resolved` are read from there
+        instead of the action store"""
+        if twin_mode == TwinMode.NONE:
+            memoized = self._memoized(context, action)
+            if memoized is not None:
+                return Ok(memoized)
+        if self.memo is not None and is_mutating(action):
+            self.memo.invalidate(action.remote_self.id)
+
+        # self and the arguments are read in one batch
+        inputs = self._resolve_many(context, action_inputs(action), resolved)
+        if inputs.is_err():
+            return inputs
+        inputs = inputs.ok()
+        return execute_object(
+            self,
+            context,
+            inputs[action.remote_self.id],
+            action,
+            twin_mode=twin_mode,
+            resolved=inputs,
+        )
 
+    @service_method(path="action.execute", name="execute", roles=GUEST_ROLE_LEVEL)
+    def execute(
+        self,
+        context: AuthedServiceContext,
+        action: Action,
+        twin_mode: TwinMode = TwinMode.NONE,
+    ) -> Result[ActionObjectPointer, Err]:
+        """Execute an operation on objects in the action store, on twins only
+        the side of `twin_mode` is evaluated, both sides for TwinMode.NONE"""
+        result_action_object = self._execute(context, action, twin_mode=twin_mode)
         if result_action_object.is_err():
             return result_action_object.err()
         else:
             result_action_object = result_action_object.ok()
 
         set_result = self.store.set(
-            uid=action.result_id,
+            uid=action.result_id.id,
             credentials=context.credentials,
             syft_object=result_action_object,
         )
         if set_result.is_err():
             return set_result.err()
+        self.store.track(uid=action.result_id.id, credentials=context.credentials)
+        if self.memo is not None and twin_mode == TwinMode.NONE:
+            self.memo.put(action, action.result_id.id)
 
         if isinstance(result_action_object, TwinObject):
             result_action_object = result_action_object.mock
@@ -260,6 +422,89 @@ class ActionService(AbstractService):
 
         return Ok(result_action_object)
 
+    @service_method(
+        path="action.execute_batch", name="execute_batch", roles=GUEST_ROLE_LEVEL
+    )
+    def execute_batch(
+        self, context: AuthedServiceContext, actions: List[Action], outputs: List[UID]
+    ) -> Result[List[ActionObjectPointer], str]:
+        """Execute a graph of Actions reading each other's results in one call
+
+        The actions run in dependency order with their results kept in memory,
+        each dropped once no later action reads it. Only the results listed in
+        `outputs` are saved to the action store, pointers to them are returned
+        in that order.
+        """
+        order = topological_order(actions)
+        if order.is_err():
+            return order
+        order = order.ok()
+        requested = {uid.id if isinstance(uid, LineageID) else uid for uid in outputs}
+        batch_results = {action.result_id.id for action in order}
+        if not requested <= batch_results:
+            return Err(f"Not results of the batch: {requested - batch_results}")
+
+        readers: Dict[UID, int] = {}
+        for action in order:
+            for uid in action_inputs(action):
+                readers[uid] = readers.get(uid, 0) + 1
+
+        resolved: Dict[UID, Any] = {}
+        for action in order:
+            result = self._execute(context, action, resolved)
+            if result.is_err():
+                return Err(f"{action.full_path} failed: {result.err()}")
+            resolved[action.result_id.id] = result.ok()
+            for uid in action_inputs(action):
+                readers[uid] -= 1
+                if readers[uid] == 0 and uid not in requested:
+                    resolved.pop(uid, None)
+
+        pointers = []
+        for action in order:
+            uid = action.result_id.id
+            if uid not in requested:
+                continue
+            result_action_object = resolved[uid]
+            set_result = self.store.set(
+                uid=uid,
+                credentials=context.credentials,
+                syft_object=result_action_object,
+            )
+            if set_result.is_err():
+                return set_result
+            self.store.track(uid=uid, credentials=context.credentials)
+            if self.memo is not None:
+                self.memo.put(action, uid)
+            if isinstance(result_action_object, TwinObject):
+                result_action_object = result_action_object.mock
+            result_action_object.syft_point_to(context.node.id)
+            pointers.append(result_action_object)
+        return Ok(pointers)
+
+    @service_method(path="action.retain", name="retain", roles=GUEST_ROLE_LEVEL)
+    def retain(
+        self, context: AuthedServiceContext, uid: UID, ttl: Optional[float] = None
+    ) -> Result[SyftSuccess, str]:
+        """Add a reference to an action result and renew its lease"""
+        return self.store.retain(uid=uid, credentials=context.credentials, ttl=ttl)
+
+    @service_method(path="action.release", name="release", roles=GUEST_ROLE_LEVEL)
+    def release(
+        self, context: AuthedServiceContext, uids: List[UID]
+    ) -> Result[SyftSuccess, str]:
+        """Drop a reference to each action result, the unreferenced ones are
+        deleted by the next garbage collection"""
+        return self.store.release(uids=uids, credentials=context.credentials)
+
+    @service_method(path="action.collect", name="collect", roles=ADMIN_ROLE_LEVEL)
+    def collect(self, context: AuthedServiceContext) -> Result[SyftSuccess, str]:
+        """Delete the released and expired action results now"""
+        result = ActionGarbageCollector(self.store).collect()
+        if result.is_err():
+            return result
+        return Ok(SyftSuccess(message=f"Collected {result.ok()} objects"))
+
     @service_method(path="action.exists", name="exists", roles=GUEST_ROLE_LEVEL)
     def exists(
         self, context: AuthedServiceContext, obj_id: UID
@@ -274,109 +519,150 @@ class ActionService(AbstractService):
 def execute_object(
     service: ActionService,
     context: AuthedServiceContext,
-    resolved_self: ActionObject,
+    resolved_self: Union[ActionObject, TwinObject],
     action: Action,
     twin_mode: TwinMode = TwinMode.NONE,
+    resolved: Optional[Dict[UID, Any]] = None,
 ) -> Result[Union[TwinObject, ActionObject], str]:
-    unboxed_resolved_self = resolved_self.syft_action_data
-    args = []
-    has_twin_inputs = False
-    if action.args:
-        for arg_id in action.args:
-            arg_value = service.get(
-                context=context, uid=arg_id, twin_mode=TwinMode.NONE
-            )
-            if arg_value.is_err():
-                return arg_value.err()
-            if isinstance(arg_value.ok(), TwinObject):
-                has_twin_inputs = True
-            args.append(arg_value.ok())
-
-    kwargs = {}
-    if action.kwargs:
-        for key, arg_id in action.kwargs.items():
-            kwarg_value = service.get(
-                context=context, uid=arg_id, twin_mode=TwinMode.NONE
+    """Result of the op of `action` on `resolved_self`, with twins on self or
+    the inputs only the side of `twin_mode` is evaluated, both for NONE"""
+    inputs = service._resolve_many(
+        context, list(action.args) + list(action.kwargs.values()), resolved
+    )
+    if inputs.is_err():
+        return inputs
+    inputs = inputs.ok()
+    args = [inputs[to_uid(arg_id)] for arg_id in action.args]
+    kwargs = {key: inputs[to_uid(arg_id)] for key, arg_id in action.kwargs.items()}
+    has_twin_inputs = any(
+        isinstance(value, TwinObject)
+        for value in [resolved_self, *args, *kwargs.values()]
+    )
+    if has_twin_inputs and is_mutating(action):
+        # a change of a twin's side in place would bypass the twin, and the
+        # change of an input shared by both sides would cross between them
+        return Err(f"{action.op} changes its inputs in place, not allowed on twins")
+
+    def side(mode: TwinMode) -> Callable[[], Any]:
+        # when both sides run, each gets a copy of the objects that aren't twins
+        copy_shared = twin_mode == TwinMode.NONE and mode != TwinMode.NONE
+        if isinstance(resolved_self, TwinObject):
+            side_self = (
+                resolved_self.private
+                if mode == TwinMode.PRIVATE
+                else resolved_self.mock
             )
-            if kwarg_value.is_err():
-                return kwarg_value.err()
-            if isinstance(kwarg_value.ok(), TwinObject):
-                has_twin_inputs = True
-            kwargs[key] = kwarg_value.ok()
-
-    # 🔵 TODO 10: Get proper code From old RunClassMethodAction to ensure the function
-    # is not bound to the original object or mutated
-    target_method = getattr(unboxed_resolved_self, action.op, None)
-    result = None
-    try:
-        if target_method:
-            if twin_mode == TwinMode.NONE and not has_twin_inputs:
-                # no twins
-                filtered_args = filter_twin_args(args, twin_mode=twin_mode)
-                filtered_kwargs = filter_twin_kwargs(kwargs, twin_mode=twin_mode)
-                result = target_method(*filtered_args, **filtered_kwargs)
-                result_action_object = wrap_result(
-                    action.parent_id, action.result_id, result
-                )
-            elif twin_mode == TwinMode.NONE and has_twin_inputs:
-                # self isn't a twin but one of the inputs is
-                private_args = filter_twin_args(args, twin_mode=twin_mode)
-                private_kwargs = filter_twin_kwargs(kwargs, twin_mode=twin_mode)
-                private_result = target_method(*private_args, **private_kwargs)
-                result_action_object_private = wrap_result(
-                    action.parent_id, action.result_id, private_result
-                )
+            unboxed_self = side_self.syft_action_data
+        elif copy_shared:
+            unboxed_self = copy.deepcopy(resolved_self.syft_action_data)
+        else:
+            unboxed_self = resolved_self.syft_action_data
+        side_args = filter_twin_args(args, twin_mode=mode, copy_shared=copy_shared)
+        side_kwargs = filter_twin_kwargs(
+            kwargs, twin_mode=mode, copy_shared=copy_shared
+        )
 
-                mock_args = filter_twin_args(args, twin_mode=twin_mode)
-                mock_kwargs = filter_twin_kwargs(kwargs, twin_mode=twin_mode)
-                mock_result = target_method(*mock_args, **mock_kwargs)
-                result_action_object_mock = wrap_result(
-                    action.parent_id, action.result_id, mock_result
-                )
+        def run() -> Any:
+            # 🔵 TODO 10: Get proper code From old RunClassMethodAction to ensure the
+            # function is not bound to the original object or mutated
+            target_method = getattr(unboxed_self, action.op)
+            return target_method(*side_args, **side_kwargs)
 
-                result_action_object = TwinObject(
-                    id=action.result_id,
-                    private_obj=result_action_object_private,
-                    mock_obj=result_action_object_mock,
-                )
-            elif twin_mode == twin_mode.PRIVATE:  # type: ignore
-                # twin private path
-                private_args = filter_twin_args(args, twin_mode=twin_mode)
-                private_kwargs = filter_twin_kwargs(kwargs, twin_mode=twin_mode)
-                result = target_method(*private_args, **private_kwargs)
-                result_action_object = wrap_result(
-                    action.parent_id, action.result_id, result
-                )
-            elif twin_mode == twin_mode.MOCK:  # type: ignore
-                # twin mock path
-                mock_args = filter_twin_args(args, twin_mode=twin_mode)
-                mock_kwargs = filter_twin_kwargs(kwargs, twin_mode=twin_mode)
-                target_method = getattr(unboxed_resolved_self, action.op, None)
-                result = target_method(*mock_args, **mock_kwargs)
-                result_action_object = wrap_result(
-                    action.parent_id, action.result_id, result
-                )
-            else:
-                raise Exception(
-                    f"Bad combination of: twin_mode: {twin_mode} and has_twin_inputs: {has_twin_inputs}"
-                )
+        return run
 
+    try:
+        if not has_twin_inputs:
+            # no twins
+            result = side(TwinMode.NONE)()
+            return Ok(wrap_result(action.id, action.result_id, result))
+        # the sides of self or of the inputs, on the twin evaluator
+        return service._evaluate_twin(
+            side,
+            twin_mode=twin_mode,
+            result_id=action.result_id.id,
+            wrap=lambda result: wrap_result(action.id, action.result_id, result),
+        )
     except Exception as e:
         print("what is this exception", e)
         return Err(e)
-    return Ok(result_action_object)
+
+
+def twin_result(
+    result_id: UID,
+    private: SideResult,
+    mock: SideResult,
+    wrap: Callable[[Any], ActionObject],
+) -> Result[Union[ActionObject, TwinObject], str]:
+    """The ActionObject of the one side evaluated, or the TwinObject of both
+
+    A side that failed holds its SyftError, so a failing mock doesn't lose the
+    private result and the other way around.
+    """
+    if private is None or mock is None:
+        only = private if private is not None else mock
+        if only is None:
+            return Err("No side of the twin was evaluated")
+        if only.is_err():
+            return only
+        return Ok(wrap(only.ok()))
+
+    if private.is_err() and mock.is_err():
+        return Err(f"private side: {private.err()}, mock side: {mock.err()}")
+
+    def side_object(side: Result[Any, str], name: str) -> ActionObject:
+        if side.is_ok():
+            return wrap(side.ok())
+        return wrap(SyftError(message=f"The {name} side failed: {side.err()}"))
+
+    return Ok(
+        TwinObject(
+            id=result_id,
+            private_obj=side_object(private, "private"),
+            private_obj_id=result_id,
+            mock_obj=side_object(mock, "mock"),
+            mock_obj_id=result_id,
+        )
+    )
+
+
+def to_uid(uid: Union[UID, LineageID]) -> UID:
+    # actions refer to objects by LineageID, they are stored by UID
+    return uid.id if isinstance(uid, LineageID) else uid
+
+
+def with_result_id(
+    obj: Union[ActionObject, TwinObject], uid: UID
+) -> Union[ActionObject, TwinObject]:
+    """Copy of a stored result to save again under `uid`"""
+    if isinstance(obj, TwinObject):
+        return TwinObject(
+            id=uid,
+            private_obj=with_result_id(obj.private_obj, uid),
+            private_obj_id=uid,
+            mock_obj=with_result_id(obj.mock_obj, uid),
+            mock_obj_id=uid,
+        )
+    obj = shallow_copy(obj)
+    obj.id = uid
+    return obj
 
 
 def wrap_result(parent_id: UID, result_id: UID, result: Any) -> ActionObject:
     # 🟡 TODO 11: Figure out how we want to store action object results
     action_type = action_type_for_type(result)
+    if isinstance(result_id, LineageID):
+        result_id = result_id.id
     result_action_object = action_type(
         id=result_id, parent_id=parent_id, syft_action_data=result
     )
     return result_action_object
 
 
-def filter_twin_args(args: List[Any], twin_mode: TwinMode) -> Any:
+def filter_twin_args(
+    args: List[Any], twin_mode: TwinMode, copy_shared: bool = False
+) -> Any:
+    """The data of `args` on the side of `twin_mode`, `copy_shared` deep copies
+    the data of the args that aren't twins"""
     filtered = []
     for arg in args:
         if isinstance(arg, TwinObject):
@@ -388,12 +674,17 @@ def filter_twin_args(args: List[Any], twin_mode: TwinMode) -> Any:
                 raise Exception(
                     f"Filter can only use {TwinMode.PRIVATE} or {TwinMode.MOCK}"
                 )
+        elif copy_shared:
+            filtered.append(copy.deepcopy(arg.syft_action_data))
         else:
             filtered.append(arg.syft_action_data)
     return filtered
 
 
-def filter_twin_kwargs(kwargs: Dict, twin_mode: TwinMode) -> Any:
+def filter_twin_kwargs(
+    kwargs: Dict, twin_mode: TwinMode, copy_shared: bool = False
+) -> Any:
+    """`filter_twin_args` of keyword arguments"""
     filtered = {}
     for k, v in kwargs.items():
         if isinstance(v, TwinObject):
@@ -405,6 +696,8 @@ def filter_twin_kwargs(kwargs: Dict, twin_mode: TwinMode) -> Any:
                 raise Exception(
                     f"Filter can only use {TwinMode.PRIVATE} or {TwinMode.MOCK}"
                 )
+        elif copy_shared:
+            filtered[k] = copy.deepcopy(v.syft_action_data)
         else:
             filtered[k] = v.syft_action_data
     return filtered
@@ -3,8 +3,16 @@ from __future__ import annotations
 
 # stdlib
 from enum import Enum
+import functools
+import time
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import ContextManager
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Union
 
 # third party
 from result import Err
@@ -12,13 +20,33 @@ from result import Ok
 from result import Result
 
 # relative
+from .action_cache import ActionObjectCache
+from .action_cache import copy_cached
+from .action_cache import estimate_size
+from .action_cache import shallow_copy
+from .action_config import ActionConfig
+from .action_lifecycle import ActionObjectLease
+from .action_object import ActionObject
+from .action_payload import ActionPayloadRef
+from .action_payload import payload_sides
+from .action_payload import payload_uid
+from .action_payload import serialize_payload
+from .blob_store import BlobRef
+from .blob_store import FileBlobStore
 from .credentials import SyftSigningKey
 from .credentials import SyftVerifyKey
+from .deserialize import _deserialize
 from .dict_document_store import DictStoreConfig
 from .document_store import BasePartitionSettings
 from .document_store import StoreConfig
+from .locks import SharedExclusiveLock
+from .locks import StripedLock
+from .permission_index import KeyValuePermissionIndex
+from .permission_index import PermissionIndex
+from .permission_index import permission_key
 from .response import SyftSuccess
 from .serializable import serializable
+from .syft_object import SYFT_OBJECT_VERSION_1
 from .syft_object import SyftObject
 from .twin_object import TwinObject
 from .uid import UID
@@ -45,6 +73,10 @@ class ActionObjectPermission:
     def permission_string(self) -> str:
         return f"{self.credentials.verify}_{self.permission.name}"
 
+    @property
+    def permission_key(self) -> bytes:
+        return permission_key(self.uid, self.credentials, self.permission)
+
     def __repr__(self) -> str:
         return f"<{self.permission.name}: {self.uid} as {self.credentials.verify}>"
 
@@ -77,70 +109,576 @@ class ActionObjectEXECUTE(ActionObjectPermission):
         self.permission = ActionPermission.EXECUTE
 
 
+@serializable()
+class ActionObjectMetadata(SyftObject):
+    """What is stored under an action store uid, kept apart from the payloads
+
+    Parameters:
+        `id`: UID
+            Action store uid of the object
+        `object_type`: str
+            Class name of the stored object, of the private side for twins
+        `is_twin`: bool
+            If the private and the mock payload are stored as separate entries
+        `private_obj_id`: Optional[UID]
+            Id of the private object of a twin
+        `mock_obj_id`: Optional[UID]
+            Id of the mock object of a twin
+    """
+
+    __canonical_name__ = "ActionObjectMetadata"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    object_type: str
+    is_twin: bool = False
+    private_obj_id: Optional[UID] = None
+    mock_obj_id: Optional[UID] = None
+
+
 class ActionStore:
     pass
 
 
+def _writes(method: Callable) -> Callable:
+    """Run a method of a KeyValueActionStore under the shared side of its write
+    lock, writers only wait for each other while `lock_writes` is held"""
+
+    @functools.wraps(method)
+    def _locked(self: KeyValueActionStore, *args: Any, **kwargs: Any) -> Any:
+        with self._write_lock.shared():
+            return method(self, *args, **kwargs)
+
+    return _locked
+
+
 @serializable()
 class KeyValueActionStore(ActionStore):
     """Generic Key-Value Action store.
 
+    The private and the mock side of a TwinObject are separate entries of `data`
+    and `mock`, next to an ActionObjectMetadata in `metadata`, so each can be read
+    without the others. The writes of this process hold the shared side of a write
+    lock, see `lock_writes`.
+
     Parameters:
         store_config: StoreConfig
-            Backend specific configuration, including connection configuration, database name, or client class type.
+            Backend specific configuration, including connection configuration,
+            database name, or client class type.
         root_verify_key: Optional[SyftVerifyKey]
             Signature verification key, used for checking access permissions.
+        action_config: Optional[ActionConfig]
+            Cache and lifecycle of the action objects, independent of the backend.
+        store_config.permission_index: Type[PermissionIndex]
+            Keeps one entry per granted (uid, verify key, permission).
+        store_config.payload_dedup: bool
+            If set, the data of an ActionObject is stored once per content in
+            `payloads`, under its digest. The sides hold an ActionPayloadRef in its
+            place, `payload_refs` lists the sides referring to each payload and the
+            payload is deleted with its last reference.
+        store_config.blob_storage: Optional[BlobStorageConfig]
+            If set, large payloads and other large objects are kept in blob files
+            and only their BlobRef in the backing stores. The blob digests of each
+            key are listed in `blob_refs`.
+        action_config.cache: Optional[ActionCacheConfig]
+            If set, payloads read are kept in an ActionObjectCache, only consulted
+            after the read permission was checked. It is invalidated by the writes
+            of this store, not by those of other processes sharing the backend,
+            which don't reach the `write_listeners` either.
+        action_config.lifecycle: Optional[ActionLifecycleConfig]
+            If set, the results of actions are tracked with an ActionObjectLease in
+            `leases` and deleted by `collect_unreachable` once released by every
+            client or expired.
     """
 
+    # the locks aren't serialized, new ones come with every copy
+    __serde_overrides__: Dict[str, Any] = {
+        "_write_lock": (lambda _: None, lambda _: SharedExclusiveLock()),
+        "_payload_locks": (lambda _: None, lambda _: None),
+    }
+
     def __init__(
-        self, store_config: StoreConfig, root_verify_key: Optional[SyftVerifyKey] = None
+        self,
+        store_config: StoreConfig,
+        root_verify_key: Optional[SyftVerifyKey] = None,
+        action_config: Optional[ActionConfig] = None,
     ) -> None:
         self.store_config = store_config
+        self.action_config = (
+            action_config if action_config is not None else ActionConfig()
+        )
         self.settings = BasePartitionSettings(name="Action")
+        self._write_lock = SharedExclusiveLock()
         self.data = self.store_config.backing_store(
             "data", self.settings, self.store_config
         )
-        self.permissions = self.store_config.backing_store(
-            "permissions", self.settings, self.store_config, ddtype=set
+        self.mock = self.store_config.backing_store(
+            "mock", self.settings, self.store_config
+        )
+        self.metadata = self.store_config.backing_store(
+            "metadata", self.settings, self.store_config
+        )
+        self.blob_refs = self.store_config.backing_store(
+            "blob_refs", self.settings, self.store_config, ddtype=set
+        )
+        self.leases = self.store_config.backing_store(
+            "leases", self.settings, self.store_config
+        )
+        self.payloads = self.store_config.backing_store(
+            "payloads", self.settings, self.store_config
+        )
+        self.payload_refs = self.store_config.backing_store(
+            "payload_refs", self.settings, self.store_config, ddtype=set
         )
+        self.blob_store: Optional[FileBlobStore] = None
+        if self.store_config.blob_storage is not None:
+            self.blob_store = FileBlobStore(self.store_config.blob_storage)
+        self.cache: Optional[ActionObjectCache] = None
+        if self.action_config.cache is not None:
+            self.cache = ActionObjectCache(self.action_config.cache)
+        # called with the uid of every object written or deleted by this store
+        self.write_listeners: List[Callable[[UID], None]] = []
+        permission_index = getattr(
+            self.store_config, "permission_index", KeyValuePermissionIndex
+        )
+        self.permissions: PermissionIndex = permission_index(
+            settings=self.settings, store_config=self.store_config
+        )
+        self._migrate_permission_sets()
         if root_verify_key is None:
             root_verify_key = SyftSigningKey.generate().verify_key
         self.root_verify_key = root_verify_key
 
-    def get(
-        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool = False
-    ) -> Result[SyftObject, str]:
+    @property
+    def dedup_payloads(self) -> bool:
+        # in-memory stores keep the objects themselves, there is nothing to save
+        return self.store_config.payload_dedup and not isinstance(
+            self.store_config, DictStoreConfig
+        )
+
+    @property
+    def payload_locks(self) -> StripedLock:
+        """Per-digest locks around adding and releasing payload references, so a
+        payload isn't deleted with its last reference while another is added"""
+        if getattr(self, "_payload_locks", None) is None:
+            self._payload_locks = StripedLock(
+                config=self.store_config.locking_config,
+                name=f"{self.settings.name}_payloads",
+            )
+        return self._payload_locks
+
+    def _migrate_permission_sets(self) -> None:
+        # earlier versions stored a set of "{verify_key}_{PERMISSION}" per uid
+        legacy = self.store_config.backing_store(
+            "permissions", self.settings, self.store_config, ddtype=set
+        )
+        if len(legacy) == 0:
+            return
+        for uid, permission_strings in legacy.items():
+            keys = []
+            for permission_string in permission_strings:
+                verify_key, name = permission_string.rsplit("_", 1)
+                credentials = SyftVerifyKey.from_string(verify_key)
+                keys.append(permission_key(uid, credentials, ActionPermission[name]))
+            self.permissions.add(keys)
+        legacy.clear()
+
+    def lock_writes(self) -> ContextManager[Any]:
+        """Block the writers of this store in this process, e.g. to take a
+        backup consistent across its backing stores"""
+        return self._write_lock.exclusive()
+
+    def _can_read(
+        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool
+    ) -> Result[bool, str]:
         # TODO 🟣 Temporarily added skip permission argument for enclave
         # until permissions are fully integrated
         # if you get something you need READ permission
         read_permission = ActionObjectREAD(uid=uid, credentials=credentials)
-        # if True:
         if skip_permission or self.has_permission(read_permission):
-            syft_object = self.data[uid]
-            return Ok(syft_object)
+            return Ok(True)
         return Err(f"Permission: {read_permission} denied")
 
+    def _get_metadata(self, uid: UID) -> Optional[ActionObjectMetadata]:
+        # objects written by earlier versions have no metadata entry
+        if uid in self.metadata:
+            return self.metadata[uid]
+        return None
+
+    def _get_mock(self, uid: UID) -> SyftObject:
+        """The mock side of a twin, or the object itself if it isn't one. The
+        private side is never read in place of a mock: `_write` stores the
+        metadata of a twin before its data, and only twins have a mock entry."""
+        metadata = self._get_metadata(uid)
+        if (metadata is not None and metadata.is_twin) or (
+            metadata is None and uid in self.mock
+        ):
+            mock = self._read("mock", uid)
+            mock.id = uid
+            return mock
+        obj = self._read("data", uid)
+        if isinstance(obj, TwinObject):
+            # written by an earlier version, which stored twins whole
+            return obj.mock
+        return obj
+
+    def get(
+        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool = False
+    ) -> Result[SyftObject, str]:
+        can_read = self._can_read(uid, credentials, skip_permission)
+        if can_read.is_err():
+            return can_read
+
+        metadata = self._get_metadata(uid)
+        if metadata is not None and metadata.is_twin:
+            return Ok(
+                TwinObject(
+                    id=uid,
+                    private_obj=self._read("data", uid),
+                    private_obj_id=metadata.private_obj_id,
+                    mock_obj=self._read("mock", uid),
+                    mock_obj_id=metadata.mock_obj_id,
+                )
+            )
+        return Ok(self._read("data", uid))
+
+    def get_many(
+        self,
+        uids: Collection[UID],
+        credentials: SyftVerifyKey,
+        skip_permission: bool = False,
+    ) -> Result[Dict[UID, SyftObject], str]:
+        """The objects of `uids` as `get` returns them, with one permission
+        check for all of them and one read per backing store"""
+        uids = list(dict.fromkeys(uids))
+        if not skip_permission:
+            can_read = self.has_permissions(uids, credentials, ActionPermission.READ)
+            denied = [uid for uid, allowed in can_read.items() if not allowed]
+            if len(denied) > 0:
+                return Err(f"Permission: READ denied for {credentials} on {denied}")
+
+        metadata = self.metadata.get_many(uids)
+        twins = [uid for uid, meta in metadata.items() if meta.is_twin]
+        data = self._read_many("data", uids)
+        missing = [uid for uid in uids if uid not in data]
+        if len(missing) > 0:
+            return Err(f"No object exists for IDs: {missing}")
+        mocks = self._read_many("mock", twins)
+
+        objs = {}
+        for uid in uids:
+            if uid in mocks:
+                objs[uid] = TwinObject(
+                    id=uid,
+                    private_obj=data[uid],
+                    private_obj_id=metadata[uid].private_obj_id,
+                    mock_obj=mocks[uid],
+                    mock_obj_id=metadata[uid].mock_obj_id,
+                )
+            else:
+                objs[uid] = data[uid]
+        return Ok(objs)
+
+    def get_private(
+        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool = False
+    ) -> Result[SyftObject, str]:
+        """The private side of a twin, without reading its mock, or the object
+        itself if it isn't a twin"""
+        can_read = self._can_read(uid, credentials, skip_permission)
+        if can_read.is_err():
+            return can_read
+
+        obj = self._read("data", uid)
+        if isinstance(obj, TwinObject):
+            return Ok(obj.private)
+        metadata = self._get_metadata(uid)
+        if metadata is not None and metadata.is_twin:
+            obj.id = uid
+        return Ok(obj)
+
+    def get_mock(
+        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool = False
+    ) -> Result[SyftObject, str]:
+        """The mock side of a twin, without reading its private data, or the
+        object itself if it isn't a twin"""
+        can_read = self._can_read(uid, credentials, skip_permission)
+        if can_read.is_err():
+            return can_read
+        return Ok(self._get_mock(uid))
+
+    def get_metadata(
+        self, uid: UID, credentials: SyftVerifyKey, skip_permission: bool = False
+    ) -> Result[ActionObjectMetadata, str]:
+        """Type and twin ids of the object, without reading any payload"""
+        can_read = self._can_read(uid, credentials, skip_permission)
+        if can_read.is_err():
+            return can_read
+
+        metadata = self._get_metadata(uid)
+        if metadata is None:
+            if uid not in self.data:
+                return Err(f"No object exists for ID: {uid}")
+            metadata = self._metadata_for(uid, self._read("data", uid))
+        return Ok(metadata)
+
     def get_pointer(
         self, uid: UID, credentials: SyftVerifyKey, node_uid: UID
     ) -> Result[SyftObject, str]:
+        """Pointer to the mock side of a twin, which is public, or to an object
+        that isn't a twin if `credentials` can read it"""
         try:
-            # 🟡 TODO 34: do we want pointer read permissions?
+            metadata = self._get_metadata(uid)
+            if metadata is None or not metadata.is_twin:
+                can_read = self._can_read(uid, credentials, skip_permission=False)
+                if can_read.is_err():
+                    return can_read
             if uid in self.data:
-                obj = self.data[uid]
-                if isinstance(obj, TwinObject):
-                    obj = obj.mock
+                obj = self._get_mock(uid)
                 obj.syft_point_to(node_uid)
                 return Ok(obj)
             return Err("Permission denied")
         except Exception as e:
             return Err(str(e))
 
+    @staticmethod
+    def _metadata_for(uid: UID, syft_object: SyftObject) -> ActionObjectMetadata:
+        if isinstance(syft_object, TwinObject):
+            return ActionObjectMetadata(
+                id=uid,
+                object_type=type(syft_object.private_obj).__name__,
+                is_twin=True,
+                private_obj_id=syft_object.private_obj_id,
+                mock_obj_id=syft_object.mock_obj_id,
+            )
+        return ActionObjectMetadata(id=uid, object_type=type(syft_object).__name__)
+
+    def _read(self, name: str, uid: UID) -> SyftObject:
+        """Payload of `uid` in the `data` or `mock` backing store. Callers check
+        the permissions first, the cache is never consulted before."""
+        objs = self._read_many(name, [uid])
+        if uid not in objs:
+            raise KeyError(f"{uid} not in {name}")
+        return objs[uid]
+
+    def _read_many(self, name: str, uids: Collection[UID]) -> Dict[UID, SyftObject]:
+        """`_read` of many uids at once, the ones not cached are read with one
+        backing store call and so are their payloads. Missing uids are left out"""
+        objs = {}
+        if self.cache is not None:
+            for uid in uids:
+                cached = self.cache.get((name, uid))
+                if cached is not None:
+                    objs[uid] = copy_cached(cached)
+
+        missing = [uid for uid in uids if uid not in objs]
+        # taken before the read, a write in between keeps its value out of the cache
+        generations = (
+            {uid: self.cache.generation((name, uid)) for uid in missing}
+            if self.cache is not None
+            else {}
+        )
+        values = getattr(self, name).get_many(missing)
+        digests = {
+            uid: value.syft_action_data.digest
+            for uid, value in values.items()
+            if isinstance(value, ActionObject)
+            and isinstance(value.syft_action_data, ActionPayloadRef)
+        }
+        payloads = self.payloads.get_many(
+            {payload_uid(digest) for digest in digests.values()}
+        )
+        for uid, value in values.items():
+            if isinstance(value, BlobRef):
+                obj = self.blob_store.load(value)
+                size = value.size
+            else:
+                if uid in digests:
+                    payload = payloads[payload_uid(digests[uid])]
+                    obj = self._with_payload(value, payload)
+                else:
+                    obj = value
+                size = estimate_size(obj) if self.cache is not None else 0
+            if self.cache is not None:
+                self.cache.put((name, uid), obj, size, generations[uid])
+                obj = copy_cached(obj)
+            objs[uid] = obj
+        return objs
+
+    def _invalidate(self, uid: UID) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(("data", uid))
+            self.cache.invalidate(("mock", uid))
+        for listener in self.write_listeners:
+            listener(uid)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit ratio, size and evictions of the payload cache, None without one"""
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
+    def _with_payload(self, obj: ActionObject, payload: Any) -> ActionObject:
+        """Copy of a stored ActionObject shell with its data, read from the
+        `payloads` entry of its digest"""
+        # in-memory backing stores return the stored shell itself
+        obj = shallow_copy(obj)
+        if isinstance(payload, BlobRef):
+            with self.blob_store.open(payload) as view:
+                obj.syft_action_data = _deserialize(view, from_bytes=True)
+        else:
+            obj.syft_action_data = _deserialize(payload, from_bytes=True)
+        return obj
+
+    def _payload_digests(self, uid: UID) -> Dict[str, str]:
+        """Digests of the payloads the stored sides of `uid` refer to"""
+        digests = {}
+        for name in ["data", "mock"]:
+            backing_store = getattr(self, name)
+            if uid not in backing_store:
+                continue
+            shell = backing_store[uid]
+            if isinstance(shell, ActionObject) and isinstance(
+                shell.syft_action_data, ActionPayloadRef
+            ):
+                digests[name] = shell.syft_action_data.digest
+        return digests
+
+    def _put_payload(self, data: Any, uid: UID, name: str) -> str:
+        """Store `data` under its digest unless it is already, and add the
+        reference of the `name` side of `uid` to it. Returns the digest."""
+        if isinstance(data, ActionPayloadRef):
+            digest, blob = data.digest, None
+        else:
+            digest, blob = serialize_payload(data)
+        key = payload_uid(digest)
+        reference = f"{uid}/{name}"
+        with self.payload_locks.hold(digest):
+            if blob is None and key not in self.payloads:
+                raise KeyError(f"Payload: {digest} not found")
+            if blob is not None and key not in self.payloads:
+                # the blob files are written before anything references them
+                if (
+                    self.blob_store is not None
+                    and len(blob) >= self.blob_store.config.threshold
+                ):
+                    ref = self.blob_store.put(blob)
+                    self.blob_refs[key] = {ref.digest}
+                    self.payloads[key] = ref
+                else:
+                    self.payloads[key] = blob
+            if key in self.payload_refs:
+                self.payload_refs.update_value(
+                    key, lambda references: set(references) | {reference}
+                )
+            else:
+                self.payload_refs[key] = {reference}
+        return digest
+
+    def _release_payload_ref(self, digest: str, uid: UID, name: str) -> None:
+        """Drop the reference of the `name` side of `uid`, the payload is deleted
+        with its last reference"""
+        key = payload_uid(digest)
+        reference = f"{uid}/{name}"
+        with self.payload_locks.hold(digest):
+            try:
+                references = self.payload_refs.update_value(
+                    key, lambda references: set(references) - {reference}
+                )
+            except KeyError:
+                return
+            if len(references) == 0:
+                for backing_store in [self.payload_refs, self.payloads, self.blob_refs]:
+                    if key in backing_store:
+                        del backing_store[key]
+
+    def _can_reference(self, digest: str, credentials: SyftVerifyKey) -> bool:
+        """If `credentials` can read an object referring to the payload, so the
+        digest alone doesn't give access to, or reveal, data of others"""
+        key = payload_uid(digest)
+        if key not in self.payload_refs or key not in self.payloads:
+            return False
+        uids = [UID.from_string(ref.split("/")[0]) for ref in self.payload_refs[key]]
+        readable = self.has_permissions(uids, credentials, ActionPermission.READ)
+        return any(readable.values())
+
+    def has_payloads(
+        self, digests: Collection[str], credentials: SyftVerifyKey
+    ) -> List[str]:
+        """The `digests` whose payload is stored and readable by `credentials`"""
+        return [
+            digest for digest in digests if self._can_reference(digest, credentials)
+        ]
+
+    def _write(self, uid: UID, syft_object: SyftObject) -> None:
+        # readers go by the metadata to tell a twin from a plain object, so a
+        # twin's metadata and mock are written before its private data, and a
+        # plain object replacing a twin is written before its metadata, the old
+        # mock being dropped last
+        metadata = self._metadata_for(uid, syft_object)
+        if metadata.is_twin:
+            self.metadata[uid] = metadata
+            payloads = {"mock": syft_object.mock_obj, "data": syft_object.private_obj}
+        else:
+            payloads = {"data": syft_object}
+        previous = self._payload_digests(uid)
+
+        digests = set()
+        current = {}
+        for name, payload in payloads.items():
+            if isinstance(payload, ActionObject) and (
+                self.dedup_payloads
+                or isinstance(payload.syft_action_data, ActionPayloadRef)
+            ):
+                digest = self._put_payload(payload.syft_action_data, uid, name)
+                current[name] = digest
+                payload = shallow_copy(payload)
+                payload.syft_action_data = ActionPayloadRef(digest=digest)
+            elif self.blob_store is not None:
+                payload = self.blob_store.dump(payload)
+            if isinstance(payload, BlobRef):
+                digests.add(payload.digest)
+            getattr(self, name)[uid] = payload
+        if len(digests) > 0:
+            self.blob_refs[uid] = digests
+        elif uid in self.blob_refs:
+            del self.blob_refs[uid]
+        if not metadata.is_twin:
+            self.metadata[uid] = metadata
+            if uid in self.mock:
+                del self.mock[uid]
+        self._invalidate(uid)
+
+        for name, digest in previous.items():
+            if current.get(name) != digest:
+                self._release_payload_ref(digest, uid, name)
+
+    def collect_garbage(self) -> Result[int, str]:
+        """Remove the blob files no stored object refers to anymore, returns the
+        number of files removed"""
+        if self.blob_store is None:
+            return Ok(0)
+        try:
+            referenced = set()
+            for digests in self.blob_refs.values():
+                referenced.update(digests)
+            return Ok(self.blob_store.collect_garbage(referenced))
+        except Exception as e:
+            return Err(f"Failed to collect the blob files: {e}")
+
     def exists(self, uid: UID) -> bool:
         return uid in self.data
 
+    @_writes
     def set(
         self, uid: UID, credentials: SyftVerifyKey, syft_object: SyftObject
     ) -> Result[SyftSuccess, Err]:
+        # payloads sent by reference must be readable already
+        for side in payload_sides(syft_object).values():
+            data = side.syft_action_data
+            if isinstance(data, ActionPayloadRef) and not self._can_reference(
+                data.digest, credentials
+            ):
+                return Err(f"Payload: {data.digest} not found")
+
         # if you set something you need WRITE permission
         write_permission = ActionObjectWRITE(uid=uid, credentials=credentials)
         can_write = self.has_permission(write_permission)
@@ -151,17 +689,12 @@ class KeyValueActionStore(ActionStore):
             can_write = True if ownership_result.is_ok() else False
 
         if can_write:
-            self.data[uid] = syft_object
-            if uid not in self.permissions:
-                # create default permissions
-                self.permissions[uid] = set()
-            permission = f"{credentials.verify}_READ"
-            permissions = self.permissions[uid]
-            permissions.add(permission)
-            self.permissions[uid] = permissions
+            self._write(uid, syft_object)
+            self.add_permission(ActionObjectREAD(uid=uid, credentials=credentials))
             return Ok(SyftSuccess(message=f"Set for ID: {uid}"))
         return Err(f"Permission: {write_permission} denied")
 
+    @_writes
     def take_ownership(
         self, uid: UID, credentials: SyftVerifyKey
     ) -> Result[SyftSuccess, str]:
@@ -178,19 +711,138 @@ class KeyValueActionStore(ActionStore):
             return Ok(SyftSuccess(message=f"Ownership of ID: {uid} taken."))
         return Err(f"UID: {uid} already owned.")
 
+    @_writes
     def delete(self, uid: UID, credentials: SyftVerifyKey) -> Result[SyftSuccess, str]:
         # if you delete something you need OWNER permission
         # is it bad to evict a key and have someone else reuse it?
         # perhaps we should keep permissions but no data?
         owner_permission = ActionObjectOWNER(uid=uid, credentials=credentials)
         if self.has_permission(owner_permission):
-            if uid in self.data:
-                del self.data[uid]
-            if uid in self.permissions:
-                del self.permissions[uid]
+            self._delete(uid)
             return Ok(SyftSuccess(message=f"ID: {uid} deleted"))
         return Err(f"Permission: {owner_permission} denied")
 
+    def _delete(self, uid: UID) -> None:
+        digests = self._payload_digests(uid)
+        backing_stores = [self.data, self.mock, self.metadata, self.blob_refs]
+        for backing_store in backing_stores + [self.leases]:
+            if uid in backing_store:
+                del backing_store[uid]
+        self._invalidate(uid)
+        self.permissions.remove_uid(uid)
+        for name, digest in digests.items():
+            self._release_payload_ref(digest, uid, name)
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        config = self.action_config.lifecycle
+        if ttl is None and config is not None:
+            ttl = config.ttl
+        return time.time() + ttl if ttl is not None else None
+
+    @_writes
+    def track(
+        self, uid: UID, credentials: SyftVerifyKey, ttl: Optional[float] = None
+    ) -> None:
+        """Lease the result `uid` with one reference of `credentials`, for `ttl`
+        seconds or the configured ttl. A no-op without a `lifecycle` configured."""
+        if self.action_config.lifecycle is None:
+            return
+        self.leases[uid] = ActionObjectLease(
+            id=uid,
+            references={str(self._verify_key(credentials)): 1},
+            expires_at=self._expiry(ttl),
+        )
+
+    @_writes
+    def retain(
+        self, uid: UID, credentials: SyftVerifyKey, ttl: Optional[float] = None
+    ) -> Result[SyftSuccess, str]:
+        """Add a client reference to a leased result and renew its lease"""
+        can_read = self._can_read(uid, credentials, skip_permission=False)
+        if can_read.is_err():
+            return can_read
+        if uid not in self.leases:
+            return Ok(SyftSuccess(message=f"ID: {uid} isn't leased"))
+
+        expires_at = self._expiry(ttl)
+        holder = str(self._verify_key(credentials))
+
+        def add_reference(lease: ActionObjectLease) -> ActionObjectLease:
+            references = dict(lease.references)
+            references[holder] = references.get(holder, 0) + 1
+            return ActionObjectLease(
+                id=uid, references=references, expires_at=expires_at
+            )
+
+        try:
+            self.leases.update_value(uid, add_reference)
+        except KeyError:
+            return Err(f"ID: {uid} was collected")
+        return Ok(SyftSuccess(message=f"ID: {uid} retained"))
+
+    @_writes
+    def release(
+        self, uids: Collection[UID], credentials: SyftVerifyKey
+    ) -> Result[SyftSuccess, str]:
+        """Drop a reference of `credentials` from each leased result in `uids`, a
+        result without references left is deleted by the next collection. Results
+        `credentials` holds no reference to are left as they are."""
+        readable = self.has_permissions(uids, credentials, ActionPermission.READ)
+        holder = str(self._verify_key(credentials))
+
+        def drop_reference(lease: ActionObjectLease) -> ActionObjectLease:
+            references = dict(lease.references)
+            if references.get(holder, 0) > 1:
+                references[holder] -= 1
+            else:
+                references.pop(holder, None)
+            return ActionObjectLease(
+                id=lease.id, references=references, expires_at=lease.expires_at
+            )
+
+        denied = [uid for uid, can_read in readable.items() if not can_read]
+        for uid, can_read in readable.items():
+            if can_read and uid in self.leases:
+                try:
+                    self.leases.update_value(uid, drop_reference)
+                except KeyError:
+                    # collected since
+                    pass
+        if len(denied) > 0:
+            return Err(f"Permission: READ denied for {denied}")
+        return Ok(SyftSuccess(message=f"Released {len(readable)} objects"))
+
+    @_writes
+    def collect_unreachable(self, limit: int = 100) -> Result[int, str]:
+        """Delete up to `limit` results whose lease was released or expired,
+        returns how many were deleted"""
+        now = time.time()
+        collected = 0
+        try:
+            for uid, lease in list(self.leases.items()):
+                if collected >= limit:
+                    break
+                if lease.is_collectable(now):
+                    self._delete(uid)
+                    collected += 1
+        except Exception as e:
+            return Err(f"Failed to collect the unreachable objects: {e}")
+        return Ok(collected)
+
+    @staticmethod
+    def _verify_key(credentials: Union[SyftSigningKey, SyftVerifyKey]) -> SyftVerifyKey:
+        # callers can pass the signing key, the index is keyed by the verify key
+        if isinstance(credentials, SyftSigningKey):
+            return credentials.verify_key
+        return credentials
+
+    def _permission_key(self, permission: ActionObjectPermission) -> bytes:
+        return permission_key(
+            permission.uid,
+            self._verify_key(permission.credentials),
+            permission.permission,
+        )
+
     def has_permission(self, permission: ActionObjectPermission) -> bool:
         if not isinstance(permission.permission, ActionPermission):
             raise Exception(f"ObjectPermission type: {permission.permission} not valid")
@@ -198,10 +850,8 @@ class KeyValueActionStore(ActionStore):
         if self.root_verify_key.verify == permission.credentials.verify:
             return True
 
-        if (
-            permission.uid in self.permissions
-            and permission.permission_string in self.permissions[permission.uid]
-        ):
+        key = self._permission_key(permission)
+        if len(self.permissions.present([key])) > 0:
             return True
 
         # 🟡 TODO 14: add ALL_READ, ALL_EXECUTE etc
@@ -216,20 +866,37 @@ class KeyValueActionStore(ActionStore):
 
         return False
 
+    def has_permissions(
+        self,
+        uids: Collection[UID],
+        credentials: SyftVerifyKey,
+        permission: ActionPermission,
+    ) -> Dict[UID, bool]:
+        """Check `permission` on many objects with a single index lookup"""
+        if not isinstance(permission, ActionPermission):
+            raise Exception(f"ObjectPermission type: {permission} not valid")
+
+        if self.root_verify_key.verify == credentials.verify:
+            return {uid: True for uid in uids}
+
+        credentials = self._verify_key(credentials)
+        keys = {uid: permission_key(uid, credentials, permission) for uid in uids}
+        granted = self.permissions.present(keys.values())
+        return {uid: key in granted for uid, key in keys.items()}
+
+    @_writes
     def add_permission(self, permission: ActionObjectPermission) -> None:
-        permissions = self.permissions[permission.uid]
-        permissions.add(permission.permission_string)
-        self.permissions[permission.uid] = permissions
+        self.permissions.add([self._permission_key(permission)])
 
+    @_writes
     def remove_permission(self, permission: ActionObjectPermission):
-        permissions = self.permissions[permission.uid]
-        permissions.remove(permission.permission_string)
-        self.permissions[permission.uid] = permissions
+        self.permissions.remove([self._permission_key(permission)])
 
+    @_writes
     def add_permissions(self, permissions: List[ActionObjectPermission]) -> None:
-        results = []
-        for permission in permissions:
-            results.append(self.add_permission(permission))
+        self.permissions.add(
+            [self._permission_key(permission) for permission in permissions]
+        )
 
 
 @serializable()
@@ -241,15 +908,22 @@ class DictActionStore(KeyValueActionStore):
             Backend specific configuration, including client class type.
         root_verify_key: Optional[SyftVerifyKey]
             Signature verification key, used for checking access permissions.
+        action_config: Optional[ActionConfig]
+            Cache and lifecycle of the action objects.
     """
 
     def __init__(
         self,
         store_config: Optional[StoreConfig] = None,
         root_verify_key: Optional[SyftVerifyKey] = None,
+        action_config: Optional[ActionConfig] = None,
     ) -> None:
         store_config = store_config if store_config is not None else DictStoreConfig()
-        super().__init__(store_config=store_config, root_verify_key=root_verify_key)
+        super().__init__(
+            store_config=store_config,
+            root_verify_key=root_verify_key,
+            action_config=action_config,
+        )
 
 
 @serializable()
@@ -261,6 +935,41 @@ class SQLiteActionStore(KeyValueActionStore):
             SQLite specific configuration, including connection settings or client class type.
         root_verify_key: Optional[SyftVerifyKey]
             Signature verification key, used for checking access permissions.
+        action_config: Optional[ActionConfig]
+            Cache and lifecycle of the action objects.
+    """
+
+    pass
+
+
+@serializable()
+class LMDBActionStore(KeyValueActionStore):
+    """LMDB-Based Key-Value Action store.
+
+    Parameters:
+        store_config: StoreConfig
+            LMDB specific configuration, including file location and map size.
+        root_verify_key: Optional[SyftVerifyKey]
+            Signature verification key, used for checking access permissions.
+        action_config: Optional[ActionConfig]
+            Cache and lifecycle of the action objects.
+    """
+
+    pass
+
+
+@serializable()
+class RedisActionStore(KeyValueActionStore):
+    """Redis-Based Key-Value Action store.
+
+    Parameters:
+        store_config: StoreConfig
+            Redis specific configuration, including connection settings and key
+            namespace.
+        root_verify_key: Optional[SyftVerifyKey]
+            Signature verification key, used for checking access permissions.
+        action_config: Optional[ActionConfig]
+            Cache and lifecycle of the action objects.
     """
 
     pass
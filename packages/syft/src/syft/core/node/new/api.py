@@ -23,6 +23,7 @@ from typeguard import check_type
 
 # relative
 from ....telemetry import instrument
+from .action_batch import deferred_actions
 from .connection import NodeConnection
 from .credentials import SyftSigningKey
 from .credentials import SyftVerifyKey
@@ -357,6 +358,11 @@ class SyftAPI(SyftObject):
         return SyftAPI(node_name=node.name, node_uid=node.id, endpoints=endpoints)
 
     def make_call(self, api_call: SyftAPICall) -> Result:
+        if api_call.path != "action.execute_batch":
+            # the results of deferred actions exist before the node is asked
+            flushed = deferred_actions.flush(node_uid=self.node_uid)
+            if isinstance(flushed, SyftError):
+                return flushed
         signed_call = api_call.sign(credentials=self.signing_key)
         signed_result = self.connection.make_call(signed_call)
 
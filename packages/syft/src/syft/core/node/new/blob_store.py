@@ -0,0 +1,166 @@
+# stdlib
+from contextlib import contextmanager
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import Set
+from typing import Union
+
+# relative
+from .action_cache import estimate_size
+from .base import SyftBaseModel
+from .deserialize import _deserialize
+from .serializable import serializable
+from .serialize import _serialize
+
+
+@serializable()
+class BlobStorageConfig(SyftBaseModel):
+    """Where and when the action store keeps payloads in files
+
+    Parameters:
+        `path`: Path or str
+            Folder of the blob files. Default: `syft_blobs` in the temp folder
+        `threshold`: int
+            Serialized payloads of at least this many bytes are written to a blob
+            file, smaller ones stay in the backing store. Default 1 MiB
+        `fsync`: bool
+            If True (default), blob files are flushed to disk before they are
+            referenced, so a reference never outlives its file after a crash
+        `gc_grace_period`: float
+            Unreferenced blobs younger than this many seconds are kept by the
+            garbage collection, they can belong to a write still in flight.
+            Default 3600
+    """
+
+    path: Optional[Union[str, Path]] = None
+    threshold: int = 1024**2
+    fsync: bool = True
+    gc_grace_period: float = 3600.0
+
+    @property
+    def root(self) -> Path:
+        path = self.path if self.path else Path(tempfile.gettempdir()) / "syft_blobs"
+        return Path(path)
+
+
+@serializable()
+class BlobRef(SyftBaseModel):
+    """Reference to a payload kept in a blob file, stored in its place
+
+    Parameters:
+        `digest`: str
+            SHA-256 of the serialized payload, which is also the file name
+        `size`: int
+            Size of the serialized payload in bytes
+    """
+
+    digest: str
+    size: int
+
+
+class FileBlobStore:
+    """Content-addressed blob files in a local folder
+
+    A blob is stored at `<root>/<digest[:2]>/<digest>`. Identical payloads share
+    one file, and a file is never changed after it was written, so readers map
+    it without any locking. Writes go to a temporary file renamed into place.
+    Files no reference points to are removed by `collect_garbage`.
+
+    Parameters:
+        `config`: BlobStorageConfig
+            Location, threshold and durability settings
+    """
+
+    def __init__(self, config: BlobStorageConfig) -> None:
+        self.config = config
+        self.root = config.root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, blob: bytes) -> BlobRef:
+        digest = hashlib.sha256(blob).hexdigest()
+        path = self.path_for(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.write(blob)
+                    tmp.flush()
+                    if self.config.fsync:
+                        os.fsync(tmp.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        else:
+            # refresh the age the garbage collection goes by
+            os.utime(path)
+        return BlobRef(digest=digest, size=len(blob))
+
+    @contextmanager
+    def open(self, ref: BlobRef) -> Iterator[memoryview]:
+        """Memory map of the blob, valid until the context exits"""
+        with open(self.path_for(ref.digest), "rb") as f:
+            if ref.size == 0:
+                # empty files can't be mapped
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def exists(self, ref: BlobRef) -> bool:
+        return self.path_for(ref.digest).exists()
+
+    def digests(self) -> Set[str]:
+        return {
+            path.name
+            for path in self.root.glob("*/*")
+            if not path.name.startswith(".tmp-")
+        }
+
+    def collect_garbage(self, referenced: Set[str]) -> int:
+        """Remove the blobs whose digest isn't in `referenced`, returns how many"""
+        cutoff = time.time() - self.config.gc_grace_period
+        removed = 0
+        for path in self.root.glob("*/*"):
+            if path.name in referenced:
+                continue
+            try:
+                if path.stat().st_mtime > cutoff:
+                    continue
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def dump(self, obj: Any) -> Any:
+        """`obj` or, when its estimated size is at least `threshold` bytes, the
+        BlobRef of its serialized form. The size is estimated rather than
+        measured, so objects kept inline are only serialized by the backing
+        store."""
+        if estimate_size(obj) < self.config.threshold:
+            return obj
+        return self.put(_serialize(obj, to_bytes=True))
+
+    def load(self, value: Any) -> Any:
+        """Inverse of `dump`, a BlobRef is deserialized from its mapped file"""
+        if not isinstance(value, BlobRef):
+            return value
+        with self.open(value) as view:
+            return _deserialize(view, from_bytes=True)
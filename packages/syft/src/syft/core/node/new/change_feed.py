@@ -0,0 +1,307 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from collections import deque
+from copy import deepcopy
+from enum import Enum
+from itertools import islice
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+
+# third party
+from result import Err
+from result import Ok
+from result import Result
+
+# relative
+from ....logger import error
+from .serializable import serializable
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .syft_object import SyftBaseObject
+from .syft_object import SyftObject
+
+# offsets are 1-based so that 0 can always be used to read from the beginning
+FIRST_OFFSET = 1
+
+
+@serializable()
+class ChangeType(Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+@serializable()
+class ChangeEvent(SyftBaseObject):
+    """A single write to a StorePartition
+
+    Parameters:
+        `offset`: int
+            Position in the change feed, strictly increasing within a partition
+        `partition`: str
+            Name of the partition the change was made to
+        `change_type`: ChangeType
+            Insert, update or delete
+        `uid`: Any
+            Store key of the changed object
+        `obj`: Optional[SyftObject]
+            The object after the change, None for deletes and for changes made
+            while the feed had no subscription, read those by `uid`
+        `created_at`: float
+            Unix timestamp of the change
+    """
+
+    __canonical_name__ = "ChangeEvent"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    offset: int
+    partition: str
+    change_type: ChangeType
+    uid: Any
+    obj: Optional[SyftObject]
+    created_at: float
+
+
+class ChangeSubscription:
+    """Cursor over a ChangeFeed
+
+    `offset` is the offset of the next event to deliver, store it to resume the
+    subscription later with `ChangeFeed.subscribe(from_offset=offset)`.
+    If a `callback` is given, events are pushed to it from a background thread
+    until the subscription is closed.
+    """
+
+    def __init__(
+        self,
+        feed: ChangeFeed,
+        offset: int,
+        callback: Optional[Callable[[ChangeEvent], Any]] = None,
+    ) -> None:
+        self.feed = feed
+        self.offset = offset
+        self.callback = callback
+        self.error: Optional[str] = None
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        feed._add_subscriber(self)
+
+        if callback is not None:
+            self._thread = threading.Thread(
+                target=self._deliver, name="syft-change-feed", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def poll(
+        self, timeout: Optional[float] = None, limit: Optional[int] = None
+    ) -> Result[List[ChangeEvent], str]:
+        """Return the events after `offset`, waiting up to `timeout` seconds for one.
+
+        With `timeout=None` the call only returns what is already in the feed.
+        """
+        events = self.feed.wait(from_offset=self.offset, timeout=timeout, limit=limit)
+        if events.is_ok() and len(events.ok()) > 0:
+            self.offset = events.ok()[-1].offset + 1
+        return events
+
+    def __iter__(self) -> Iterator[ChangeEvent]:
+        while not self.closed:
+            events = self.poll(timeout=self.feed.poll_interval)
+            if events.is_err():
+                raise Exception(events.err())
+            yield from events.ok()
+
+    def _deliver(self) -> None:
+        while not self.closed:
+            events = self.poll(timeout=self.feed.poll_interval)
+            if events.is_err():
+                # most likely the offset was evicted, the subscriber has to resync
+                self.error = events.err()
+                self.close()
+                return
+            for event in events.ok():
+                try:
+                    self.callback(event)
+                except Exception as e:
+                    error(f"Change feed callback failed on {event.offset}: {e}")
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._closed.set()
+        self.feed._remove_subscriber(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+class ChangeFeed:
+    """Ordered log of the inserts, updates and deletes made to a StorePartition
+
+    Partitions call `record` after every successful write, backends decide how the
+    event is kept. Readers either `read` from an offset or `subscribe` to be handed
+    new events as they come in. Every write gets an event, the in-memory and SQLite
+    feeds only keep the object with it while the feed has an open subscription, so
+    a partition nobody follows doesn't pay for copies of everything it stores.
+
+    Parameters:
+        `name`: str
+            Partition name
+        `capacity`: int
+            Number of events kept, older ones are evicted
+        `poll_interval`: float
+            Upper bound in seconds between checks for writes made by other processes
+    """
+
+    def __init__(
+        self, name: str, capacity: int = 10_000, poll_interval: float = 0.5
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._subscriptions: Set[int] = set()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return len(self._subscriptions) > 0
+
+    def _add_subscriber(self, subscription: ChangeSubscription) -> None:
+        with self._cond:
+            self._subscriptions.add(id(subscription))
+
+    def _remove_subscriber(self, subscription: ChangeSubscription) -> None:
+        with self._cond:
+            self._subscriptions.discard(id(subscription))
+
+    @property
+    def latest_offset(self) -> int:
+        """Offset the next event will get"""
+        raise NotImplementedError
+
+    @property
+    def oldest_offset(self) -> int:
+        """Offset of the oldest event still in the feed"""
+        raise NotImplementedError
+
+    def _append(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject]
+    ) -> None:
+        raise NotImplementedError
+
+    def _read(self, from_offset: int, limit: Optional[int]) -> List[ChangeEvent]:
+        raise NotImplementedError
+
+    def event(
+        self,
+        offset: int,
+        change_type: ChangeType,
+        uid: Any,
+        obj: Optional[SyftObject],
+        created_at: Optional[float] = None,
+    ) -> ChangeEvent:
+        return ChangeEvent(
+            offset=offset,
+            partition=self.name,
+            change_type=change_type,
+            uid=uid,
+            obj=obj,
+            created_at=time.time() if created_at is None else created_at,
+        )
+
+    def record(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject] = None
+    ) -> None:
+        with self._cond:
+            self._append(change_type, uid, obj)
+            self._cond.notify_all()
+
+    def read(
+        self, from_offset: int = FIRST_OFFSET, limit: Optional[int] = None
+    ) -> Result[List[ChangeEvent], str]:
+        try:
+            from_offset = max(from_offset, FIRST_OFFSET)
+            oldest_offset = self.oldest_offset
+            if from_offset < oldest_offset:
+                return Err(
+                    f"Offset {from_offset} of {self.name} is no longer available, "
+                    f"the oldest offset kept is {oldest_offset}"
+                )
+            return Ok(self._read(from_offset, limit))
+        except Exception as e:
+            return Err(f"Failed to read the changes of {self.name}. {e}")
+
+    def wait(
+        self,
+        from_offset: int = FIRST_OFFSET,
+        timeout: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Result[List[ChangeEvent], str]:
+        """Like `read`, but block up to `timeout` seconds until there is an event"""
+        deadline = time.monotonic() + (timeout or 0)
+        with self._cond:
+            while True:
+                events = self.read(from_offset=from_offset, limit=limit)
+                if events.is_err() or len(events.ok()) > 0:
+                    return events
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return events
+                # writes made in this process notify the condition, the interval
+                # bounds the delay for those made by other processes
+                self._cond.wait(min(remaining, self.poll_interval))
+
+    def subscribe(
+        self,
+        from_offset: Optional[int] = None,
+        callback: Optional[Callable[[ChangeEvent], Any]] = None,
+    ) -> ChangeSubscription:
+        """Subscribe to the feed, from `from_offset` or only to new events if None"""
+        if from_offset is None:
+            from_offset = self.latest_offset
+        return ChangeSubscription(feed=self, offset=from_offset, callback=callback)
+
+
+class RingBufferChangeFeed(ChangeFeed):
+    """In-process ChangeFeed keeping the last `capacity` events in memory"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._events: Deque[ChangeEvent] = deque(maxlen=self.capacity)
+        self._next_offset = FIRST_OFFSET
+
+    @property
+    def latest_offset(self) -> int:
+        return self._next_offset
+
+    @property
+    def oldest_offset(self) -> int:
+        with self._cond:
+            return self._next_offset - len(self._events)
+
+    def _append(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject]
+    ) -> None:
+        # in-memory stores update their objects in place, keep the state as of now
+        if obj is not None and self.has_subscribers:
+            obj = deepcopy(obj)
+        else:
+            obj = None
+        self._events.append(self.event(self._next_offset, change_type, uid, obj))
+        self._next_offset += 1
+
+    def _read(self, from_offset: int, limit: Optional[int]) -> List[ChangeEvent]:
+        with self._cond:
+            start = from_offset - self.oldest_offset
+            stop = None if limit is None else start + limit
+            return list(islice(self._events, start, stop))
@@ -28,6 +28,7 @@ from ...node.new.credentials import UserLoginCredentials
 from ...node.new.node_metadata import NodeMetadataJSON
 from ...node.new.user import UserCreate
 from ...node.new.user import UserPrivateKey
+from .action_payload import skip_known_payloads
 from .api import APIModule
 from .api import APIRegistry
 from .api import SignedSyftAPICall
@@ -36,15 +37,20 @@ from .api import SyftAPICall
 from .connection import NodeConnection
 from .context import NodeServiceContext
 from .credentials import SyftSigningKey
+from .dataset import Asset
 from .dataset import CreateDataset
 from .deserialize import _deserialize
 from .grid_url import GridURL
+from .ingest import IngestOptions
+from .ingest import ingest_format
+from .ingest import stage_file
 from .node import NewNode
 from .response import SyftError
 from .response import SyftSuccess
 from .serializable import serializable
 from .serialize import _serialize
 from .syft_object import SYFT_OBJECT_VERSION_1
+from .transfer import upload_object
 from .uid import UID
 from .user_service import UserService
 
@@ -365,7 +371,13 @@ class SyftClient:
                 twin = TwinObject(private_obj=asset.data, mock_obj=asset.mock)
             except Exception as e:
                 return SyftError(message=f"Failed to create twin. {e}")
-            response = self.api.services.action.set(twin)
+            # payloads the node already holds are sent by digest
+            twin = skip_known_payloads(self.api, twin)
+            if hasattr(self.api.services, "transfer"):
+                # chunked, a failed upload resumes when it is retried
+                response = upload_object(self.api, twin)
+            else:
+                response = self.api.services.action.set(twin)
             if isinstance(response, SyftError):
                 print(f"Failed to upload asset\n: {asset}")
                 return response
@@ -379,6 +391,40 @@ class SyftClient:
                 return tuple(valid.err())
             return valid.err()
 
+    def ingest_file(
+        self,
+        path: str,
+        dataset_name: str,
+        asset_name: str,
+        description: Optional[str] = None,
+        options: Optional[IngestOptions] = None,
+        on_node: bool = False,
+    ) -> Union[Asset, SyftError]:
+        """Add a CSV or Parquet file as an asset, read and mocked on the node.
+        A local file is staged as raw bytes first, `on_node` reads `path` on
+        the node instead, relative to or inside the ingest root of the node."""
+        if on_node:
+            return self.api.services.dataset.ingest(
+                dataset_name=dataset_name,
+                asset_name=asset_name,
+                path=path,
+                description=description,
+                options=options,
+            )
+        options = options if options is not None else IngestOptions()
+        if options.format is None:
+            options = options.copy(update={"format": ingest_format(path, options)})
+        session_id = stage_file(self.api, path)
+        if isinstance(session_id, SyftError):
+            return session_id
+        return self.api.services.dataset.ingest(
+            dataset_name=dataset_name,
+            asset_name=asset_name,
+            session_id=session_id,
+            description=description,
+            options=options,
+        )
+
     def exchange_route(self, client: Self) -> None:
         result = self.api.services.network.exchange_credentials_with(client=client)
         if result:
@@ -1,15 +1,26 @@
 # stdlib
+import os
+from pathlib import Path
+import threading
 from typing import List
+from typing import Optional
 from typing import Union
 
+# third party
+import pyarrow as pa
+
 # relative
 from ....telemetry import instrument
 from .context import AuthedServiceContext
 from .dataset import Asset
+from .dataset import CreateAsset
 from .dataset import CreateDataset
 from .dataset import Dataset
 from .dataset_stash import DatasetStash
 from .document_store import DocumentStore
+from .ingest import IngestOptions
+from .ingest import generate_mock
+from .ingest import read_table
 from .response import SyftError
 from .response import SyftSuccess
 from .serializable import serializable
@@ -21,16 +32,29 @@ from .uid import UID
 from .user_roles import DATA_OWNER_ROLE_LEVEL
 from .user_roles import GUEST_ROLE_LEVEL
 
+# serializes the read and write of the asset list of a dataset by `ingest`
+_ingest_lock = threading.Lock()
+
 
 @instrument
 @serializable()
 class DatasetService(AbstractService):
+    """Datasets of the node
+
+    `ingest` only reads node files inside `ingest_root`, set with
+    `Worker(ingest_root=...)`. None (the default) allows staged uploads only.
+    """
+
     store: DocumentStore
     stash: DatasetStash
+    ingest_root: Optional[Union[str, Path]] = None
 
-    def __init__(self, store: DocumentStore) -> None:
+    def __init__(
+        self, store: DocumentStore, ingest_root: Optional[Union[str, Path]] = None
+    ) -> None:
         self.store = store
         self.stash = DatasetStash(store=store)
+        self.ingest_root = ingest_root
 
     @service_method(path="dataset.add", name="add", roles=DATA_OWNER_ROLE_LEVEL)
     def add(
@@ -43,9 +67,11 @@ class DatasetService(AbstractService):
         return SyftSuccess(message="Dataset Added")
 
     @service_method(path="dataset.get_all", name="get_all", roles=GUEST_ROLE_LEVEL)
-    def get_all(self, context: AuthedServiceContext) -> Union[List[Dataset], SyftError]:
+    async def get_all(
+        self, context: AuthedServiceContext
+    ) -> Union[List[Dataset], SyftError]:
         """Get a Dataset"""
-        result = self.stash.get_all()
+        result = await self.stash.async_get_all()
         if result.is_ok():
             datasets = result.ok()
             results = []
@@ -56,11 +82,11 @@ class DatasetService(AbstractService):
         return SyftError(message=result.err())
 
     @service_method(path="dataset.search", name="search")
-    def search(
+    async def search(
         self, context: AuthedServiceContext, name: str
     ) -> Union[List[Dataset], SyftError]:
         """Search a Dataset by name"""
-        results = self.get_all(context)
+        results = await self.get_all(context)
 
         return (
             results
@@ -69,11 +95,11 @@ class DatasetService(AbstractService):
         )
 
     @service_method(path="dataset.get_by_id", name="get_by_id")
-    def get_by_id(
+    async def get_by_id(
         self, context: AuthedServiceContext, uid: UID
     ) -> Union[SyftSuccess, SyftError]:
         """Get a Dataset"""
-        result = self.stash.get_by_uid(uid=uid)
+        result = await self.stash.async_get_by_uid(uid=uid)
         if result.is_ok():
             dataset = result.ok()
             dataset.node_uid = context.node.id
@@ -120,6 +146,121 @@ class DatasetService(AbstractService):
         else:
             return SyftError(message=result.err())
 
+    @service_method(path="dataset.ingest", name="ingest", roles=DATA_OWNER_ROLE_LEVEL)
+    def ingest(
+        self,
+        context: AuthedServiceContext,
+        dataset_name: str,
+        asset_name: str,
+        path: Optional[str] = None,
+        session_id: Optional[UID] = None,
+        description: Optional[str] = None,
+        options: Optional[IngestOptions] = None,
+    ) -> Union[Asset, SyftError]:
+        """Read a CSV or Parquet file into a new asset of a Dataset, created if
+        there is none with `dataset_name`. The file is either at `path` on the
+        node or staged with `transfer.put_chunk` in the upload `session_id`.
+        The mock is generated on the node."""
+        if (path is None) == (session_id is None):
+            return SyftError(message="Pass either a path or a session_id")
+        options = options if options is not None else IngestOptions()
+        if session_id is not None and options.format is None:
+            # the staging folder doesn't keep the name of the file
+            return SyftError(message="Set the format of a staged file")
+
+        result = self.stash.get_by_name(dataset_name)
+        if result.is_err():
+            return SyftError(message=str(result.err()))
+        dataset = result.ok()
+        if dataset is not None and asset_name in dataset.assets:
+            return SyftError(message=f"{dataset_name} already has {asset_name}")
+
+        session = None
+        if session_id is not None:
+            transfer_service = context.node.get_service("transferservice")
+            staged = transfer_service.staged_upload(context, session_id)
+            if staged.is_err():
+                return SyftError(message=staged.err())
+            session, source = staged.ok()
+        else:
+            resolved = self._ingest_path(path)
+            if isinstance(resolved, SyftError):
+                return resolved
+            source = resolved
+
+        try:
+            data = read_table(source, options)
+        except (OSError, ValueError, KeyError, pa.ArrowException) as e:
+            return SyftError(message=f"Failed to read {path or session_id}: {e}")
+        finally:
+            if session is not None:
+                transfer_service.discard(context, session)
+
+        create_asset = CreateAsset(
+            name=asset_name,
+            description=description,
+            node_uid=context.node.id,
+            data=data,
+            mock=generate_mock(data, seed=options.mock_seed),
+            mock_is_real=False,
+        )
+        try:
+            # stores the twin, outside of the lock
+            asset = create_asset.to(Asset, context=context)
+        except Exception as e:
+            return SyftError(message=f"Failed to create {asset_name}. {e}")
+
+        result = self._add_asset(context, dataset_name, asset)
+        if isinstance(result, SyftError):
+            action_store = context.node.get_service("actionservice").store
+            action_store.delete(uid=asset.action_id, credentials=context.credentials)
+            return result
+        return result.assets[asset_name]
+
+    def _add_asset(
+        self, context: AuthedServiceContext, dataset_name: str, asset: Asset
+    ) -> Union[Dataset, SyftError]:
+        """Add `asset` to the Dataset `dataset_name`, created if there is none"""
+        try:
+            with _ingest_lock:
+                # read again, another ingest may have added to it meanwhile
+                result = self.stash.get_by_name(dataset_name)
+                if result.is_err():
+                    return SyftError(message=str(result.err()))
+                dataset = result.ok()
+                if dataset is None:
+                    dataset = CreateDataset(name=dataset_name)
+                    dataset = dataset.to(Dataset, context=context)
+                    dataset.asset_list = [asset]
+                    result = self.stash.set(dataset)
+                elif asset.name in dataset.assets:
+                    return SyftError(message=f"{dataset_name} already has {asset.name}")
+                else:
+                    result = self.stash.update_fields(
+                        dataset.id, {"asset_list": dataset.asset_list + [asset]}
+                    )
+        except Exception as e:
+            return SyftError(message=f"Failed to create {asset.name}. {e}")
+        if result.is_err():
+            return SyftError(message=str(result.err()))
+        return result.ok()
+
+    def _ingest_path(self, path: str) -> Union[Path, SyftError]:
+        """`path` resolved, if it is a file inside `ingest_root`"""
+        if self.ingest_root is None:
+            return SyftError(message="Reading files on the node is disabled")
+        root = Path(self.ingest_root).expanduser().resolve()
+        source = Path(path).expanduser()
+        if not source.is_absolute():
+            source = root / source
+        # symlinks and ".." are resolved before the containment check
+        source = source.resolve()
+        if os.path.commonpath([root, source]) != str(root):
+            return SyftError(message=f"{path} is outside of the ingest root")
+        if not source.is_file():
+            return SyftError(message=f"No file at {path} on the node")
+        return source
+
 
 TYPE_TO_SERVICE[Dataset] = DatasetService
 SERVICE_TO_TYPES[DatasetService].update({Dataset})
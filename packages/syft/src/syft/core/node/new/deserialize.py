@@ -15,7 +15,7 @@ def _deserialize(
     from .recursive import rs_proto2object
 
     if (
-        (from_bytes and not isinstance(blob, bytes))
+        (from_bytes and not isinstance(blob, (bytes, memoryview)))
         or (
             from_proto
             and not from_bytes
@@ -2,25 +2,182 @@
 from __future__ import annotations
 
 # stdlib
+import os
+from pathlib import Path
+import struct
+import threading
 from typing import Any
+from typing import BinaryIO
+from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Type
+from typing import Union
+import zlib
 
 # relative
+from .deserialize import _deserialize
 from .document_store import DocumentStore
+from .document_store import StoreClientConfig
 from .document_store import StoreConfig
 from .kv_document_store import KeyValueBackingStore
 from .kv_document_store import KeyValueStorePartition
+from .permission_index import KeyValuePermissionIndex
+from .permission_index import PermissionIndex
 from .serializable import serializable
+from .serialize import _serialize
 
 
-@serializable()
+class DictStoreJournal:
+    """Write-ahead log and compacted snapshot of a single DictBackingStore.
+
+    Every `set` and `delete` is appended to the log as a framed record
+    (op, key length, value length, key, value, crc32). A change to one entry of an
+    index column is logged as that entry alone, with the column entry key and
+    value in place of the value. After `snapshot_interval` records the whole store
+    is written to a new snapshot and the log is truncated.
+    On startup the snapshot is loaded and the log replayed on top of it; a torn
+    record at the end of the log (a crash mid-write) is dropped.
+    """
+
+    SET = 1
+    DELETE = 2
+    COLUMN_SET = 3
+    COLUMN_DELETE = 4
+    OPS = (SET, DELETE, COLUMN_SET, COLUMN_DELETE)
+
+    _header = struct.Struct("<BII")
+    _checksum = struct.Struct("<I")
+
+    def __init__(self, name: str, client_config: DictStoreClientConfig) -> None:
+        path = Path(client_config.path)
+        path.mkdir(parents=True, exist_ok=True)
+        self.snapshot_path = path / f"{name}.snapshot"
+        self.log_path = path / f"{name}.wal"
+        self.snapshot_interval = client_config.snapshot_interval
+        self.fsync = client_config.fsync
+        self._records = 0
+        self._log: Optional[BinaryIO] = None
+
+    def replay(self) -> Dict[Any, Any]:
+        data: Dict[Any, Any] = {}
+        if self.snapshot_path.exists():
+            data = _deserialize(self.snapshot_path.read_bytes(), from_bytes=True)
+
+        if self.log_path.exists():
+            buffer = self.log_path.read_bytes()
+            offset = 0
+            while True:
+                record = self._read_record(buffer, offset)
+                if record is None:
+                    break
+                op, key, value, offset = record
+                if op == self.SET:
+                    data[key] = value
+                elif op == self.DELETE:
+                    data.pop(key, None)
+                elif op == self.COLUMN_SET:
+                    column_key, column_value = value
+                    data[key][column_key] = column_value
+                else:
+                    data[key].pop(value, None)
+                self._records += 1
+
+            if offset < len(buffer):
+                # incomplete or corrupted tail, drop it so new records stay readable
+                with open(self.log_path, "r+b") as log:
+                    log.truncate(offset)
+
+        self._log = open(self.log_path, "ab")
+        return data
+
+    def _read_record(
+        self, buffer: bytes, offset: int
+    ) -> Optional[Tuple[int, Any, Any, int]]:
+        header_end = offset + self._header.size
+        if header_end > len(buffer):
+            return None
+        op, key_len, value_len = self._header.unpack_from(buffer, offset)
+        value_start = header_end + key_len
+        value_end = value_start + value_len
+        record_end = value_end + self._checksum.size
+        if op not in self.OPS or record_end > len(buffer):
+            return None
+        (checksum,) = self._checksum.unpack_from(buffer, value_end)
+        if zlib.crc32(buffer[offset:value_end]) != checksum:
+            return None
+
+        key = _deserialize(buffer[header_end:value_start], from_bytes=True)
+        value = None
+        if op != self.DELETE:
+            value = _deserialize(buffer[value_start:value_end], from_bytes=True)
+        return op, key, value, record_end
+
+    def append(self, op: int, key: Any, value: Any = None) -> bool:
+        """Log a record, returns True once the log is due for compaction"""
+        key_blob = _serialize(key, to_bytes=True)
+        value_blob = _serialize(value, to_bytes=True) if op != self.DELETE else b""
+        record = (
+            self._header.pack(op, len(key_blob), len(value_blob))
+            + key_blob
+            + value_blob
+        )
+        self._log.write(record + self._checksum.pack(zlib.crc32(record)))
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+        self._records += 1
+        return self._records >= self.snapshot_interval
+
+    def compact(self, data: Dict[Any, Any]) -> None:
+        # write the new snapshot next to the old one and swap it in atomically,
+        # replaying the old log on top of the new snapshot is idempotent so a
+        # crash before the log is truncated is harmless
+        tmp_path = self.snapshot_path.with_suffix(".snapshot.tmp")
+        with open(tmp_path, "wb") as snapshot:
+            snapshot.write(_serialize(dict(data), to_bytes=True))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        self._log.close()
+        self._log = open(self.log_path, "wb")
+        self._records = 0
+
+    def close(self) -> None:
+        if self._log is not None and not self._log.closed:
+            self._log.close()
+
+
+@serializable(attrs=["_ddtype"])
 class DictBackingStore(dict, KeyValueBackingStore):
-    """Dictionary-based Store core logic"""
+    """Dictionary-based Store core logic
+
+    If the store config has a `DictStoreClientConfig`, every write is also
+    appended to a `DictStoreJournal` and the contents are restored from it
+    when the store is created.
+    """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(dict).__init__()
         self._ddtype = kwargs.get("ddtype", None)
+        self._journal: Optional[DictStoreJournal] = None
+        self._lock = threading.RLock()
+
+        if len(args) == 3:
+            index_name, settings, store_config = args
+            client_config = getattr(store_config, "client_config", None)
+            if client_config is not None:
+                self._journal = DictStoreJournal(
+                    name=f"{settings.name}_{index_name}", client_config=client_config
+                )
+                super().update(self._journal.replay())
+
+    @property
+    def journal(self) -> Optional[DictStoreJournal]:
+        # not set when the store was rebuilt by the deserializer
+        return getattr(self, "_journal", None)
 
     def __getitem__(self, key: Any) -> Any:
         try:
@@ -31,6 +188,94 @@ class DictBackingStore(dict, KeyValueBackingStore):
                 return self._ddtype()
             raise e
 
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if self.journal is None:
+            return super().__setitem__(key, value)
+
+        with self._lock:
+            super().__setitem__(key, value)
+            if self.journal.append(DictStoreJournal.SET, key, value):
+                self.journal.compact(self)
+
+    def __delitem__(self, key: Any) -> None:
+        if self.journal is None:
+            return super().__delitem__(key)
+
+        with self._lock:
+            super().__delitem__(key)
+            if self.journal.append(DictStoreJournal.DELETE, key):
+                self.journal.compact(self)
+
+    def set_in_column(self, key: Any, column_key: Any, value: Any) -> None:
+        if self.journal is None:
+            super().__getitem__(key)[column_key] = value
+            return
+
+        with self._lock:
+            super().__getitem__(key)[column_key] = value
+            self._log(DictStoreJournal.COLUMN_SET, key, (column_key, value))
+
+    def append_to_column(self, key: Any, column_key: Any, value: Any) -> None:
+        if self.journal is None:
+            super().__getitem__(key)[column_key].append(value)
+            return
+
+        with self._lock:
+            column = super().__getitem__(key)
+            column[column_key].append(value)
+            self._log(
+                DictStoreJournal.COLUMN_SET, key, (column_key, column[column_key])
+            )
+
+    def delete_from_column(self, key: Any, column_key: Any) -> None:
+        if self.journal is None:
+            super().__getitem__(key).pop(column_key, None)
+            return
+
+        with self._lock:
+            column = super().__getitem__(key)
+            if column_key in column:
+                column.pop(column_key)
+                self._log(DictStoreJournal.COLUMN_DELETE, key, column_key)
+
+    def _log(self, op: int, key: Any, value: Any) -> None:
+        if self.journal.append(op, key, value):
+            self.journal.compact(self)
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        if self.journal is None:
+            return super().pop(key, *args)
+
+        with self._lock:
+            if key not in self:
+                return super().pop(key, *args)
+            value = self[key]
+            del self[key]
+            return value
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        if self.journal is None:
+            return super().update(*args, **kwargs)
+
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        if self.journal is None:
+            return super().clear()
+
+        with self._lock:
+            super().clear()
+            self.journal.compact(self)
+
+    def compact(self) -> None:
+        """Write a new snapshot and truncate the write-ahead log"""
+        if self.journal is None:
+            return
+
+        with self._lock:
+            self.journal.compact(self)
+
 
 @serializable()
 class DictStorePartition(KeyValueStorePartition):
@@ -44,8 +289,18 @@ class DictStorePartition(KeyValueStorePartition):
     """
 
     def prune(self):
+        # wipe the persisted state as well, otherwise init_store would replay it
+        for store_name in ["data", "unique_keys", "searchable_keys"]:
+            store = getattr(self, store_name, None)
+            if store is not None:
+                store.clear()
         self.init_store()
 
+    def commit(self) -> None:
+        self.data.compact()
+        self.unique_keys.compact()
+        self.searchable_keys.compact()
+
 
 # the base document store is already a dict but we can change it later
 @serializable()
@@ -69,6 +324,26 @@ class DictDocumentStore(DocumentStore):
             partition.prune()
 
 
+@serializable()
+class DictStoreClientConfig(StoreClientConfig):
+    """Persistence config for the dictionary-based stores
+
+    Parameters:
+        `path`: Path or str
+            Folder for the snapshot and write-ahead log files, one pair per backing store.
+        `snapshot_interval`: int
+            Number of logged writes after which the log is compacted into a new snapshot.
+            Default 1000.
+        `fsync`: bool
+            If True (default), fsync the log after every write so that acknowledged
+            writes also survive an OS crash, not only a process crash.
+    """
+
+    path: Union[str, Path]
+    snapshot_interval: int = 1000
+    fsync: bool = True
+
+
 @serializable()
 class DictStoreConfig(StoreConfig):
     """Dictionary-based configuration
@@ -78,8 +353,14 @@ class DictStoreConfig(StoreConfig):
             The Document type used. Default: DictDocumentStore
         `backing_store`: Type[KeyValueBackingStore]
             The backend type used. Default: DictBackingStore
-
+        `client_config`: Optional[DictStoreClientConfig]
+            If set, the stores are persisted with a write-ahead log and snapshots.
+            Default: None, in-memory only.
+        `permission_index`: Type[PermissionIndex]
+            Permission index of the action store. Default: KeyValuePermissionIndex
     """
 
     store_type: Type[DocumentStore] = DictDocumentStore
     backing_store: Type[KeyValueBackingStore] = DictBackingStore
+    client_config: Optional[DictStoreClientConfig] = None
+    permission_index: Type[PermissionIndex] = KeyValuePermissionIndex
@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 # stdlib
+import asyncio
 from functools import partial
 import types
 from typing import Any
+from typing import Callable
+from typing import ContextManager
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -16,6 +19,7 @@ from typing import _GenericAlias
 
 # third party
 from pydantic import BaseModel
+from pydantic import ValidationError
 from result import Err
 from result import Ok
 from result import Result
@@ -24,8 +28,18 @@ from typeguard import check_type
 # relative
 from ....telemetry import instrument
 from .base import SyftBaseModel
+from .blob_store import BlobStorageConfig
+from .change_feed import ChangeEvent
+from .change_feed import ChangeFeed
+from .change_feed import ChangeSubscription
+from .change_feed import RingBufferChangeFeed
+from .locks import LockingConfig
+from .locks import StripedLock
+from .locks import ThreadingLockingConfig
 from .response import SyftSuccess
 from .serializable import serializable
+from .store_metrics import PartitionMetrics
+from .store_metrics import SlowQuery
 from .syft_object import SYFT_OBJECT_VERSION_1
 from .syft_object import SyftBaseObject
 from .syft_object import SyftObject
@@ -337,6 +351,64 @@ class StorePartition:
     def store_query_keys(self, objs: Any) -> QueryKeys:
         return QueryKeys(qks=[self.store_query_key(obj) for obj in objs])
 
+    @property
+    def change_feed(self) -> ChangeFeed:
+        # created on first use, once the backend storage exists
+        if getattr(self, "_change_feed", None) is None:
+            self._change_feed = self._create_change_feed()
+        return self._change_feed
+
+    def _create_change_feed(self) -> ChangeFeed:
+        return RingBufferChangeFeed(
+            name=self.settings.name,
+            capacity=self.store_config.change_feed_capacity,
+        )
+
+    def subscribe(
+        self,
+        from_offset: Optional[int] = None,
+        callback: Optional[Callable[[ChangeEvent], Any]] = None,
+    ) -> ChangeSubscription:
+        return self.change_feed.subscribe(from_offset=from_offset, callback=callback)
+
+    @property
+    def key_locks(self) -> StripedLock:
+        if getattr(self, "_key_locks", None) is None:
+            self._key_locks = StripedLock(
+                config=self.store_config.locking_config, name=self.settings.name
+            )
+        return self._key_locks
+
+    def lock(self, key: Any) -> ContextManager[None]:
+        """Hold the lock of the object stored under `key`, for read-modify-write
+        cycles that must not interleave with other writers of the same object,
+        in this process or another one depending on `locking_config`"""
+        return self.key_locks.hold(key)
+
+    @property
+    def index_locks(self) -> StripedLock:
+        if getattr(self, "_index_locks", None) is None:
+            self._index_locks = StripedLock(
+                config=self.store_config.locking_config.copy(update={"stripes": 1}),
+                name=f"{self.settings.name}_index",
+            )
+        return self._index_locks
+
+    def index_lock(self) -> ContextManager[None]:
+        """Hold the lock of the whole partition around a check of the unique keys
+        and the index writes that depend on it, key locks alone would let two
+        writers of different keys claim the same unique value. Taken after the
+        key lock, never the other way around."""
+        return self.index_locks.hold(self.settings.name)
+
+    @property
+    def metrics(self) -> PartitionMetrics:
+        if getattr(self, "_metrics", None) is None:
+            self._metrics = PartitionMetrics.from_config(
+                name=self.settings.name, store_config=self.store_config
+            )
+        return self._metrics
+
     def find_index_or_search_keys(self, index_qks: QueryKeys, search_qks: QueryKeys):
         raise NotImplementedError
 
@@ -350,18 +422,152 @@ class StorePartition:
     ) -> Result[SyftObject, str]:
         raise NotImplementedError
 
+    def set_many(
+        self, objs: List[SyftObject], ignore_duplicates: bool = False
+    ) -> Result[List[SyftObject], str]:
+        """Insert several objects, backends with batched writes override this"""
+        for obj in objs:
+            result = self.set(obj, ignore_duplicates=ignore_duplicates)
+            if result.is_err():
+                return result
+        return Ok(objs)
+
     def update(self, qk: QueryKey, obj: SyftObject) -> Result[SyftObject, str]:
         raise NotImplementedError
 
+    def upsert_many(self, objs: List[SyftObject]) -> Result[List[SyftObject], str]:
+        """Insert the objects, or update the stored ones with the same store key"""
+        upserted = []
+        for obj in objs:
+            qk = self.store_query_key(obj)
+            exists = self.get_all_from_store(QueryKeys(qks=[qk]))
+            if exists.is_err():
+                return exists
+            if len(exists.ok()) > 0:
+                result = self.update(qk=qk, obj=obj)
+            else:
+                result = self.set(obj)
+            if result.is_err():
+                return result
+            upserted.append(result.ok())
+        return Ok(upserted)
+
+    def update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        raise NotImplementedError
+
+    def validate_fields(self, fields: Dict[str, Any]) -> Result[Dict[str, Any], str]:
+        """Check that `fields` can be set on the objects of this partition"""
+        object_type = self.settings.object_type
+        validated = {}
+        for key, value in fields.items():
+            if key in ("id", self.settings.store_key.key):
+                return Err(f"{key} of {object_type.__name__} can't be updated")
+            field = object_type.__fields__.get(key)
+            if field is None:
+                return Err(f"{object_type.__name__} has no field {key}")
+            value, errors = field.validate(value, {}, loc=key, cls=object_type)
+            if errors:
+                return Err(str(ValidationError([errors], object_type)))
+            validated[key] = value
+        return Ok(validated)
+
+    def affected_partition_keys(
+        self, partition_keys: Iterable[PartitionKey], fields: Dict[str, Any]
+    ) -> List[PartitionKey]:
+        """The keys whose values can change when `fields` are updated"""
+        object_fields = self.settings.object_type.__fields__
+        # keys computed by a method can depend on any field
+        return [
+            pk
+            for pk in partition_keys
+            if pk.key in fields or pk.key not in object_fields
+        ]
+
     def get_all_from_store(self, qks: QueryKeys) -> Result[List[SyftObject], str]:
         raise NotImplementedError
 
+    def project(
+        self, index_qks: QueryKeys, search_qks: QueryKeys, fields: List[str]
+    ) -> Result[List[Dict[str, Any]], str]:
+        """Only `fields` of the matching objects, backends storing the fields
+        natively return them without loading the objects"""
+        objs = self.find_index_or_search_keys(
+            index_qks=index_qks, search_qks=search_qks
+        )
+        if objs.is_err():
+            return objs
+        try:
+            return Ok(
+                [{field: getattr(obj, field) for field in fields} for obj in objs.ok()]
+            )
+        except AttributeError as e:
+            return Err(str(e))
+
+    def store_keys(self) -> Result[List[Any], str]:
+        """The store key of every object in the partition, without loading them"""
+        raise NotImplementedError
+
+    def migrate(
+        self, keys: List[Any], fn: Callable[[SyftObject], SyftObject]
+    ) -> Result[List[SyftObject], str]:
+        """Replace each stored object with `fn(obj)` in one atomic step per object.
+        `fn` returns the object itself when there is nothing to change, only
+        the replaced objects are returned."""
+        raise NotImplementedError
+
     def create(self, obj: SyftObject) -> Result[SyftObject, str]:
         raise NotImplementedError
 
     def delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
         raise NotImplementedError
 
+    # Awaitable API. Backends with an async driver override these, the others
+    # are bridged: the blocking call runs in the default executor of the loop so
+    # the event loop isn't blocked, it still holds an executor thread meanwhile.
+
+    async def _run_blocking(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args, **kwargs))
+
+    async def async_set(
+        self,
+        obj: SyftObject,
+        ignore_duplicates: bool = False,
+    ) -> Result[SyftObject, str]:
+        return await self._run_blocking(
+            self.set, obj=obj, ignore_duplicates=ignore_duplicates
+        )
+
+    async def async_update(
+        self, qk: QueryKey, obj: SyftObject
+    ) -> Result[SyftObject, str]:
+        return await self._run_blocking(self.update, qk=qk, obj=obj)
+
+    async def async_update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        return await self._run_blocking(self.update_fields, qk=qk, fields=fields)
+
+    async def async_get_all_from_store(
+        self, qks: QueryKeys
+    ) -> Result[List[SyftObject], str]:
+        return await self._run_blocking(self.get_all_from_store, qks=qks)
+
+    async def async_find_index_or_search_keys(
+        self, index_qks: QueryKeys, search_qks: QueryKeys
+    ) -> Result[List[SyftObject], str]:
+        return await self._run_blocking(
+            self.find_index_or_search_keys, index_qks=index_qks, search_qks=search_qks
+        )
+
+    async def async_all(self) -> Result[List[SyftObject], str]:
+        return await self._run_blocking(self.all)
+
+    async def async_delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
+        return await self._run_blocking(self.delete, qk=qk)
+
 
 @instrument
 @serializable()
@@ -389,6 +595,37 @@ class DocumentStore:
             )
         return self.partitions[settings.name]
 
+    def metrics(self, name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Latency and scan counters per partition and operation"""
+        return {
+            partition_name: partition.metrics.to_dict()
+            for partition_name, partition in self.partitions.items()
+            if name is None or partition_name == name
+        }
+
+    def slow_queries(self, name: Optional[str] = None) -> List[SlowQuery]:
+        """Slow query log of all partitions, or of partition `name`, oldest first"""
+        slow_queries = [
+            slow_query
+            for partition_name, partition in self.partitions.items()
+            if name is None or partition_name == name
+            for slow_query in partition.metrics.get_slow_queries()
+        ]
+        return sorted(slow_queries, key=lambda slow_query: slow_query.created_at)
+
+    def lock_metrics(self, name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Wait times of the per-key write locks of each partition"""
+        return {
+            partition_name: partition.key_locks.metrics.to_dict()
+            for partition_name, partition in self.partitions.items()
+            if name is None or partition_name == name
+        }
+
+    def reset_metrics(self) -> None:
+        for partition in self.partitions.values():
+            partition.metrics.reset()
+            partition.key_locks.metrics.reset()
+
 
 @instrument
 class BaseStash:
@@ -413,6 +650,13 @@ class BaseStash:
     def __len__(self) -> int:
         return len(self.partition)
 
+    def subscribe(
+        self,
+        from_offset: Optional[int] = None,
+        callback: Optional[Callable[[ChangeEvent], Any]] = None,
+    ) -> ChangeSubscription:
+        return self.partition.subscribe(from_offset=from_offset, callback=callback)
+
     def set(
         self,
         obj: BaseStash.object_type,
@@ -420,9 +664,24 @@ class BaseStash:
     ) -> Result[BaseStash.object_type, str]:
         return self.partition.set(obj=obj, ignore_duplicates=ignore_duplicates)
 
-    def query_all(
-        self, qks: Union[QueryKey, QueryKeys]
+    def set_many(
+        self,
+        objs: List[BaseStash.object_type],
+        ignore_duplicates: bool = False,
+    ) -> Result[List[BaseStash.object_type], str]:
+        return self.partition.set_many(objs=objs, ignore_duplicates=ignore_duplicates)
+
+    def upsert(self, obj: BaseStash.object_type) -> Result[BaseStash.object_type, str]:
+        return self.upsert_many(objs=[obj]).map(lambda objs: objs[0])
+
+    def upsert_many(
+        self, objs: List[BaseStash.object_type]
     ) -> Result[List[BaseStash.object_type], str]:
+        return self.partition.upsert_many(objs=objs)
+
+    def _split_query_keys(
+        self, qks: Union[QueryKey, QueryKeys]
+    ) -> Result[Tuple[QueryKeys, QueryKeys], str]:
         if isinstance(qks, QueryKey):
             qks = QueryKeys(qks=qks)
 
@@ -440,12 +699,31 @@ class BaseStash:
                     f"{qk} not in {type(self.partition)} unique or searchable keys"
                 )
 
-        index_qks = QueryKeys(qks=unique_keys)
-        search_qks = QueryKeys(qks=searchable_keys)
+        return Ok((QueryKeys(qks=unique_keys), QueryKeys(qks=searchable_keys)))
+
+    def query_all(
+        self, qks: Union[QueryKey, QueryKeys]
+    ) -> Result[List[BaseStash.object_type], str]:
+        split_status = self._split_query_keys(qks)
+        if split_status.is_err():
+            return split_status
+        index_qks, search_qks = split_status.ok()
         return self.partition.find_index_or_search_keys(
             index_qks=index_qks, search_qks=search_qks
         )
 
+    def query_fields(
+        self, qks: Union[QueryKey, QueryKeys], fields: List[str]
+    ) -> Result[List[Dict[str, Any]], str]:
+        """Only `fields` of the objects matching `qks`, as dicts"""
+        split_status = self._split_query_keys(qks)
+        if split_status.is_err():
+            return split_status
+        index_qks, search_qks = split_status.ok()
+        return self.partition.project(
+            index_qks=index_qks, search_qks=search_qks, fields=fields
+        )
+
     def query_all_kwargs(
         self, **kwargs: Dict[str, Any]
     ) -> Result[List[BaseStash.object_type], str]:
@@ -494,6 +772,73 @@ class BaseStash:
         qk = self.partition.store_query_key(obj)
         return self.partition.update(qk=qk, obj=obj)
 
+    def update_fields(
+        self, uid: Any, fields: Dict[str, Any]
+    ) -> Result[BaseStash.object_type, str]:
+        """Set only `fields` on the object stored under `uid`
+
+        Unlike `update` the object doesn't have to be fetched first, backends write
+        as little as they can and only the index entries of the changed keys are
+        rewritten.
+        """
+        qk = self.partition.settings.store_key.with_obj(uid)
+        return self.partition.update_fields(qk=qk, fields=fields)
+
+    # Awaitable counterparts of the methods above, for the async request path
+
+    async def async_get_all(self) -> Result[List[BaseStash.object_type], str]:
+        return await self.partition.async_all()
+
+    async def async_set(
+        self,
+        obj: BaseStash.object_type,
+        ignore_duplicates: bool = False,
+    ) -> Result[BaseStash.object_type, str]:
+        return await self.partition.async_set(
+            obj=obj, ignore_duplicates=ignore_duplicates
+        )
+
+    async def async_query_all(
+        self, qks: Union[QueryKey, QueryKeys]
+    ) -> Result[List[BaseStash.object_type], str]:
+        split_status = self._split_query_keys(qks)
+        if split_status.is_err():
+            return split_status
+        index_qks, search_qks = split_status.ok()
+        return await self.partition.async_find_index_or_search_keys(
+            index_qks=index_qks, search_qks=search_qks
+        )
+
+    async def async_query_one(
+        self, qks: Union[QueryKey, QueryKeys]
+    ) -> Result[Optional[BaseStash.object_type], str]:
+        return (await self.async_query_all(qks=qks)).and_then(first_or_none)
+
+    async def async_find_all(
+        self, **kwargs: Dict[str, Any]
+    ) -> Result[List[BaseStash.object_type], str]:
+        return await self.async_query_all(qks=QueryKeys.from_dict(kwargs))
+
+    async def async_find_one(
+        self, **kwargs: Dict[str, Any]
+    ) -> Result[Optional[BaseStash.object_type], str]:
+        return await self.async_query_one(qks=QueryKeys.from_dict(kwargs))
+
+    async def async_delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
+        return await self.partition.async_delete(qk=qk)
+
+    async def async_update(
+        self, obj: BaseStash.object_type
+    ) -> Result[BaseStash.object_type, str]:
+        qk = self.partition.store_query_key(obj)
+        return await self.partition.async_update(qk=qk, obj=obj)
+
+    async def async_update_fields(
+        self, uid: Any, fields: Dict[str, Any]
+    ) -> Result[BaseStash.object_type, str]:
+        qk = self.partition.settings.store_key.with_obj(uid)
+        return await self.partition.async_update_fields(qk=qk, fields=fields)
+
 
 @instrument
 class BaseUIDStoreStash(BaseStash):
@@ -518,6 +863,22 @@ class BaseUIDStoreStash(BaseStash):
         set_method = partial(super().set, ignore_duplicates=ignore_duplicates)
         return self.check_type(obj, self.object_type).and_then(set_method)
 
+    async def async_get_by_uid(
+        self, uid: UID
+    ) -> Result[Optional[BaseUIDStoreStash.object_type], str]:
+        qks = QueryKeys(qks=[UIDPartitionKey.with_obj(uid)])
+        return await self.async_query_one(qks=qks)
+
+    async def async_set(
+        self,
+        obj: BaseUIDStoreStash.object_type,
+        ignore_duplicates: bool = False,
+    ) -> Result[BaseUIDStoreStash.object_type, str]:
+        type_status = self.check_type(obj, self.object_type)
+        if type_status.is_err():
+            return type_status
+        return await super().async_set(obj=obj, ignore_duplicates=ignore_duplicates)
+
 
 @serializable()
 class StoreConfig(SyftBaseObject):
@@ -528,6 +889,27 @@ class StoreConfig(SyftBaseObject):
             Document Store type
         client_config: Optional[StoreClientConfig]
             Backend-specific config
+        change_feed_capacity: int
+            Number of change events kept per partition. Default 10000.
+        metrics_enabled: bool
+            Record latency and scan metrics of the partitions. Default True.
+        slow_query_threshold: Optional[float]
+            Partition calls taking at least this many seconds are added to the slow
+            query log, None disables the log. Default 0.1.
+        slow_query_log_size: int
+            Number of slow queries kept per partition. Default 100.
+        locking_config: LockingConfig
+            Locks taken per object key around the writes of the key-value
+            partitions, File and Redis locks coordinate several processes.
+            Default ThreadingLockingConfig, writers of the same process only.
+        blob_storage: Optional[BlobStorageConfig]
+            If set, the action store keeps large payloads in blob files instead
+            of its backing store. Default None.
+        payload_dedup: bool
+            Store each distinct ActionObject payload once under its digest, at
+            the cost of serializing it on every write and read of the action
+            store. Ignored by in-memory stores, which keep the objects
+            themselves. Default False.
     """
 
     __canonical_name__ = "StoreConfig"
@@ -535,3 +917,10 @@ class StoreConfig(SyftBaseObject):
 
     store_type: Type[DocumentStore]
     client_config: Optional[StoreClientConfig]
+    change_feed_capacity: int = 10_000
+    metrics_enabled: bool = True
+    slow_query_threshold: Optional[float] = 0.1
+    slow_query_log_size: int = 100
+    locking_config: LockingConfig = ThreadingLockingConfig()
+    blob_storage: Optional[BlobStorageConfig] = None
+    payload_dedup: bool = False
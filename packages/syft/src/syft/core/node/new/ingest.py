@@ -0,0 +1,232 @@
+# stdlib
+import hashlib
+import mmap
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+# third party
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import parquet as pq
+
+# relative
+from .action_payload import payload_uid
+from .base import SyftBaseModel
+from .response import SyftError
+from .serializable import serializable
+from .transfer import DEFAULT_CHUNK_SIZE
+from .transfer import DEFAULT_STREAMS
+from .transfer import TransferError
+from .transfer import put_chunks
+from .uid import UID
+
+CSV = "csv"
+PARQUET = "parquet"
+FORMATS_BY_SUFFIX = {
+    ".csv": CSV,
+    ".tsv": CSV,
+    ".txt": CSV,
+    ".parquet": PARQUET,
+    ".pq": PARQUET,
+}
+# placeholder values per text column of a mock, at most
+MAX_MOCK_CATEGORIES = 100
+
+
+@serializable()
+class IngestOptions(SyftBaseModel):
+    """How a CSV or Parquet file is read into an asset on the node
+
+    Parameters:
+        `format`: Optional[str]
+            "csv" or "parquet", inferred from the file suffix when None
+        `columns`: Optional[List[str]]
+            Columns to read, all of them when None
+        `column_types`: Dict[str, str]
+            Arrow type of columns by name, e.g. {"age": "int32", "at":
+            "timestamp[s]"}. Other columns keep the type of the file or the
+            one inferred by the CSV reader
+        `delimiter`: str
+            Field delimiter of a CSV file. Default ","
+        `block_size`: int
+            Bytes of CSV read per batch. Default 16 MiB
+        `batch_size`: int
+            Rows of Parquet read per batch. Default 65536
+        `use_threads`: bool
+            Parse and decode with the Arrow thread pool. Default True
+        `mock_seed`: Optional[int]
+            Seed of the generated mock, a fresh one every time when None
+    """
+
+    format: Optional[str] = None
+    columns: Optional[List[str]] = None
+    column_types: Dict[str, str] = {}
+    delimiter: str = ","
+    block_size: int = 16 * 1024**2
+    batch_size: int = 65536
+    use_threads: bool = True
+    mock_seed: Optional[int] = None
+
+
+def ingest_format(path: Union[str, Path], options: IngestOptions) -> str:
+    if options.format is not None:
+        if options.format not in (CSV, PARQUET):
+            raise ValueError(f"Unsupported format: {options.format}")
+        return options.format
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMATS_BY_SUFFIX:
+        raise ValueError(f"Can't infer the format of {path}, set `format`")
+    return FORMATS_BY_SUFFIX[suffix]
+
+
+def arrow_types(column_types: Dict[str, str]) -> Dict[str, pa.DataType]:
+    return {name: pa.type_for_alias(type_) for name, type_ in column_types.items()}
+
+
+def open_batches(
+    path: Union[str, Path], options: IngestOptions
+) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """Schema and streamed record batches of a CSV or Parquet file"""
+    types = arrow_types(options.column_types)
+    if ingest_format(path, options) == CSV:
+        reader = pa_csv.open_csv(
+            str(path),
+            read_options=pa_csv.ReadOptions(
+                use_threads=options.use_threads, block_size=options.block_size
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=options.delimiter),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=types,
+                include_columns=options.columns,
+                strings_can_be_null=True,
+            ),
+        )
+        return reader.schema, iter(reader)
+
+    parquet_file = pq.ParquetFile(str(path))
+    schema = parquet_file.schema_arrow
+    if options.columns is not None:
+        schema = pa.schema([schema.field(name) for name in options.columns])
+    batches = parquet_file.iter_batches(
+        batch_size=options.batch_size,
+        columns=options.columns,
+        use_threads=options.use_threads,
+    )
+    return schema, batches
+
+
+def read_table(path: Union[str, Path], options: IngestOptions) -> pd.DataFrame:
+    """Read a CSV or Parquet file into a DataFrame, batch by batch"""
+    schema, batches = open_batches(path, options)
+    table = pa.Table.from_batches(batches, schema=schema)
+    types = arrow_types(options.column_types)
+    if len(types) > 0:
+        # parquet columns are stored typed, they are cast after reading
+        fields = [
+            pa.field(field.name, types.get(field.name, field.type))
+            for field in table.schema
+        ]
+        table = table.cast(pa.schema(fields))
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _mock_column(
+    name: str, column: pd.Series, rng: np.random.Generator
+) -> Union[pd.Series, np.ndarray]:
+    size = len(column)
+    valid = column.dropna()
+    if len(valid) == 0:
+        return column.copy()
+
+    if pd.api.types.is_bool_dtype(valid):
+        values = rng.random(size) < valid.astype(bool).mean()
+    elif pd.api.types.is_integer_dtype(valid):
+        values = rng.integers(int(valid.min()), int(valid.max()), size, endpoint=True)
+        values = values.astype(valid.dtype)
+    elif pd.api.types.is_float_dtype(valid):
+        values = rng.normal(valid.mean(), valid.std(ddof=0), size)
+        values = np.clip(values, valid.min(), valid.max()).astype(valid.dtype)
+    elif pd.api.types.is_datetime64_any_dtype(valid):
+        low, high = valid.min(), valid.max()
+        values = pd.to_datetime(
+            rng.integers(low.value, high.value, size, endpoint=True)
+        )
+        if low.tz is not None:
+            values = values.tz_localize("UTC").tz_convert(low.tz)
+    else:
+        categories = min(valid.nunique(), MAX_MOCK_CATEGORIES)
+        values = np.array([f"{name}_{i}" for i in range(categories)], dtype=object)
+        values = values[rng.integers(0, categories, size)]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            values = pd.Categorical(values)
+
+    values = pd.Series(values, index=column.index, name=column.name)
+    null_rate = 1 - len(valid) / size
+    if null_rate > 0:
+        values = values.mask(rng.random(size) < null_rate)
+    return values
+
+
+def generate_mock(data: pd.DataFrame, seed: Optional[int] = None) -> pd.DataFrame:
+    """A synthetic DataFrame with the shape, columns and dtypes of `data`
+
+    Every column is drawn on its own, so no row of `data` is reproduced:
+    numbers from the mean and spread of the column clipped to its range, dates
+    uniformly over its range, booleans and nulls at their observed rates and
+    text as placeholders like "city_3", as many as the column has distinct
+    values up to MAX_MOCK_CATEGORIES.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {name: _mock_column(str(name), data[name], rng) for name in data.columns},
+        index=data.index,
+        columns=data.columns,
+    )
+
+
+def stage_file(
+    api: Any,
+    path: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    streams: int = DEFAULT_STREAMS,
+) -> Union[UID, SyftError]:
+    """Upload the raw bytes of a local file to the node in chunks, for
+    `dataset.ingest`. Returns the transfer session id to ingest it with.
+
+    The session is keyed by the content of the file, so staging the same file
+    again after a failure resumes the upload.
+    """
+    path = Path(path)
+    size = path.stat().st_size
+    if size == 0:
+        return SyftError(message=f"{path} is empty")
+    transfer = api.services.transfer
+    with open(path, "rb") as source:
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                digest = hashlib.sha256(view).hexdigest()
+                session = transfer.begin_upload(
+                    object_id=payload_uid(digest),
+                    size=size,
+                    digest=digest,
+                    chunk_size=chunk_size,
+                )
+                if isinstance(session, SyftError):
+                    return session
+                put_chunks(transfer, session, view, streams)
+            except TransferError as e:
+                return SyftError(
+                    message=f"Staging of {path} failed, retry to resume: {e}"
+                )
+            finally:
+                view.release()
+    return session.id
@@ -5,9 +5,13 @@ from __future__ import annotations
 from collections import defaultdict
 from enum import Enum
 from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Set
+from typing import Tuple
 
 # third party
 from result import Err
@@ -16,12 +20,17 @@ from result import Result
 from typing_extensions import Self
 
 # relative
+from .change_feed import ChangeType
 from .document_store import BaseStash
+from .document_store import PartitionKey
 from .document_store import QueryKey
 from .document_store import QueryKeys
 from .document_store import StorePartition
 from .response import SyftSuccess
 from .serializable import serializable
+from .store_metrics import measured
+from .store_metrics import record_index_hit
+from .store_metrics import record_scan
 from .syft_object import SyftObject
 
 
@@ -77,6 +86,48 @@ class KeyValueBackingStore:
     def __iter__(self) -> Any:
         raise NotImplementedError
 
+    def update_value(self, key: Any, fn: Callable[[Any], Any]) -> Any:
+        """Replace the value at `key` with `fn(value)` and return the new value
+
+        The partition serializes the calls made in this process, backends shared
+        between processes override this to make the read and the write atomic.
+        `fn` can be called more than once and raises to abort the update.
+        """
+        value = fn(self[key])
+        self[key] = value
+        return value
+
+    def set_in_column(self, key: Any, column_key: Any, value: Any) -> None:
+        """Set one entry of the index column at `key`, backends that can persist
+        the change alone override this and the two methods below"""
+        column = self[key]
+        column[column_key] = value
+        self[key] = column
+
+    def append_to_column(self, key: Any, column_key: Any, value: Any) -> None:
+        """Append `value` to the list at `column_key` of the index column at `key`"""
+        column = self[key]
+        column[column_key].append(value)
+        self[key] = column
+
+    def delete_from_column(self, key: Any, column_key: Any) -> None:
+        """Remove an entry of the index column at `key`, if present"""
+        column = self[key]
+        if column_key in column:
+            column.pop(column_key)
+            self[key] = column
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Values of the `keys` present, backends override this to read them in
+        one round trip"""
+        values = {}
+        for key in keys:
+            try:
+                values[key] = self[key]
+            except KeyError:
+                pass
+        return values
+
 
 class KeyValueStorePartition(StorePartition):
     """Key-Value StorePartition
@@ -118,36 +169,45 @@ class KeyValueStorePartition(StorePartition):
 
         return Ok()
 
+    @measured("set")
     def set(
         self, obj: SyftObject, ignore_duplicates: bool = False
     ) -> Result[SyftObject, str]:
         try:
             store_query_key = self.settings.store_key.with_obj(obj)
-            exists = store_query_key.value in self.data
-            unique_query_keys = self.settings.unique_keys.with_obj(obj)
-            searchable_query_keys = self.settings.searchable_keys.with_obj(obj)
-            ck_check = self._validate_partition_keys(
-                store_query_key=store_query_key, unique_query_keys=unique_query_keys
-            )
-            if not exists and ck_check == UniqueKeyCheck.EMPTY:
-                self._set_data_and_keys(
-                    store_query_key=store_query_key,
-                    unique_query_keys=unique_query_keys,
-                    searchable_query_keys=searchable_query_keys,
-                    obj=obj,
+            with self.lock(store_query_key.value), self.index_lock():
+                exists = store_query_key.value in self.data
+                unique_query_keys = self.settings.unique_keys.with_obj(obj)
+                searchable_query_keys = self.settings.searchable_keys.with_obj(obj)
+                ck_check = self._validate_partition_keys(
+                    store_query_key=store_query_key, unique_query_keys=unique_query_keys
                 )
-            elif not ignore_duplicates:
-                return Err(f"Duplication Key Error: {obj}")
+                if not exists and ck_check == UniqueKeyCheck.EMPTY:
+                    self._set_data_and_keys(
+                        store_query_key=store_query_key,
+                        unique_query_keys=unique_query_keys,
+                        searchable_query_keys=searchable_query_keys,
+                        obj=obj,
+                    )
+                    self.change_feed.record(
+                        ChangeType.INSERT, store_query_key.value, obj
+                    )
+                elif not ignore_duplicates:
+                    return Err(f"Duplication Key Error: {obj}")
         except Exception as e:
             return Err(f"Failed to write obj {obj}. {e}")
         return Ok(obj)
 
+    @measured("all")
     def all(self) -> Result[List[BaseStash.object_type], str]:
-        return Ok(list(self.data.values()))
+        objs = list(self.data.values())
+        record_scan(len(objs))
+        return Ok(objs)
 
     def __len__(self) -> Result[List[BaseStash.object_type], str]:
         return len(self.data)
 
+    @measured("query")
     def find_index_or_search_keys(
         self, index_qks: QueryKeys, search_qks: QueryKeys
     ) -> Result[List[SyftObject], str]:
@@ -179,8 +239,9 @@ class KeyValueStorePartition(StorePartition):
         if ids is None:
             return Ok([])
 
+        # the ids come from an index lookup which is already counted
         qks = self.store_query_keys(ids)
-        return self.get_all_from_store(qks=qks)
+        return Ok(self._get_all_from_data(qks=qks))
 
     def remove_keys(
         self,
@@ -189,71 +250,227 @@ class KeyValueStorePartition(StorePartition):
     ) -> None:
         uqks = unique_query_keys.all
         for qk in uqks:
-            pk_key, pk_value = qk.key, qk.value
-            ck_col = self.unique_keys[pk_key]
-            ck_col.pop(pk_value, None)
+            self.unique_keys.delete_from_column(qk.key, qk.value)
 
         sqks = searchable_query_keys.all
         for qk in sqks:
-            pk_key, pk_value = qk.key, qk.value
-            ck_col = self.searchable_keys[pk_key]
-            ck_col.pop(pk_value, None)
+            self.searchable_keys.delete_from_column(qk.key, qk.value)
 
+    @measured("update")
     def update(self, qk: QueryKey, obj: SyftObject) -> Result[SyftObject, str]:
         try:
-            if qk.value not in self.data:
-                return Err(f"No object exists for query key: {qk}")
+            with self.lock(qk.value), self.index_lock():
+                return self._update(qk=qk, obj=obj)
+        except Exception as e:
+            return Err(f"Failed to update obj {obj} with error: {e}")
 
-            _original_obj = self.data[qk.value]
-            _original_unique_keys = self.settings.unique_keys.with_obj(_original_obj)
-            _original_searchable_keys = self.settings.searchable_keys.with_obj(
-                _original_obj
+    def _update(self, qk: QueryKey, obj: SyftObject) -> Result[SyftObject, str]:
+        if qk.value not in self.data:
+            return Err(f"No object exists for query key: {qk}")
+
+        _original_obj = self.data[qk.value]
+        _original_unique_keys = self.settings.unique_keys.with_obj(_original_obj)
+        _original_searchable_keys = self.settings.searchable_keys.with_obj(
+            _original_obj
+        )
+
+        # remove old keys
+        self.remove_keys(
+            unique_query_keys=_original_unique_keys,
+            searchable_query_keys=_original_searchable_keys,
+        )
+
+        # update the object with new data
+        for key, value in obj.to_dict(exclude_none=True).items():
+            if key == "id":
+                # protected field
+                continue
+            setattr(_original_obj, key, value)
+
+        # update data and keys
+        self._set_data_and_keys(
+            store_query_key=qk,
+            unique_query_keys=self.settings.unique_keys.with_obj(_original_obj),
+            searchable_query_keys=self.settings.searchable_keys.with_obj(_original_obj),
+            obj=_original_obj,
+        )
+        self.change_feed.record(ChangeType.UPDATE, qk.value, _original_obj)
+
+        return Ok(_original_obj)
+
+    @measured("update_fields")
+    def update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        fields_status = self.validate_fields(fields)
+        if fields_status.is_err():
+            return fields_status
+        fields = fields_status.ok()
+
+        unique_pks = self.affected_partition_keys(self.unique_cks, fields)
+        searchable_pks = self.affected_partition_keys(self.searchable_cks, fields)
+        keys: Dict[str, QueryKeys] = {}
+
+        def _patch(obj: SyftObject) -> SyftObject:
+            # the new keys are checked on a copy, in-memory stores hold `obj` itself
+            patched = obj.copy(update=fields)
+            for new_qk in [pk.with_obj(patched) for pk in unique_pks]:
+                owner = self.unique_keys[new_qk.key].get(new_qk.value)
+                if owner is not None and owner != qk.value:
+                    raise ValueError(f"Duplication Key Error: {new_qk}")
+
+            keys["old_unique"] = QueryKeys(qks=[pk.with_obj(obj) for pk in unique_pks])
+            keys["old_searchable"] = QueryKeys(
+                qks=[pk.with_obj(obj) for pk in searchable_pks]
+            )
+            for key, value in fields.items():
+                setattr(obj, key, value)
+            keys["unique"] = QueryKeys(qks=[pk.with_obj(obj) for pk in unique_pks])
+            keys["searchable"] = QueryKeys(
+                qks=[pk.with_obj(obj) for pk in searchable_pks]
             )
+            return obj
 
-            # 🟡 TODO 28: Add locking in this transaction
+        try:
+            with self.lock(qk.value), self.index_lock():
+                if qk.value not in self.data:
+                    return Err(f"No object exists for query key: {qk}")
 
-            # remove old keys
-            self.remove_keys(
-                unique_query_keys=_original_unique_keys,
-                searchable_query_keys=_original_searchable_keys,
-            )
+                obj = self.data.update_value(qk.value, _patch)
 
-            # update the object with new data
-            for key, value in obj.to_dict(exclude_none=True).items():
-                if key == "id":
-                    # protected field
-                    continue
-                setattr(_original_obj, key, value)
-
-            # update data and keys
-            self._set_data_and_keys(
-                store_query_key=qk,
-                unique_query_keys=self.settings.unique_keys.with_obj(_original_obj),
-                searchable_query_keys=self.settings.searchable_keys.with_obj(
-                    _original_obj
-                ),
-                obj=_original_obj,
+                # only the index entries of changed keys are rewritten
+                old_unique, new_unique = self._changed_keys(
+                    keys["old_unique"], keys["unique"]
+                )
+                old_searchable, new_searchable = self._changed_keys(
+                    keys["old_searchable"], keys["searchable"]
+                )
+                self._unset_keys(
+                    store_query_key=qk,
+                    unique_query_keys=old_unique,
+                    searchable_query_keys=old_searchable,
+                )
+                self._set_keys(
+                    store_query_key=qk,
+                    unique_query_keys=new_unique,
+                    searchable_query_keys=new_searchable,
+                )
+                self.change_feed.record(ChangeType.UPDATE, qk.value, obj)
+            return Ok(obj)
+        except Exception as e:
+            return Err(
+                f"Failed to update fields {list(fields)} of {qk} with error: {e}"
             )
 
-            return Ok(_original_obj)
+    @staticmethod
+    def _changed_keys(old: QueryKeys, new: QueryKeys) -> Tuple[QueryKeys, QueryKeys]:
+        changed = [
+            (old_qk, new_qk)
+            for old_qk, new_qk in zip(old.all, new.all)
+            if old_qk.value != new_qk.value
+        ]
+        return (
+            QueryKeys(qks=[old_qk for old_qk, _ in changed]),
+            QueryKeys(qks=[new_qk for _, new_qk in changed]),
+        )
+
+    def store_keys(self) -> Result[List[Any], str]:
+        try:
+            return Ok(list(self.data.keys()))
         except Exception as e:
-            return Err(f"Failed to update obj {obj} with error: {e}")
+            return Err(f"Failed to list the keys of {self.settings.name}. {e}")
 
-    def get_all_from_store(self, qks: QueryKeys) -> Result[List[SyftObject], str]:
+    @measured("migrate")
+    def migrate(
+        self, keys: List[Any], fn: Callable[[SyftObject], SyftObject]
+    ) -> Result[List[SyftObject], str]:
+        migrated = []
+        for key in keys:
+            try:
+                obj = self._migrate_object(key, fn)
+            except Exception as e:
+                return Err(f"Failed to migrate {key} with error: {e}")
+            if obj is not None:
+                migrated.append(obj)
+        return Ok(migrated)
+
+    def _migrate_object(
+        self, key: Any, fn: Callable[[SyftObject], SyftObject]
+    ) -> Optional[SyftObject]:
+        store_query_key = self.settings.store_key.with_obj(key)
+        keys: Dict[str, QueryKeys] = {}
+
+        def _migrate(obj: SyftObject) -> SyftObject:
+            keys.clear()
+            migrated = fn(obj)
+            if migrated is obj:
+                return obj
+
+            unique_query_keys = self.settings.unique_keys.with_obj(migrated)
+            for qk in unique_query_keys.all:
+                owner = self.unique_keys[qk.key].get(qk.value)
+                if owner is not None and owner != key:
+                    raise ValueError(f"Duplication Key Error: {qk}")
+            keys["old_unique"] = self._present_query_keys(self.unique_cks, obj)
+            keys["old_searchable"] = self._present_query_keys(self.searchable_cks, obj)
+            keys["unique"] = unique_query_keys
+            keys["searchable"] = self.settings.searchable_keys.with_obj(migrated)
+            return migrated
+
+        with self.lock(key), self.index_lock():
+            if key not in self.data:
+                # deleted since the keys were listed
+                return None
+            obj = self.data.update_value(key, _migrate)
+            if len(keys) == 0:
+                return None
+
+            self._unset_keys(
+                store_query_key=store_query_key,
+                unique_query_keys=keys["old_unique"],
+                searchable_query_keys=keys["old_searchable"],
+            )
+            self._set_keys(
+                store_query_key=store_query_key,
+                unique_query_keys=keys["unique"],
+                searchable_query_keys=keys["searchable"],
+            )
+            self.change_feed.record(ChangeType.UPDATE, key, obj)
+        return obj
+
+    @staticmethod
+    def _present_query_keys(
+        partition_keys: List[PartitionKey], obj: SyftObject
+    ) -> QueryKeys:
+        # objects written by an older version can miss keys added since
+        return QueryKeys(
+            qks=[pk.with_obj(obj) for pk in partition_keys if hasattr(obj, pk.key)]
+        )
+
+    def _get_all_from_data(self, qks: QueryKeys) -> List[SyftObject]:
         matches = []
         for qk in qks.all:
             if qk.value in self.data:
                 matches.append(self.data[qk.value])
+        return matches
+
+    @measured("get")
+    def get_all_from_store(self, qks: QueryKeys) -> Result[List[SyftObject], str]:
+        matches = self._get_all_from_data(qks=qks)
+        record_index_hit(len(matches))
         return Ok(matches)
 
     def create(self, obj: SyftObject) -> Result[SyftObject, str]:
         pass
 
+    @measured("delete")
     def delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
         try:
-            _obj = self.data.pop(qk.value)
-            self._delete_unique_keys_for(_obj)
-            self._delete_search_keys_for(_obj)
+            with self.lock(qk.value), self.index_lock():
+                _obj = self.data.pop(qk.value)
+                self._delete_unique_keys_for(_obj)
+                self._delete_search_keys_for(_obj)
+                self.change_feed.record(ChangeType.DELETE, qk.value)
             return Ok(SyftSuccess(message="Deleted"))
         except Exception as e:
             return Err(f"Failed to delete with query key {qk} with error: {e}")
@@ -261,13 +478,13 @@ class KeyValueStorePartition(StorePartition):
     def _delete_unique_keys_for(self, obj: SyftObject) -> Result[SyftSuccess, str]:
         for _unique_ck in self.unique_cks:
             qk = _unique_ck.with_obj(obj)
-            self.unique_keys[qk.key].pop(qk.value, None)
+            self.unique_keys.delete_from_column(qk.key, qk.value)
         return Ok(SyftSuccess(message="Deleted"))
 
     def _delete_search_keys_for(self, obj: SyftObject) -> Result[SyftSuccess, str]:
         for _search_ck in self.searchable_cks:
             qk = _search_ck.with_obj(obj)
-            self.searchable_keys[qk.key].pop(qk.value, None)
+            self.searchable_keys.delete_from_column(qk.key, qk.value)
         return Ok(SyftSuccess(message="Deleted"))
 
     def _get_keys_index(self, qks: QueryKeys) -> Result[Set[QueryKey], str]:
@@ -287,12 +504,14 @@ class KeyValueStorePartition(StorePartition):
                 subsets.append({store_value})
 
             if len(subsets) == 0:
+                record_index_hit()
                 return Ok(set())
             # AND
             subset = subsets.pop()
             for s in subsets:
                 subset = subset.intersection(s)
 
+            record_index_hit(len(subset))
             return Ok(subset)
         except Exception as e:
             return Err(f"Failed to query with {qks}. {e}")
@@ -314,8 +533,10 @@ class KeyValueStorePartition(StorePartition):
                     # match OR against all keys for this col
                     # the values of the list will be turned into strings in a single key
                     matches = set()
+                    col_keys = list(ck_col.keys())
+                    record_scan(len(pk_value) * len(col_keys))
                     for item in pk_value:
-                        for col_key in ck_col.keys():
+                        for col_key in col_keys:
                             if str(item) in col_key:
                                 store_values = ck_col[col_key]
                                 for value in store_values:
@@ -326,8 +547,10 @@ class KeyValueStorePartition(StorePartition):
                     # this is the normal path
                     if pk_value not in ck_col.keys():
                         # must be at least one in all query keys
+                        record_index_hit()
                         continue
                     store_values = ck_col[pk_value]
+                    record_index_hit(len(store_values))
                     subsets.append(set(store_values))
 
             if len(subsets) == 0:
@@ -370,27 +593,62 @@ class KeyValueStorePartition(StorePartition):
         obj: SyftObject,
     ) -> None:
         # we should lock
+        self._set_keys(
+            store_query_key=store_query_key,
+            unique_query_keys=unique_query_keys,
+            searchable_query_keys=searchable_query_keys,
+        )
+
+        self.unique_keys.set_in_column(
+            store_query_key.key, store_query_key.value, store_query_key.value
+        )
+
+        self.data[store_query_key.value] = obj
+
+    @staticmethod
+    def _searchable_value(qk: QueryKey) -> Any:
+        if qk.type_list:
+            # coerce the list of objects to strings for a single key
+            return " ".join([str(obj) for obj in qk.value])
+        return qk.value
+
+    def _set_keys(
+        self,
+        store_query_key: QueryKey,
+        unique_query_keys: QueryKeys,
+        searchable_query_keys: QueryKeys,
+    ) -> None:
         uqks = unique_query_keys.all
 
         for qk in uqks:
-            pk_key, pk_value = qk.key, qk.value
-            ck_col = self.unique_keys[pk_key]
-            ck_col[pk_value] = store_query_key.value
-            self.unique_keys[pk_key] = ck_col
-
-        self.unique_keys[store_query_key.key][
-            store_query_key.value
-        ] = store_query_key.value
+            self.unique_keys.set_in_column(qk.key, qk.value, store_query_key.value)
 
         sqks = searchable_query_keys.all
         for qk in sqks:
-            pk_key, pk_value = qk.key, qk.value
-            ck_col = self.searchable_keys[pk_key]
-            if qk.type_list:
-                # coerce the list of objects to strings for a single key
-                pk_value = " ".join([str(obj) for obj in pk_value])
-
-            ck_col[pk_value].append(store_query_key.value)
-            self.searchable_keys[pk_key] = ck_col
+            self.searchable_keys.append_to_column(
+                qk.key, self._searchable_value(qk), store_query_key.value
+            )
 
-        self.data[store_query_key.value] = obj
+    def _unset_keys(
+        self,
+        store_query_key: QueryKey,
+        unique_query_keys: QueryKeys,
+        searchable_query_keys: QueryKeys,
+    ) -> None:
+        """Remove the index entries of a single object, unlike `remove_keys` other
+        objects sharing a searchable value keep theirs"""
+        for qk in unique_query_keys.all:
+            if self.unique_keys[qk.key].get(qk.value) == store_query_key.value:
+                self.unique_keys.delete_from_column(qk.key, qk.value)
+
+        for qk in searchable_query_keys.all:
+            pk_key, pk_value = qk.key, self._searchable_value(qk)
+            uids = [
+                uid
+                for uid in self.searchable_keys[pk_key].get(pk_value, [])
+                if uid != store_query_key.value
+            ]
+            if len(uids) > 0:
+                self.searchable_keys.set_in_column(pk_key, pk_value, uids)
+            else:
+                self.searchable_keys.delete_from_column(pk_key, pk_value)
@@ -0,0 +1,431 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from copy import deepcopy
+from pathlib import Path
+import tempfile
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Collection
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+from typing import Type
+from typing import Union
+
+# third party
+import lmdb
+from typing_extensions import Self
+
+# relative
+from .deserialize import _deserialize
+from .document_store import BasePartitionSettings
+from .document_store import DocumentStore
+from .document_store import PartitionSettings
+from .document_store import StoreClientConfig
+from .document_store import StoreConfig
+from .kv_document_store import KeyValueBackingStore
+from .kv_document_store import KeyValueStorePartition
+from .permission_index import PermissionIndex
+from .permission_index import uid_key_range
+from .serializable import serializable
+from .serialize import _serialize
+from .store_metrics import record_deserialized
+from .uid import UID
+
+
+class LMDBEnvironmentCache:
+    """LMDB only allows one open Environment per file and process, so every
+    backing store pointing at the same file shares a single Environment."""
+
+    __env_cache__: Dict[str, lmdb.Environment] = {}
+    _lock: Lock = Lock()
+
+    @classmethod
+    def from_config(cls, config: LMDBStoreClientConfig) -> lmdb.Environment:
+        file_path = str(config.file_path)
+        with cls._lock:
+            env = cls.__env_cache__.get(file_path, None)
+            if env is None:
+                Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+                env = lmdb.open(
+                    file_path,
+                    subdir=False,
+                    map_size=config.map_size,
+                    max_dbs=config.max_dbs,
+                    max_readers=config.max_readers,
+                    readahead=config.readahead,
+                    sync=config.sync,
+                )
+                cls.__env_cache__[file_path] = env
+        return env
+
+    @classmethod
+    def close(cls, config: LMDBStoreClientConfig) -> None:
+        with cls._lock:
+            env = cls.__env_cache__.pop(str(config.file_path), None)
+            if env is not None:
+                env.close()
+
+
+@serializable(attrs=["index_name", "settings", "store_config"])
+class LMDBBackingStore(KeyValueBackingStore):
+    """Core Store logic for the LMDB stores.
+
+    Every backing store is a named sub-database inside a single memory-mapped
+    LMDB environment. Reads happen inside read-only transactions directly on the
+    mapped pages, writes are serialized by LMDB's single-writer transactions.
+
+    Parameters:
+        `index_name`: str
+            Index name
+        `settings`: PartitionSettings
+            Syft specific settings
+        `store_config`: LMDBStoreConfig
+            Connection Configuration
+        `ddtype`: Type
+            Class used as fallback on `get` errors
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        settings: PartitionSettings,
+        store_config: StoreConfig,
+        ddtype: Optional[type] = None,
+    ) -> None:
+        self.index_name = index_name
+        self.settings = settings
+        self.store_config = store_config
+        self._ddtype = ddtype
+        self._env: Optional[lmdb.Environment] = None
+        self._db: Optional[Any] = None
+        self.create_db()
+
+    @property
+    def db_name(self) -> str:
+        return f"{self.settings.name}_{self.index_name}"
+
+    @property
+    def env(self) -> lmdb.Environment:
+        # the store can be rebuilt by the deserializer without calling __init__
+        if getattr(self, "_env", None) is None:
+            self._env = LMDBEnvironmentCache.from_config(
+                self.store_config.client_config
+            )
+        return self._env
+
+    @property
+    def db(self) -> Any:
+        if getattr(self, "_db", None) is None:
+            self.create_db()
+        return self._db
+
+    def create_db(self) -> None:
+        # without a transaction open_db waits for the write lock holding the GIL,
+        # deadlocking with a writer of another thread, begin() releases it
+        with self.env.begin(write=True) as txn:
+            self._db = self.env.open_db(
+                self.db_name.encode("utf-8"), txn=txn, create=True
+            )
+
+    @staticmethod
+    def _key(key: Any) -> bytes:
+        # keys are serialized as well so that keys() returns the original types
+        return _serialize(key, to_bytes=True)
+
+    def _close(self) -> None:
+        self._commit()
+
+    def _commit(self) -> None:
+        # transactions are committed when they exit, this flushes the buffers
+        # to disk in case `sync` was disabled on the environment
+        self.env.sync(True)
+
+    def _set(self, key: Any, value: Any) -> None:
+        data = _serialize(value, to_bytes=True)
+        with self.env.begin(db=self.db, write=True) as txn:
+            txn.put(self._key(key), data)
+
+    def _get(self, key: Any) -> Any:
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            # zero-copy: the buffer points into the memory map and is only
+            # valid until the transaction ends
+            data = txn.get(self._key(key))
+            if data is None:
+                raise KeyError(f"{key} not in {type(self)}")
+            record_deserialized(len(data))
+            return _deserialize(data, from_bytes=True)
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        values = {}
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            for key in keys:
+                data = txn.get(self._key(key))
+                if data is not None:
+                    record_deserialized(len(data))
+                    values[key] = _deserialize(data, from_bytes=True)
+        return values
+
+    def update_value(self, key: Any, fn: Callable[[Any], Any]) -> Any:
+        # LMDB has a single writer, reading inside the write transaction makes
+        # the update atomic across processes
+        with self.env.begin(db=self.db, write=True) as txn:
+            data = txn.get(self._key(key))
+            if data is None:
+                raise KeyError(f"{key} not in {type(self)}")
+            record_deserialized(len(data))
+            value = fn(_deserialize(data, from_bytes=True))
+            txn.put(self._key(key), _serialize(value, to_bytes=True))
+        return value
+
+    def _exists(self, key: Any) -> bool:
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            return txn.get(self._key(key)) is not None
+
+    def _get_all(self) -> Any:
+        data = {}
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            for key, value in txn.cursor():
+                record_deserialized(len(value))
+                data[_deserialize(key, from_bytes=True)] = _deserialize(
+                    value, from_bytes=True
+                )
+        return data
+
+    def _get_all_keys(self) -> Any:
+        with self.env.begin(db=self.db, buffers=True) as txn:
+            return [
+                _deserialize(key, from_bytes=True)
+                for key in txn.cursor().iternext(keys=True, values=False)
+            ]
+
+    def _delete(self, key: Any) -> None:
+        with self.env.begin(db=self.db, write=True) as txn:
+            txn.delete(self._key(key))
+
+    def _delete_all(self) -> None:
+        with self.env.begin(write=True) as txn:
+            txn.drop(self.db, delete=False)
+
+    def _len(self) -> int:
+        with self.env.begin(db=self.db) as txn:
+            return txn.stat(self.db)["entries"]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._set(key, value)
+
+    def __getitem__(self, key: Any) -> Self:
+        try:
+            return self._get(key)
+        except KeyError as e:
+            if self._ddtype is not None:
+                return self._ddtype()
+            raise e
+
+    def __repr__(self) -> str:
+        return repr(self._get_all())
+
+    def __len__(self) -> int:
+        return self._len()
+
+    def __delitem__(self, key: str):
+        self._delete(key)
+
+    def clear(self) -> Self:
+        self._delete_all()
+
+    def copy(self) -> Self:
+        return deepcopy(self)
+
+    def keys(self) -> Any:
+        return self._get_all_keys()
+
+    def values(self) -> Any:
+        return self._get_all().values()
+
+    def items(self) -> Any:
+        return self._get_all().items()
+
+    def pop(self, key: Any) -> Self:
+        with self.env.begin(db=self.db, write=True) as txn:
+            data = txn.pop(self._key(key))
+        if data is None:
+            raise KeyError(f"{key} not in {type(self)}")
+        return _deserialize(data, from_bytes=True)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._exists(key)
+
+    def __iter__(self) -> Any:
+        return iter(self.keys())
+
+
+@serializable(attrs=["settings", "store_config"])
+class LMDBPermissionIndex(PermissionIndex):
+    """PermissionIndex stored as a named sub-database of binary keys with empty
+    values. A batch of lookups runs in a single read transaction and the keys
+    of a uid are visited with one cursor range.
+
+    Parameters:
+        `settings`: BasePartitionSettings
+            Settings of the action store, the name prefixes the sub-database
+        `store_config`: LMDBStoreConfig
+            Connection Configuration
+    """
+
+    def __init__(
+        self, settings: BasePartitionSettings, store_config: StoreConfig
+    ) -> None:
+        super().__init__(settings=settings, store_config=store_config)
+        self._db: Optional[Any] = None
+
+    @property
+    def env(self) -> lmdb.Environment:
+        return LMDBEnvironmentCache.from_config(self.store_config.client_config)
+
+    @property
+    def db(self) -> Any:
+        # the index can be rebuilt by the deserializer without calling __init__
+        if getattr(self, "_db", None) is None:
+            # opened in a transaction for the same reason as LMDBBackingStore.create_db
+            with self.env.begin(write=True) as txn:
+                self._db = self.env.open_db(
+                    self.index_name.encode("utf-8"), txn=txn, create=True
+                )
+        return self._db
+
+    def add(self, keys: Iterable[bytes]) -> None:
+        with self.env.begin(db=self.db, write=True) as txn:
+            for key in keys:
+                txn.put(key, b"")
+
+    def remove(self, keys: Iterable[bytes]) -> None:
+        with self.env.begin(db=self.db, write=True) as txn:
+            for key in keys:
+                txn.delete(key)
+
+    def present(self, keys: Collection[bytes]) -> Set[bytes]:
+        with self.env.begin(db=self.db) as txn:
+            return {key for key in keys if txn.get(key) is not None}
+
+    def has_uid(self, uid: UID) -> bool:
+        lower, upper = uid_key_range(uid)
+        with self.env.begin(db=self.db) as txn:
+            cursor = txn.cursor()
+            return cursor.set_range(lower) and cursor.key() < upper
+
+    def remove_uid(self, uid: UID) -> None:
+        lower, upper = uid_key_range(uid)
+        with self.env.begin(db=self.db, write=True) as txn:
+            cursor = txn.cursor()
+            found = cursor.set_range(lower)
+            while found and cursor.key() < upper:
+                # delete moves the cursor to the next key
+                found = cursor.delete()
+
+    def clear(self) -> None:
+        with self.env.begin(write=True) as txn:
+            txn.drop(self.db, delete=False)
+
+
+@serializable()
+class LMDBStorePartition(KeyValueStorePartition):
+    """LMDB StorePartition
+
+    Parameters:
+        `settings`: PartitionSettings
+            PySyft specific settings, used for indexing and partitioning
+        `store_config`: LMDBStoreConfig
+            LMDB specific configuration
+    """
+
+    def close(self) -> None:
+        self.data._close()
+        self.unique_keys._close()
+        self.searchable_keys._close()
+
+    def commit(self) -> None:
+        self.data._commit()
+        self.unique_keys._commit()
+        self.searchable_keys._commit()
+
+
+@serializable()
+class LMDBDocumentStore(DocumentStore):
+    """LMDB Document Store
+
+    Parameters:
+        `store_config`: StoreConfig
+            LMDB specific configuration, including file location and map size.
+    """
+
+    partition_type = LMDBStorePartition
+
+
+@serializable()
+class LMDBStoreClientConfig(StoreClientConfig):
+    """LMDB environment config
+
+    Parameters:
+        `filename` : str
+            Database file name
+        `path` : Path or str
+            Database folder
+        `map_size`: int
+            Maximum size the memory map (and the database file) may grow to, in bytes.
+            The file is sparse, so a large value does not use disk space up front.
+            Default 10 GiB.
+        `max_dbs`: int
+            Maximum number of named sub-databases. Every partition uses three of them
+            (data, unique keys and searchable keys). Default 256.
+        `max_readers`: int
+            Maximum number of simultaneous read transactions. Default 126.
+        `readahead`: bool
+            If False (default), disable OS readahead, which improves random read
+            performance when the database is larger than RAM.
+        `sync`: bool
+            If True (default), flush buffers to disk when a write transaction commits.
+    """
+
+    filename: Optional[str]
+    path: Optional[Union[str, Path]] = None
+    map_size: int = 10 * 1024**3
+    max_dbs: int = 256
+    max_readers: int = 126
+    readahead: bool = False
+    sync: bool = True
+
+    @property
+    def temp_path(self) -> str:
+        return tempfile.gettempdir()
+
+    @property
+    def file_path(self) -> Path:
+        path = self.path if self.path else self.temp_path
+        path = Path(path)
+        return path / self.filename
+
+
+@serializable()
+class LMDBStoreConfig(StoreConfig):
+    """LMDB Store config, used by LMDBStorePartition
+
+    Parameters:
+        `client_config`: LMDBStoreClientConfig
+            LMDB environment configuration
+        `store_type`: DocumentStore
+            Class interacting with QueueStash. Default: LMDBDocumentStore
+        `backing_store`: KeyValueBackingStore
+            The Store core logic. Default: LMDBBackingStore
+        `permission_index`: PermissionIndex
+            Permission index of the action store. Default: LMDBPermissionIndex
+    """
+
+    client_config: LMDBStoreClientConfig
+    store_type: Type[DocumentStore] = LMDBDocumentStore
+    backing_store: Type[KeyValueBackingStore] = LMDBBackingStore
+    permission_index: Type[PermissionIndex] = LMDBPermissionIndex
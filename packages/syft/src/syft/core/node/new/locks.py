@@ -1,19 +1,38 @@
 # stdlib
+from contextlib import contextmanager
+import ctypes
+import ctypes.util
+import os
 from pathlib import Path
+import select
+import struct
+import sys
+import threading
 import time
+from typing import Any
+from typing import Dict
+from typing import Iterator
 from typing import Optional
+from typing import Tuple
+import uuid
+import zlib
 
 # third party
 from pydantic import BaseModel
 import redis
 from sherlock.lock import BaseLock
 from sherlock.lock import FileLock
+from sherlock.lock import LockException
+from sherlock.lock import LockTimeoutException
 from sherlock.lock import RedisLock
 
 # relative
 from ....logger import debug
+from .serializable import serializable
+from .store_metrics import LatencyHistogram
 
 
+@serializable()
 class LockingConfig(BaseModel):
     """
     Locking config
@@ -28,7 +47,11 @@ class LockingConfig(BaseModel):
         timeout: Optional[int]
              Timeout to acquire lock(seconds)
         retry_interval: float
-            Retry interval to retry acquiring a lock if previous attempts failed.
+            Longest wait between two attempts to acquire a held lock. Waiters are
+            woken up as soon as the lock is released, the interval only bounds how
+            late an expired lock is noticed.
+        stripes: int
+            Number of locks the keys of a `StripedLock` are spread over.
     """
 
     lock_name: str = "syft_lock"
@@ -36,8 +59,10 @@ class LockingConfig(BaseModel):
     expire: Optional[int] = 60
     timeout: Optional[int] = 30
     retry_interval: float = 0.1
+    stripes: int = 64
 
 
+@serializable()
 class NoLockingConfig(LockingConfig):
     """
     No-locking policy
@@ -46,12 +71,21 @@ class NoLockingConfig(LockingConfig):
     pass
 
 
+@serializable()
+class ThreadingLockingConfig(LockingConfig):
+    """In-process locking policy, waiters block on a condition variable"""
+
+    pass
+
+
+@serializable()
 class FileLockingConfig(LockingConfig):
     """File locking policy"""
 
     client_path: Optional[Path] = None
 
 
+@serializable()
 class RedisClientConfig(BaseModel):
     host: str = "localhost"
     port: int = 6379
@@ -60,19 +94,241 @@ class RedisClientConfig(BaseModel):
     password: Optional[str] = None
 
 
+@serializable()
 class RedisLockingConfig(LockingConfig):
     """Redis locking policy"""
 
     client: RedisClientConfig = RedisClientConfig()
 
 
+class LockMetrics:
+    """Wait times of the blocking acquires of a group of locks"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.wait_time = LatencyHistogram()
+            self.acquired = 0
+            self.contended = 0
+            self.timeouts = 0
+            self.wakeups = 0
+
+    def record(self, wait: float, acquired: bool, wakeups: int) -> None:
+        with self._lock:
+            self.wait_time.observe(wait)
+            self.acquired += int(acquired)
+            self.contended += int(wakeups > 0)
+            self.timeouts += int(not acquired)
+            self.wakeups += wakeups
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "wait_time": self.wait_time.to_dict(),
+                "acquired": self.acquired,
+                "contended": self.contended,
+                "timeouts": self.timeouts,
+                "wakeups": self.wakeups,
+            }
+
+
+class _LeaseState:
+    def __init__(self) -> None:
+        self.cond = threading.Condition()
+        self.owner: Optional[str] = None
+        self.expires_at: Optional[float] = None
+
+    def held(self) -> bool:
+        return self.owner is not None and (
+            self.expires_at is None or time.monotonic() < self.expires_at
+        )
+
+
+class ThreadingLock(BaseLock):
+    """In-process lock with the sherlock lease semantics, owners expire after
+    `expire` seconds. Waiters sleep on a condition variable notified on release.
+    """
+
+    _states: Dict[str, _LeaseState] = {}
+    _states_lock = threading.Lock()
+
+    def __init__(self, lock_name: str, **kwargs: Any) -> None:
+        super().__init__(lock_name, **kwargs)
+        self._owner: Optional[str] = None
+        with self._states_lock:
+            self._state = self._states.setdefault(self._key_name, _LeaseState())
+
+    @property
+    def _key_name(self) -> str:
+        if self.namespace is not None:
+            return f"{self.namespace}_{self.lock_name}"
+        return self.lock_name
+
+    def _acquire(self) -> bool:
+        state = self._state
+        with state.cond:
+            if state.held():
+                return False
+            owner = str(uuid.uuid4())
+            state.owner = owner
+            state.expires_at = (
+                time.monotonic() + self.expire if self.expire is not None else None
+            )
+            self._owner = owner
+            return True
+
+    def _release(self) -> None:
+        if self._owner is None:
+            raise LockException("Lock was not set by this process.")
+
+        state = self._state
+        with state.cond:
+            if state.owner == self._owner:
+                state.owner = None
+                state.expires_at = None
+                state.cond.notify_all()
+        self._owner = None
+
+    def _renew(self) -> bool:
+        state = self._state
+        with state.cond:
+            if self._owner is None or state.owner != self._owner or not state.held():
+                return False
+            if self.expire is not None:
+                state.expires_at = time.monotonic() + self.expire
+            return True
+
+    @property
+    def _locked(self) -> bool:
+        with self._state.cond:
+            return self._state.held()
+
+    def wait_released(self, timeout: float) -> None:
+        state = self._state
+        with state.cond:
+            if state.held():
+                state.cond.wait(timeout)
+
+
+# inotify(7), used to wait for the lease file of a FileLock to go away
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+_libc: Optional[ctypes.CDLL] = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        _libc.inotify_init1
+    except (OSError, AttributeError):  # nosec
+        _libc = None
+
+
+class NotifyingFileLock(FileLock):
+    """sherlock FileLock whose waiters are woken up by inotify events on the
+    lease file instead of polling it, where inotify is available"""
+
+    def _lease_changed(self, fd: int, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        name = self._data_file.name.encode()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                return False
+            buffer = os.read(fd, 4096)
+            offset = 0
+            while offset < len(buffer):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                event_name = buffer[offset : offset + length].rstrip(
+                    b"\0"
+                )  # noqa: E203
+                offset += length
+                if event_name == name:
+                    return True
+
+    def wait_released(self, timeout: float) -> None:
+        if _libc is None:
+            time.sleep(timeout)
+            return
+
+        fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            time.sleep(timeout)
+            return
+        try:
+            mask = IN_DELETE | IN_MOVED_FROM | IN_CLOSE_WRITE
+            if _libc.inotify_add_watch(fd, str(self.client).encode(), mask) < 0:
+                time.sleep(timeout)
+                return
+            # released between the failed attempt and the watch
+            if not self._locked:
+                return
+            self._lease_changed(fd, timeout)
+        finally:
+            os.close(fd)
+
+
+class NotifyingRedisLock(RedisLock):
+    """sherlock RedisLock whose release pushes a token to a list the waiters
+    block on with BLPOP, one waiter is woken up per release"""
+
+    # how long a release token waits for a waiter, in milliseconds
+    notify_ttl = 1000
+
+    _release_script = """
+    local result = 0
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        redis.call('DEL', KEYS[1])
+        redis.call('DEL', KEYS[2])
+        redis.call('RPUSH', KEYS[2], 1)
+        redis.call('PEXPIRE', KEYS[2], ARGV[2])
+        result = 1
+    end
+    return result
+    """
+
+    @property
+    def _notify_key(self) -> str:
+        return f"{self._key_name}_released"
+
+    def _release(self) -> None:
+        if self._owner is None:
+            raise LockException("Lock was not set by this process.")
+
+        released = self._release_func(
+            keys=[self._key_name, self._notify_key],
+            args=[self._owner, self.notify_ttl],
+        )
+        if released != 1:
+            raise LockException(
+                "Lock could not be released because it was "
+                "not acquired by this instance."
+            )
+
+        self._owner = None
+
+    def wait_released(self, timeout: float) -> None:
+        self.client.blpop([self._notify_key], timeout=timeout)
+
+
 class SyftLock(BaseLock):
     """
     Syft Lock implementations.
     """
 
-    def __init__(self, config: LockingConfig):
+    def __init__(self, config: LockingConfig, metrics: Optional[LockMetrics] = None):
         self.config = config
+        self.metrics = metrics
 
         self.lock_name = config.lock_name
         self.namespace = config.namespace
@@ -93,16 +349,18 @@ class SyftLock(BaseLock):
         }
         if isinstance(config, NoLockingConfig):
             self.passthrough = True
+        elif isinstance(config, ThreadingLockingConfig):
+            self._lock = ThreadingLock(**base_params)
         elif isinstance(config, FileLockingConfig):
             client = config.client_path
-            self._lock = FileLock(
+            self._lock = NotifyingFileLock(
                 **base_params,
                 client=client,
             )
         elif isinstance(config, RedisLockingConfig):
             client = redis.StrictRedis(**config.client.dict())
 
-            self._lock = RedisLock(
+            self._lock = NotifyingRedisLock(
                 **base_params,
                 client=client,
             )
@@ -134,15 +392,28 @@ class SyftLock(BaseLock):
         if not blocking:
             return self._acquire()
 
-        timeout = self.timeout
-        start_time = time.time()
-        elapsed = 0
-        while timeout >= elapsed:
-            if not self._acquire():
-                time.sleep(self.retry_interval)
-                elapsed = time.time() - start_time
-            else:
+        start_time = time.monotonic()
+        wakeups = 0
+        while True:
+            if self._acquire():
+                self._record(start_time, acquired=True, wakeups=wakeups)
                 return True
+
+            elapsed = time.monotonic() - start_time
+            if self.timeout is not None and elapsed >= self.timeout:
+                break
+            wait = self.retry_interval
+            if self.timeout is not None:
+                wait = min(wait, self.timeout - elapsed)
+            self._wait_released(wait)
+            wakeups += 1
+            if (
+                self.timeout is not None
+                and time.monotonic() - start_time > self.timeout
+            ):
+                break
+
+        self._record(start_time, acquired=False, wakeups=wakeups)
         debug(
             "Timeout elapsed after %s seconds "
             "while trying to acquiring "
@@ -150,6 +421,24 @@ class SyftLock(BaseLock):
         )
         return False
 
+    def _wait_released(self, timeout: float) -> None:
+        """Block until the lock is released or `timeout` seconds passed"""
+        wait_released = getattr(self._lock, "wait_released", None)
+        if wait_released is None:
+            time.sleep(timeout)
+            return
+        try:
+            wait_released(timeout)
+        except BaseException:
+            # e.g. the backend went away, fall back to polling
+            time.sleep(timeout)
+
+    def _record(self, start_time: float, acquired: bool, wakeups: int) -> None:
+        if self.metrics is not None:
+            self.metrics.record(
+                time.monotonic() - start_time, acquired=acquired, wakeups=wakeups
+            )
+
     def _acquire(self) -> bool:
         """
         Implementation of acquiring a lock in a non-blocking fashion.
@@ -186,3 +475,166 @@ class SyftLock(BaseLock):
             return True
 
         return self._lock._renew()
+
+
+class StripedLock:
+    """Per-key locks spread over a fixed number of stripes
+
+    Keys are hashed onto `config.stripes` locks, so writers of different keys
+    rarely wait for each other while the number of backend locks stays bounded.
+    The hash is stable across processes, File and Redis locks of the same key
+    are shared by every process using the same config.
+
+    Parameters:
+        `config`: LockingConfig
+            Backend and lease settings of the stripes
+        `name`: str
+            Prefix of the stripe lock names, e.g. the partition name
+        `metrics`: Optional[LockMetrics]
+            Where the wait times are recorded, a new LockMetrics by default
+    """
+
+    def __init__(
+        self,
+        config: LockingConfig,
+        name: str = "",
+        metrics: Optional[LockMetrics] = None,
+    ) -> None:
+        if config.stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.config = config
+        self.name = name
+        self.metrics = metrics if metrics is not None else LockMetrics()
+        self.passthrough = isinstance(config, NoLockingConfig)
+        # one in-process lock and one backend lock per stripe, created on first use
+        self._stripes: Dict[int, Tuple[threading.Lock, SyftLock]] = {}
+        self._stripes_lock = threading.Lock()
+
+    def stripe(self, key: Any) -> int:
+        return zlib.crc32(str(key).encode()) % self.config.stripes
+
+    def _stripe_locks(self, stripe: int) -> Tuple[threading.Lock, SyftLock]:
+        with self._stripes_lock:
+            if stripe not in self._stripes:
+                lock_name = f"{self.config.lock_name}_{self.name}_{stripe}"
+                self._stripes[stripe] = (
+                    threading.Lock(),
+                    SyftLock(self.config.copy(update={"lock_name": lock_name})),
+                )
+            return self._stripes[stripe]
+
+    def lock_for(self, key: Any) -> SyftLock:
+        """The SyftLock of the stripe of `key`, created once and shared by the
+        holders of the stripe, who take turns on an in-process lock first"""
+        return self._stripe_locks(self.stripe(key))[1]
+
+    def _remaining(self, start_time: float) -> Optional[float]:
+        if self.config.timeout is None:
+            return None
+        return max(self.config.timeout - (time.monotonic() - start_time), 0)
+
+    @contextmanager
+    def hold(self, key: Any) -> Iterator[None]:
+        """Hold the lock of `key`, raises LockTimeoutException when it can't be
+        acquired within `config.timeout` seconds"""
+        if self.passthrough:
+            yield
+            return
+
+        local, lock = self._stripe_locks(self.stripe(key))
+        start_time = time.monotonic()
+        waited = not local.acquire(blocking=False)
+        if waited:
+            remaining = self._remaining(start_time)
+            if not local.acquire(timeout=-1 if remaining is None else remaining):
+                self._timeout(start_time, key)
+        try:
+            if not lock.acquire(blocking=False):
+                waited = True
+                # only the holder of `local` uses the stripe's SyftLock
+                lock.timeout = self._remaining(start_time)
+                if not lock.acquire(blocking=True):
+                    self._timeout(start_time, key)
+            self.metrics.record(
+                time.monotonic() - start_time, acquired=True, wakeups=int(waited)
+            )
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            local.release()
+
+    def _timeout(self, start_time: float, key: Any) -> None:
+        self.metrics.record(time.monotonic() - start_time, acquired=False, wakeups=1)
+        raise LockTimeoutException(
+            f"Timeout waiting {self.config.timeout}s for the lock of {key}"
+        )
+
+
+class SharedExclusiveLock:
+    """In-process lock with a shared side, held by any number of threads at once,
+    and an exclusive side, held by one thread while no other holds the shared one.
+
+    A thread waiting for the exclusive side blocks new shared holders, so it isn't
+    starved by a steady stream of them. Both sides are reentrant and the holder
+    of either side can also take the other one.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._shared = 0
+        self._exclusive_owner: Optional[int] = None
+        self._exclusive_depth = 0
+        self._exclusive_waiting = 0
+        # per thread: depth of the shared holds and whether they are counted
+        self._local = threading.local()
+
+    def _shared_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        depth = self._shared_depth()
+        if depth == 0:
+            with self._cond:
+                # the exclusive holder is alone anyway, its shared holds aren't counted
+                self._local.counted = self._exclusive_owner != threading.get_ident()
+                if self._local.counted:
+                    while self._exclusive_owner is not None or self._exclusive_waiting:
+                        self._cond.wait()
+                    self._shared += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0 and self._local.counted:
+                with self._cond:
+                    self._shared -= 1
+                    if self._shared == 0:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._exclusive_owner != me:
+                # a shared hold of this thread doesn't block it
+                own = int(self._shared_depth() > 0 and self._local.counted)
+                self._exclusive_waiting += 1
+                try:
+                    while self._exclusive_owner is not None or self._shared > own:
+                        self._cond.wait()
+                finally:
+                    self._exclusive_waiting -= 1
+                self._exclusive_owner = me
+            self._exclusive_depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive_depth -= 1
+                if self._exclusive_depth == 0:
+                    self._exclusive_owner = None
+                    self._cond.notify_all()
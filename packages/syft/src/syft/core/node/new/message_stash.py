@@ -2,7 +2,6 @@
 from typing import List
 
 # third party
-from result import Err
 from result import Ok
 from result import Result
 
@@ -78,15 +77,7 @@ class MessageStash(BaseUIDStoreStash):
     def update_message_status(
         self, uid: UID, status: MessageStatus
     ) -> Result[Message, str]:
-        result = self.get_by_uid(uid=uid)
-        if result.is_err():
-            return result.err()
-
-        message = result.ok()
-        if message is None:
-            return Err(f"No message exists for id: {uid}")
-        message.status = status
-        return self.update(obj=message)
+        return self.update_fields(uid=uid, fields={"status": status})
 
     def delete_all_for_verify_key(self, verify_key: SyftVerifyKey) -> Result[bool, str]:
         messages = self.get_all_inbox_for_verify_key(verify_key=verify_key)
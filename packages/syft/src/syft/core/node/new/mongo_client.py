@@ -1,11 +1,15 @@
 # stdlib
+import asyncio
 from threading import Lock
 from typing import Any
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Type
 
 # third party
+from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo.collection import Collection as MongoCollection
 from pymongo.database import Database as MongoDatabase
 from pymongo.errors import ConnectionFailure
@@ -94,6 +98,9 @@ class MongoStoreClientConfig(StoreClientConfig):
         # Testing and connection reuse
         client: Optional[PyMongoClient]
             If provided, this client is reused. Default = None
+        async_client: Optional[AsyncIOMotorClient]
+            If provided, this client is reused by the awaitable store calls.
+            Default = None
 
     """
 
@@ -119,10 +126,38 @@ class MongoStoreClientConfig(StoreClientConfig):
     tls: Optional[bool] = False
     # Testing and connection reuse
     client: Any = None
+    async_client: Any = None
+
+
+def _client_kwargs(config: MongoStoreClientConfig) -> Dict[str, Any]:
+    return dict(
+        # Connection
+        host=config.hostname,
+        port=config.port,
+        directConnection=config.directConnection,
+        maxPoolSize=config.maxPoolSize,
+        minPoolSize=config.minPoolSize,
+        maxIdleTimeMS=config.maxIdleTimeMS,
+        maxConnecting=config.maxConnecting,
+        timeoutMS=config.timeoutMS,
+        socketTimeoutMS=config.socketTimeoutMS,
+        connectTimeoutMS=config.connectTimeoutMS,
+        serverSelectionTimeoutMS=config.serverSelectionTimeoutMS,
+        waitQueueTimeoutMS=config.waitQueueTimeoutMS,
+        heartbeatFrequencyMS=config.heartbeatFrequencyMS,
+        appname=config.appname,
+        # Auth
+        username=config.username,
+        password=config.password,
+        authSource=config.authSource,
+        tls=config.tls,
+        uuidRepresentation="standard",
+    )
 
 
 class MongoClientCache:
     __client_cache__: Dict[str, Type["MongoClient"]] = {}
+    __async_client_cache__: Dict[Tuple[int, int], AsyncIOMotorClient] = {}
     _lock: Lock = Lock()
 
     @classmethod
@@ -134,6 +169,24 @@ class MongoClientCache:
         with cls._lock:
             cls.__client_cache__[hash(str(config))] = client
 
+    # motor clients are bound to the event loop they are first used in
+
+    @classmethod
+    def from_async_cache(
+        cls, config: MongoStoreClientConfig, loop: asyncio.AbstractEventLoop
+    ) -> Optional[AsyncIOMotorClient]:
+        return cls.__async_client_cache__.get((hash(str(config)), id(loop)), None)
+
+    @classmethod
+    def set_async_cache(
+        cls,
+        config: MongoStoreClientConfig,
+        loop: asyncio.AbstractEventLoop,
+        client: AsyncIOMotorClient,
+    ) -> None:
+        with cls._lock:
+            cls.__async_client_cache__[(hash(str(config)), id(loop))] = client
+
 
 class MongoClient:
     client: PyMongoClient = None
@@ -148,29 +201,7 @@ class MongoClient:
             self.connect(config=config)
 
     def connect(self, config: MongoStoreClientConfig) -> Result[Ok, Err]:
-        self.client = PyMongoClient(
-            # Connection
-            host=config.hostname,
-            port=config.port,
-            directConnection=config.directConnection,
-            maxPoolSize=config.maxPoolSize,
-            minPoolSize=config.minPoolSize,
-            maxIdleTimeMS=config.maxIdleTimeMS,
-            maxConnecting=config.maxConnecting,
-            timeoutMS=config.timeoutMS,
-            socketTimeoutMS=config.socketTimeoutMS,
-            connectTimeoutMS=config.connectTimeoutMS,
-            serverSelectionTimeoutMS=config.serverSelectionTimeoutMS,
-            waitQueueTimeoutMS=config.waitQueueTimeoutMS,
-            heartbeatFrequencyMS=config.heartbeatFrequencyMS,
-            appname=config.appname,
-            # Auth
-            username=config.username,
-            password=config.password,
-            authSource=config.authSource,
-            tls=config.tls,
-            uuidRepresentation="standard",
-        )
+        self.client = PyMongoClient(**_client_kwargs(config))
         MongoClientCache.set_cache(config=config, client=self.client)
         try:
             # Check if mongo connection is still up
@@ -203,3 +234,44 @@ class MongoClient:
             return Err(str(e))
 
         return Ok(collection)
+
+
+class AsyncMongoClient:
+    """Motor client used by the awaitable store calls, must be created from a
+    coroutine running in the event loop it is used with"""
+
+    client: AsyncIOMotorClient = None
+
+    def __init__(self, config: MongoStoreClientConfig, cache: bool = True) -> None:
+        if config.async_client is not None:
+            self.client = config.async_client
+            return
+        if config.client is not None:
+            # the connection details of a reused client aren't known
+            return
+
+        loop = asyncio.get_running_loop()
+        if cache:
+            self.client = MongoClientCache.from_async_cache(config=config, loop=loop)
+        if not cache or self.client is None:
+            # unlike `MongoClient.connect` there is no ping, connection errors
+            # surface on the first awaited call
+            self.client = AsyncIOMotorClient(**_client_kwargs(config))
+            MongoClientCache.set_async_cache(
+                config=config, loop=loop, client=self.client
+            )
+
+    def with_collection(
+        self, collection_settings: PartitionSettings, store_config: StoreConfig
+    ) -> Result[AsyncIOMotorCollection, Err]:
+        if self.client is None:
+            return Err("An async_client has to be configured next to the reused client")
+        try:
+            db = self.client[store_config.db_name]
+            collection = db.get_collection(
+                name=collection_settings.name, codec_options=SYFT_CODEC_OPTIONS
+            )
+        except BaseException as e:
+            return Err(str(e))
+
+        return Ok(collection)
@@ -1,29 +1,51 @@
 # stdlib
+import asyncio
+import time
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 
 # third party
+from bson import Timestamp
+from bson import decode
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo import ASCENDING
+from pymongo import InsertOne
+from pymongo import ReplaceOne
+from pymongo import ReturnDocument
 from pymongo import WriteConcern
 from pymongo.collection import Collection as MongoCollection
+from pymongo.errors import BulkWriteError
 from pymongo.errors import DuplicateKeyError
 from result import Err
 from result import Ok
 from result import Result
 
 # relative
+from .change_feed import ChangeEvent
+from .change_feed import ChangeFeed
+from .change_feed import ChangeType
+from .change_feed import FIRST_OFFSET
 from .document_store import DocumentStore
+from .document_store import PartitionKey
 from .document_store import QueryKey
 from .document_store import QueryKeys
 from .document_store import StoreConfig
 from .document_store import StorePartition
+from .mongo_client import AsyncMongoClient
 from .mongo_client import MongoClient
 from .mongo_client import MongoStoreClientConfig
 from .response import SyftSuccess
 from .serializable import serializable
+from .store_metrics import measured
+from .store_metrics import record_deserialized
+from .store_metrics import record_index_hit
+from .store_metrics import record_scan
 from .syft_object import StorableObjectType
 from .syft_object import SyftObject
 from .syft_object import SyftObjectRegistry
@@ -31,6 +53,9 @@ from .transforms import TransformContext
 from .transforms import transform
 from .transforms import transform_method
 
+SEARCH_INDEX_SUFFIX = "_search_index"
+DUPLICATE_KEY_CODE = 11000
+
 
 class MongoBsonObject(StorableObjectType, dict):
     pass
@@ -89,6 +114,200 @@ def from_mongo(
     return constructor(**output)
 
 
+def timestamp_to_offset(timestamp: Timestamp) -> int:
+    return (timestamp.time << 32) | timestamp.inc
+
+
+def offset_to_timestamp(offset: int) -> Timestamp:
+    return Timestamp(offset >> 32, offset & 0xFFFFFFFF)
+
+
+class MongoChangeFeed(ChangeFeed):
+    """ChangeFeed on top of MongoDB change streams
+
+    Change streams need a replica set or a sharded cluster. The offset of a native
+    event is the cluster time of the change, `(seconds << 32) | increment`, which
+    the stream is resumed from. Changes made in a single transaction share their
+    cluster time and so their offset.
+
+    When change streams are not available (standalone servers, test doubles) the
+    feed is emulated: the partition appends its writes to a `<name>_changelog`
+    collection, offsets being handed out by an atomic counter document.
+
+    Parameters:
+        `name`: str
+            Partition name
+        `collection`: MongoCollection
+            Collection of the partition
+        `decode`: Callable
+            Turns a stored document back into a SyftObject
+        `capacity`: int
+            Number of events kept by the emulated changelog
+    """
+
+    # how often, in recorded writes, the emulated changelog is trimmed to `capacity`
+    trim_interval = 100
+    # how long an offset missing from the emulated changelog is waited for, it was
+    # handed out to a writer in another process that hasn't inserted its event yet
+    gap_timeout = 5.0
+    # how long a native read waits on the server for changes
+    max_await_time_ms = 10
+
+    def __init__(
+        self,
+        name: str,
+        collection: MongoCollection,
+        decode: Callable[[Dict], SyftObject],
+        capacity: int = 10_000,
+    ) -> None:
+        super().__init__(name=name, capacity=capacity)
+        self.collection = collection
+        self.decode = decode
+        self.native = self._supports_change_streams()
+
+        database = collection.database
+        self.changelog = database.get_collection(
+            f"{collection.name}_changelog", codec_options=collection.codec_options
+        )
+        self.counters = database.get_collection("__syft_change_feed_offsets")
+        self._writes = 0
+
+    def _supports_change_streams(self) -> bool:
+        try:
+            with self.collection.watch(max_await_time_ms=1):
+                pass
+        except Exception:  # nosec
+            return False
+        return True
+
+    @property
+    def latest_offset(self) -> int:
+        if self.native:
+            ping = self.collection.database.command("ping")
+            return timestamp_to_offset(ping["operationTime"]) + 1
+
+        counter = self.counters.find_one({"_id": self.name})
+        return (counter["offset"] if counter is not None else 0) + 1
+
+    @property
+    def oldest_offset(self) -> int:
+        if self.native:
+            # bounded by the oplog, a stale resume point is reported by the server
+            return FIRST_OFFSET
+
+        oldest = self.changelog.find_one(sort=[("_id", ASCENDING)])
+        return oldest["_id"] if oldest is not None else self.latest_offset
+
+    def _append(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject]
+    ) -> None:
+        if self.native:
+            # the change stream already has it
+            return
+
+        counter = self.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"offset": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        offset = counter["offset"]
+        self.changelog.insert_one(
+            {
+                "_id": offset,
+                "op": change_type.value,
+                "uid": uid,
+                "obj": obj.to(MongoBsonObject) if obj is not None else None,
+                "created_at": time.time(),
+            }
+        )
+
+        self._writes += 1
+        if self._writes % self.trim_interval == 0:
+            self.changelog.delete_many({"_id": {"$lte": offset - self.capacity}})
+
+    def _read(self, from_offset: int, limit: Optional[int]) -> List[ChangeEvent]:
+        if self.native:
+            return self._watch(from_offset, limit, timeout=None)
+
+        docs = self.changelog.find({"_id": {"$gte": from_offset}}).sort("_id")
+        if limit is not None:
+            docs = docs.limit(limit)
+
+        events = []
+        expected = from_offset
+        for doc in docs:
+            if (
+                doc["_id"] != expected
+                and time.time() - doc["created_at"] < self.gap_timeout
+            ):
+                # deliver in order, the missing event should show up shortly
+                break
+            obj = self.decode(doc["obj"]) if doc["obj"] is not None else None
+            events.append(
+                self.event(
+                    doc["_id"],
+                    ChangeType(doc["op"]),
+                    doc["uid"],
+                    obj,
+                    doc["created_at"],
+                )
+            )
+            expected = doc["_id"] + 1
+        return events
+
+    def _watch(
+        self, from_offset: int, limit: Optional[int], timeout: Optional[float]
+    ) -> List[ChangeEvent]:
+        deadline = time.monotonic() + (timeout or 0)
+        events: List[ChangeEvent] = []
+        with self.collection.watch(
+            full_document="updateLookup",
+            start_at_operation_time=offset_to_timestamp(from_offset),
+            max_await_time_ms=self.max_await_time_ms,
+        ) as stream:
+            while limit is None or len(events) < limit:
+                change = stream.try_next()
+                if change is None:
+                    if len(events) > 0 or time.monotonic() >= deadline:
+                        break
+                    continue
+
+                offset = timestamp_to_offset(change["clusterTime"])
+                change_type = {
+                    "insert": ChangeType.INSERT,
+                    "update": ChangeType.UPDATE,
+                    "replace": ChangeType.UPDATE,
+                    "delete": ChangeType.DELETE,
+                }.get(change["operationType"], None)
+                if change_type is None or offset < from_offset:
+                    continue
+
+                document = change.get("fullDocument", None)
+                obj = None
+                if change_type != ChangeType.DELETE and document is not None:
+                    obj = self.decode(document)
+                events.append(
+                    self.event(offset, change_type, change["documentKey"]["_id"], obj)
+                )
+        return events
+
+    def wait(
+        self,
+        from_offset: int = FIRST_OFFSET,
+        timeout: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Result[List[ChangeEvent], str]:
+        if not self.native:
+            return super().wait(from_offset=from_offset, timeout=timeout, limit=limit)
+
+        # the server holds the change stream open until there is a change
+        try:
+            return Ok(self._watch(max(from_offset, FIRST_OFFSET), limit, timeout))
+        except Exception as e:
+            return Err(f"Failed to read the changes of {self.name}. {e}")
+
+
 @serializable(attrs=["storage_type"])
 class MongoStorePartition(StorePartition):
     """Mongo StorePartition
@@ -125,6 +344,14 @@ class MongoStorePartition(StorePartition):
             return collection_status
         collection = collection_status.ok()
 
+        unique_status = self._create_update_unique_index(collection)
+        if unique_status.is_err():
+            return unique_status
+        return self._create_update_search_indexes(collection)
+
+    def _create_update_unique_index(
+        self, collection: MongoCollection
+    ) -> Result[Ok, Err]:
         def check_index_keys(current_keys, new_index_keys):
             current_keys.sort()
             new_index_keys.sort()
@@ -171,6 +398,49 @@ class MongoStorePartition(StorePartition):
 
         return Ok()
 
+    def _search_index_attrs(self) -> Dict[str, str]:
+        syft_obj = self.settings.object_type
+        object_name = syft_obj.__canonical_name__
+        unique_attrs = getattr(syft_obj, "__attr_unique__", [])
+        # `_id` and the first key of the compound unique index are indexed already
+        indexed = {"id"} | set(unique_attrs[:1])
+        return {
+            f"{object_name}_{attr}{SEARCH_INDEX_SUFFIX}": attr
+            for attr in getattr(syft_obj, "__attr_searchable__", [])
+            if attr not in indexed
+        }
+
+    def _create_update_search_indexes(
+        self, collection: MongoCollection
+    ) -> Result[Ok, Err]:
+        index_attrs = self._search_index_attrs()
+        try:
+            current_indexes = collection.index_information()
+        except BaseException as e:
+            return Err(str(e))
+
+        for index_name in current_indexes:
+            if (
+                index_name.endswith(SEARCH_INDEX_SUFFIX)
+                and index_name not in index_attrs
+            ):
+                try:
+                    collection.drop_index(index_or_name=index_name)
+                except Exception:
+                    return Err(f"Failed to drop the search index {index_name}")
+
+        for index_name, attr in index_attrs.items():
+            if index_name in current_indexes:
+                continue
+            try:
+                # fields holding a list are stored as arrays, Mongo makes their
+                # index multikey so `$in` queries match single elements
+                collection.create_index([(attr, ASCENDING)], name=index_name)
+            except Exception:
+                return Err(f"Failed to create the search index {index_name}")
+
+        return Ok()
+
     @property
     def collection(self) -> Result[MongoCollection, Err]:
         if not hasattr(self, "_collection"):
@@ -180,6 +450,34 @@ class MongoStorePartition(StorePartition):
 
         return Ok(self._collection)
 
+    def _create_change_feed(self) -> MongoChangeFeed:
+        collection_status = self.collection
+        if collection_status.is_err():
+            raise Exception(collection_status.err())
+
+        return MongoChangeFeed(
+            name=self.settings.name,
+            collection=collection_status.ok(),
+            decode=self._from_storage,
+            capacity=self.store_config.change_feed_capacity,
+        )
+
+    def _from_storage(self, storage_obj: Dict) -> SyftObject:
+        obj = self.storage_type(storage_obj)
+        transform_context = TransformContext(output={}, obj=obj)
+        return obj.to(self.settings.object_type, transform_context)
+
+    def _uses_index(self, mongo_filter: Dict) -> bool:
+        # the unique index is compound, only queries on its first key can use it,
+        # the searchable keys have one index each
+        unique_attrs = getattr(self.settings.object_type, "__attr_unique__", [])
+        return (
+            "_id" in mongo_filter
+            or (len(unique_attrs) > 0 and unique_attrs[0] in mongo_filter)
+            or any(attr in mongo_filter for attr in self._search_index_attrs().values())
+        )
+
+    @measured("set")
     def set(
         self,
         obj: SyftObject,
@@ -192,51 +490,262 @@ class MongoStorePartition(StorePartition):
             return collection_status
         collection = collection_status.ok()
 
-        if ignore_duplicates:
+        # the emulated change feed has to know whether the insert happened
+        if ignore_duplicates and self.change_feed.native:
             collection = collection.with_options(write_concern=WriteConcern(w=0))
         try:
             collection.insert_one(storage_obj)
         except DuplicateKeyError as e:
+            if ignore_duplicates:
+                return Ok(obj)
             return Err(f"Duplicate Key Error for {obj}: {e}")
 
+        self.change_feed.record(ChangeType.INSERT, obj.id, obj)
         return Ok(obj)
 
+    @measured("update")
     def update(self, qk: QueryKey, obj: SyftObject) -> Result[SyftObject, str]:
+        # like the key-value stores, the fields set on `obj` are merged into the
+        # stored object, in a single round trip
+        fields = {
+            key: value
+            for key, value in obj.to_dict(exclude_none=True).items()
+            if key != "id"
+        }
+        return self._update_fields(qk=qk, fields=fields)
+
+    @measured("update_fields")
+    def update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        fields_status = self.validate_fields(fields)
+        if fields_status.is_err():
+            return fields_status
+        return self._update_fields(qk=qk, fields=fields_status.ok())
+
+    def _update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
         collection_status = self.collection
         if collection_status.is_err():
             return collection_status
         collection = collection_status.ok()
 
-        # TODO: optimize the update. The ID should not be overwritten,
-        # but the qk doesn't necessarily have to include the `id` field either.
+        update, index_pks = self._fields_update(fields)
+        try:
+            storage_obj = collection.find_one_and_update(
+                filter=qk.as_dict_mongo,
+                update={"$set": update},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as e:
+            return Err(f"Duplicate Key Error updating {qk}: {e}")
+        except Exception as e:
+            return Err(f"Failed to update fields of {qk}. Error: {e}")
 
-        prev_obj_status = self.get_all_from_store(QueryKeys(qks=[qk]))
-        if prev_obj_status.is_err():
-            return Err(f"No object found with query key: {qk}")
+        if storage_obj is None:
+            return Err(f"No object exists for query key: {qk}")
+        obj = self._from_storage(storage_obj)
 
-        prev_obj = prev_obj_status.ok()
-        if len(prev_obj) == 0:
-            return Err(f"Missing values for query key: {qk}")
+        computed = self._computed_keys(obj, storage_obj, index_pks, fields)
+        if len(computed) > 0:
+            try:
+                collection.update_one(
+                    filter={"_id": storage_obj["_id"]}, update={"$set": computed}
+                )
+            except Exception as e:
+                return Err(f"Failed to update the keys of {qk}. Error: {e}")
 
-        # we don't want to overwrite Mongo's "id_" or Syft's "id" on update
-        obj_id = obj["id"]
+        self.change_feed.record(ChangeType.UPDATE, obj.id, obj)
+        return Ok(obj)
 
-        # Set ID to the updated object value
-        setattr(obj, "id", prev_obj[0]["id"])
+    def _fields_update(
+        self, fields: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], List[PartitionKey]]:
+        # only the changed fields are sent, next to their copies used by the indexes
+        update = {f"__obj__.{key}": value for key, value in fields.items()}
+        index_pks = self.affected_partition_keys(
+            list(self.unique_cks) + list(self.searchable_cks), fields
+        )
+        for pk in index_pks:
+            if pk.key in fields:
+                update[pk.key] = fields[pk.key]
+        return update, index_pks
 
-        # Create the Mongo object
-        storage_obj = obj.to(self.storage_type)
+    @staticmethod
+    def _computed_keys(
+        obj: SyftObject,
+        storage_obj: Dict,
+        index_pks: List[PartitionKey],
+        fields: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        # keys computed by a method are refreshed from the updated object
+        computed = {}
+        for pk in index_pks:
+            if pk.key not in fields:
+                value = getattr(obj, pk.key)()
+                if storage_obj.get(pk.key) != value:
+                    computed[pk.key] = value
+        return computed
+
+    def store_keys(self) -> Result[List[Any], str]:
+        collection_status = self.collection
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        try:
+            return Ok([doc["_id"] for doc in collection.find({}, projection=["_id"])])
+        except Exception as e:
+            return Err(f"Failed to list the keys of {self.settings.name}. {e}")
 
-        # revert the ID
-        setattr(obj, "id", obj_id)
+    @measured("migrate")
+    def migrate(
+        self, keys: List[Any], fn: Callable[[SyftObject], SyftObject]
+    ) -> Result[List[SyftObject], str]:
+        collection_status = self.collection
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
 
+        migrated = []
         try:
-            collection.update_one(filter=qk.as_dict_mongo, update={"$set": storage_obj})
+            for storage_obj in collection.find(filter={"_id": {"$in": keys}}):
+                obj = self._from_storage(storage_obj)
+                migrated_obj = fn(obj)
+                if migrated_obj is obj:
+                    continue
+
+                # compare-and-swap, documents written since they were read are
+                # left to the next run
+                result = collection.replace_one(
+                    filter={
+                        "_id": storage_obj["_id"],
+                        "__obj__": storage_obj["__obj__"],
+                    },
+                    replacement=migrated_obj.to(self.storage_type),
+                )
+                if result.matched_count == 1:
+                    self.change_feed.record(
+                        ChangeType.UPDATE, storage_obj["_id"], migrated_obj
+                    )
+                    migrated.append(migrated_obj)
+        except DuplicateKeyError as e:
+            return Err(f"Duplicate Key Error migrating {self.settings.name}: {e}")
         except Exception as e:
-            return Err(f"Failed to update obj: {obj} with qk: {qk}. Error: {e}")
+            return Err(f"Failed to migrate {self.settings.name}. Error: {e}")
+        return Ok(migrated)
 
-        return Ok(obj)
+    @measured("set_many")
+    def set_many(
+        self, objs: List[SyftObject], ignore_duplicates: bool = False
+    ) -> Result[List[SyftObject], str]:
+        collection_status = self.collection
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        if len(objs) == 0:
+            return Ok(objs)
+        requests = [InsertOne(obj.to(self.storage_type)) for obj in objs]
+        failed = set()
+        try:
+            collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            duplicates = [
+                error for error in write_errors if error["code"] == DUPLICATE_KEY_CODE
+            ]
+            if len(duplicates) < len(write_errors) or not ignore_duplicates:
+                return Err(f"Failed to write objects: {write_errors}")
+            failed = {error["index"] for error in write_errors}
+        except Exception as e:
+            return Err(f"Failed to write objects. Error: {e}")
+
+        for idx, obj in enumerate(objs):
+            if idx not in failed:
+                self.change_feed.record(ChangeType.INSERT, obj.id, obj)
+        return Ok(objs)
+
+    @measured("upsert")
+    def upsert_many(self, objs: List[SyftObject]) -> Result[List[SyftObject], str]:
+        collection_status = self.collection
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        if len(objs) == 0:
+            return Ok(objs)
+        # replaced by `_id` without reading the stored documents first
+        requests = []
+        for obj in objs:
+            storage_obj = obj.to(self.storage_type)
+            requests.append(
+                ReplaceOne(
+                    filter={"_id": storage_obj["_id"]},
+                    replacement=storage_obj,
+                    upsert=True,
+                )
+            )
+        try:
+            result = collection.bulk_write(requests, ordered=False)
+        except BulkWriteError as e:
+            return Err(f"Failed to upsert objects: {e.details.get('writeErrors')}")
+        except Exception as e:
+            return Err(f"Failed to upsert objects. Error: {e}")
+
+        for idx, obj in enumerate(objs):
+            change_type = (
+                ChangeType.INSERT if idx in result.upserted_ids else ChangeType.UPDATE
+            )
+            self.change_feed.record(change_type, obj.id, obj)
+        return Ok(objs)
+
+    @measured("project")
+    def project(
+        self, index_qks: QueryKeys, search_qks: QueryKeys, fields: List[str]
+    ) -> Result[List[Dict[str, Any]], str]:
+        collection_status = self.collection
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        # the indexed fields are stored next to the object, the others are read
+        # from inside it, either way only the projected values are sent back
+        indexed = set(self.settings.object_type.__attr_unique__) | set(
+            self.settings.object_type.__attr_searchable__
+        )
+        paths = {
+            field: field if field in indexed else f"__obj__.{field}" for field in fields
+        }
+        mongo_filter = QueryKeys(qks=(index_qks.all + search_qks.all)).as_dict_mongo
+        projection = {path: 1 for path in paths.values()}
+        projection["_id"] = 0
+
+        try:
+            documents = list(
+                collection.find(filter=mongo_filter, projection=projection)
+            )
+        except Exception as e:
+            return Err(f"Failed to query with {mongo_filter}. Error: {e}")
 
+        if self._uses_index(mongo_filter):
+            record_index_hit(len(documents))
+        else:
+            record_scan(len(documents))
+
+        rows = []
+        for document in documents:
+            row = {}
+            for field, path in paths.items():
+                value = document
+                for part in path.split("."):
+                    value = value.get(part) if isinstance(value, dict) else None
+                row[field] = value
+            rows.append(row)
+        return Ok(rows)
+
+    @measured("query")
     def find_index_or_search_keys(
         self, index_qks: QueryKeys, search_qks: QueryKeys
     ) -> Result[List[SyftObject], str]:
@@ -244,20 +753,34 @@ class MongoStorePartition(StorePartition):
         qks = QueryKeys(qks=(index_qks.all + search_qks.all))
         return self.get_all_from_store(qks=qks)
 
+    @measured("get")
     def get_all_from_store(self, qks: QueryKeys) -> Result[List[SyftObject], str]:
         collection_status = self.collection
         if collection_status.is_err():
             return collection_status
         collection = collection_status.ok()
 
-        storage_objs = collection.find(filter=qks.as_dict_mongo)
+        # fetch the raw BSON to know how many bytes are decoded
+        raw_collection = collection.with_options(
+            codec_options=collection.codec_options.with_options(
+                document_class=RawBSONDocument
+            )
+        )
+        mongo_filter = qks.as_dict_mongo
         syft_objs = []
-        for storage_obj in storage_objs:
-            obj = self.storage_type(storage_obj)
-            transform_context = TransformContext(output={}, obj=obj)
-            syft_objs.append(obj.to(self.settings.object_type, transform_context))
+        for raw_obj in raw_collection.find(filter=mongo_filter):
+            record_deserialized(len(raw_obj.raw))
+            storage_obj = decode(raw_obj.raw, codec_options=collection.codec_options)
+            syft_objs.append(self._from_storage(storage_obj))
+
+        if self._uses_index(mongo_filter):
+            record_index_hit(len(syft_objs))
+        else:
+            # without explain() only the returned documents are known
+            record_scan(len(syft_objs))
         return Ok(syft_objs)
 
+    @measured("delete")
     def delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
         collection_status = self.collection
         if collection_status.is_err():
@@ -268,10 +791,12 @@ class MongoStorePartition(StorePartition):
         result = collection.delete_one(filter=qks.as_dict_mongo)
 
         if result.deleted_count == 1:
+            self.change_feed.record(ChangeType.DELETE, qk.value)
             return Ok(SyftSuccess(message="Deleted"))
 
         return Err(f"Failed to delete object with qk: {qk}")
 
+    @measured("all")
     def all(self):
         qks = QueryKeys(qks=())
         return self.get_all_from_store(qks=qks)
@@ -283,6 +808,180 @@ class MongoStorePartition(StorePartition):
         collection = collection_status.ok()
         return collection.count_documents(filter={})
 
+    # Awaitable API on motor, the request path awaits these without holding a
+    # thread for the round trip. The sync methods above keep using pymongo.
+
+    async def _async_collection(self) -> Result[AsyncIOMotorCollection, Err]:
+        if not hasattr(self, "_collection"):
+            # the indexes are created once, with the sync client
+            collection_status = await self._run_blocking(lambda: self.collection)
+            if collection_status.is_err():
+                return collection_status
+
+        # a motor collection is bound to the event loop of its client
+        loop_id = id(asyncio.get_running_loop())
+        collections = self.__dict__.setdefault("_async_collections", {})
+        if loop_id not in collections:
+            client = AsyncMongoClient(config=self.store_config.client_config)
+            collection_status = client.with_collection(
+                collection_settings=self.settings, store_config=self.store_config
+            )
+            if collection_status.is_err():
+                return collection_status
+            collections[loop_id] = collection_status.ok()
+        return Ok(collections[loop_id])
+
+    async def _async_record(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject] = None
+    ) -> None:
+        change_feed = getattr(self, "_change_feed", None)
+        if change_feed is not None and change_feed.native:
+            # nothing to write, the change stream already has it
+            change_feed.record(change_type, uid, obj)
+            return
+
+        # creating the feed and writing the emulated changelog are blocking
+        def record() -> None:
+            self.change_feed.record(change_type, uid, obj)
+
+        await self._run_blocking(record)
+
+    @measured("set")
+    async def async_set(
+        self,
+        obj: SyftObject,
+        ignore_duplicates: bool = False,
+    ) -> Result[SyftObject, str]:
+        storage_obj = obj.to(self.storage_type)
+
+        collection_status = await self._async_collection()
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        try:
+            await collection.insert_one(storage_obj)
+        except DuplicateKeyError as e:
+            if ignore_duplicates:
+                return Ok(obj)
+            return Err(f"Duplicate Key Error for {obj}: {e}")
+
+        await self._async_record(ChangeType.INSERT, obj.id, obj)
+        return Ok(obj)
+
+    @measured("update")
+    async def async_update(
+        self, qk: QueryKey, obj: SyftObject
+    ) -> Result[SyftObject, str]:
+        fields = {
+            key: value
+            for key, value in obj.to_dict(exclude_none=True).items()
+            if key != "id"
+        }
+        return await self._async_update_fields(qk=qk, fields=fields)
+
+    @measured("update_fields")
+    async def async_update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        fields_status = self.validate_fields(fields)
+        if fields_status.is_err():
+            return fields_status
+        return await self._async_update_fields(qk=qk, fields=fields_status.ok())
+
+    async def _async_update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        collection_status = await self._async_collection()
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        update, index_pks = self._fields_update(fields)
+        try:
+            storage_obj = await collection.find_one_and_update(
+                filter=qk.as_dict_mongo,
+                update={"$set": update},
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError as e:
+            return Err(f"Duplicate Key Error updating {qk}: {e}")
+        except Exception as e:
+            return Err(f"Failed to update fields of {qk}. Error: {e}")
+
+        if storage_obj is None:
+            return Err(f"No object exists for query key: {qk}")
+        obj = self._from_storage(storage_obj)
+
+        computed = self._computed_keys(obj, storage_obj, index_pks, fields)
+        if len(computed) > 0:
+            try:
+                await collection.update_one(
+                    filter={"_id": storage_obj["_id"]}, update={"$set": computed}
+                )
+            except Exception as e:
+                return Err(f"Failed to update the keys of {qk}. Error: {e}")
+
+        await self._async_record(ChangeType.UPDATE, obj.id, obj)
+        return Ok(obj)
+
+    @measured("query")
+    async def async_find_index_or_search_keys(
+        self, index_qks: QueryKeys, search_qks: QueryKeys
+    ) -> Result[List[SyftObject], str]:
+        qks = QueryKeys(qks=(index_qks.all + search_qks.all))
+        return await self.async_get_all_from_store(qks=qks)
+
+    @measured("get")
+    async def async_get_all_from_store(
+        self, qks: QueryKeys
+    ) -> Result[List[SyftObject], str]:
+        collection_status = await self._async_collection()
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        raw_collection = collection.with_options(
+            codec_options=collection.codec_options.with_options(
+                document_class=RawBSONDocument
+            )
+        )
+        mongo_filter = qks.as_dict_mongo
+        syft_objs = []
+        try:
+            async for raw_obj in raw_collection.find(filter=mongo_filter):
+                record_deserialized(len(raw_obj.raw))
+                storage_obj = decode(
+                    raw_obj.raw, codec_options=collection.codec_options
+                )
+                syft_objs.append(self._from_storage(storage_obj))
+        except Exception as e:
+            return Err(f"Failed to query with {mongo_filter}. Error: {e}")
+
+        if self._uses_index(mongo_filter):
+            record_index_hit(len(syft_objs))
+        else:
+            record_scan(len(syft_objs))
+        return Ok(syft_objs)
+
+    @measured("all")
+    async def async_all(self) -> Result[List[SyftObject], str]:
+        return await self.async_get_all_from_store(qks=QueryKeys(qks=()))
+
+    @measured("delete")
+    async def async_delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
+        collection_status = await self._async_collection()
+        if collection_status.is_err():
+            return collection_status
+        collection = collection_status.ok()
+
+        result = await collection.delete_one(filter=QueryKeys(qks=qk).as_dict_mongo)
+        if result.deleted_count == 1:
+            await self._async_record(ChangeType.DELETE, qk.value)
+            return Ok(SyftSuccess(message="Deleted"))
+
+        return Err(f"Failed to delete object with qk: {qk}")
+
 
 @serializable()
 class MongoDocumentStore(DocumentStore):
@@ -95,6 +95,7 @@ class PythonNodeRoute(SyftObject, NodeRoute):
             signing_key=self.worker_settings.signing_key,
             document_store_config=self.worker_settings.document_store_config,
             action_store_config=self.worker_settings.action_store_config,
+            action_config=self.worker_settings.action_config,
             processes=1,
         )
         return node
@@ -0,0 +1,613 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from contextlib import ExitStack
+from datetime import datetime
+import hashlib
+import io
+import json
+from pathlib import Path
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+import time
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+# third party
+from bson import CodecOptions
+from bson import decode_all
+from bson.raw_bson import RawBSONDocument
+import lmdb
+from pymongo.errors import PyMongoError
+from result import Err
+from result import Ok
+from result import Result
+
+# relative
+from .deserialize import _deserialize
+from .dict_document_store import DictStoreConfig
+from .document_store import DocumentStore
+from .document_store import StoreConfig
+from .lmdb_document_store import LMDBEnvironmentCache
+from .lmdb_document_store import LMDBStoreConfig
+from .mongo_client import MongoClient
+from .mongo_document_store import MongoStoreConfig
+from .response import SyftSuccess
+from .serialize import _serialize
+from .sharded_sqlite_document_store import ShardedSQLiteStoreConfig
+from .sharded_sqlite_document_store import shard_store_config
+from .sqlite_document_store import SQLiteStoreConfig
+from .uid import UID
+
+BACKUP_FORMAT = "syft-node-backup"
+BACKUP_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class BackupWriter:
+    """Appends members to a tar stream as soon as they are produced"""
+
+    def __init__(self, fileobj: BinaryIO, compress: bool = False) -> None:
+        self.tar = tarfile.open(fileobj=fileobj, mode="w|gz" if compress else "w|")
+        self.names: Set[str] = set()
+
+    def add_bytes(self, name: str, data: bytes) -> None:
+        info = tarfile.TarInfo(name=name)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.tar.addfile(info, io.BytesIO(data))
+        self.names.add(name)
+
+    def add_file(self, name: str, path: Path) -> None:
+        # stores can share a file, it is only archived once
+        if name in self.names:
+            return
+        self.tar.add(str(path), arcname=name, recursive=False)
+        self.names.add(name)
+
+    def close(self) -> None:
+        self.tar.close()
+
+
+class StoreBackup:
+    """Backup and restore of the store of one node role (document or action store)
+
+    `entries` describes the archived members of the store in the manifest, it
+    is known before anything is dumped so the manifest can lead the archive.
+    A backup `freeze`s the writers of every store first, takes a `snapshot` of
+    each while they are all frozen and only `dump`s the snapshots into the
+    archive once the writers are let go again.
+    """
+
+    def __init__(self, role: str, store: Any, store_config: StoreConfig) -> None:
+        self.role = role
+        self.store = store
+        self.store_config = store_config
+
+    @property
+    def entries(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def freeze(self, stack: ExitStack, frozen: Dict[Any, Any]) -> None:
+        """Block the writers of the store until `stack` is closed. `frozen` is
+        shared by the stores of a backup, stores on the same backend block its
+        writers once."""
+        pass
+
+    def snapshot(self, workspace: Path) -> None:
+        """Copy the store, called while every store of the node is frozen"""
+        pass
+
+    def dump(self, writer: BackupWriter, workspace: Path) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release what the snapshot holds on to, once the backup is over"""
+        pass
+
+    def prepare(self, entries: Dict[str, Any]) -> None:
+        """Called with the archived entries before any member is loaded"""
+        self.archived_entries = entries
+
+    def owns(self, member_name: str) -> bool:
+        raise NotImplementedError
+
+    def load(self, member_name: str, path: Path, restored: Set[Path]) -> None:
+        raise NotImplementedError
+
+
+class FileStoreBackup(StoreBackup):
+    """Stores persisted in local database files, copied into the workspace
+    while the writers of every file are blocked, then archived"""
+
+    @property
+    def files(self) -> Dict[str, Path]:
+        raise NotImplementedError
+
+    def member_name(self, path: Path) -> str:
+        digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return f"files/{digest}_{path.name}"
+
+    @property
+    def entries(self) -> Dict[str, Any]:
+        return {label: self.member_name(path) for label, path in self.files.items()}
+
+    def copy_path(self, path: Path, workspace: Path) -> Path:
+        return workspace / self.member_name(path).replace("/", "_")
+
+    def freeze(self, stack: ExitStack, frozen: Dict[Any, Any]) -> None:
+        for path in self.files.values():
+            key = path.resolve()
+            if key not in frozen:
+                frozen[key] = self.block_writers(stack, path)
+
+    def snapshot(self, workspace: Path) -> None:
+        for path in self.files.values():
+            copy_path = self.copy_path(path, workspace)
+            # stores can share a file, it is only copied once
+            if not copy_path.exists():
+                self.copy(path, copy_path)
+
+    def dump(self, writer: BackupWriter, workspace: Path) -> None:
+        for path in self.files.values():
+            name = self.member_name(path)
+            if name in writer.names:
+                continue
+            copy_path = self.copy_path(path, workspace)
+            writer.add_file(name, copy_path)
+            copy_path.unlink()
+
+    def owns(self, member_name: str) -> bool:
+        return member_name in self.archived_entries.values()
+
+    def load(self, member_name: str, path: Path, restored: Set[Path]) -> None:
+        for label, name in self.archived_entries.items():
+            if name != member_name:
+                continue
+            if label not in self.files:
+                raise Exception(
+                    f"{self.role} has no file {label}, the node config doesn't match the backup"
+                )
+            target = self.files[label]
+            if target.resolve() in restored:
+                continue
+            self.restore(path, target)
+            restored.add(target.resolve())
+
+    def block_writers(self, stack: ExitStack, path: Path) -> Any:
+        raise NotImplementedError
+
+    def copy(self, source: Path, target: Path) -> None:
+        raise NotImplementedError
+
+    def restore(self, source: Path, target: Path) -> None:
+        raise NotImplementedError
+
+
+class SQLiteStoreBackup(FileStoreBackup):
+    """Copies the database files with the SQLite online backup API.
+
+    Every file is frozen with a `BEGIN IMMEDIATE` transaction of its own
+    connection, the reserved lock keeps out other writers, of this process or
+    another one, but not the readers, the copy being one of them. Writers wait
+    for the copy up to their connection timeout.
+    """
+
+    @property
+    def files(self) -> Dict[str, Path]:
+        if isinstance(self.store_config, ShardedSQLiteStoreConfig):
+            labels = [f"shard{idx}" for idx in range(self.store_config.shard_count)]
+            labels.append("index")
+            return {
+                label: Path(
+                    shard_store_config(self.store_config, label).client_config.file_path
+                )
+                for label in labels
+            }
+        return {"main": Path(self.store_config.client_config.file_path)}
+
+    def _connect(self, path: Path, **kwargs: Any) -> sqlite3.Connection:
+        return sqlite3.connect(
+            path, timeout=self.store_config.client_config.timeout, **kwargs
+        )
+
+    def block_writers(self, stack: ExitStack, path: Path) -> Any:
+        guard = self._connect(path, isolation_level=None)
+        stack.callback(guard.close)
+        guard.execute("BEGIN IMMEDIATE")
+        stack.callback(guard.execute, "ROLLBACK")
+        return guard
+
+    def copy(self, source: Path, target: Path) -> None:
+        # the guard's own connection can't be the source of a backup
+        source_db = self._connect(source)
+        target_db = sqlite3.connect(target)
+        try:
+            source_db.backup(target_db)
+        finally:
+            target_db.close()
+            source_db.close()
+
+    def restore(self, source: Path, target: Path) -> None:
+        # copying into the live file keeps the connections of the node valid
+        source_db = sqlite3.connect(source)
+        target_db = self._connect(target)
+        try:
+            source_db.backup(target_db)
+        finally:
+            target_db.close()
+            source_db.close()
+
+
+class LMDBStoreBackup(FileStoreBackup):
+    """Copies the environment with `mdb_env_copy`, while a write transaction
+    held open, and aborted, by the backup keeps out the other writers"""
+
+    @property
+    def files(self) -> Dict[str, Path]:
+        return {"main": Path(self.store_config.client_config.file_path)}
+
+    def block_writers(self, stack: ExitStack, path: Path) -> Any:
+        env = LMDBEnvironmentCache.from_config(self.store_config.client_config)
+        txn = env.begin(write=True)
+        stack.callback(txn.abort)
+        return txn
+
+    def copy(self, source: Path, target: Path) -> None:
+        env = LMDBEnvironmentCache.from_config(self.store_config.client_config)
+        env.copy(str(target), compact=True)
+
+    def restore(self, source: Path, target: Path) -> None:
+        client_config = self.store_config.client_config
+        env = LMDBEnvironmentCache.from_config(client_config)
+        source_env = lmdb.open(
+            str(source),
+            subdir=False,
+            readonly=True,
+            lock=False,
+            max_dbs=client_config.max_dbs,
+        )
+        try:
+            with source_env.begin() as source_txn:
+                names = [name for name, _ in source_txn.cursor()]
+
+            # one write transaction, readers of the node see all or nothing
+            with env.begin(write=True) as txn:
+                for name in names:
+                    source_db = source_env.open_db(name, create=False)
+                    db = env.open_db(name, txn=txn)
+                    txn.drop(db, delete=False)
+                    with source_env.begin(db=source_db, buffers=True) as source_txn:
+                        txn.cursor(db=db).putmulti(source_txn.cursor(), append=True)
+        finally:
+            source_env.close()
+
+
+class MongoStoreBackup(StoreBackup):
+    """Dumps every collection of the store database as raw BSON batches.
+
+    On replica sets the collections are read in one snapshot session, started
+    while the other stores are frozen, so the backup is consistent across
+    collections and with the other stores. Standalone servers only give a
+    consistent view per document.
+    """
+
+    batch_size = 1000
+    session: Optional[Any] = None
+
+    @property
+    def database(self) -> Any:
+        client = MongoClient(config=self.store_config.client_config).client
+        return client[self.store_config.db_name]
+
+    @property
+    def collections(self) -> List[str]:
+        return sorted(
+            name
+            for name in self.database.list_collection_names()
+            if not name.startswith("system.")
+        )
+
+    @property
+    def entries(self) -> Dict[str, Any]:
+        return {"collections": self.collections}
+
+    def _snapshot_session(self) -> Optional[Any]:
+        session = None
+        try:
+            session = self.database.client.start_session(snapshot=True)
+            # snapshot reads fail on the first read on a standalone server
+            self.database["__syft_backup"].find_one({}, session=session)
+        except PyMongoError:
+            if session is not None:
+                session.end_session()
+            return None
+        return session
+
+    def snapshot(self, workspace: Path) -> None:
+        # the first read of the session fixes the point in time it reads at
+        self.session = self._snapshot_session()
+
+    def dump(self, writer: BackupWriter, workspace: Path) -> None:
+        for collection_name in self.entries["collections"]:
+            collection = self.database[collection_name]
+            batches = collection.find_raw_batches(
+                {}, session=self.session, batch_size=self.batch_size
+            )
+            for idx, batch in enumerate(batches):
+                writer.add_bytes(
+                    f"{self.role}/mongo/{collection_name}/{idx:08d}.bson", batch
+                )
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.end_session()
+            self.session = None
+
+    def prepare(self, entries: Dict[str, Any]) -> None:
+        super().prepare(entries)
+        # empty the collections but keep their indexes
+        for collection_name in entries["collections"]:
+            self.database[collection_name].delete_many({})
+
+    def owns(self, member_name: str) -> bool:
+        return member_name.startswith(f"{self.role}/mongo/")
+
+    def load(self, member_name: str, path: Path, restored: Set[Path]) -> None:
+        collection_name = member_name.split("/")[2]
+        documents = decode_all(
+            path.read_bytes(), CodecOptions(document_class=RawBSONDocument)
+        )
+        if len(documents) > 0:
+            self.database[collection_name].insert_many(documents, ordered=False)
+
+
+class DictStoreBackup(StoreBackup):
+    """Serializes the backing stores of in-memory stores while their writers are
+    blocked, by the index lock of every document store partition or the write
+    lock of the action store. Partitions with a `NoLockingConfig` can't block
+    their writers, their backing stores are only consistent one by one and are
+    serialized again when a concurrent write changes them meanwhile."""
+
+    retries = 10
+
+    @property
+    def backing_stores(self) -> Dict[str, Any]:
+        if isinstance(self.store, DocumentStore):
+            return {
+                f"{name}.{index}": getattr(partition, index)
+                for name, partition in self.store.partitions.items()
+                for index in ["data", "unique_keys", "searchable_keys"]
+            }
+        return {
+            "data": self.store.data,
+            "mock": self.store.mock,
+            "metadata": self.store.metadata,
+            "blob_refs": self.store.blob_refs,
+            "payloads": self.store.payloads,
+            "payload_refs": self.store.payload_refs,
+            "leases": self.store.leases,
+            "permission_index": self.store.permissions.data,
+        }
+
+    @property
+    def entries(self) -> Dict[str, Any]:
+        return {"stores": sorted(self.backing_stores.keys())}
+
+    def freeze(self, stack: ExitStack, frozen: Dict[Any, Any]) -> None:
+        if isinstance(self.store, DocumentStore):
+            for name in sorted(self.store.partitions.keys()):
+                stack.enter_context(self.store.partitions[name].index_lock())
+        else:
+            stack.enter_context(self.store.lock_writes())
+
+    def snapshot(self, workspace: Path) -> None:
+        self.snapshots: Dict[str, bytes] = {}
+        for name, backing_store in self.backing_stores.items():
+            for attempt in range(self.retries):
+                try:
+                    self.snapshots[name] = _serialize(
+                        dict(backing_store), to_bytes=True
+                    )
+                    break
+                except RuntimeError:
+                    # dictionary changed size during iteration
+                    if attempt == self.retries - 1:
+                        raise
+
+    def dump(self, writer: BackupWriter, workspace: Path) -> None:
+        for name, data in self.snapshots.items():
+            writer.add_bytes(f"{self.role}/dict/{name}", data)
+
+    def close(self) -> None:
+        self.snapshots = {}
+
+    def owns(self, member_name: str) -> bool:
+        return member_name.startswith(f"{self.role}/dict/")
+
+    def load(self, member_name: str, path: Path, restored: Set[Path]) -> None:
+        name = member_name.split("/", 2)[2]
+        backing_stores = self.backing_stores
+        if name not in backing_stores:
+            raise Exception(f"{self.role} has no store {name} to restore into")
+        backing_store = backing_stores[name]
+        backing_store.clear()
+        backing_store.update(_deserialize(path.read_bytes(), from_bytes=True))
+
+
+def store_backup_for(
+    role: str, store: Any, store_config: StoreConfig
+) -> Result[StoreBackup, str]:
+    if isinstance(store_config, SQLiteStoreConfig):
+        return Ok(SQLiteStoreBackup(role, store, store_config))
+    elif isinstance(store_config, LMDBStoreConfig):
+        return Ok(LMDBStoreBackup(role, store, store_config))
+    elif isinstance(store_config, MongoStoreConfig) and isinstance(
+        store, DocumentStore
+    ):
+        return Ok(MongoStoreBackup(role, store, store_config))
+    elif isinstance(store_config, DictStoreConfig):
+        return Ok(DictStoreBackup(role, store, store_config))
+    return Err(f"Backups of {type(store_config).__name__} are not supported")
+
+
+class NodeBackup:
+    """Online backup and restore of the document and action stores of a node
+
+    The backup is a single tar stream: a versioned `manifest.json` followed by
+    the members of every store. The writers of all the stores are blocked at
+    once while each store is copied, with the backend's own mechanism (see the
+    `StoreBackup` classes), so the stores are consistent with each other. The
+    node keeps serving reads meanwhile, and writes once the copies are made.
+    A backup is restored into a node with the same kind of stores, replacing
+    their contents.
+
+    Parameters:
+        `node_id`: UID
+            Id of the node, recorded in the manifest
+        `document_store`: DocumentStore
+        `document_store_config`: StoreConfig
+        `action_store`: ActionStore
+        `action_store_config`: StoreConfig
+    """
+
+    def __init__(
+        self,
+        node_id: UID,
+        document_store: DocumentStore,
+        document_store_config: StoreConfig,
+        action_store: Any,
+        action_store_config: StoreConfig,
+    ) -> None:
+        self.node_id = node_id
+        self.stores = {
+            "document_store": (document_store, document_store_config),
+            "action_store": (action_store, action_store_config),
+        }
+
+    @classmethod
+    def from_node(cls, node: Any) -> NodeBackup:
+        return cls(
+            node_id=node.id,
+            document_store=node.document_store,
+            document_store_config=node.document_store_config,
+            action_store=node.action_store,
+            action_store_config=node.action_store_config,
+        )
+
+    def _store_backups(self) -> Result[Dict[str, StoreBackup], str]:
+        backups = {}
+        for role, (store, store_config) in self.stores.items():
+            backup = store_backup_for(role, store, store_config)
+            if backup.is_err():
+                return backup
+            backups[role] = backup.ok()
+        return Ok(backups)
+
+    def backup(
+        self, fileobj: BinaryIO, compress: bool = False
+    ) -> Result[SyftSuccess, str]:
+        backups = self._store_backups()
+        if backups.is_err():
+            return backups
+        backups = backups.ok()
+
+        try:
+            manifest = {
+                "format": BACKUP_FORMAT,
+                "version": BACKUP_FORMAT_VERSION,
+                "node_id": str(self.node_id),
+                "created_at": datetime.utcnow().isoformat(),
+                "stores": {
+                    role: {
+                        "type": type(backup.store_config).__name__,
+                        "entries": backup.entries,
+                    }
+                    for role, backup in backups.items()
+                },
+            }
+            writer = BackupWriter(fileobj, compress=compress)
+            writer.add_bytes(MANIFEST_NAME, json.dumps(manifest).encode("utf-8"))
+            with tempfile.TemporaryDirectory() as workspace:
+                # every store is frozen before the first copy is made
+                with ExitStack() as stack:
+                    frozen: Dict[Any, Any] = {}
+                    for backup in backups.values():
+                        backup.freeze(stack, frozen)
+                    for backup in backups.values():
+                        backup.snapshot(Path(workspace))
+                for backup in backups.values():
+                    backup.dump(writer, Path(workspace))
+            writer.close()
+        except Exception as e:
+            return Err(f"Failed to back up node {self.node_id}. {e}")
+        finally:
+            for backup in backups.values():
+                backup.close()
+
+        return Ok(SyftSuccess(message=f"Node {self.node_id} backed up"))
+
+    def _check_manifest(
+        self, manifest: Dict[str, Any], backups: Dict[str, StoreBackup]
+    ) -> Result[Ok, str]:
+        if manifest.get("format", None) != BACKUP_FORMAT:
+            return Err("Not a node backup")
+        if manifest["version"] > BACKUP_FORMAT_VERSION:
+            return Err(
+                f"Backup format version {manifest['version']} is newer than "
+                f"the supported version {BACKUP_FORMAT_VERSION}"
+            )
+        for role, backup in backups.items():
+            archived_type = manifest["stores"][role]["type"]
+            if archived_type != type(backup.store_config).__name__:
+                return Err(
+                    f"The {role} backup is a {archived_type}, "
+                    f"can't restore it into a {type(backup.store_config).__name__}"
+                )
+        return Ok()
+
+    def restore(self, fileobj: BinaryIO) -> Result[SyftSuccess, str]:
+        backups = self._store_backups()
+        if backups.is_err():
+            return backups
+        backups = backups.ok()
+
+        try:
+            restored: Set[Path] = set()
+            with tempfile.TemporaryDirectory() as workspace, tarfile.open(
+                fileobj=fileobj, mode="r|*"
+            ) as tar:
+                manifest = None
+                for member in tar:
+                    member_file = tar.extractfile(member)
+                    if member.name == MANIFEST_NAME:
+                        manifest = json.loads(member_file.read())
+                        check = self._check_manifest(manifest, backups)
+                        if check.is_err():
+                            return check
+                        for role, backup in backups.items():
+                            backup.prepare(manifest["stores"][role]["entries"])
+                        continue
+                    if manifest is None:
+                        return Err(f"{MANIFEST_NAME} has to be the first member")
+
+                    # members are spooled to disk, so archived databases larger
+                    # than memory can be restored
+                    path = Path(workspace) / "member"
+                    with open(path, "wb") as f:
+                        shutil.copyfileobj(member_file, f)
+                    for backup in backups.values():
+                        if backup.owns(member.name):
+                            backup.load(member.name, path, restored)
+                    path.unlink()
+        except Exception as e:
+            return Err(f"Failed to restore node {self.node_id}. {e}")
+
+        return Ok(SyftSuccess(message=f"Node {self.node_id} restored"))
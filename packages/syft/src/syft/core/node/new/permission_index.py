@@ -0,0 +1,146 @@
+# stdlib
+from collections import defaultdict
+from enum import Enum
+from typing import Any
+from typing import Collection
+from typing import Dict
+from typing import Iterable
+from typing import Set
+from typing import Tuple
+
+# relative
+from .credentials import SyftVerifyKey
+from .document_store import BasePartitionSettings
+from .document_store import StoreConfig
+from .serializable import serializable
+from .uid import UID
+
+UID_SIZE = 16
+VERIFY_KEY_SIZE = 32
+PERMISSION_KEY_SIZE = UID_SIZE + VERIFY_KEY_SIZE + 1
+
+
+def permission_key(uid: UID, credentials: SyftVerifyKey, permission: Enum) -> bytes:
+    """Binary index key of a permission: the 16 bytes of the uid, the 32 bytes
+    of the verify key and one byte for the permission. Keys of the same uid
+    share a prefix, so they are next to each other in ordered stores."""
+    return (
+        uid.value.bytes
+        + bytes(credentials.verify_key)
+        + permission.value.to_bytes(1, "big")
+    )
+
+
+def uid_key_range(uid: UID) -> Tuple[bytes, bytes]:
+    """Bounds of the keys of `uid`, lower inclusive and upper exclusive"""
+    prefix = uid.value.bytes
+    return prefix, prefix + b"\xff" * (PERMISSION_KEY_SIZE - UID_SIZE + 1)
+
+
+def uid_of_key(key: bytes) -> UID:
+    return UID(bytes(key[:UID_SIZE]))
+
+
+class PermissionIndex:
+    """Set of granted permissions of the action store objects
+
+    Each grant is a single entry, keyed by `permission_key`, so checking a
+    permission is a key lookup instead of reading every grant of the object.
+    Backends with ordered keys implement the per uid operations with range
+    scans over the shared prefix.
+
+    Parameters:
+        `settings`: BasePartitionSettings
+            Settings of the action store, the name prefixes the index
+        `store_config`: StoreConfig
+            Configuration of the action store backend
+    """
+
+    def __init__(
+        self, settings: BasePartitionSettings, store_config: StoreConfig
+    ) -> None:
+        self.settings = settings
+        self.store_config = store_config
+
+    @property
+    def index_name(self) -> str:
+        return f"{self.settings.name}_permission_index"
+
+    def add(self, keys: Iterable[bytes]) -> None:
+        raise NotImplementedError
+
+    def remove(self, keys: Iterable[bytes]) -> None:
+        raise NotImplementedError
+
+    def present(self, keys: Collection[bytes]) -> Set[bytes]:
+        """The subset of `keys` present in the index, looked up in one batch"""
+        raise NotImplementedError
+
+    def has_uid(self, uid: UID) -> bool:
+        """If any permission on `uid` was granted"""
+        raise NotImplementedError
+
+    def remove_uid(self, uid: UID) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __contains__(self, uid: Any) -> bool:
+        return isinstance(uid, UID) and self.has_uid(uid)
+
+
+@serializable(attrs=["settings", "store_config", "data"])
+class KeyValuePermissionIndex(PermissionIndex):
+    """PermissionIndex on top of a KeyValueBackingStore of the store config
+
+    The grants of a uid are kept as a set of their key suffixes, the verify key
+    and permission bytes, under the uid. Used by the backends without ordered
+    binary keys, for in-memory dict stores the sets are checked in place.
+    """
+
+    def __init__(
+        self, settings: BasePartitionSettings, store_config: StoreConfig
+    ) -> None:
+        super().__init__(settings=settings, store_config=store_config)
+        self.data = store_config.backing_store(
+            "permission_index", settings, store_config, ddtype=set
+        )
+
+    @staticmethod
+    def _by_uid(keys: Iterable[bytes]) -> Dict[UID, Set[bytes]]:
+        grouped: Dict[UID, Set[bytes]] = defaultdict(set)
+        for key in keys:
+            grouped[uid_of_key(key)].add(bytes(key[UID_SIZE:]))
+        return grouped
+
+    def add(self, keys: Iterable[bytes]) -> None:
+        for uid, suffixes in self._by_uid(keys).items():
+            if uid in self.data:
+                self.data.update_value(uid, lambda granted: set(granted) | suffixes)
+            else:
+                self.data[uid] = suffixes
+
+    def remove(self, keys: Iterable[bytes]) -> None:
+        for uid, suffixes in self._by_uid(keys).items():
+            if uid in self.data:
+                self.data.update_value(uid, lambda granted: set(granted) - suffixes)
+
+    def present(self, keys: Collection[bytes]) -> Set[bytes]:
+        found = set()
+        for uid, suffixes in self._by_uid(keys).items():
+            if uid not in self.data:
+                continue
+            prefix = uid.value.bytes
+            found.update(prefix + suffix for suffix in suffixes & self.data[uid])
+        return found
+
+    def has_uid(self, uid: UID) -> bool:
+        return uid in self.data
+
+    def remove_uid(self, uid: UID) -> None:
+        if uid in self.data:
+            del self.data[uid]
+
+    def clear(self) -> None:
+        self.data.clear()
@@ -1,4 +1,5 @@
 # stdlib
+import time
 from typing import Any
 from typing import Optional
 from typing import Union
@@ -23,6 +24,8 @@ from .syft_object import SYFT_OBJECT_VERSION_1
 from .syft_object import SyftObject
 from .uid import UID
 
+MAX_WAIT_TIMEOUT = 30.0
+
 
 @serializable()
 class QueueItem(SyftObject):
@@ -34,13 +37,18 @@ class QueueItem(SyftObject):
     result: Optional[Any]
     resolved: bool = False
 
-    def fetch(self) -> None:
+    def fetch(self, timeout: Optional[float] = None) -> None:
+        """Fetch the result, if `timeout` is set the node holds the call for up
+        to `timeout` seconds, or its own maximum, until the result is stored"""
         api = APIRegistry.api_for(node_uid=self.node_uid)
+        kwargs = {"uid": self.id}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
         call = SyftAPICall(
             node_uid=self.node_uid,
             path="queue",
             args=[],
-            kwargs={"uid": self.id},
+            kwargs=kwargs,
             blocking=True,
         )
         result = api.make_call(call)
@@ -65,6 +73,8 @@ class QueueStash(BaseStash):
     settings: PartitionSettings = PartitionSettings(
         name=QueueItem.__canonical_name__, object_type=QueueItem
     )
+    # longest a `wait_for` can hold the thread serving it, whatever was asked for
+    max_wait_timeout: float = MAX_WAIT_TIMEOUT
 
     def __init__(self, store: DocumentStore) -> None:
         super().__init__(store=store)
@@ -87,6 +97,28 @@ class QueueStash(BaseStash):
         item = self.query_one(qks=qks)
         return item
 
+    def wait_for(self, uid: UID, timeout: float) -> Result[Optional[QueueItem], str]:
+        """Get the item, waiting up to `timeout` seconds, at most
+        `max_wait_timeout`, for it to be stored"""
+        timeout = min(max(timeout, 0), self.max_wait_timeout)
+        # subscribe first so a write between the lookup and the wait isn't missed
+        subscription = self.subscribe()
+        try:
+            deadline = time.monotonic() + timeout
+            item = self.get_by_uid(uid)
+            while item.is_ok() and item.ok() is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                events = subscription.poll(timeout=remaining)
+                if events.is_err():
+                    return events
+                if any(event.uid == uid for event in events.ok()):
+                    item = self.get_by_uid(uid)
+            return item
+        finally:
+            subscription.close()
+
     def pop(self, uid: UID) -> Result[Optional[QueueItem], str]:
         item = self.get_by_uid(uid)
         self.delete_by_uid(uid)
@@ -0,0 +1,510 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from collections import defaultdict
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Type
+
+# third party
+import redis
+from typing_extensions import Self
+
+# relative
+from .deserialize import _deserialize
+from .document_store import DocumentStore
+from .document_store import PartitionSettings
+from .document_store import StoreClientConfig
+from .document_store import StoreConfig
+from .kv_document_store import KeyValueBackingStore
+from .kv_document_store import KeyValueStorePartition
+from .permission_index import KeyValuePermissionIndex
+from .permission_index import PermissionIndex
+from .serializable import serializable
+from .serialize import _serialize
+from .store_metrics import record_deserialized
+
+# default factories of index columns, stored next to the column so that missing
+# fields of a searchable key column behave like a defaultdict
+COLUMN_FACTORIES: Dict[bytes, Optional[Callable]] = {
+    b"": None,
+    b"list": list,
+    b"set": set,
+}
+
+
+def _to_bytes(value: Any) -> bytes:
+    return _serialize(value, to_bytes=True)
+
+
+def _from_bytes(blob: bytes) -> Any:
+    return _deserialize(blob, from_bytes=True)
+
+
+def _factory_marker(column: dict) -> bytes:
+    factory = getattr(column, "default_factory", None)
+    for marker, column_factory in COLUMN_FACTORIES.items():
+        if column_factory is factory:
+            return marker
+    raise ValueError(f"Unsupported index column default factory: {factory}")
+
+
+@serializable()
+class RedisStoreClientConfig(StoreClientConfig):
+    """Redis connection config
+
+    Parameters:
+        `host`: str
+            Redis hostname. Default: localhost
+        `port`: int
+            Redis port. Default: 6379
+        `db`: int
+            Redis logical database index. Default: 0
+        `username`: Optional[str]
+            Redis ACL username
+        `password`: Optional[str]
+            Redis password
+        `client`: Optional[redis.Redis]
+            If provided, this client is reused. Used for testing. Default = None
+    """
+
+    host: str = "localhost"
+    port: int = 6379
+    db: int = 0
+    username: Optional[str] = None
+    password: Optional[str] = None
+    # Testing and connection reuse
+    client: Any = None
+
+
+class RedisClientCache:
+    __client_cache__: Dict[int, redis.Redis] = {}
+    _lock: Lock = Lock()
+
+    @classmethod
+    def from_config(cls, config: RedisStoreClientConfig) -> redis.Redis:
+        if config.client is not None:
+            return config.client
+
+        cache_key = hash(str(config))
+        with cls._lock:
+            client = cls.__client_cache__.get(cache_key, None)
+            if client is None:
+                client = redis.StrictRedis(
+                    host=config.host,
+                    port=config.port,
+                    db=config.db,
+                    username=config.username,
+                    password=config.password,
+                )
+                cls.__client_cache__[cache_key] = client
+        return client
+
+
+class RedisHashColumn:
+    """Dict-like view over a Redis hash, used for index columns.
+
+    Single field reads and writes go straight to the hash, so updating one entry
+    of a unique or searchable key column doesn't rewrite the whole column.
+    Values handed out by `__getitem__` are copies, in-place edits such as
+    `column[value].append(uid)` go through `RedisBackingStore.append_to_column`.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        name: bytes,
+        default_factory: Optional[Callable] = None,
+    ) -> None:
+        self._client = client
+        self._name = name
+        self.default_factory = default_factory
+
+    def __getitem__(self, key: Any) -> Any:
+        data = self._client.hget(self._name, _to_bytes(key))
+        if data is None:
+            if self.default_factory is None:
+                raise KeyError(key)
+            return self.default_factory()
+        return _from_bytes(data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        data = self._client.hget(self._name, _to_bytes(key))
+        if data is None:
+            return default
+        return _from_bytes(data)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._client.hset(self._name, _to_bytes(key), _to_bytes(value))
+
+    def __delitem__(self, key: Any) -> None:
+        if not self._client.hdel(self._name, _to_bytes(key)):
+            raise KeyError(key)
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        field = _to_bytes(key)
+        pipe = self._client.pipeline()
+        pipe.hget(self._name, field)
+        pipe.hdel(self._name, field)
+        data, _ = pipe.execute()
+        if data is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        return _from_bytes(data)
+
+    def __contains__(self, key: Any) -> bool:
+        return bool(self._client.hexists(self._name, _to_bytes(key)))
+
+    def __len__(self) -> int:
+        return self._client.hlen(self._name)
+
+    def __iter__(self) -> Any:
+        return iter(self.keys())
+
+    def keys(self) -> Any:
+        return [_from_bytes(field) for field in self._client.hkeys(self._name)]
+
+    def values(self) -> Any:
+        return self.to_dict().values()
+
+    def items(self) -> Any:
+        return self.to_dict().items()
+
+    def to_dict(self) -> dict:
+        return {
+            _from_bytes(field): _from_bytes(data)
+            for field, data in self._client.hgetall(self._name).items()
+        }
+
+    def materialize(self) -> dict:
+        """Copy of the column as a plain (default)dict"""
+        if self.default_factory is None:
+            return self.to_dict()
+        column = defaultdict(self.default_factory)
+        column.update(self.to_dict())
+        return column
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+
+@serializable(attrs=["index_name", "settings", "store_config"])
+class RedisBackingStore(KeyValueBackingStore):
+    """Core Store logic for the Redis stores.
+
+    Every backing store is a Redis hash keyed by the serialized key. Values which
+    are dicts (the unique and searchable key columns of a partition) are stored in
+    a hash of their own and returned as a `RedisHashColumn`, so index lookups and
+    updates only touch single fields. Entries of a column are set and deleted with
+    a single HSET/HDEL and appended to in an optimistic transaction, so concurrent
+    writers don't need to read the column first. Multi-key updates are sent in one
+    pipeline.
+
+    Parameters:
+        `index_name`: str
+            Index name
+        `settings`: PartitionSettings
+            Syft specific settings
+        `store_config`: RedisStoreConfig
+            Connection Configuration
+        `ddtype`: Type
+            Class used as fallback on `get` errors
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        settings: PartitionSettings,
+        store_config: StoreConfig,
+        ddtype: Optional[type] = None,
+    ) -> None:
+        self.index_name = index_name
+        self.settings = settings
+        self.store_config = store_config
+        self._ddtype = ddtype
+
+    @property
+    def client(self) -> redis.Redis:
+        return RedisClientCache.from_config(self.store_config.client_config)
+
+    @property
+    def hash_name(self) -> bytes:
+        namespace = self.store_config.namespace
+        return f"{namespace}:{self.settings.name}:{self.index_name}".encode("utf-8")
+
+    @property
+    def columns_name(self) -> bytes:
+        return self.hash_name + b":columns"
+
+    def _column_name(self, field: bytes) -> bytes:
+        return self.hash_name + b":column:" + field
+
+    def _column(self, field: bytes, marker: bytes) -> RedisHashColumn:
+        return RedisHashColumn(
+            client=self.client,
+            name=self._column_name(field),
+            default_factory=COLUMN_FACTORIES[marker],
+        )
+
+    def _set(self, key: Any, value: Any) -> None:
+        field = _to_bytes(key)
+        if isinstance(value, RedisHashColumn):
+            if value._name == self._column_name(field):
+                # the column already lives in its own hash, edits are written through
+                return
+            value = value.materialize()
+
+        pipe = self.client.pipeline()
+        pipe.delete(self._column_name(field))
+        if isinstance(value, dict):
+            pipe.hdel(self.hash_name, field)
+            pipe.hset(self.columns_name, field, _factory_marker(value))
+            if len(value) > 0:
+                mapping = {_to_bytes(k): _to_bytes(v) for k, v in value.items()}
+                pipe.hset(self._column_name(field), mapping=mapping)
+        else:
+            pipe.hdel(self.columns_name, field)
+            pipe.hset(self.hash_name, field, _to_bytes(value))
+        pipe.execute()
+
+    def _get(self, key: Any) -> Any:
+        field = _to_bytes(key)
+        pipe = self.client.pipeline()
+        pipe.hget(self.columns_name, field)
+        pipe.hget(self.hash_name, field)
+        marker, data = pipe.execute()
+        if marker is not None:
+            return self._column(field, marker)
+        if data is None:
+            raise KeyError(f"{key} not in {type(self)}")
+        record_deserialized(len(data))
+        return _from_bytes(data)
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        keys = list(keys)
+        if len(keys) == 0:
+            return {}
+        fields = [_to_bytes(key) for key in keys]
+        pipe = self.client.pipeline()
+        pipe.hmget(self.columns_name, fields)
+        pipe.hmget(self.hash_name, fields)
+        markers, blobs = pipe.execute()
+        values = {}
+        for key, field, marker, data in zip(keys, fields, markers, blobs):
+            if marker is not None:
+                values[key] = self._column(field, marker)
+            elif data is not None:
+                record_deserialized(len(data))
+                values[key] = _from_bytes(data)
+        return values
+
+    def update_value(self, key: Any, fn: Callable[[Any], Any]) -> Any:
+        # optimistic transaction, retried if the hash changes before the write
+        field = _to_bytes(key)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.hash_name)
+                    data = pipe.hget(self.hash_name, field)
+                    if data is None:
+                        raise KeyError(f"{key} not in {type(self)}")
+                    record_deserialized(len(data))
+                    value = fn(_from_bytes(data))
+                    pipe.multi()
+                    pipe.hset(self.hash_name, field, _to_bytes(value))
+                    pipe.execute()
+                    return value
+                except redis.WatchError:
+                    continue
+
+    def set_in_column(self, key: Any, column_key: Any, value: Any) -> None:
+        self._column_of(key)[column_key] = value
+
+    def append_to_column(self, key: Any, column_key: Any, value: Any) -> None:
+        column = self._column_of(key)
+        name, entry = column._name, _to_bytes(column_key)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(name)
+                    data = pipe.hget(name, entry)
+                    if data is None:
+                        values = column.default_factory()
+                    else:
+                        values = _from_bytes(data)
+                    values.append(value)
+                    pipe.multi()
+                    pipe.hset(name, entry, _to_bytes(values))
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+    def delete_from_column(self, key: Any, column_key: Any) -> None:
+        self.client.hdel(self._column_name(_to_bytes(key)), _to_bytes(column_key))
+
+    def _column_of(self, key: Any) -> RedisHashColumn:
+        column = self._get(key)
+        if not isinstance(column, RedisHashColumn):
+            raise KeyError(f"{key} is not an index column of {type(self)}")
+        return column
+
+    def _exists(self, key: Any) -> bool:
+        field = _to_bytes(key)
+        pipe = self.client.pipeline()
+        pipe.hexists(self.columns_name, field)
+        pipe.hexists(self.hash_name, field)
+        return any(pipe.execute())
+
+    def _get_all(self) -> Any:
+        pipe = self.client.pipeline()
+        pipe.hgetall(self.hash_name)
+        pipe.hgetall(self.columns_name)
+        values, columns = pipe.execute()
+
+        data = {}
+        for field, value in values.items():
+            record_deserialized(len(value))
+            data[_from_bytes(field)] = _from_bytes(value)
+        for field, marker in columns.items():
+            data[_from_bytes(field)] = self._column(field, marker)
+        return data
+
+    def _get_all_keys(self) -> Any:
+        pipe = self.client.pipeline()
+        pipe.hkeys(self.hash_name)
+        pipe.hkeys(self.columns_name)
+        fields, column_fields = pipe.execute()
+        return [_from_bytes(field) for field in fields + column_fields]
+
+    def _delete(self, key: Any) -> None:
+        field = _to_bytes(key)
+        pipe = self.client.pipeline()
+        pipe.hdel(self.hash_name, field)
+        pipe.hdel(self.columns_name, field)
+        pipe.delete(self._column_name(field))
+        pipe.execute()
+
+    def _delete_all(self) -> None:
+        column_fields = self.client.hkeys(self.columns_name)
+        pipe = self.client.pipeline()
+        for field in column_fields:
+            pipe.delete(self._column_name(field))
+        pipe.delete(self.hash_name)
+        pipe.delete(self.columns_name)
+        pipe.execute()
+
+    def _len(self) -> int:
+        pipe = self.client.pipeline()
+        pipe.hlen(self.hash_name)
+        pipe.hlen(self.columns_name)
+        return sum(pipe.execute())
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._set(key, value)
+
+    def __getitem__(self, key: Any) -> Self:
+        try:
+            return self._get(key)
+        except KeyError as e:
+            if self._ddtype is not None:
+                return self._ddtype()
+            raise e
+
+    def __repr__(self) -> str:
+        return repr(self._get_all())
+
+    def __len__(self) -> int:
+        return self._len()
+
+    def __delitem__(self, key: str):
+        self._delete(key)
+
+    def clear(self) -> Self:
+        self._delete_all()
+
+    def copy(self) -> Self:
+        data = {}
+        for key, value in self._get_all().items():
+            if isinstance(value, RedisHashColumn):
+                value = value.materialize()
+            data[key] = value
+        return data
+
+    def keys(self) -> Any:
+        return self._get_all_keys()
+
+    def values(self) -> Any:
+        return self._get_all().values()
+
+    def items(self) -> Any:
+        return self._get_all().items()
+
+    def pop(self, key: Any) -> Self:
+        value = self._get(key)
+        if isinstance(value, RedisHashColumn):
+            value = value.materialize()
+        self._delete(key)
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return self._exists(key)
+
+    def __iter__(self) -> Any:
+        return iter(self.keys())
+
+
+@serializable()
+class RedisStorePartition(KeyValueStorePartition):
+    """Redis StorePartition
+
+    Parameters:
+        `settings`: PartitionSettings
+            PySyft specific settings, used for indexing and partitioning
+        `store_config`: RedisStoreConfig
+            Redis specific configuration
+    """
+
+    pass
+
+
+@serializable()
+class RedisDocumentStore(DocumentStore):
+    """Redis Document Store
+
+    Parameters:
+        `store_config`: RedisStoreConfig
+            Redis specific configuration, including connection configuration and key namespace.
+    """
+
+    partition_type = RedisStorePartition
+
+
+@serializable()
+class RedisStoreConfig(StoreConfig):
+    """Redis Store config, used by RedisStorePartition
+
+    Parameters:
+        `client_config`: RedisStoreClientConfig
+            Redis connection configuration
+        `store_type`: DocumentStore
+            Class interacting with QueueStash. Default: RedisDocumentStore
+        `backing_store`: KeyValueBackingStore
+            The Store core logic. Default: RedisBackingStore
+        `namespace`: str
+            Prefix for all the Redis keys written by the store. Default: syft
+        `permission_index`: PermissionIndex
+            Permission index of the action store. Default: KeyValuePermissionIndex
+    """
+
+    client_config: RedisStoreClientConfig
+    store_type: Type[DocumentStore] = RedisDocumentStore
+    backing_store: Type[KeyValueBackingStore] = RedisBackingStore
+    namespace: str = "syft"
+    permission_index: Type[PermissionIndex] = KeyValuePermissionIndex
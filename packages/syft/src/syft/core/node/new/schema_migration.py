@@ -0,0 +1,253 @@
+# stdlib
+import threading
+import time
+from typing import Any
+from typing import List
+from typing import Optional
+
+# third party
+from result import Ok
+from result import Result
+
+# relative
+from .document_store import BaseUIDStoreStash
+from .document_store import DocumentStore
+from .document_store import PartitionKey
+from .document_store import PartitionSettings
+from .document_store import QueryKeys
+from .document_store import StorePartition
+from .serializable import serializable
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .syft_object import SyftObject
+
+PartitionNamePartitionKey = PartitionKey(key="partition", type_=str)
+
+
+def upgrade_object(obj: SyftObject) -> SyftObject:
+    """The latest version of `obj`, or `obj` itself when it is already current"""
+    if not obj._needs_upgrade():
+        return obj
+    return obj._upgrade_version(latest=True)
+
+
+@serializable()
+class MigrationProgress(SyftObject):
+    """Resumable state of the migration of one partition
+
+    Parameters:
+        `partition`: str
+            Name of the partition
+        `version`: int
+            Version of the partition object type the objects are migrated to
+        `last_key`: Optional[str]
+            The store keys are visited in string order, the last key of the
+            last batch written back
+        `scanned`: int
+            Objects read so far
+        `migrated`: int
+            Objects upgraded and written back so far
+        `completed`: bool
+            Every object of the partition is at the latest version
+        `error`: Optional[str]
+            Why the last run stopped early, the next run resumes after `last_key`
+        `updated_at`: float
+            Unix timestamp of the last batch
+    """
+
+    __canonical_name__ = "MigrationProgress"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    partition: str
+    version: int
+    last_key: Optional[str] = None
+    scanned: int = 0
+    migrated: int = 0
+    completed: bool = False
+    error: Optional[str] = None
+    updated_at: float = 0.0
+
+    __attr_searchable__ = ["partition"]
+    __attr_unique__ = ["partition"]
+    __attr_repr_cols__ = ["partition", "scanned", "migrated", "completed"]
+
+
+@serializable()
+class MigrationProgressStash(BaseUIDStoreStash):
+    object_type = MigrationProgress
+    settings: PartitionSettings = PartitionSettings(
+        name=MigrationProgress.__canonical_name__, object_type=MigrationProgress
+    )
+
+    def __init__(self, store: DocumentStore) -> None:
+        super().__init__(store=store)
+
+    def get_by_partition(self, name: str) -> Result[Optional[MigrationProgress], str]:
+        qks = QueryKeys(qks=[PartitionNamePartitionKey.with_obj(name)])
+        return self.query_one(qks=qks)
+
+    def save(self, progress: MigrationProgress) -> Result[MigrationProgress, str]:
+        # fields reset to None have to be written too, unlike with `update`
+        fields = {key: value for key, value in progress if key != "id"}
+        return self.update_fields(uid=progress.id, fields=fields)
+
+
+class SchemaMigration:
+    """Upgrades the stored objects of a DocumentStore to their latest version
+
+    Each partition is walked in batches of store keys. The objects of a batch
+    needing an upgrade go through their `_upgrade_version` transforms and are
+    written back by `StorePartition.migrate`, one atomic step per object. The
+    progress is saved after every batch so an interrupted run resumes where it
+    stopped, and a partition whose migration completed isn't read again until
+    the version of its object type changes.
+
+    Parameters:
+        `store`: DocumentStore
+            Store holding the partitions to migrate and the migration progress
+        `batch_size`: int
+            Number of objects read and written back per batch
+        `duty_cycle`: float
+            Share of the wall time spent migrating, between batches the migration
+            sleeps for the rest so it doesn't starve the API traffic. 1.0 runs
+            the batches back to back.
+    """
+
+    def __init__(
+        self, store: DocumentStore, batch_size: int = 100, duty_cycle: float = 0.5
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if not 0 < duty_cycle <= 1:
+            raise ValueError("duty_cycle must be in (0, 1]")
+        self.store = store
+        self.batch_size = batch_size
+        self.duty_cycle = duty_cycle
+        self.progress_stash = MigrationProgressStash(store=store)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def partitions(self) -> List[StorePartition]:
+        return [
+            partition
+            for name, partition in list(self.store.partitions.items())
+            if name != MigrationProgressStash.settings.name
+        ]
+
+    def progress(self) -> Result[List[MigrationProgress], str]:
+        return self.progress_stash.get_all()
+
+    def run(self) -> Result[List[MigrationProgress], str]:
+        """Migrate every partition, failures are kept in the progress of each"""
+        self._stop.clear()
+        progresses = []
+        for partition in self.partitions():
+            if self._stop.is_set():
+                break
+            result = self.migrate_partition(partition)
+            if result.is_err():
+                return result
+            progresses.append(result.ok())
+        return Ok(progresses)
+
+    def start(self) -> None:
+        """Run the migration in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the current batch, the next run resumes from there"""
+        self._stop.set()
+        self.join(timeout=timeout)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _load_progress(
+        self, partition: StorePartition
+    ) -> Result[MigrationProgress, str]:
+        name = partition.settings.name
+        version = partition.settings.object_type.__version__
+        result = self.progress_stash.get_by_partition(name)
+        if result.is_err():
+            return result
+
+        progress = result.ok()
+        if progress is None:
+            return self.progress_stash.set(
+                MigrationProgress(partition=name, version=version)
+            )
+        if progress.version != version:
+            # a new version was deployed since, every object is visited again
+            progress = MigrationProgress(
+                id=progress.id, partition=name, version=version
+            )
+        return Ok(progress)
+
+    def migrate_partition(
+        self, partition: StorePartition
+    ) -> Result[MigrationProgress, str]:
+        progress_status = self._load_progress(partition)
+        if progress_status.is_err():
+            return progress_status
+        progress = progress_status.ok()
+        if progress.completed:
+            return Ok(progress)
+
+        keys_status = partition.store_keys()
+        if keys_status.is_err():
+            progress.error = keys_status.err()
+            return self.progress_stash.save(progress)
+        keys = sorted(keys_status.ok(), key=str)
+        if progress.last_key is not None:
+            keys = [key for key in keys if str(key) > progress.last_key]
+
+        progress.error = None
+        for start in range(0, len(keys), self.batch_size):
+            if self._stop.is_set():
+                return self.progress_stash.save(progress)
+
+            batch = keys[start : start + self.batch_size]  # noqa: E203
+            started = time.monotonic()
+            batch_status = self._migrate_batch(partition, batch)
+            if batch_status.is_err():
+                progress.error = batch_status.err()
+                return self.progress_stash.save(progress)
+
+            progress.scanned += len(batch)
+            progress.migrated += batch_status.ok()
+            progress.last_key = str(batch[-1])
+            progress.updated_at = time.time()
+            save_status = self.progress_stash.save(progress)
+            if save_status.is_err():
+                return save_status
+            self._throttle(time.monotonic() - started)
+
+        progress.completed = True
+        progress.updated_at = time.time()
+        return self.progress_stash.save(progress)
+
+    def _migrate_batch(
+        self, partition: StorePartition, batch: List[Any]
+    ) -> Result[int, str]:
+        objs_status = partition.get_all_from_store(partition.store_query_keys(batch))
+        if objs_status.is_err():
+            return objs_status
+
+        stale_keys = [
+            partition.store_query_key(obj).value
+            for obj in objs_status.ok()
+            if obj._needs_upgrade()
+        ]
+        if len(stale_keys) == 0:
+            return Ok(0)
+        return partition.migrate(stale_keys, upgrade_object).map(len)
+
+    def _throttle(self, elapsed: float) -> None:
+        pause = elapsed * (1 - self.duty_cycle) / self.duty_cycle
+        if pause > 0:
+            # wakes up early when the migration is stopped
+            self._stop.wait(pause)
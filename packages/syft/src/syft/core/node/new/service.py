@@ -25,6 +25,7 @@ from .syft_object import SyftObject
 from .uid import UID
 from .user_roles import DATA_OWNER_ROLE_LEVEL
 from .user_roles import ServiceRole
+from .util import run_coroutine_sync
 
 TYPE_TO_SERVICE = {}
 SERVICE_TO_TYPES = defaultdict(set)
@@ -206,7 +207,7 @@ def service_method(
 
         input_signature = deepcopy(signature)
 
-        def _decorator(self, *args, **kwargs):
+        def _reconstruct(args, kwargs):
             if autosplat is not None and len(autosplat) > 0:
                 args, kwargs = reconstruct_args_kwargs(
                     signature=input_signature,
@@ -214,7 +215,20 @@ def service_method(
                     args=args,
                     kwargs=kwargs,
                 )
-            return func(self, *args, **kwargs)
+            return args, kwargs
+
+        if inspect.iscoroutinefunction(func):
+            # awaited by the async request path, sync callers go through
+            # `call_service_method`
+            async def _decorator(self, *args, **kwargs):
+                args, kwargs = _reconstruct(args, kwargs)
+                return await func(self, *args, **kwargs)
+
+        else:
+
+            def _decorator(self, *args, **kwargs):
+                args, kwargs = _reconstruct(args, kwargs)
+                return func(self, *args, **kwargs)
 
         if autosplat is not None and len(autosplat) > 0:
             signature = expand_signature(signature=input_signature, autosplat=autosplat)
@@ -238,6 +252,14 @@ def service_method(
     return wrapper
 
 
+def call_service_method(method: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Call a service method from synchronous code, async service methods are
+    run to completion on the sync bridge event loop"""
+    if inspect.iscoroutinefunction(method):
+        return run_coroutine_sync(method(*args, **kwargs))
+    return method(*args, **kwargs)
+
+
 class SyftServiceRegistry:
     __service_registry__: Dict[str, Callable] = {}
 
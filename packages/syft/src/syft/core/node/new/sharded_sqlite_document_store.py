@@ -0,0 +1,630 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+import sqlite3
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Type
+import zlib
+
+# third party
+from result import Err
+from result import Ok
+from result import Result
+from typing_extensions import Self
+
+# relative
+from .change_feed import ChangeType
+from .document_store import BaseStash
+from .document_store import DocumentStore
+from .document_store import PartitionSettings
+from .document_store import QueryKey
+from .document_store import QueryKeys
+from .document_store import StorePartition
+from .kv_document_store import KeyValueBackingStore
+from .permission_index import PermissionIndex
+from .response import SyftSuccess
+from .serializable import serializable
+from .serialize import _serialize
+from .sqlite_document_store import SQLiteBackingStore
+from .sqlite_document_store import SQLitePermissionIndex
+from .sqlite_document_store import SQLiteStoreClientConfig
+from .sqlite_document_store import SQLiteStoreConfig
+from .sqlite_document_store import SQLiteStorePartition
+from .sqlite_document_store import thread_ident
+from .store_metrics import bind_query
+from .store_metrics import current_query
+from .store_metrics import measured
+from .syft_object import SyftObject
+from .uid import UID
+
+
+def shard_filename(filename: str, suffix: str) -> str:
+    path = Path(filename)
+    return f"{path.stem}.{suffix}{path.suffix}"
+
+
+def shard_index(key: Any, shard_count: int) -> int:
+    # must be stable across processes, so the builtin hash() can't be used
+    return zlib.crc32(str(key).encode("utf-8")) % shard_count
+
+
+# the fields a shard doesn't take from the config of its sharded store
+SHARD_OWN_FIELDS = ("client_config", "store_type", "backing_store", "permission_index")
+
+
+def shard_store_config(
+    store_config: SQLiteStoreConfig, suffix: str
+) -> SQLiteStoreConfig:
+    client_config = store_config.client_config.copy(
+        update={"filename": shard_filename(store_config.client_config.filename, suffix)}
+    )
+    # a shard is a plain SQLite store, with the locking config and the other
+    # settings of the sharded store
+    shard_config = SQLiteStoreConfig(client_config=client_config)
+    return shard_config.copy(
+        update={
+            name: getattr(store_config, name)
+            for name in shard_config.__fields__
+            if name not in SHARD_OWN_FIELDS
+        }
+    )
+
+
+class SQLiteShardIndex:
+    """Coordinator index enforcing unique keys across all the shards of a partition.
+
+    Every unique key of every object is a row (key, value, uid) in a single small
+    table whose primary key is (key, value), so claiming the keys of a new object
+    is one transaction and a collision is reported by SQLite itself, no matter
+    which process or shard the competing write came from.
+    """
+
+    def __init__(self, settings: PartitionSettings, store_config: SQLiteStoreConfig):
+        self.settings = settings
+        self.store_config = shard_store_config(store_config, "index")
+        self._db: Dict[int, sqlite3.Connection] = {}
+        self.create_table()
+
+    @property
+    def table_name(self) -> str:
+        return f"{self.settings.name}_unique_index"
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if thread_ident() not in self._db:
+            client_config = self.store_config.client_config
+            self._db[thread_ident()] = sqlite3.connect(
+                client_config.file_path,
+                timeout=client_config.timeout,
+                check_same_thread=client_config.check_same_thread,
+            )
+        return self._db[thread_ident()]
+
+    def create_table(self) -> None:
+        self.db.execute(
+            f"create table if not exists {self.table_name} "  # nosec
+            + "(key TEXT NOT NULL, value BLOB NOT NULL, uid VARCHAR(32) NOT NULL, "
+            + "PRIMARY KEY (key, value))"
+        )
+        self.db.execute(
+            f"create index if not exists {self.table_name}_uid "  # nosec
+            + f"on {self.table_name} (uid)"
+        )
+        self.db.commit()
+
+    @staticmethod
+    def _rows(uid: UID, unique_query_keys: QueryKeys) -> List[tuple]:
+        # the store key is added to the unique keys even when already listed
+        rows = {
+            qk.key: (qk.key, _serialize(qk.value, to_bytes=True), str(uid))
+            for qk in unique_query_keys.all
+        }
+        return list(rows.values())
+
+    def claim(self, uid: UID, unique_query_keys: QueryKeys) -> Result[Ok, str]:
+        insert_sql = (
+            f"insert into {self.table_name} (key, value, uid) values (?, ?, ?)"  # nosec
+        )
+        try:
+            with self.db:
+                self.db.executemany(insert_sql, self._rows(uid, unique_query_keys))
+        except sqlite3.IntegrityError as e:
+            return Err(f"Duplication Key Error: {e}")
+        return Ok()
+
+    def write(self, fn: Callable[[], Result]) -> Result:
+        """Call `fn` in a transaction holding the write lock of the index, which
+        keeps out the unique key changes of every other writer, in this process
+        or another one. The `rewrite`s made by `fn` are committed if it returns
+        Ok, and rolled back if it returns an Err or raises, so they can wrap the
+        shard write they go with."""
+        try:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn()
+            except BaseException:
+                self.db.rollback()
+                raise
+            if result.is_ok():
+                self.db.commit()
+            else:
+                self.db.rollback()
+            return result
+        except sqlite3.IntegrityError as e:
+            return Err(f"Duplication Key Error: {e}")
+
+    def rewrite(self, uid: UID, unique_query_keys: QueryKeys) -> None:
+        """Replace the unique keys of `uid`, only called by the `fn` of `write`.
+        Raises sqlite3.IntegrityError when a key is owned by another object."""
+        delete_sql = f"delete from {self.table_name} where uid = ?"  # nosec
+        insert_sql = (
+            f"insert into {self.table_name} (key, value, uid) values (?, ?, ?)"  # nosec
+        )
+        self.db.execute(delete_sql, [str(uid)])
+        self.db.executemany(insert_sql, self._rows(uid, unique_query_keys))
+
+    def release(self, uid: UID) -> None:
+        delete_sql = f"delete from {self.table_name} where uid = ?"  # nosec
+        with self.db:
+            self.db.execute(delete_sql, [str(uid)])
+
+    def lookup(self, qks: QueryKeys) -> Set[UID]:
+        select_sql = (
+            f"select uid from {self.table_name} where key = ? and value = ?"  # nosec
+        )
+        # match AND, query keys without any match are skipped like the
+        # KeyValueStorePartition index does
+        subsets = []
+        for qk in qks.all:
+            row = self.db.execute(
+                select_sql, [qk.key, _serialize(qk.value, to_bytes=True)]
+            ).fetchone()
+            if row is not None:
+                subsets.append({UID(row[0])})
+
+        if len(subsets) == 0:
+            return set()
+        return set.intersection(*subsets)
+
+    def clear(self) -> None:
+        with self.db:
+            self.db.execute(f"delete from {self.table_name}")  # nosec
+
+    def _close(self) -> None:
+        for db in self._db.values():
+            try:
+                db.close()
+            except BaseException:  # nosec
+                pass
+        self._db = {}
+
+
+class ShardFanOut:
+    """Runs a call on every shard in a thread pool and collects the results"""
+
+    def __init__(self, max_workers: Optional[int]) -> None:
+        # worker threads are only started on the first submit
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="syft-shard"
+        )
+
+    def map(self, fn: Callable, shards: List[Any]) -> List[Any]:
+        if len(shards) == 1:
+            return [fn(shards[0])]
+
+        # the shards count towards the metrics of the call fanning out
+        query = current_query()
+
+        def _run(shard: Any) -> Any:
+            with bind_query(query):
+                return fn(shard)
+
+        return list(self.executor.map(_run, shards))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    def __del__(self) -> None:
+        # a partition dropped without `close` must not keep its threads around
+        self.shutdown(wait=False)
+
+
+@serializable()
+class ShardedSQLiteStorePartition(StorePartition):
+    """SQLite StorePartition spread over several SQLite files
+
+    Objects are placed on a shard by hashing their store key (UID), every shard
+    being a regular `SQLiteStorePartition` in a file of its own, so writers to
+    different shards don't block each other. Queries are fanned out to the shards
+    in parallel and merged, unique keys are enforced by a `SQLiteShardIndex`.
+    The change feed of the partition is kept in memory, every shard also keeps
+    the changelog of its own file.
+
+    Parameters:
+        `settings`: PartitionSettings
+            PySyft specific settings, used for indexing and partitioning
+        `store_config`: ShardedSQLiteStoreConfig
+            SQLite specific configuration, including the number of shards
+    """
+
+    def init_store(self) -> Result[Ok, Err]:
+        store_status = super().init_store()
+        if store_status.is_err():
+            return store_status
+
+        try:
+            self.shards = [
+                SQLiteStorePartition(
+                    settings=self.settings,
+                    store_config=shard_store_config(self.store_config, f"shard{idx}"),
+                )
+                for idx in range(self.store_config.shard_count)
+            ]
+            for shard in self.shards:
+                # the calls to a shard are measured as calls to this partition
+                shard._metrics = self.metrics
+            self.index = SQLiteShardIndex(
+                settings=self.settings, store_config=self.store_config
+            )
+            if getattr(self, "fan_out", None) is not None:
+                self.fan_out.shutdown()
+            self.fan_out = ShardFanOut(max_workers=self.store_config.max_workers)
+        except BaseException as e:
+            return Err(str(e))
+
+        return Ok()
+
+    def shard_for(self, uid: Any) -> SQLiteStorePartition:
+        return self.shards[shard_index(uid, len(self.shards))]
+
+    def _merge(self, results: List[Result]) -> Result[List[SyftObject], str]:
+        merged = []
+        for result in results:
+            if result.is_err():
+                return result
+            merged.extend(result.ok())
+        return Ok(merged)
+
+    @measured("set")
+    def set(
+        self, obj: SyftObject, ignore_duplicates: bool = False
+    ) -> Result[SyftObject, str]:
+        try:
+            store_query_key = self.settings.store_key.with_obj(obj)
+            unique_query_keys = self.settings.unique_keys.with_obj(obj)
+        except Exception as e:
+            return Err(f"Failed to write obj {obj}. {e}")
+
+        claim = self.index.claim(store_query_key.value, unique_query_keys)
+        if claim.is_err():
+            if ignore_duplicates:
+                return Ok(obj)
+            return Err(f"Duplication Key Error: {obj}")
+
+        shard = self.shard_for(store_query_key.value)
+        result = shard.set(obj, ignore_duplicates=ignore_duplicates)
+        if result.is_err():
+            self.index.release(store_query_key.value)
+        else:
+            self.change_feed.record(ChangeType.INSERT, store_query_key.value, obj)
+        return result
+
+    @measured("update")
+    def update(self, qk: QueryKey, obj: SyftObject) -> Result[SyftObject, str]:
+        shard = self.shard_for(qk.value)
+
+        def _update() -> Result[SyftObject, str]:
+            if qk.value not in shard.data:
+                return Err(f"No object exists for query key: {qk}")
+
+            # the shard returns a freshly deserialized copy, the changes are
+            # applied to it to find the new unique keys
+            updated_obj = shard.data[qk.value]
+            for key, value in obj.to_dict(exclude_none=True).items():
+                if key == "id":
+                    continue
+                setattr(updated_obj, key, value)
+            self.index.rewrite(
+                qk.value, self.settings.unique_keys.with_obj(updated_obj)
+            )
+            return shard.update(qk=qk, obj=obj)
+
+        # the new unique keys are only committed with the shard update
+        try:
+            result = self.index.write(_update)
+        except Exception as e:
+            return Err(f"Failed to update obj {obj} with error: {e}")
+        if result.is_ok():
+            self.change_feed.record(ChangeType.UPDATE, qk.value, result.ok())
+        return result
+
+    @measured("update_fields")
+    def update_fields(
+        self, qk: QueryKey, fields: Dict[str, Any]
+    ) -> Result[SyftObject, str]:
+        fields_status = self.validate_fields(fields)
+        if fields_status.is_err():
+            return fields_status
+
+        shard = self.shard_for(qk.value)
+
+        def _update_fields() -> Result[SyftObject, str]:
+            if qk.value not in shard.data:
+                return Err(f"No object exists for query key: {qk}")
+            updated_obj = shard.data[qk.value]
+            for key, value in fields_status.ok().items():
+                setattr(updated_obj, key, value)
+            self.index.rewrite(
+                qk.value, self.settings.unique_keys.with_obj(updated_obj)
+            )
+            return shard.update_fields(qk=qk, fields=fields)
+
+        if len(self.affected_partition_keys(self.unique_cks, fields)) > 0:
+            # like in `update`, the index and the shard change together
+            try:
+                result = self.index.write(_update_fields)
+            except Exception as e:
+                return Err(f"Failed to update fields of {qk} with error: {e}")
+        else:
+            result = shard.update_fields(qk=qk, fields=fields)
+        if result.is_ok():
+            self.change_feed.record(ChangeType.UPDATE, qk.value, result.ok())
+        return result
+
+    @measured("delete")
+    def delete(self, qk: QueryKey) -> Result[SyftSuccess, Err]:
+        result = self.shard_for(qk.value).delete(qk=qk)
+        if result.is_ok():
+            self.index.release(qk.value)
+            self.change_feed.record(ChangeType.DELETE, qk.value)
+        return result
+
+    @measured("query")
+    def find_index_or_search_keys(
+        self, index_qks: QueryKeys, search_qks: QueryKeys
+    ) -> Result[List[SyftObject], str]:
+        shards = self.shards
+        if len(index_qks.all) > 0:
+            # only the shards owning the matching objects have to be searched
+            uids = self.index.lookup(index_qks)
+            if len(uids) == 0:
+                return Ok([])
+            shards = list({id(s): s for s in map(self.shard_for, uids)}.values())
+
+        results = self.fan_out.map(
+            lambda shard: shard.find_index_or_search_keys(
+                index_qks=index_qks, search_qks=search_qks
+            ),
+            shards,
+        )
+        return self._merge(results)
+
+    @measured("get")
+    def get_all_from_store(self, qks: QueryKeys) -> Result[List[SyftObject], str]:
+        shard_qks: Dict[int, List[QueryKey]] = defaultdict(list)
+        for qk in qks.all:
+            shard_qks[shard_index(qk.value, len(self.shards))].append(qk)
+
+        results = self.fan_out.map(
+            lambda idx: self.shards[idx].get_all_from_store(
+                QueryKeys(qks=shard_qks[idx])
+            ),
+            list(shard_qks.keys()),
+        )
+        return self._merge(results)
+
+    def store_keys(self) -> Result[List[Any], str]:
+        return self._merge(
+            self.fan_out.map(lambda shard: shard.store_keys(), self.shards)
+        )
+
+    @measured("migrate")
+    def migrate(
+        self, keys: List[Any], fn: Callable[[SyftObject], SyftObject]
+    ) -> Result[List[SyftObject], str]:
+        def _migrate(obj: SyftObject) -> SyftObject:
+            migrated_obj = fn(obj)
+            if migrated_obj is not obj:
+                try:
+                    self.index.rewrite(
+                        self.settings.store_key.with_obj(migrated_obj).value,
+                        self.settings.unique_keys.with_obj(migrated_obj),
+                    )
+                except sqlite3.IntegrityError as e:
+                    raise ValueError(f"Duplication Key Error: {e}")
+            return migrated_obj
+
+        migrated = []
+        for key in keys:
+            # like in `update`, one index transaction around each shard write
+            result = self.index.write(
+                lambda: self.shard_for(key).migrate([key], _migrate)
+            )
+            if result.is_err():
+                return result
+            for obj in result.ok():
+                self.change_feed.record(ChangeType.UPDATE, key, obj)
+            migrated.extend(result.ok())
+        return Ok(migrated)
+
+    @measured("all")
+    def all(self) -> Result[List[BaseStash.object_type], str]:
+        return self._merge(self.fan_out.map(lambda shard: shard.all(), self.shards))
+
+    def __len__(self) -> int:
+        return sum(self.fan_out.map(len, self.shards))
+
+    def close(self) -> None:
+        self.fan_out.shutdown()
+        for shard in self.shards:
+            shard.close()
+        self.index._close()
+
+    def commit(self) -> None:
+        for shard in self.shards:
+            shard.commit()
+
+
+@serializable(attrs=["index_name", "settings", "store_config"])
+class ShardedSQLiteBackingStore(KeyValueBackingStore):
+    """SQLite backing store spread over several SQLite files by key
+
+    Used by the action store, whose keys are UIDs.
+
+    Parameters:
+        `index_name`: str
+            Index name
+        `settings`: PartitionSettings
+            Syft specific settings
+        `store_config`: ShardedSQLiteStoreConfig
+            Connection Configuration
+        `ddtype`: Type
+            Class used as fallback on `get` errors
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        settings: PartitionSettings,
+        store_config: ShardedSQLiteStoreConfig,
+        ddtype: Optional[type] = None,
+    ) -> None:
+        self.index_name = index_name
+        self.settings = settings
+        self.store_config = store_config
+        self._ddtype = ddtype
+        self.shards = [
+            SQLiteBackingStore(
+                index_name=index_name,
+                settings=settings,
+                store_config=shard_store_config(store_config, f"shard{idx}"),
+                ddtype=ddtype,
+            )
+            for idx in range(store_config.shard_count)
+        ]
+
+    def shard_for(self, key: Any) -> SQLiteBackingStore:
+        return self.shards[shard_index(key, len(self.shards))]
+
+    def _close(self) -> None:
+        for shard in self.shards:
+            shard._close()
+
+    def _commit(self) -> None:
+        for shard in self.shards:
+            shard._commit()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.shard_for(key)[key] = value
+
+    def __getitem__(self, key: Any) -> Self:
+        return self.shard_for(key)[key]
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        by_shard: Dict[int, List[Any]] = defaultdict(list)
+        for key in keys:
+            by_shard[shard_index(key, len(self.shards))].append(key)
+        values = {}
+        for idx, shard_keys in by_shard.items():
+            values.update(self.shards[idx].get_many(shard_keys))
+        return values
+
+    def update_value(self, key: Any, fn: Callable[[Any], Any]) -> Any:
+        return self.shard_for(key).update_value(key, fn)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    def __delitem__(self, key: str):
+        del self.shard_for(key)[key]
+
+    def clear(self) -> Self:
+        for shard in self.shards:
+            shard.clear()
+
+    def copy(self) -> Self:
+        return deepcopy(self)
+
+    def keys(self) -> Any:
+        return [key for shard in self.shards for key in shard.keys()]
+
+    def values(self) -> Any:
+        return [value for shard in self.shards for value in shard.values()]
+
+    def items(self) -> Any:
+        return [item for shard in self.shards for item in shard.items()]
+
+    def pop(self, key: Any) -> Self:
+        return self.shard_for(key).pop(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.shard_for(key)
+
+    def __iter__(self) -> Any:
+        return iter(self.keys())
+
+
+@serializable(attrs=["settings", "store_config"])
+class ShardedSQLitePermissionIndex(SQLitePermissionIndex):
+    """SQLitePermissionIndex kept in the `.index` file next to the shards"""
+
+    @property
+    def client_config(self) -> SQLiteStoreClientConfig:
+        return shard_store_config(self.store_config, "index").client_config
+
+
+@serializable()
+class ShardedSQLiteDocumentStore(DocumentStore):
+    """Sharded SQLite Document Store
+
+    Parameters:
+        `store_config`: ShardedSQLiteStoreConfig
+            SQLite specific configuration, including connection details and the number of shards.
+    """
+
+    partition_type = ShardedSQLiteStorePartition
+
+
+@serializable()
+class ShardedSQLiteStoreConfig(SQLiteStoreConfig):
+    """Sharded SQLite Store config, used by ShardedSQLiteStorePartition
+
+    Each shard is a file named after `client_config.filename` with a `.shard<N>`
+    suffix, the unique key index lives in the `.index` file.
+
+    Parameters:
+        `client_config`: SQLiteStoreClientConfig
+            SQLite connection configuration
+        `store_type`: DocumentStore
+            Class interacting with QueueStash. Default: ShardedSQLiteDocumentStore
+        `backing_store`: KeyValueBackingStore
+            The Store core logic, used by the action store. Default: ShardedSQLiteBackingStore
+        `shard_count`: int
+            Number of SQLite files per partition. Default 4
+        `max_workers`: Optional[int]
+            Number of threads used to query the shards in parallel.
+            Default: None, as chosen by ThreadPoolExecutor
+        `permission_index`: PermissionIndex
+            Permission index of the action store. Default: ShardedSQLitePermissionIndex
+    """
+
+    client_config: SQLiteStoreClientConfig
+    store_type: Type[DocumentStore] = ShardedSQLiteDocumentStore
+    backing_store: Type[KeyValueBackingStore] = ShardedSQLiteBackingStore
+    shard_count: int = 4
+    max_workers: Optional[int] = None
+    permission_index: Type[PermissionIndex] = ShardedSQLitePermissionIndex
@@ -3,30 +3,47 @@ from __future__ import annotations
 
 # stdlib
 from copy import deepcopy
+import os
 from pathlib import Path
 import sqlite3
+import sys
 import tempfile
 import threading
 from typing import Any
+from typing import Callable
+from typing import Collection
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Type
 from typing import Union
 
 # third party
+from result import Err
+from result import Ok
+from result import Result
 from typing_extensions import Self
 
 # relative
+from .change_feed import ChangeEvent
+from .change_feed import ChangeFeed
+from .change_feed import ChangeType
 from .deserialize import _deserialize
+from .document_store import BasePartitionSettings
 from .document_store import DocumentStore
 from .document_store import PartitionSettings
 from .document_store import StoreClientConfig
 from .document_store import StoreConfig
 from .kv_document_store import KeyValueBackingStore
 from .kv_document_store import KeyValueStorePartition
+from .permission_index import PermissionIndex
+from .permission_index import uid_key_range
 from .serializable import serializable
 from .serialize import _serialize
+from .store_metrics import record_deserialized
+from .syft_object import SyftObject
 from .uid import UID
 
 
@@ -55,6 +72,9 @@ class SQLiteBackingStore(KeyValueBackingStore):
             Class used as fallback on `get` errors
     """
 
+    # keys per query of get_many, below the SQLite limit of bound variables
+    batch_size = 500
+
     def __init__(
         self,
         index_name: str,
@@ -154,8 +174,41 @@ class SQLiteBackingStore(KeyValueBackingStore):
         if row is None or len(row) == 0:
             raise KeyError(f"{key} not in {type(self)}")
         data = row[2]
+        record_deserialized(len(data))
         return _deserialize(data, from_bytes=True)
 
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        by_str = {str(key): key for key in keys}
+        names = list(by_str)
+        values = {}
+        for start in range(0, len(names), self.batch_size):
+            batch = names[start : start + self.batch_size]  # noqa: E203
+            placeholders = ", ".join("?" * len(batch))
+            select_sql = f"select uid, value from {self.table_name} where uid in ({placeholders})"  # nosec
+            for name, data in self._execute(select_sql, batch).fetchall():
+                record_deserialized(len(data))
+                values[by_str[name]] = _deserialize(data, from_bytes=True)
+        return values
+
+    def update_value(self, key: UID, fn: Callable[[Any], Any]) -> Any:
+        # compare-and-swap on the stored blob, safe across connections and processes
+        select_sql = f"select value from {self.table_name} where uid = ?"  # nosec
+        update_sql = f"update {self.table_name} set repr = ?, value = ? where uid = ? and value = ?"  # nosec
+        while True:
+            row = self._execute(select_sql, [str(key)]).fetchone()
+            if row is None:
+                raise KeyError(f"{key} not in {type(self)}")
+            record_deserialized(len(row[0]))
+            value = fn(_deserialize(row[0], from_bytes=True))
+            data = _serialize(value, to_bytes=True)
+            cursor = self._execute(
+                update_sql, [_repr_debug_(value), data, str(key), row[0]]
+            )
+            if cursor is None:
+                raise Exception(f"Failed to update {key} in {self.table_name}")
+            if cursor.rowcount == 1:
+                return value
+
     def _exists(self, key: UID) -> bool:
         select_sql = f"select uid from {self.table_name} where uid = ?"  # nosec
         row = self._execute(select_sql, [str(key)]).fetchone()
@@ -174,6 +227,7 @@ class SQLiteBackingStore(KeyValueBackingStore):
 
         for row in rows:
             keys.append(UID(row[0]))
+            record_deserialized(len(row[2]))
             data.append(_deserialize(row[2], from_bytes=True))
         return dict(zip(keys, data))
 
@@ -257,6 +311,282 @@ class SQLiteBackingStore(KeyValueBackingStore):
             pass
 
 
+class SQLiteChangeFeed(ChangeFeed):
+    """ChangeFeed backed by a changelog table filled by triggers on the data table.
+
+    The triggers run inside the transaction of the write itself, so the log can't
+    miss or reorder changes, including those made by other processes sharing the
+    database file. The offset is the AUTOINCREMENT rowid of the changelog. The
+    value blob is only copied into the log while a subscription, from any process,
+    is registered in the subscribers table.
+
+    Parameters:
+        `settings`: PartitionSettings
+            Syft specific settings
+        `store_config`: SQLiteStoreConfig
+            Connection Configuration
+    """
+
+    # how often, in recorded writes, the changelog is trimmed to `capacity`
+    trim_interval = 100
+
+    def __init__(self, settings: PartitionSettings, store_config: StoreConfig) -> None:
+        super().__init__(name=settings.name, capacity=store_config.change_feed_capacity)
+        self.settings = settings
+        self.store_config = store_config
+        self._db: Dict[int, sqlite3.Connection] = {}
+        self._writes = 0
+        self.create_table()
+
+    @property
+    def table_name(self) -> str:
+        return f"{self.settings.name}_changelog"
+
+    @property
+    def data_table_name(self) -> str:
+        return f"{self.settings.name}_data"
+
+    @property
+    def subscribers_table_name(self) -> str:
+        return f"{self.settings.name}_changelog_subscribers"
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if thread_ident() not in self._db:
+            client_config = self.store_config.client_config
+            self._db[thread_ident()] = sqlite3.connect(
+                client_config.file_path,
+                timeout=client_config.timeout,
+                check_same_thread=client_config.check_same_thread,
+            )
+        return self._db[thread_ident()]
+
+    def create_table(self) -> None:
+        with self.db:
+            self.db.execute(
+                f"create table if not exists {self.table_name} "  # nosec
+                + "(offset INTEGER PRIMARY KEY AUTOINCREMENT, op TEXT NOT NULL, "
+                + "uid VARCHAR(32) NOT NULL, value BLOB, created_at REAL NOT NULL "
+                + "DEFAULT ((julianday('now') - 2440587.5) * 86400.0))"
+            )
+            self.db.execute(
+                f"create table if not exists {self.subscribers_table_name} "  # nosec
+                + "(token TEXT PRIMARY KEY, pid INTEGER NOT NULL)"
+            )
+            subscribed = f"exists (select 1 from {self.subscribers_table_name})"
+            for op, event, row, value in [
+                (ChangeType.INSERT, "insert", "new", "new.value"),
+                (ChangeType.UPDATE, "update", "new", "new.value"),
+                (ChangeType.DELETE, "delete", "old", "NULL"),
+            ]:
+                # recreated, files written by earlier versions always copied the value
+                self.db.execute(
+                    f"drop trigger if exists {self.table_name}_{event}"  # nosec
+                )
+                self.db.execute(
+                    f"create trigger {self.table_name}_{event} "  # nosec
+                    + f"after {event} on {self.data_table_name} begin "
+                    + f"insert into {self.table_name} (op, uid, value) "
+                    + f"values ('{op.value}', {row}.uid, "
+                    + f"case when {subscribed} then {value} end); end"
+                )
+        self._prune_subscribers()
+
+    def _prune_subscribers(self) -> None:
+        # subscriptions of processes which died without closing them
+        if sys.platform == "win32":
+            return
+        rows = self.db.execute(
+            f"select token, pid from {self.subscribers_table_name}"  # nosec
+        ).fetchall()
+        for token, pid in rows:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                with self.db:
+                    self.db.execute(
+                        f"delete from {self.subscribers_table_name} "  # nosec
+                        + "where token = ?",
+                        [token],
+                    )
+            except PermissionError:  # nosec
+                pass
+
+    def _token(self, subscription: Any) -> str:
+        return f"{os.getpid()}-{id(subscription)}"
+
+    def _add_subscriber(self, subscription: Any) -> None:
+        super()._add_subscriber(subscription)
+        with self.db:
+            self.db.execute(
+                f"insert or replace into {self.subscribers_table_name} "  # nosec
+                + "(token, pid) values (?, ?)",
+                [self._token(subscription), os.getpid()],
+            )
+
+    def _remove_subscriber(self, subscription: Any) -> None:
+        super()._remove_subscriber(subscription)
+        with self.db:
+            self.db.execute(
+                f"delete from {self.subscribers_table_name} where token = ?",  # nosec
+                [self._token(subscription)],
+            )
+
+    @property
+    def latest_offset(self) -> int:
+        row = self.db.execute(
+            "select seq from sqlite_sequence where name = ?", [self.table_name]
+        ).fetchone()
+        return (row[0] if row is not None else 0) + 1
+
+    @property
+    def oldest_offset(self) -> int:
+        row = self.db.execute(
+            f"select min(offset) from {self.table_name}"  # nosec
+        ).fetchone()
+        return row[0] if row[0] is not None else self.latest_offset
+
+    def _append(
+        self, change_type: ChangeType, uid: Any, obj: Optional[SyftObject]
+    ) -> None:
+        # the row was already written by the trigger, only trim the log
+        self._writes += 1
+        if self._writes % self.trim_interval == 0:
+            with self.db:
+                self.db.execute(
+                    f"delete from {self.table_name} where offset < ("  # nosec
+                    + f"select max(offset) from {self.table_name}) - ?",
+                    [self.capacity - 1],
+                )
+
+    def _read(self, from_offset: int, limit: Optional[int]) -> List[ChangeEvent]:
+        select_sql = (
+            f"select offset, op, uid, value, created_at from {self.table_name} "  # nosec
+            + "where offset >= ? order by offset limit ?"
+        )
+        rows = self.db.execute(
+            select_sql, [from_offset, -1 if limit is None else limit]
+        ).fetchall()
+
+        events = []
+        for offset, op, uid, value, created_at in rows:
+            obj = _deserialize(value, from_bytes=True) if value is not None else None
+            events.append(self.event(offset, ChangeType(op), UID(uid), obj, created_at))
+        return events
+
+    def _close(self) -> None:
+        for db in self._db.values():
+            try:
+                db.close()
+            except BaseException:  # nosec
+                pass
+        self._db = {}
+
+
+@serializable(attrs=["settings", "store_config"])
+class SQLitePermissionIndex(PermissionIndex):
+    """PermissionIndex stored as a table of binary keys
+
+    The table is the primary key index itself (WITHOUT ROWID), so a lookup is a
+    single B-tree search and the keys of a uid are one contiguous range.
+
+    Parameters:
+        `settings`: BasePartitionSettings
+            Settings of the action store, the name prefixes the table
+        `store_config`: SQLiteStoreConfig
+            Connection Configuration
+    """
+
+    # keys bound per statement, below the default SQLITE_MAX_VARIABLE_NUMBER
+    batch_size = 500
+
+    def __init__(
+        self, settings: BasePartitionSettings, store_config: StoreConfig
+    ) -> None:
+        super().__init__(settings=settings, store_config=store_config)
+        self._db: Dict[int, sqlite3.Connection] = {}
+        self.create_table()
+
+    @property
+    def client_config(self) -> SQLiteStoreClientConfig:
+        return self.store_config.client_config
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # the index can be rebuilt by the deserializer without calling __init__
+        if getattr(self, "_db", None) is None:
+            self._db = {}
+        if thread_ident() not in self._db:
+            self._db[thread_ident()] = sqlite3.connect(
+                self.client_config.file_path,
+                timeout=self.client_config.timeout,
+                check_same_thread=self.client_config.check_same_thread,
+            )
+        return self._db[thread_ident()]
+
+    def create_table(self) -> None:
+        with self.db:
+            self.db.execute(
+                f"create table if not exists {self.index_name} "  # nosec
+                + "(key BLOB NOT NULL PRIMARY KEY) WITHOUT ROWID"
+            )
+
+    def add(self, keys: Iterable[bytes]) -> None:
+        with self.db:
+            self.db.executemany(
+                f"insert or ignore into {self.index_name} (key) values (?)",  # nosec
+                [(key,) for key in keys],
+            )
+
+    def remove(self, keys: Iterable[bytes]) -> None:
+        with self.db:
+            self.db.executemany(
+                f"delete from {self.index_name} where key = ?",  # nosec
+                [(key,) for key in keys],
+            )
+
+    def present(self, keys: Collection[bytes]) -> Set[bytes]:
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start : start + self.batch_size]  # noqa: E203
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.db.execute(
+                f"select key from {self.index_name} "  # nosec
+                + f"where key in ({placeholders})",
+                batch,
+            ).fetchall()
+            found.update(bytes(row[0]) for row in rows)
+        return found
+
+    def has_uid(self, uid: UID) -> bool:
+        row = self.db.execute(
+            f"select 1 from {self.index_name} "  # nosec
+            + "where key >= ? and key < ? limit 1",
+            uid_key_range(uid),
+        ).fetchone()
+        return row is not None
+
+    def remove_uid(self, uid: UID) -> None:
+        with self.db:
+            self.db.execute(
+                f"delete from {self.index_name} where key >= ? and key < ?",  # nosec
+                uid_key_range(uid),
+            )
+
+    def clear(self) -> None:
+        with self.db:
+            self.db.execute(f"delete from {self.index_name}")  # nosec
+
+    def _close(self) -> None:
+        for db in self._db.values():
+            try:
+                db.close()
+            except BaseException:  # nosec
+                pass
+        self._db = {}
+
+
 @serializable()
 class SQLiteStorePartition(KeyValueStorePartition):
     """SQLite StorePartition
@@ -268,10 +598,27 @@ class SQLiteStorePartition(KeyValueStorePartition):
             SQLite specific configuration
     """
 
+    def init_store(self) -> Result[Ok, Err]:
+        store_status = super().init_store()
+        if store_status.is_err():
+            return store_status
+
+        try:
+            # set up the changelog triggers before anything is written
+            self.change_feed
+        except BaseException as e:
+            return Err(str(e))
+
+        return Ok()
+
+    def _create_change_feed(self) -> SQLiteChangeFeed:
+        return SQLiteChangeFeed(settings=self.settings, store_config=self.store_config)
+
     def close(self) -> None:
         self.data._close()
         self.unique_keys._close()
         self.searchable_keys._close()
+        self.change_feed._close()
 
     def commit(self) -> None:
         self.data._commit()
@@ -339,8 +686,11 @@ class SQLiteStoreConfig(StoreConfig):
             Class interacting with QueueStash. Default: SQLiteDocumentStore
         `backing_store`: KeyValueBackingStore
             The Store core logic. Default: SQLiteBackingStore
+        `permission_index`: PermissionIndex
+            Permission index of the action store. Default: SQLitePermissionIndex
     """
 
     client_config: SQLiteStoreClientConfig
     store_type: Type[DocumentStore] = SQLiteDocumentStore
     backing_store: Type[KeyValueBackingStore] = SQLiteBackingStore
+    permission_index: Type[PermissionIndex] = SQLitePermissionIndex
@@ -0,0 +1,414 @@
+# future
+from __future__ import annotations
+
+# stdlib
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import inspect
+import threading
+import time
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+# third party
+from result import Err
+
+# relative
+from ....logger import warning
+from .serializable import serializable
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .syft_object import SyftBaseObject
+
+# upper bounds of the latency buckets in seconds, slower calls go in a last bucket
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# longest repr of a query value kept in the slow query log
+MAX_QUERY_VALUE_REPR = 100
+
+# a context variable rather than a thread local, the awaitable partition calls
+# of concurrent requests share the event loop thread
+_active: ContextVar[Optional[QueryStats]] = ContextVar("active_query", default=None)
+
+
+class LatencyHistogram:
+    """Latency histogram with fixed buckets
+
+    Parameters:
+        `buckets`: Tuple[float, ...]
+            Sorted upper bounds of the buckets in seconds
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile, capped at the max"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(bound): count for bound, count in zip(self.buckets, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class QueryStats:
+    """What a single StorePartition call did, filled in while it runs
+
+    `partitions` are the PartitionMetrics of this call and of the measured calls
+    it is nested in, a partition doesn't measure the calls nested in its own.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        query: Dict[str, str],
+        partitions: Tuple[Any, ...] = (),
+    ) -> None:
+        self.operation = operation
+        self.query = query
+        self.partitions = partitions
+        self.index_hits = 0
+        self.scans = 0
+        self.rows_scanned = 0
+        self.rows_deserialized = 0
+        self.bytes_deserialized = 0
+        self.failed = False
+        # a call can fan out to other threads, see `bind_query`
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        index_hits: int = 0,
+        scans: int = 0,
+        rows_scanned: int = 0,
+        rows_deserialized: int = 0,
+        bytes_deserialized: int = 0,
+    ) -> None:
+        with self._lock:
+            self.index_hits += index_hits
+            self.scans += scans
+            self.rows_scanned += rows_scanned
+            self.rows_deserialized += rows_deserialized
+            self.bytes_deserialized += bytes_deserialized
+
+
+def current_query() -> Optional[QueryStats]:
+    return _active.get()
+
+
+@contextmanager
+def bind_query(query: Optional[QueryStats]) -> Iterator[None]:
+    """Count the work done by this thread towards `query` of another thread"""
+    token = _active.set(query)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def record_index_hit(rows: int = 0) -> None:
+    """Mark the running query as answered by an index lookup returning `rows`"""
+    query = current_query()
+    if query is not None:
+        query.add(index_hits=1, rows_scanned=rows)
+
+
+def record_scan(rows: int) -> None:
+    """Mark the running query as having walked through `rows` rows or keys"""
+    query = current_query()
+    if query is not None:
+        query.add(scans=1, rows_scanned=rows)
+
+
+def record_deserialized(nbytes: int) -> None:
+    """Called by backends for every stored value they deserialize"""
+    query = current_query()
+    if query is not None:
+        query.add(rows_deserialized=1, bytes_deserialized=nbytes)
+
+
+def query_repr(*qks: Any) -> Dict[str, str]:
+    # QueryKey and QueryKeys both have `as_dict`
+    query = {}
+    for keys in qks:
+        for key, value in keys.as_dict.items():
+            query[key] = repr(value)[:MAX_QUERY_VALUE_REPR]
+    return query
+
+
+@serializable()
+class SlowQuery(SyftBaseObject):
+    """A StorePartition call slower than the configured threshold
+
+    Parameters:
+        `partition`: str
+            Name of the partition
+        `operation`: str
+            Partition method, e.g. `query`, `get` or `set`
+        `query`: Dict[str, str]
+            The QueryKeys of the call, values shortened to their repr
+        `duration`: float
+            Seconds the call took
+        `index_hits`: int
+            Number of index lookups used to answer the call
+        `scans`: int
+            Number of scans used to answer the call
+        `rows_scanned`: int
+            Rows or index keys examined
+        `bytes_deserialized`: int
+            Size of the stored values deserialized
+        `created_at`: float
+            Unix timestamp of the end of the call
+    """
+
+    __canonical_name__ = "SlowQuery"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    partition: str
+    operation: str
+    query: Dict[str, str]
+    duration: float
+    index_hits: int
+    scans: int
+    rows_scanned: int
+    bytes_deserialized: int
+    created_at: float
+
+
+class OperationMetrics:
+    """Counters of a single StorePartition operation"""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.index_hits = 0
+        self.scans = 0
+        self.rows_scanned = 0
+        self.rows_deserialized = 0
+        self.bytes_deserialized = 0
+
+    def add(self, query: QueryStats, duration: float) -> None:
+        self.latency.observe(duration)
+        self.errors += int(query.failed)
+        self.index_hits += query.index_hits
+        self.scans += query.scans
+        self.rows_scanned += query.rows_scanned
+        self.rows_deserialized += query.rows_deserialized
+        self.bytes_deserialized += query.bytes_deserialized
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency.to_dict(),
+            "errors": self.errors,
+            "index_hits": self.index_hits,
+            "scans": self.scans,
+            "rows_scanned": self.rows_scanned,
+            "rows_deserialized": self.rows_deserialized,
+            "bytes_deserialized": self.bytes_deserialized,
+        }
+
+
+class PartitionMetrics:
+    """Latency histograms and counters of a StorePartition, per operation
+
+    Works in-process without any tracing backend. Calls nested in a measured call
+    of the same partition on the same thread or asyncio task, e.g. the lookup
+    done by an update, count towards the outer call. Calls of other partitions
+    made meanwhile are measured by their own partition.
+
+    Parameters:
+        `name`: str
+            Partition name
+        `enabled`: bool
+            Record anything at all
+        `slow_query_threshold`: Optional[float]
+            Calls taking at least this many seconds go in the slow query log,
+            None disables the log
+        `slow_query_log_size`: int
+            Number of slow queries kept, older ones are dropped
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = True,
+        slow_query_threshold: Optional[float] = 0.1,
+        slow_query_log_size: int = 100,
+    ) -> None:
+        self.name = name
+        self.enabled = enabled
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_log_size = slow_query_log_size
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_config(cls, name: str, store_config: Any) -> PartitionMetrics:
+        return cls(
+            name=name,
+            enabled=store_config.metrics_enabled,
+            slow_query_threshold=store_config.slow_query_threshold,
+            slow_query_log_size=store_config.slow_query_log_size,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self.operations: Dict[str, OperationMetrics] = {}
+            self.slow_queries: Deque[SlowQuery] = deque(maxlen=self.slow_query_log_size)
+
+    @contextmanager
+    def measure(self, operation: str, *qks: Any) -> Iterator[Optional[QueryStats]]:
+        outer = current_query()
+        if not self.enabled or (outer is not None and self in outer.partitions):
+            yield None
+            return
+
+        partitions = outer.partitions if outer is not None else ()
+        query = QueryStats(
+            operation=operation,
+            query=query_repr(*qks),
+            partitions=partitions + (self,),
+        )
+        token = _active.set(query)
+        start = time.perf_counter()
+        try:
+            yield query
+        except BaseException:
+            query.failed = True
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            _active.reset(token)
+            self._record(query, duration)
+
+    def _record(self, query: QueryStats, duration: float) -> None:
+        slow = (
+            self.slow_query_threshold is not None
+            and duration >= self.slow_query_threshold
+        )
+        with self._lock:
+            if query.operation not in self.operations:
+                self.operations[query.operation] = OperationMetrics()
+            self.operations[query.operation].add(query, duration)
+            if slow:
+                self.slow_queries.append(
+                    SlowQuery(
+                        partition=self.name,
+                        operation=query.operation,
+                        query=query.query,
+                        duration=duration,
+                        index_hits=query.index_hits,
+                        scans=query.scans,
+                        rows_scanned=query.rows_scanned,
+                        bytes_deserialized=query.bytes_deserialized,
+                        created_at=time.time(),
+                    )
+                )
+        if slow:
+            warning(
+                f"Slow {query.operation} on {self.name} took {duration:.3f}s, "
+                f"query: {query.query}, index hits: {query.index_hits}, "
+                f"scans: {query.scans}, rows scanned: {query.rows_scanned}"
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                operation: metrics.to_dict()
+                for operation, metrics in self.operations.items()
+            }
+
+    def get_slow_queries(self) -> List[SlowQuery]:
+        with self._lock:
+            return list(self.slow_queries)
+
+
+def _find_query_keys(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> List[Any]:
+    # the QueryKey and QueryKeys arguments, find_index_or_search_keys takes two
+    return [
+        value
+        for value in list(args) + list(kwargs.values())
+        if hasattr(value, "as_dict")
+    ]
+
+
+def measured(operation: str) -> Callable:
+    """Record the calls of a StorePartition method in its `metrics`"""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                qks = _find_query_keys(args, kwargs)
+                with self.metrics.measure(operation, *qks) as query:
+                    result = await func(self, *args, **kwargs)
+                    if query is not None and isinstance(result, Err):
+                        query.failed = True
+                return result
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            qks = _find_query_keys(args, kwargs)
+            with self.metrics.measure(operation, *qks) as query:
+                result = func(self, *args, **kwargs)
+                if query is not None and isinstance(result, Err):
+                    query.failed = True
+            return result
+
+        return wrapper
+
+    return decorator
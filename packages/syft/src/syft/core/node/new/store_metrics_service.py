@@ -0,0 +1,83 @@
+# stdlib
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+# third party
+from result import Ok
+from result import Result
+
+# relative
+from .context import AuthedServiceContext
+from .response import SyftError
+from .response import SyftSuccess
+from .serializable import serializable
+from .service import AbstractService
+from .service import service_method
+from .store_metrics import SlowQuery
+from .user_roles import ADMIN_ROLE_LEVEL
+
+
+@serializable()
+class StoreMetricsService(AbstractService):
+    """Latency metrics and slow query log of the document store partitions"""
+
+    def __init__(self) -> None:
+        pass
+
+    @service_method(
+        path="metrics.partitions", name="partitions", roles=ADMIN_ROLE_LEVEL
+    )
+    def partitions(
+        self, context: AuthedServiceContext, name: Optional[str] = None
+    ) -> Result[Dict[str, Dict[str, Any]], str]:
+        """Latency histograms, index hits and scans per partition and operation"""
+        return Ok(context.node.document_store.metrics(name=name))
+
+    @service_method(
+        path="metrics.slow_queries", name="slow_queries", roles=ADMIN_ROLE_LEVEL
+    )
+    def slow_queries(
+        self, context: AuthedServiceContext, name: Optional[str] = None
+    ) -> Result[List[SlowQuery], str]:
+        """Slow query log of all partitions or of partition `name`, oldest first"""
+        return Ok(context.node.document_store.slow_queries(name=name))
+
+    @service_method(path="metrics.locks", name="locks", roles=ADMIN_ROLE_LEVEL)
+    def locks(
+        self, context: AuthedServiceContext, name: Optional[str] = None
+    ) -> Result[Dict[str, Dict[str, Any]], str]:
+        """Wait times, contention and timeouts of the per-key write locks"""
+        return Ok(context.node.document_store.lock_metrics(name=name))
+
+    @service_method(
+        path="metrics.action_cache", name="action_cache", roles=ADMIN_ROLE_LEVEL
+    )
+    def action_cache(
+        self, context: AuthedServiceContext
+    ) -> Result[Optional[Dict[str, Any]], str]:
+        """Hit ratio, size and evictions of the action store payload cache, None
+        if the cache isn't enabled"""
+        return Ok(context.node.action_store.cache_stats())
+
+    @service_method(
+        path="metrics.action_memo", name="action_memo", roles=ADMIN_ROLE_LEVEL
+    )
+    def action_memo(
+        self, context: AuthedServiceContext
+    ) -> Result[Optional[Dict[str, Any]], str]:
+        """Entries and hit ratio of the memoized action results, None if the
+        memoization isn't enabled"""
+        memo = context.node.get_service("actionservice").memo
+        return Ok(memo.stats() if memo is not None else None)
+
+    @service_method(path="metrics.reset", name="reset", roles=ADMIN_ROLE_LEVEL)
+    def reset(self, context: AuthedServiceContext) -> Union[SyftSuccess, SyftError]:
+        """Clear the metrics and slow query logs of all partitions"""
+        context.node.document_store.reset_metrics()
+        cache = getattr(context.node.action_store, "cache", None)
+        if cache is not None:
+            cache.reset_stats()
+        return SyftSuccess(message="Store metrics reset")
@@ -272,6 +272,19 @@ class SyftObject(SyftBaseObject, SyftObjectRegistry):
                 upgraded = upgraded._upgrade_version(latest=latest)
             return upgraded
 
+    @classmethod
+    def _from_previous_version(cls, prev: "SyftObject") -> "SyftObject":
+        # migrations are registered as transforms from the previous version
+        return prev.to(cls)
+
+    def _needs_upgrade(self) -> bool:
+        return (
+            SyftObjectRegistry.versioned_class(
+                name=self.__canonical_name__, version=self.__version__ + 1
+            )
+            is not None
+        )
+
     # transform from one supported type to another
     def to(self, projection: type, context: Optional[Context] = None) -> Any:
         # 🟡 TODO 19: Could we do an mro style inheritence conversion? Risky?
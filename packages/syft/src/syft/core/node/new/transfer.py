@@ -0,0 +1,181 @@
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Union
+
+# relative
+from .deserialize import _deserialize
+from .response import SyftError
+from .serializable import serializable
+from .serialize import _serialize
+from .syft_object import SYFT_OBJECT_VERSION_1
+from .syft_object import SyftObject
+from .uid import UID
+
+DEFAULT_CHUNK_SIZE = 8 * 1024**2
+MAX_CHUNK_SIZE = 64 * 1024**2
+DEFAULT_STREAMS = 4
+
+
+@serializable()
+class TransferSession(SyftObject):
+    """Chunked upload or download of one serialized action object
+
+    Parameters:
+        `id`: UID
+            Session id, sent with every chunk
+        `object_id`: UID
+            Action store uid of the object transferred
+        `direction`: str
+            "upload" or "download"
+        `verify_key`: str
+            Verify key of the user who began the session, the only one allowed
+            to continue it
+        `size`: int
+            Size of the serialized object in bytes
+        `digest`: str
+            SHA-256 of the serialized object
+        `chunk_size`: int
+            Size of every chunk but the last one
+        `created_at`: float
+            Unix timestamp of the start of the session
+        `received`: List[int]
+            Indexes of the chunks already acknowledged by the node, set in the
+            responses to `transfer.begin_upload` so a client resumes after them
+    """
+
+    __canonical_name__ = "TransferSession"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    object_id: UID
+    direction: str
+    verify_key: str
+    size: int
+    digest: str
+    chunk_size: int
+    created_at: float
+    received: List[int] = []
+
+    __attr_searchable__ = ["object_id", "digest", "verify_key"]
+    __attr_repr_cols__ = ["object_id", "direction", "size"]
+
+    @property
+    def chunk_count(self) -> int:
+        return max(1, -(-self.size // self.chunk_size))
+
+    def chunk_range(self, index: int) -> range:
+        start = index * self.chunk_size
+        return range(start, min(start + self.chunk_size, self.size))
+
+
+def chunk_digest(data: Union[bytes, memoryview]) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class TransferError(Exception):
+    pass
+
+
+def _raise_on_error(result: Any) -> Any:
+    if isinstance(result, SyftError):
+        raise TransferError(result.message)
+    return result
+
+
+def put_chunks(
+    transfer: Any, session: TransferSession, view: memoryview, streams: int
+) -> None:
+    """Send the chunks of `view` the node hasn't received yet for `session`,
+    `streams` at a time. Raises TransferError on the first rejected chunk."""
+
+    def put_chunk(index: int) -> None:
+        chunk = session.chunk_range(index)
+        data = bytes(view[chunk.start : chunk.stop])  # noqa: E203
+        _raise_on_error(
+            transfer.put_chunk(
+                session_id=session.id,
+                index=index,
+                data=data,
+                digest=chunk_digest(data),
+            )
+        )
+
+    missing = sorted(set(range(session.chunk_count)) - set(session.received))
+    with ThreadPoolExecutor(max_workers=max(1, streams)) as executor:
+        list(executor.map(put_chunk, missing))
+
+
+def upload_object(
+    api: Any,
+    obj: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    streams: int = DEFAULT_STREAMS,
+) -> Any:
+    """Upload `obj` to the action store in chunks, `streams` at a time
+
+    A chunk the node already acknowledged for the same object and content isn't
+    sent again, so calling this again after a failure resumes the upload.
+    Returns the response of `action.set`, or the SyftError that stopped it.
+    """
+    blob = _serialize(obj, to_bytes=True)
+    view = memoryview(blob)
+    transfer = api.services.transfer
+    session = transfer.begin_upload(
+        object_id=obj.id,
+        size=len(blob),
+        digest=chunk_digest(view),
+        chunk_size=chunk_size,
+    )
+    if isinstance(session, SyftError):
+        return session
+
+    try:
+        put_chunks(transfer, session, view, streams)
+    except TransferError as e:
+        return SyftError(message=f"Upload of {obj.id} failed, retry to resume: {e}")
+    return transfer.commit_upload(session_id=session.id)
+
+
+def download_object(
+    api: Any,
+    uid: UID,
+    twin_mode: Optional[Any] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    streams: int = DEFAULT_STREAMS,
+) -> Any:
+    """Download an object of the action store in ranged chunks, `streams` at a
+    time, as `action.get` would return it with the same `twin_mode`"""
+    transfer = api.services.transfer
+    kwargs = {"uid": uid, "chunk_size": chunk_size}
+    if twin_mode is not None:
+        kwargs["twin_mode"] = twin_mode
+    session = transfer.begin_download(**kwargs)
+    if isinstance(session, SyftError):
+        return session
+
+    buffer = bytearray(session.size)
+    view = memoryview(buffer)
+
+    def get_chunk(index: int) -> None:
+        chunk = session.chunk_range(index)
+        data = _raise_on_error(
+            transfer.get_chunk(
+                session_id=session.id, offset=chunk.start, length=len(chunk)
+            )
+        )
+        view[chunk.start : chunk.start + len(data)] = data  # noqa: E203
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, streams)) as executor:
+            list(executor.map(get_chunk, range(session.chunk_count)))
+    except TransferError as e:
+        return SyftError(message=f"Download of {uid} failed: {e}")
+    finally:
+        transfer.end_transfer(session_id=session.id)
+
+    if chunk_digest(view) != session.digest:
+        return SyftError(message=f"Download of {uid} is corrupted")
+    return _deserialize(view, from_bytes=True)
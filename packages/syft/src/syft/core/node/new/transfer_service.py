@@ -0,0 +1,401 @@
+# stdlib
+import hashlib
+import mmap
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+from typing import List
+from typing import Tuple
+from typing import Union
+
+# third party
+from result import Err
+from result import Ok
+from result import Result
+
+# relative
+from ....telemetry import instrument
+from .action_object import ActionObject
+from .action_service import TwinMode
+from .context import AuthedServiceContext
+from .deserialize import _deserialize
+from .document_store import DocumentStore
+from .response import SyftError
+from .response import SyftSuccess
+from .serializable import serializable
+from .serialize import _serialize
+from .service import AbstractService
+from .service import service_method
+from .transfer import DEFAULT_CHUNK_SIZE
+from .transfer import MAX_CHUNK_SIZE
+from .transfer import TransferSession
+from .transfer import chunk_digest
+from .transfer_stash import TransferSessionStash
+from .uid import UID
+from .user_roles import GUEST_ROLE_LEVEL
+
+UPLOAD = "upload"
+DOWNLOAD = "download"
+PAYLOAD_NAME = "payload"
+
+# serializes the quota checks of new sessions with their creation
+_quota_lock = threading.Lock()
+
+
+@instrument
+@serializable()
+class TransferService(AbstractService):
+    """Chunked, resumable transfers of action objects
+
+    An upload is begun with the size and digest of the serialized object, each
+    chunk is then sent with its own digest and written to a file of its own in
+    the staging folder of the session, so chunks can arrive in parallel and in
+    any order. Beginning the same upload again returns the chunks already
+    received. The commit assembles the chunks, checks the digest and saves the
+    object with `action.set`. A download serializes the object once into the
+    staging folder and serves byte ranges of it. The staging folder is next to
+    the blob files of the action store, or in the temp folder without those.
+    Sessions older than `session_ttl` seconds, and uploads without a chunk for
+    `upload_idle_ttl` seconds, are removed when a new session begins.
+    Each user has at most `max_sessions` sessions open, of at most
+    `max_session_bytes` bytes together.
+    """
+
+    store: DocumentStore
+    stash: TransferSessionStash
+    session_ttl: float = 24 * 3600.0
+    upload_idle_ttl: float = 3600.0
+    max_sessions: int = 8
+    max_session_bytes: int = 16 * 1024**3
+
+    def __init__(self, store: DocumentStore) -> None:
+        self.store = store
+        self.stash = TransferSessionStash(store=store)
+
+    def _root(self, context: AuthedServiceContext) -> Path:
+        blob_storage = context.node.action_store.store_config.blob_storage
+        if blob_storage is not None:
+            root = blob_storage.root / "transfers"
+        else:
+            root = Path(tempfile.gettempdir()) / "syft_transfers"
+        return root / str(context.node.id)
+
+    def _session_dir(
+        self, context: AuthedServiceContext, session: TransferSession
+    ) -> Path:
+        return self._root(context) / str(session.id)
+
+    def _chunk_path(
+        self, context: AuthedServiceContext, session: TransferSession, index: int
+    ) -> Path:
+        return self._session_dir(context, session) / f"{index:08d}.chunk"
+
+    def _received(
+        self, context: AuthedServiceContext, session: TransferSession
+    ) -> List[int]:
+        path = self._session_dir(context, session)
+        if not path.exists():
+            return []
+        return sorted(int(chunk.stem) for chunk in path.glob("*.chunk"))
+
+    def _get_session(
+        self, context: AuthedServiceContext, session_id: UID, direction: str
+    ) -> Result[TransferSession, str]:
+        result = self.stash.get_by_uid(session_id)
+        if result.is_err():
+            return result
+        session = result.ok()
+        if (
+            session is None
+            or session.direction != direction
+            or session.verify_key != context.credentials.verify
+        ):
+            return Err(f"No {direction} session: {session_id}")
+        return Ok(session)
+
+    def _remove(self, context: AuthedServiceContext, session: TransferSession) -> None:
+        shutil.rmtree(self._session_dir(context, session), ignore_errors=True)
+        self.stash.delete_by_uid(session.id)
+
+    def _last_active(
+        self, context: AuthedServiceContext, session: TransferSession
+    ) -> float:
+        # chunks are renamed into the session folder, which updates its mtime
+        try:
+            return self._session_dir(context, session).stat().st_mtime
+        except FileNotFoundError:
+            return session.created_at
+
+    def _expire_sessions(self, context: AuthedServiceContext) -> None:
+        result = self.stash.get_all()
+        if result.is_err():
+            return
+        now = time.time()
+        for session in result.ok():
+            if session.created_at < now - self.session_ttl or (
+                session.direction == UPLOAD
+                and self._last_active(context, session) < now - self.upload_idle_ttl
+            ):
+                self._remove(context, session)
+
+    def _check_quota(
+        self, context: AuthedServiceContext, size: int
+    ) -> Result[None, str]:
+        """If the user can open one more session of `size` bytes"""
+        if size > self.max_session_bytes:
+            return Err(f"Size {size} exceeds the limit of {self.max_session_bytes}")
+        result = self.stash.get_by_verify_key(context.credentials.verify)
+        if result.is_err():
+            return result
+        sessions = result.ok()
+        if len(sessions) >= self.max_sessions:
+            return Err(f"Too many open transfers, end one of the {len(sessions)} first")
+        total = sum(session.size for session in sessions) + size
+        if total > self.max_session_bytes:
+            return Err(
+                f"Open transfers of {total} bytes exceed the limit of "
+                f"{self.max_session_bytes}, end some first"
+            )
+        return Ok(None)
+
+    def _assemble(
+        self, context: AuthedServiceContext, session: TransferSession
+    ) -> Result[Path, str]:
+        missing = set(range(session.chunk_count)) - set(
+            self._received(context, session)
+        )
+        if len(missing) > 0:
+            return Err(f"Chunks missing: {sorted(missing)}")
+
+        payload_path = self._session_dir(context, session) / PAYLOAD_NAME
+        digest = hashlib.sha256()
+        with open(payload_path, "wb") as payload:
+            for index in range(session.chunk_count):
+                with open(self._chunk_path(context, session, index), "rb") as chunk:
+                    while True:
+                        data = chunk.read(1024**2)
+                        if not data:
+                            break
+                        digest.update(data)
+                        payload.write(data)
+        if digest.hexdigest() != session.digest:
+            self._remove(context, session)
+            return Err("Upload doesn't match its digest, begin again")
+        return Ok(payload_path)
+
+    def staged_upload(
+        self, context: AuthedServiceContext, session_id: UID
+    ) -> Result[Tuple[TransferSession, Path], str]:
+        """Assemble a complete upload into a file of its staging folder, for
+        services reading the uploaded bytes themselves instead of committing
+        them as an action object. The caller ends the session with `discard`."""
+        result = self._get_session(context, session_id, UPLOAD)
+        if result.is_err():
+            return result
+        session = result.ok()
+        result = self._assemble(context, session)
+        if result.is_err():
+            return result
+        return Ok((session, result.ok()))
+
+    def discard(self, context: AuthedServiceContext, session: TransferSession) -> None:
+        self._remove(context, session)
+
+    @service_method(
+        path="transfer.begin_upload", name="begin_upload", roles=GUEST_ROLE_LEVEL
+    )
+    def begin_upload(
+        self,
+        context: AuthedServiceContext,
+        object_id: UID,
+        size: int,
+        digest: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Union[TransferSession, SyftError]:
+        """Begin or resume the chunked upload of an action object"""
+        if size < 0 or not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            return SyftError(message="Invalid size or chunk_size")
+        self._expire_sessions(context)
+
+        result = self.stash.get_by_digest(digest)
+        if result.is_err():
+            return SyftError(message=result.err())
+        for session in result.ok():
+            if (
+                session.direction == UPLOAD
+                and session.object_id == object_id
+                and session.verify_key == context.credentials.verify
+                and session.size == size
+                and session.chunk_size == chunk_size
+            ):
+                session.received = self._received(context, session)
+                return session
+
+        session = TransferSession(
+            object_id=object_id,
+            direction=UPLOAD,
+            verify_key=context.credentials.verify,
+            size=size,
+            digest=digest,
+            chunk_size=chunk_size,
+            created_at=time.time(),
+        )
+        with _quota_lock:
+            result = self._check_quota(context, size)
+            if result.is_err():
+                return SyftError(message=result.err())
+            result = self.stash.set(session)
+        if result.is_err():
+            return SyftError(message=result.err())
+        self._session_dir(context, session).mkdir(parents=True, exist_ok=True)
+        return session
+
+    @service_method(path="transfer.put_chunk", name="put_chunk", roles=GUEST_ROLE_LEVEL)
+    def put_chunk(
+        self,
+        context: AuthedServiceContext,
+        session_id: UID,
+        index: int,
+        data: bytes,
+        digest: str,
+    ) -> Union[SyftSuccess, SyftError]:
+        """Store one chunk of an upload, checked against its digest"""
+        result = self._get_session(context, session_id, UPLOAD)
+        if result.is_err():
+            return SyftError(message=result.err())
+        session = result.ok()
+
+        if not 0 <= index < session.chunk_count:
+            return SyftError(message=f"Chunk {index} out of range")
+        if len(data) != len(session.chunk_range(index)):
+            return SyftError(message=f"Chunk {index} has the wrong size")
+        if chunk_digest(data) != digest:
+            return SyftError(message=f"Chunk {index} doesn't match its digest")
+
+        path = self._chunk_path(context, session, index)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return SyftSuccess(message=f"Chunk {index} received")
+
+    @service_method(
+        path="transfer.commit_upload", name="commit_upload", roles=GUEST_ROLE_LEVEL
+    )
+    def commit_upload(
+        self, context: AuthedServiceContext, session_id: UID
+    ) -> Union[ActionObject, SyftError]:
+        """Assemble the chunks of an upload and save the object"""
+        result = self._get_session(context, session_id, UPLOAD)
+        if result.is_err():
+            return SyftError(message=result.err())
+        session = result.ok()
+
+        result = self._assemble(context, session)
+        if result.is_err():
+            return SyftError(message=result.err())
+        payload_path = result.ok()
+
+        with open(payload_path, "rb") as payload:
+            with mmap.mmap(payload.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    obj = _deserialize(view, from_bytes=True)
+                finally:
+                    view.release()
+        if obj.id != session.object_id:
+            self._remove(context, session)
+            return SyftError(message=f"Uploaded object isn't {session.object_id}")
+
+        action_service = context.node.get_service("actionservice")
+        result = action_service.set(context, obj)
+        self._remove(context, session)
+        if isinstance(result, Ok):
+            return result.ok()
+        return SyftError(
+            message=str(result.err() if isinstance(result, Err) else result)
+        )
+
+    @service_method(
+        path="transfer.begin_download", name="begin_download", roles=GUEST_ROLE_LEVEL
+    )
+    def begin_download(
+        self,
+        context: AuthedServiceContext,
+        uid: UID,
+        twin_mode: TwinMode = TwinMode.PRIVATE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Union[TransferSession, SyftError]:
+        """Begin the ranged download of an action object, as `action.get` returns
+        it with the same `twin_mode`"""
+        if not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+            return SyftError(message="Invalid chunk_size")
+        self._expire_sessions(context)
+
+        action_service = context.node.get_service("actionservice")
+        result = action_service.get(context=context, uid=uid, twin_mode=twin_mode)
+        if result.is_err():
+            return SyftError(message=str(result.err()))
+
+        blob = _serialize(result.ok(), to_bytes=True)
+        session = TransferSession(
+            object_id=uid,
+            direction=DOWNLOAD,
+            verify_key=context.credentials.verify,
+            size=len(blob),
+            digest=chunk_digest(blob),
+            chunk_size=chunk_size,
+            created_at=time.time(),
+        )
+        with _quota_lock:
+            result = self._check_quota(context, session.size)
+            if result.is_err():
+                return SyftError(message=result.err())
+            result = self.stash.set(session)
+        if result.is_err():
+            return SyftError(message=result.err())
+        path = self._session_dir(context, session)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / PAYLOAD_NAME).write_bytes(blob)
+        return session
+
+    @service_method(path="transfer.get_chunk", name="get_chunk", roles=GUEST_ROLE_LEVEL)
+    def get_chunk(
+        self, context: AuthedServiceContext, session_id: UID, offset: int, length: int
+    ) -> Union[bytes, SyftError]:
+        """Read `length` bytes at `offset` of a download"""
+        result = self._get_session(context, session_id, DOWNLOAD)
+        if result.is_err():
+            return SyftError(message=result.err())
+        session = result.ok()
+
+        if offset < 0 or length < 0 or offset > session.size:
+            return SyftError(message=f"Range {offset}+{length} out of bounds")
+        with open(self._session_dir(context, session) / PAYLOAD_NAME, "rb") as payload:
+            payload.seek(offset)
+            return payload.read(min(length, session.size - offset))
+
+    @service_method(
+        path="transfer.end_transfer", name="end_transfer", roles=GUEST_ROLE_LEVEL
+    )
+    def end_transfer(
+        self, context: AuthedServiceContext, session_id: UID
+    ) -> Union[SyftSuccess, SyftError]:
+        """Finish a download or abort an upload, removing its staged data"""
+        result = self.stash.get_by_uid(session_id)
+        if result.is_err():
+            return SyftError(message=result.err())
+        session = result.ok()
+        if session is None or session.verify_key != context.credentials.verify:
+            return SyftError(message=f"No session: {session_id}")
+        self._remove(context, session)
+        return SyftSuccess(message=f"Session {session_id} ended")
@@ -0,0 +1,42 @@
+# stdlib
+from typing import List
+
+# third party
+from result import Result
+
+# relative
+from .document_store import BaseUIDStoreStash
+from .document_store import DocumentStore
+from .document_store import PartitionKey
+from .document_store import PartitionSettings
+from .document_store import QueryKeys
+from .serializable import serializable
+from .transfer import TransferSession
+from .uid import UID
+
+ObjectIDPartitionKey = PartitionKey(key="object_id", type_=UID)
+DigestPartitionKey = PartitionKey(key="digest", type_=str)
+VerifyKeyPartitionKey = PartitionKey(key="verify_key", type_=str)
+
+
+@serializable()
+class TransferSessionStash(BaseUIDStoreStash):
+    object_type = TransferSession
+    settings: PartitionSettings = PartitionSettings(
+        name=TransferSession.__canonical_name__, object_type=TransferSession
+    )
+
+    def __init__(self, store: DocumentStore) -> None:
+        super().__init__(store=store)
+
+    def get_by_object_id(self, uid: UID) -> Result[List[TransferSession], str]:
+        qks = QueryKeys(qks=[ObjectIDPartitionKey.with_obj(uid)])
+        return self.query_all(qks=qks)
+
+    def get_by_digest(self, digest: str) -> Result[List[TransferSession], str]:
+        qks = QueryKeys(qks=[DigestPartitionKey.with_obj(digest)])
+        return self.query_all(qks=qks)
+
+    def get_by_verify_key(self, verify_key: str) -> Result[List[TransferSession], str]:
+        qks = QueryKeys(qks=[VerifyKeyPartitionKey.with_obj(verify_key)])
+        return self.query_all(qks=qks)
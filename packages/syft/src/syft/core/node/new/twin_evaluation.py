@@ -0,0 +1,96 @@
+# stdlib
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+# third party
+from result import Err
+from result import Ok
+from result import Result
+
+# relative
+from .base import SyftBaseModel
+from .serializable import serializable
+
+TWIN_EVALUATION_POLICIES = ("thread", "sequential")
+
+SideResult = Optional[Result[Any, str]]
+
+
+@serializable()
+class TwinEvaluationConfig(SyftBaseModel):
+    """Evaluation of the private and mock sides of a twin by the ActionService
+
+    Parameters:
+        `policy`: str
+            "thread" evaluates the mock side on a thread pool while the private
+            side runs in the request thread, "sequential" evaluates one side
+            after the other in the request thread. Default "thread"
+        `max_workers`: int
+            Threads of the pool shared by the requests. Default 4
+    """
+
+    policy: str = "thread"
+    max_workers: int = 4
+
+
+def evaluate_side(side: Callable[[], Any]) -> Result[Any, str]:
+    """Run one side, its exception never reaches the other side"""
+    try:
+        return Ok(side())
+    except Exception as e:
+        return Err(f"{type(e).__name__}: {e}")
+
+
+class TwinEvaluator:
+    """Runs the private and mock sides of a twin operation
+
+    Each side gets its own Result, so a failing mock doesn't hide the private
+    result and the other way around. A side given as None is skipped.
+    """
+
+    def __init__(self, config: Optional[TwinEvaluationConfig] = None) -> None:
+        self.config = config if config is not None else TwinEvaluationConfig()
+        if self.config.policy not in TWIN_EVALUATION_POLICIES:
+            raise ValueError(
+                f"Unknown twin evaluation policy {self.config.policy}, "
+                f"use one of {TWIN_EVALUATION_POLICIES}"
+            )
+        if self.config.max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.config.max_workers,
+                    thread_name_prefix="syft-twin",
+                )
+            return self._pool
+
+    def evaluate(
+        self,
+        private: Optional[Callable[[], Any]],
+        mock: Optional[Callable[[], Any]],
+    ) -> Tuple[SideResult, SideResult]:
+        """Results of the private and mock sides, None for a skipped side"""
+        if private is None or mock is None or self.config.policy == "sequential":
+            private_result = evaluate_side(private) if private is not None else None
+            mock_result = evaluate_side(mock) if mock is not None else None
+            return private_result, mock_result
+
+        mock_future = self.pool.submit(evaluate_side, mock)
+        private_result = evaluate_side(private)
+        return private_result, mock_future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
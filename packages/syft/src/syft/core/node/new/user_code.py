@@ -3,6 +3,7 @@ from __future__ import annotations
 
 # stdlib
 import ast
+from contextlib import contextmanager
 from enum import Enum
 import hashlib
 import inspect
@@ -10,11 +11,14 @@ from inspect import Parameter
 from inspect import Signature
 from io import StringIO
 import sys
+import threading
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
@@ -117,20 +121,19 @@ class InputPolicy(SyftObject):
 def retrieve_from_db(
     code_item_id: UID, allowed_inputs: Dict[str, UID], context: AuthedServiceContext
 ) -> Dict:
-    # relative
-    from .action_service import TwinMode
-
     action_service = context.node.get_service("actionservice")
     code_inputs = {}
 
     if context.node.node_type == NodeType.DOMAIN:
+        # every input is read with one permission check
+        kwarg_values = action_service.get_many(
+            context=context, uids=list(allowed_inputs.values())
+        )
+        if kwarg_values.is_err():
+            return kwarg_values
+        kwarg_values = kwarg_values.ok()
         for var_name, arg_id in allowed_inputs.items():
-            kwarg_value = action_service.get(
-                context=context, uid=arg_id, twin_mode=TwinMode.NONE
-            )
-            if kwarg_value.is_err():
-                return kwarg_value
-            code_inputs[var_name] = kwarg_value.ok()
+            code_inputs[var_name] = kwarg_values[arg_id]
 
     elif context.node.node_type == NodeType.ENCLAVE:
         # TODO 🟣 Temporarily added skip permission arguments for enclave
@@ -749,28 +752,73 @@ class UserCodeExecutionResult(SyftObject):
     result: Any
 
 
-def execute_byte_code(code_item: UserCode, kwargs: Dict[str, Any]) -> Any:
-    stdout_ = sys.stdout
-    stderr_ = sys.stderr
+class ThreadOutput:
+    """Stands in for sys.stdout or sys.stderr while user code runs, so code
+    running in several threads at once captures its own output"""
+
+    def __init__(self, name: str, stream: Any) -> None:
+        self.name = name
+        self.stream = stream
+
+    def _target(self) -> Any:
+        captured = getattr(_captured_output, self.name, None)
+        return captured if captured is not None else self.stream
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
 
+
+_captured_output = threading.local()
+_capture_lock = threading.Lock()
+_capture_count = 0
+
+
+@contextmanager
+def captured_output() -> Iterator[Tuple[StringIO, StringIO]]:
+    """Buffers of what the current thread writes to stdout and stderr"""
+    global _capture_count
+    stdout, stderr = StringIO(), StringIO()
+    with _capture_lock:
+        if _capture_count == 0:
+            sys.stdout = ThreadOutput("stdout", sys.stdout)
+            sys.stderr = ThreadOutput("stderr", sys.stderr)
+        _capture_count += 1
+    previous = (
+        getattr(_captured_output, "stdout", None),
+        getattr(_captured_output, "stderr", None),
+    )
+    _captured_output.stdout, _captured_output.stderr = stdout, stderr
     try:
-        stdout = StringIO()
-        stderr = StringIO()
+        yield stdout, stderr
+    finally:
+        _captured_output.stdout, _captured_output.stderr = previous
+        with _capture_lock:
+            _capture_count -= 1
+            if _capture_count == 0:
+                if isinstance(sys.stdout, ThreadOutput):
+                    sys.stdout = sys.stdout.stream
+                if isinstance(sys.stderr, ThreadOutput):
+                    sys.stderr = sys.stderr.stream
 
-        sys.stdout = stdout
-        sys.stderr = stderr
 
-        # statisfy lint checker
-        result = None
+def execute_byte_code(code_item: UserCode, kwargs: Dict[str, Any]) -> Any:
+    stderr_ = sys.stderr
 
-        exec(code_item.byte_code)  # nosec
+    try:
+        with captured_output() as (stdout, stderr):
+            # statisfy lint checker
+            result = None
 
-        evil_string = f"{code_item.unique_func_name}(**kwargs)"
-        result = eval(evil_string, None, locals())  # nosec
+            exec(code_item.byte_code)  # nosec
 
-        # restore stdout and stderr
-        sys.stdout = stdout_
-        sys.stderr = stderr_
+            evil_string = f"{code_item.unique_func_name}(**kwargs)"
+            result = eval(evil_string, None, locals())  # nosec
 
         return UserCodeExecutionResult(
             user_code_id=code_item.id,
@@ -781,6 +829,3 @@ def execute_byte_code(code_item: UserCode, kwargs: Dict[str, Any]) -> Any:
 
     except Exception as e:
         print("execute_byte_code failed", e, file=stderr_)
-    finally:
-        sys.stdout = stdout_
-        sys.stderr = stderr_
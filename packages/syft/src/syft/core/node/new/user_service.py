@@ -100,6 +100,16 @@ class UserService(AbstractService):
                 return user.role
         return ServiceRole.GUEST
 
+    async def async_get_role_for_credentials(
+        self, credentials: SyftVerifyKey
+    ) -> Union[Optional[ServiceRole], SyftError]:
+        result = await self.stash.async_get_by_verify_key(verify_key=credentials)
+        if result.is_ok():
+            user = result.ok()
+            if user:
+                return user.role
+        return ServiceRole.GUEST
+
     @service_method(path="user.search", name="search", autosplat=["user_search"])
     def search(
         self,
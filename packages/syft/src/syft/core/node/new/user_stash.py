@@ -71,6 +71,14 @@ class UserStash(BaseStash):
         qks = QueryKeys(qks=[VerifyKeyPartitionKey.with_obj(verify_key)])
         return self.query_one(qks=qks)
 
+    async def async_get_by_verify_key(
+        self, verify_key: SyftVerifyKey
+    ) -> Result[Optional[User], str]:
+        if isinstance(verify_key, str):
+            verify_key = SyftVerifyKey.from_string(verify_key)
+        qks = QueryKeys(qks=[VerifyKeyPartitionKey.with_obj(verify_key)])
+        return await self.async_query_one(qks=qks)
+
     def delete_by_uid(self, uid: UID) -> Result[SyftSuccess, str]:
         qk = UIDPartitionKey.with_obj(uid)
         result = super().delete(qk=qk)
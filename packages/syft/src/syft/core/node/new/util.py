@@ -20,10 +20,12 @@ import re
 from secrets import randbelow
 import socket
 import sys
+import threading
 import time
 from types import ModuleType
 from typing import Any
 from typing import Callable
+from typing import Coroutine
 from typing import Dict
 from typing import Iterator
 from typing import List
@@ -570,6 +572,38 @@ def initializer(event_loop: Optional[BaseSelectorEventLoop] = None) -> None:
         asyncio.set_event_loop(event_loop)
 
 
+_bridge_loop: Optional[asyncio.AbstractEventLoop] = None
+_bridge_lock = threading.Lock()
+
+
+def run_coroutine_sync(coro: Coroutine) -> Any:
+    """Run a coroutine to completion from synchronous code.
+    The coroutines of all the sync callers run on one event loop in a background
+    thread, clients bound to an event loop are then only created once.
+    Args:
+        coro (Coroutine): The coroutine to run.
+    Returns:
+        Any: What the coroutine returns.
+    """
+    global _bridge_loop
+    with _bridge_lock:
+        if _bridge_loop is None or _bridge_loop.is_closed():
+            _bridge_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_bridge_loop.run_forever, name="sync-bridge", daemon=True
+            ).start()
+        loop = _bridge_loop
+
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("run_coroutine_sync called from the bridge event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
 # local scope functions cant be pickled so this needs to be global
 def parallel_execution(
     fn: Callable[..., Any],
@@ -1,10 +1,14 @@
 # future
 from __future__ import annotations
 
+# stdlib
+from typing import Optional
+
 # third party
 from typing_extensions import Self
 
 # relative
+from ..new.action_config import ActionConfig
 from ..new.credentials import SyftSigningKey
 from ..new.document_store import StoreConfig
 from ..new.node import NewNode
@@ -24,6 +28,7 @@ class WorkerSettings(SyftObject):
     signing_key: SyftSigningKey
     document_store_config: StoreConfig
     action_store_config: StoreConfig
+    action_config: Optional[ActionConfig] = None
 
     @staticmethod
     def from_node(node: NewNode) -> Self:
@@ -33,6 +38,7 @@ class WorkerSettings(SyftObject):
             signing_key=node.signing_key,
             document_store_config=node.document_store_config,
             action_store_config=node.action_store_config,
+            action_config=node.action_config,
         )
 
     def __hash__(self) -> int:
@@ -42,4 +48,5 @@ class WorkerSettings(SyftObject):
             + hash(self.signing_key)
             + hash(self.document_store_config)
             + hash(self.action_store_config)
+            + hash(self.action_config)
         )
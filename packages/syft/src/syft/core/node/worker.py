@@ -2,17 +2,22 @@
 from __future__ import annotations
 
 # stdlib
+import asyncio
 import contextlib
 from datetime import datetime
 from functools import partial
 import hashlib
+import inspect
 import os
+from pathlib import Path
 from typing import Any
+from typing import BinaryIO
 from typing import Callable
 from typing import List
 from typing import Optional
 from typing import Type
 from typing import Union
+import weakref
 
 # third party
 import gevent
@@ -27,8 +32,12 @@ from ... import __version__
 from ...external import OBLV
 from ...telemetry import instrument
 from ...util import random_name
+from .new.action_config import ActionConfig
+from .new.action_lifecycle import ActionGarbageCollector
 from .new.action_service import ActionService
 from .new.action_store import DictActionStore
+from .new.action_store import LMDBActionStore
+from .new.action_store import RedisActionStore
 from .new.action_store import SQLiteActionStore
 from .new.api import SignedSyftAPICall
 from .new.api import SyftAPI
@@ -46,29 +55,37 @@ from .new.dataset_service import DatasetService
 from .new.deserialize import _deserialize
 from .new.dict_document_store import DictStoreConfig
 from .new.document_store import StoreConfig
+from .new.lmdb_document_store import LMDBStoreConfig
 from .new.message_service import MessageService
 from .new.metadata_service import MetadataService
 from .new.metadata_stash import MetadataStash
 from .new.network_service import NetworkService
 from .new.node import NewNode
 from .new.node import NodeType
+from .new.node_backup import NodeBackup
 from .new.node_metadata import NodeMetadata
 from .new.project_service import ProjectService
 from .new.queue_stash import QueueItem
 from .new.queue_stash import QueueStash
+from .new.redis_document_store import RedisStoreConfig
 from .new.request_service import RequestService
 from .new.response import SyftError
+from .new.response import SyftSuccess
+from .new.schema_migration import SchemaMigration
 from .new.serializable import serializable
 from .new.serialize import _serialize
 from .new.service import AbstractService
 from .new.service import ServiceConfigRegistry
 from .new.service import UserServiceConfigRegistry
+from .new.service import call_service_method
 from .new.sqlite_document_store import SQLiteStoreClientConfig
 from .new.sqlite_document_store import SQLiteStoreConfig
+from .new.store_metrics_service import StoreMetricsService
 from .new.syft_object import HIGHEST_SYFT_OBJECT_VERSION
 from .new.syft_object import LOWEST_SYFT_OBJECT_VERSION
 from .new.syft_object import SyftObject
 from .new.test_service import TestService
+from .new.transfer_service import TransferService
 from .new.uid import UID
 from .new.user import User
 from .new.user import UserCreate
@@ -122,6 +139,7 @@ class Worker(NewNode):
         signing_key: Optional[Union[SyftSigningKey, SigningKey]] = None,
         action_store_config: Optional[StoreConfig] = None,
         document_store_config: Optional[StoreConfig] = None,
+        action_config: Optional[ActionConfig] = None,
         root_email: str = "info@openmined.org",
         root_password: str = "changethis",
         processes: int = 0,
@@ -129,6 +147,7 @@ class Worker(NewNode):
         node_type: NodeType = NodeType.DOMAIN,
         local_db: bool = False,
         sqlite_path: Optional[str] = None,
+        ingest_root: Optional[Union[str, Path]] = None,
     ):
         # 🟡 TODO 22: change our ENV variable format and default init args to make this
         # less horrible or add some convenience functions
@@ -169,6 +188,8 @@ class Worker(NewNode):
                 MessageService,
                 ProjectService,
                 DataSubjectMemberService,
+                StoreMetricsService,
+                TransferService,
             ]
             if services is None
             else services
@@ -177,9 +198,11 @@ class Worker(NewNode):
         self.service_config = ServiceConfigRegistry.get_registered_configs()
         self.local_db = local_db
         self.sqlite_path = sqlite_path
+        self.ingest_root = ingest_root
         self.init_stores(
             action_store_config=action_store_config,
             document_store_config=document_store_config,
+            action_config=action_config,
         )
 
         if OBLV:
@@ -267,6 +290,7 @@ class Worker(NewNode):
         self,
         document_store_config: Optional[StoreConfig] = None,
         action_store_config: Optional[StoreConfig] = None,
+        action_config: Optional[ActionConfig] = None,
     ):
         if document_store_config is None:
             if self.local_db or (self.processes > 0 and not self.is_subprocess):
@@ -283,6 +307,11 @@ class Worker(NewNode):
             print(
                 f"SQLite Store Path:\n!open file://{document_store_config.client_config.file_path}\n"
             )
+        if (
+            isinstance(document_store_config, LMDBStoreConfig)
+            and document_store_config.client_config.filename is None
+        ):
+            document_store_config.client_config.filename = f"{self.id}.lmdb"
         document_store = document_store_config.store_type
         self.document_store_config = document_store_config
 
@@ -299,18 +328,47 @@ class Worker(NewNode):
             and action_store_config.client_config.filename is None
         ):
             action_store_config.client_config.filename = f"{self.id}.sqlite"
+        if (
+            isinstance(action_store_config, LMDBStoreConfig)
+            and action_store_config.client_config.filename is None
+        ):
+            action_store_config.client_config.filename = f"{self.id}.lmdb"
 
         if isinstance(action_store_config, SQLiteStoreConfig):
             self.action_store = SQLiteActionStore(
                 store_config=action_store_config,
                 root_verify_key=self.signing_key.verify_key,
+                action_config=action_config,
+            )
+        elif isinstance(action_store_config, LMDBStoreConfig):
+            self.action_store = LMDBActionStore(
+                store_config=action_store_config,
+                root_verify_key=self.signing_key.verify_key,
+                action_config=action_config,
+            )
+        elif isinstance(action_store_config, RedisStoreConfig):
+            self.action_store = RedisActionStore(
+                store_config=action_store_config,
+                root_verify_key=self.signing_key.verify_key,
+                action_config=action_config,
             )
         else:
             self.action_store = DictActionStore(
-                root_verify_key=self.signing_key.verify_key
+                store_config=action_store_config,
+                root_verify_key=self.signing_key.verify_key,
+                action_config=action_config,
             )
 
         self.action_store_config = action_store_config
+        self.action_config = self.action_store.action_config
+        if getattr(self, "action_gc", None) is not None:
+            self.action_gc.stop()
+        self.action_gc: Optional[ActionGarbageCollector] = None
+        if self.action_config.lifecycle is not None and not self.is_subprocess:
+            self.action_gc = ActionGarbageCollector(self.action_store)
+            self.action_gc.start()
+            # the collector thread doesn't refer to the worker, it is stopped with it
+            weakref.finalize(self, self.action_gc.stop)
         self.queue_stash = QueueStash(store=self.document_store)
 
     def _construct_services(self):
@@ -320,6 +378,8 @@ class Worker(NewNode):
             kwargs = {}
             if service_klass == ActionService:
                 kwargs["store"] = self.action_store
+            if service_klass == DatasetService:
+                kwargs["ingest_root"] = self.ingest_root
             store_services = [
                 UserService,
                 MetadataService,
@@ -331,6 +391,7 @@ class Worker(NewNode):
                 MessageService,
                 ProjectService,
                 DataSubjectMemberService,
+                TransferService,
             ]
 
             if OBLV:
@@ -396,7 +457,19 @@ class Worker(NewNode):
 
         return True
 
-    def resolve_future(self, uid: UID) -> Union[Optional[QueueItem], SyftError]:
+    def resolve_future(
+        self, uid: UID, timeout: Optional[float] = None
+    ) -> Union[Optional[QueueItem], SyftError]:
+        if timeout is not None:
+            try:
+                timeout = float(timeout)
+            except (TypeError, ValueError):
+                return SyftError(message=f"Invalid timeout: {timeout}")
+            # push instead of client side polling, hold the call until it's stored,
+            # the stash caps how long a call can be held
+            result = self.queue_stash.wait_for(uid, timeout=timeout)
+            if result.is_err():
+                return result.err()
         result = self.queue_stash.pop(uid)
         if result.is_ok():
             return result.ok()
@@ -438,6 +511,30 @@ class Worker(NewNode):
         )
         return role
 
+    async def async_get_role_for_credentials(
+        self, credentials: SyftVerifyKey
+    ) -> ServiceRole:
+        user_service = self.get_service("userservice")
+        return await user_service.async_get_role_for_credentials(
+            credentials=credentials
+        )
+
+    def _service_method_for_role(
+        self, path: str, role: ServiceRole
+    ) -> Union[Callable, SyftError]:
+        user_config_registry = UserServiceConfigRegistry.from_role(role)
+
+        if path not in user_config_registry:
+            if ServiceConfigRegistry.path_exists(path):
+                return SyftError(
+                    message=f"As a `{role}`, you have has no access to: {path}"
+                )  # type: ignore
+            else:
+                return SyftError(message=f"API call not in registered services: {path}")  # type: ignore
+
+        _private_api_path = user_config_registry.private_path_for(path)
+        return self.get_service_method(_private_api_path)
+
     def handle_api_call(
         self, api_call: Union[SyftAPICall, SignedSyftAPICall]
     ) -> Result[SignedSyftAPICall, Err]:
@@ -463,7 +560,10 @@ class Worker(NewNode):
             return self.forward_message(api_call=api_call)
 
         if api_call.message.path == "queue":
-            return self.resolve_future(uid=api_call.message.kwargs["uid"])
+            return self.resolve_future(
+                uid=api_call.message.kwargs["uid"],
+                timeout=api_call.message.kwargs.get("timeout", None),
+            )
 
         if api_call.message.path == "metadata":
             return self.metadata
@@ -478,21 +578,13 @@ class Worker(NewNode):
                 node=self, credentials=credentials, role=role
             )
 
-            user_config_registry = UserServiceConfigRegistry.from_role(role)
-
-            if api_call.path not in user_config_registry:
-                if ServiceConfigRegistry.path_exists(api_call.path):
-                    return SyftError(
-                        message=f"As a `{role}`,"
-                        "you have has no access to: {api_call.path}"
-                    )  # type: ignore
-                else:
-                    return SyftError(message=f"API call not in registered services: {api_call.path}")  # type: ignore
-
-            _private_api_path = user_config_registry.private_path_for(api_call.path)
-            method = self.get_service_method(_private_api_path)
+            method = self._service_method_for_role(api_call.path, role)
+            if isinstance(method, SyftError):
+                return method
             try:
-                result = method(context, *api_call.args, **api_call.kwargs)
+                result = call_service_method(
+                    method, context, *api_call.args, **api_call.kwargs
+                )
             except Exception as e:
                 result = SyftError(message=f"Exception calling {api_call.path}. {e}")
         else:
@@ -502,6 +594,7 @@ class Worker(NewNode):
                 signing_key=self.signing_key,
                 document_store_config=self.document_store_config,
                 action_store_config=self.action_store_config,
+                action_config=self.action_config,
             )
 
             task_uid = UID()
@@ -528,6 +621,107 @@ class Worker(NewNode):
                 result = item
         return result
 
+    async def async_handle_api_call(
+        self, api_call: Union[SyftAPICall, SignedSyftAPICall]
+    ) -> Result[SignedSyftAPICall, Err]:
+        result = await self.async_handle_api_call_with_unsigned_result(api_call)
+        signed_result = SyftAPIData(data=result).sign(self.signing_key)
+
+        return signed_result
+
+    async def async_handle_api_call_with_unsigned_result(
+        self, api_call: Union[SyftAPICall, SignedSyftAPICall]
+    ) -> Result[Union[QueueItem, SyftObject], Err]:
+        """Awaitable `handle_api_call_with_unsigned_result` for async routes
+
+        Async service methods and their store calls are awaited on the event loop,
+        without holding a thread for the database round trips. Everything else,
+        sync service methods included, runs in the default executor of the loop.
+        """
+        loop = asyncio.get_running_loop()
+        if not self._handles_in_event_loop(api_call):
+            return await loop.run_in_executor(
+                None, self.handle_api_call_with_unsigned_result, api_call
+            )
+
+        credentials: SyftVerifyKey = api_call.credentials
+        api_call = api_call.message
+
+        role = await self.async_get_role_for_credentials(credentials=credentials)
+        context = AuthedServiceContext(node=self, credentials=credentials, role=role)
+
+        method = self._service_method_for_role(api_call.path, role)
+        if isinstance(method, SyftError):
+            return method
+        try:
+            if inspect.iscoroutinefunction(method):
+                return await method(context, *api_call.args, **api_call.kwargs)
+            return await loop.run_in_executor(
+                None, partial(method, context, *api_call.args, **api_call.kwargs)
+            )
+        except Exception as e:
+            return SyftError(message=f"Exception calling {api_call.path}. {e}")
+
+    def _handles_in_event_loop(
+        self, api_call: Union[SyftAPICall, SignedSyftAPICall]
+    ) -> bool:
+        # the rejected, forwarded, queued and special calls take the sync path
+        if isinstance(api_call, SyftAPICall) or not api_call.is_valid:
+            return False
+        if api_call.message.node_uid != self.id:
+            return False
+        if api_call.message.path in ("queue", "metadata"):
+            return False
+        return self.is_subprocess or self.processes == 0
+
+    def stop(self) -> None:
+        """Stop the background threads of the node"""
+        if self.action_gc is not None:
+            self.action_gc.stop()
+        self.get_service("actionservice").shutdown()
+
+    def backup(
+        self, target: Union[str, Path, BinaryIO], compress: bool = False
+    ) -> Union[SyftSuccess, SyftError]:
+        """Write an online backup of the node stores to a path or a binary stream"""
+        node_backup = NodeBackup.from_node(self)
+        if isinstance(target, (str, Path)):
+            with open(target, "wb") as f:
+                result = node_backup.backup(f, compress=compress)
+        else:
+            result = node_backup.backup(target, compress=compress)
+        if result.is_err():
+            return SyftError(message=result.err())
+        return result.ok()
+
+    def restore(
+        self, source: Union[str, Path, BinaryIO]
+    ) -> Union[SyftSuccess, SyftError]:
+        """Replace the contents of the node stores with a backup"""
+        node_backup = NodeBackup.from_node(self)
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as f:
+                result = node_backup.restore(f)
+        else:
+            result = node_backup.restore(source)
+        if result.is_err():
+            return SyftError(message=result.err())
+        return result.ok()
+
+    def migrate(
+        self, batch_size: int = 100, duty_cycle: float = 0.5, background: bool = True
+    ) -> SchemaMigration:
+        """Upgrade the objects of the document store to their latest version, in a
+        background thread unless `background` is False"""
+        migration = SchemaMigration(
+            store=self.document_store, batch_size=batch_size, duty_cycle=duty_cycle
+        )
+        if background:
+            migration.start()
+        else:
+            migration.run()
+        return migration
+
     def get_api(self, for_user: Optional[SyftVerifyKey] = None) -> SyftAPI:
         return SyftAPI.for_user(node=self, user_verify_key=for_user)
 
@@ -577,6 +771,7 @@ def task_runner(
         signing_key=worker_settings.signing_key,
         document_store_config=worker_settings.document_store_config,
         action_store_config=worker_settings.action_store_config,
+        action_config=worker_settings.action_config,
         is_subprocess=True,
     )
     try:
@@ -6,14 +6,28 @@ import pytest
 import syft as sy
 
 # relative
+from .syft.stores.store_fixtures_test import (  # noqa: F401
+    sharded_sqlite_store_partition,
+)
 from .syft.stores.store_fixtures_test import dict_action_store  # noqa: F401
 from .syft.stores.store_fixtures_test import dict_document_store  # noqa: F401
 from .syft.stores.store_fixtures_test import dict_queue_stash  # noqa: F401
 from .syft.stores.store_fixtures_test import dict_store_partition  # noqa: F401
+from .syft.stores.store_fixtures_test import lmdb_action_store  # noqa: F401
+from .syft.stores.store_fixtures_test import lmdb_document_store  # noqa: F401
+from .syft.stores.store_fixtures_test import lmdb_queue_stash  # noqa: F401
+from .syft.stores.store_fixtures_test import lmdb_store_partition  # noqa: F401
 from .syft.stores.store_fixtures_test import mongo_document_store  # noqa: F401
 from .syft.stores.store_fixtures_test import mongo_queue_stash  # noqa: F401
 from .syft.stores.store_fixtures_test import mongo_server_mock  # noqa: F401
 from .syft.stores.store_fixtures_test import mongo_store_partition  # noqa: F401
+from .syft.stores.store_fixtures_test import redis_action_store  # noqa: F401
+from .syft.stores.store_fixtures_test import redis_document_store  # noqa: F401
+from .syft.stores.store_fixtures_test import redis_queue_stash  # noqa: F401
+from .syft.stores.store_fixtures_test import redis_server_fake  # noqa: F401
+from .syft.stores.store_fixtures_test import redis_store_partition  # noqa: F401
+from .syft.stores.store_fixtures_test import sharded_sqlite_action_store  # noqa: F401
+from .syft.stores.store_fixtures_test import sharded_sqlite_queue_stash  # noqa: F401
 from .syft.stores.store_fixtures_test import sqlite_action_store  # noqa: F401
 from .syft.stores.store_fixtures_test import sqlite_document_store  # noqa: F401
 from .syft.stores.store_fixtures_test import sqlite_queue_stash  # noqa: F401
@@ -66,6 +80,18 @@ __all__ = [
     "dict_action_store",
     "dict_document_store",
     "dict_queue_stash",
+    "lmdb_store_partition",
+    "lmdb_document_store",
+    "lmdb_queue_stash",
+    "lmdb_action_store",
+    "redis_server_fake",
+    "redis_store_partition",
+    "redis_document_store",
+    "redis_queue_stash",
+    "redis_action_store",
+    "sharded_sqlite_store_partition",
+    "sharded_sqlite_queue_stash",
+    "sharded_sqlite_action_store",
 ]
 
 pytest_plugins = [
@@ -0,0 +1,41 @@
+# stdlib
+import operator
+from typing import Any
+from typing import Callable
+
+# third party
+import numpy as np
+import pytest
+
+# syft absolute
+from syft.core.node.new.action_object import ActionObject
+
+OPS = {
+    "add": operator.add,
+    "mul": operator.mul,
+    "truediv": operator.truediv,
+    "lt": operator.lt,
+    "eq": operator.eq,
+    "getitem": lambda x, _: x[1:],
+    "sum": lambda x, _: x.sum(),
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("op", list(OPS))
+def test_action_object_op_benchmark(benchmark: Any, op: str) -> None:
+    func: Callable = OPS[op]
+    raw_data = np.arange(1, 101)
+    action_object = ActionObject.from_obj(raw_data)
+
+    result = benchmark(func, action_object, action_object)
+    assert (np.asarray(result.syft_action_data) == func(raw_data, raw_data)).all()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("op", list(OPS))
+def test_numpy_op_benchmark(benchmark: Any, op: str) -> None:
+    func: Callable = OPS[op]
+    raw_data = np.arange(1, 101)
+
+    benchmark(func, raw_data, raw_data)
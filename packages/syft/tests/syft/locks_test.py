@@ -5,6 +5,7 @@ import random
 import string
 import sys
 import tempfile
+from threading import Event
 from threading import Thread
 import time
 
@@ -13,13 +14,18 @@ from joblib import Parallel
 from joblib import delayed
 import pytest
 from pytest_mock_resources import create_redis_fixture
+from sherlock.lock import LockTimeoutException
 
 # syft absolute
 from syft.core.node.new.locks import FileLockingConfig
+from syft.core.node.new.locks import LockMetrics
 from syft.core.node.new.locks import LockingConfig
 from syft.core.node.new.locks import NoLockingConfig
 from syft.core.node.new.locks import RedisLockingConfig
+from syft.core.node.new.locks import SharedExclusiveLock
+from syft.core.node.new.locks import StripedLock
 from syft.core.node.new.locks import SyftLock
+from syft.core.node.new.locks import ThreadingLockingConfig
 
 redis_server_mock = create_redis_fixture(scope="session")
 
@@ -42,6 +48,12 @@ def locks_nop_config(request):
     return NoLockingConfig(**def_params)
 
 
+@pytest.fixture(scope="function")
+def locks_threading_config():
+    def_params["lock_name"] = generate_lock_name()
+    return ThreadingLockingConfig(**def_params)
+
+
 @pytest.fixture(scope="function")
 def locks_file_config():
     def_params["lock_name"] = generate_lock_name()
@@ -59,6 +71,7 @@ def locks_redis_config(redis_server_mock):
     "config",
     [
         pytest.lazy_fixture("locks_nop_config"),
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -95,6 +108,7 @@ def test_acquire_nop(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -122,6 +136,7 @@ def test_acquire_release(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -138,6 +153,7 @@ def test_acquire_release_with(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -166,6 +182,7 @@ def test_acquire_expire(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -189,6 +206,7 @@ def test_acquire_double_aqcuire_timeout_fail(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -214,6 +232,7 @@ def test_acquire_double_aqcuire_timeout_ok(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -239,6 +258,7 @@ def test_acquire_double_aqcuire_nonblocking(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -265,6 +285,7 @@ def test_acquire_double_aqcuire_retry_interval(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -282,6 +303,7 @@ def test_acquire_double_release(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -303,6 +325,7 @@ def test_acquire_same_name_diff_namespace(config: LockingConfig):
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -348,6 +371,7 @@ def test_parallel_multithreading(config: LockingConfig) -> None:
 @pytest.mark.parametrize(
     "config",
     [
+        pytest.lazy_fixture("locks_threading_config"),
         pytest.lazy_fixture("locks_file_config"),
         pytest.lazy_fixture("locks_redis_config"),
     ],
@@ -382,3 +406,142 @@ def test_parallel_joblib(
         stored = int(f.read())
 
     assert stored == thread_cnt * repeats
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        pytest.lazy_fixture("locks_threading_config"),
+        pytest.lazy_fixture("locks_file_config"),
+        pytest.lazy_fixture("locks_redis_config"),
+    ],
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_acquire_woken_on_release(config: LockingConfig) -> None:
+    config.timeout = 5
+    config.retry_interval = 3
+    metrics = LockMetrics()
+
+    lock = SyftLock(config)
+    assert lock.acquire()
+
+    timer = Thread(target=lambda: (time.sleep(0.2), lock.release()))
+    timer.start()
+
+    start = time.time()
+    waiter = SyftLock(config, metrics=metrics)
+    assert waiter.acquire()
+    elapsed = time.time() - start
+    waiter.release()
+    timer.join()
+
+    # the waiter doesn't sleep out the retry interval
+    assert elapsed < config.retry_interval
+    stats = metrics.to_dict()
+    assert stats["acquired"] == 1
+    assert stats["contended"] == 1
+    assert stats["timeouts"] == 0
+    assert stats["wait_time"]["count"] == 1
+
+
+def test_lock_metrics_timeout(locks_threading_config: LockingConfig) -> None:
+    metrics = LockMetrics()
+    lock = SyftLock(locks_threading_config, metrics=metrics)
+    assert lock.acquire()
+
+    other = SyftLock(locks_threading_config, metrics=metrics)
+    assert not other.acquire(blocking=False)
+    assert not other.acquire()
+    lock.release()
+
+    stats = metrics.to_dict()
+    assert stats["acquired"] == 1
+    assert stats["contended"] == 1
+    # non-blocking attempts aren't waits
+    assert stats["timeouts"] == 1
+
+    metrics.reset()
+    assert metrics.to_dict()["timeouts"] == 0
+
+
+def test_striped_lock(locks_threading_config: LockingConfig) -> None:
+    locks_threading_config.stripes = 8
+    locks = StripedLock(locks_threading_config, name="partition")
+
+    assert locks.stripe("key") == locks.stripe("key")
+    # one backend lock per stripe, reused by every holder
+    assert locks.lock_for("key") is locks.lock_for("key")
+    assert {locks.stripe(idx) for idx in range(100)} <= set(range(8))
+
+    with locks.hold("key"):
+        # the same key waits, other stripes are free
+        assert not locks.lock_for("key").acquire(blocking=False)
+        other = next(
+            idx for idx in range(100) if locks.stripe(idx) != locks.stripe("key")
+        )
+        with locks.hold(other):
+            pass
+
+        with pytest.raises(LockTimeoutException):
+            with locks.hold("key"):
+                pass
+
+    with locks.hold("key"):
+        pass
+    assert locks.metrics.to_dict()["timeouts"] == 1
+
+
+def test_striped_lock_nop(locks_nop_config: LockingConfig) -> None:
+    locks = StripedLock(locks_nop_config)
+    with locks.hold("key"):
+        with locks.hold("key"):
+            pass
+
+
+def test_shared_exclusive_lock() -> None:
+    lock = SharedExclusiveLock()
+    entered = Event()
+    released = Event()
+
+    def _shared() -> None:
+        with lock.shared():
+            with lock.shared():
+                entered.set()
+                released.wait(5)
+
+    # shared holders don't wait for each other
+    holder = Thread(target=_shared)
+    holder.start()
+    assert entered.wait(5)
+    with lock.shared():
+        pass
+
+    exclusive_held = Event()
+
+    def _exclusive() -> None:
+        with lock.exclusive():
+            exclusive_held.set()
+
+    waiter = Thread(target=_exclusive)
+    waiter.start()
+    assert not exclusive_held.wait(0.2)
+    released.set()
+    holder.join()
+    waiter.join()
+    assert exclusive_held.is_set()
+
+    # the exclusive holder can take either side again
+    with lock.exclusive():
+        with lock.exclusive(), lock.shared():
+            pass
+        shared_held = Event()
+
+        def _shared_once() -> None:
+            with lock.shared():
+                shared_held.set()
+
+        other = Thread(target=_shared_once)
+        other.start()
+        assert not shared_held.wait(0.2)
+    other.join()
+    assert shared_held.is_set()
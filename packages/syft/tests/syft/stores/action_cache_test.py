@@ -0,0 +1,67 @@
+# syft absolute
+from syft.core.node.new.action_cache import ActionCacheConfig
+from syft.core.node.new.action_cache import ActionObjectCache
+from syft.core.node.new.action_cache import CachePolicy
+
+
+def test_action_cache_lru() -> None:
+    cache = ActionObjectCache(ActionCacheConfig(max_bytes=30))
+    for key in "abc":
+        assert cache.put(key, key.upper(), 10)
+    assert cache.get("a") == "A"
+
+    # "b" is the least recently used
+    assert cache.put("d", "D", 10)
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.size == 30
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hit_ratio"] == 1.0
+
+
+def test_action_cache_lfu() -> None:
+    cache = ActionObjectCache(ActionCacheConfig(max_bytes=30, policy=CachePolicy.LFU))
+    for key in "abc":
+        assert cache.put(key, key.upper(), 10)
+    for _ in range(3):
+        cache.get("a")
+    cache.get("b")
+    cache.get("c")
+    cache.get("b")
+
+    # "c" is the least frequently used, then "b"
+    assert cache.put("d", "D", 20)
+    assert "c" not in cache
+    assert "b" not in cache
+    assert "a" in cache and "d" in cache
+    assert cache.size == 30
+    assert cache.stats()["evictions"] == 2
+
+
+def test_action_cache_size_bound() -> None:
+    cache = ActionObjectCache(ActionCacheConfig(max_bytes=100, max_entry_bytes=40))
+    assert not cache.put("big", "x", 50)
+    assert "big" not in cache
+    assert cache.get("big") is None
+    assert cache.stats()["misses"] == 1
+
+    assert cache.put("a", "A", 40)
+    cache.invalidate("a")
+    assert "a" not in cache
+    assert cache.size == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_action_cache_generation() -> None:
+    cache = ActionObjectCache(ActionCacheConfig(max_bytes=100))
+
+    # a value read before an invalidation isn't cached
+    generation = cache.generation("a")
+    cache.invalidate("a")
+    assert not cache.put("a", "stale", 10, generation)
+    assert "a" not in cache
+
+    assert cache.put("a", "A", 10, cache.generation("a"))
+    assert cache.get("a") == "A"
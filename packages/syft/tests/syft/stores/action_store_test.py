@@ -1,15 +1,39 @@
 # stdlib
+from pathlib import Path
+from threading import Event
+from threading import Thread
 from typing import Any
 
 # third party
+import numpy as np
 import pytest
 
 # syft absolute
+from syft.core.node.new.action_cache import ActionCacheConfig
+from syft.core.node.new.action_config import ActionConfig
+from syft.core.node.new.action_lifecycle import ActionGarbageCollector
+from syft.core.node.new.action_lifecycle import ActionLifecycleConfig
+from syft.core.node.new.action_lifecycle import PointerReleaseTracker
+from syft.core.node.new.action_object import ActionObject
+from syft.core.node.new.action_payload import ActionPayloadRef
+from syft.core.node.new.action_payload import payload_uid
+from syft.core.node.new.action_payload import serialize_payload
 from syft.core.node.new.action_store import ActionObjectEXECUTE
 from syft.core.node.new.action_store import ActionObjectOWNER
 from syft.core.node.new.action_store import ActionObjectREAD
 from syft.core.node.new.action_store import ActionObjectWRITE
+from syft.core.node.new.action_store import ActionPermission
+from syft.core.node.new.action_store import DictActionStore
+from syft.core.node.new.action_store import SQLiteActionStore
+import syft.core.node.new.blob_store as blob_store_module
+from syft.core.node.new.blob_store import BlobRef
+from syft.core.node.new.blob_store import BlobStorageConfig
+from syft.core.node.new.blob_store import FileBlobStore
 from syft.core.node.new.credentials import SyftVerifyKey
+from syft.core.node.new.permission_index import PERMISSION_KEY_SIZE
+from syft.core.node.new.permission_index import permission_key
+from syft.core.node.new.serialize import _serialize
+from syft.core.node.new.twin_object import TwinObject
 from syft.core.node.new.uid import UID
 
 # relative
@@ -31,6 +55,9 @@ permissions = [
     [
         pytest.lazy_fixture("dict_action_store"),
         pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
     ],
 )
 def test_action_store_sanity(store: Any):
@@ -47,6 +74,9 @@ def test_action_store_sanity(store: Any):
     [
         pytest.lazy_fixture("dict_action_store"),
         pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
     ],
 )
 @pytest.mark.parametrize("permission", permissions)
@@ -104,6 +134,9 @@ def test_action_store_test_permissions(store: Any, permission: Any):
     [
         pytest.lazy_fixture("dict_action_store"),
         pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
     ],
 )
 def test_action_store_test_data_set_get(store: Any):
@@ -135,3 +168,470 @@ def test_action_store_test_data_set_get(store: Any):
     assert res.is_ok()
     res = store.delete(data_uid, client_key)
     assert res.is_err()
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_action_store"),
+        pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
+    ],
+)
+def test_action_store_has_permissions(store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    root_key = SyftVerifyKey.from_string(test_verify_key_string_root)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+
+    uids = [UID() for _ in range(10)]
+    readable = uids[::2]
+    store.add_permissions(
+        [ActionObjectREAD(uid=uid, credentials=client_key) for uid in readable]
+        + [ActionObjectWRITE(uid=uid, credentials=client_key) for uid in uids]
+    )
+
+    result = store.has_permissions(uids, client_key, ActionPermission.READ)
+    assert result == {uid: uid in readable for uid in uids}
+    result = store.has_permissions(uids, client_key, ActionPermission.WRITE)
+    assert all(result.values())
+    assert not any(
+        store.has_permissions(uids, hacker_key, ActionPermission.READ).values()
+    )
+    assert all(store.has_permissions(uids, root_key, ActionPermission.OWNER).values())
+
+    # grants of other uids and keys are untouched by a delete
+    store.permissions.remove_uid(uids[0])
+    assert uids[0] not in store.permissions
+    assert uids[2] in store.permissions
+    result = store.has_permissions(uids[:3], client_key, ActionPermission.WRITE)
+    assert result == {uids[0]: False, uids[1]: True, uids[2]: True}
+
+
+def test_action_store_permission_key():
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    uid = UID()
+
+    key = permission_key(uid, client_key, ActionPermission.EXECUTE)
+    assert len(key) == PERMISSION_KEY_SIZE
+    assert key.startswith(uid.value.bytes)
+    assert key == ActionObjectEXECUTE(uid=uid, credentials=client_key).permission_key
+    assert key != permission_key(uid, client_key, ActionPermission.READ)
+
+
+def test_action_store_migrates_permission_sets(sqlite_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    store_config = sqlite_action_store.store_config
+    uid = UID()
+
+    # permissions as written by earlier versions
+    legacy = store_config.backing_store(
+        "permissions", sqlite_action_store.settings, store_config, ddtype=set
+    )
+    legacy[uid] = {f"{client_key.verify}_READ", f"{client_key.verify}_OWNER"}
+
+    store = SQLiteActionStore(
+        store_config=store_config, root_verify_key=sqlite_action_store.root_verify_key
+    )
+    assert store.has_permission(ActionObjectREAD(uid=uid, credentials=client_key))
+    assert store.has_permission(ActionObjectOWNER(uid=uid, credentials=client_key))
+    assert not store.has_permission(ActionObjectWRITE(uid=uid, credentials=client_key))
+    assert len(legacy) == 0
+
+
+class UnreadableStore(dict):
+    def __getitem__(self, key: Any) -> Any:
+        raise AssertionError(f"{key} was read")
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_action_store"),
+        pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
+    ],
+)
+def test_action_store_twin_entries(store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+
+    twin = TwinObject(private_obj=np.arange(100), mock_obj=np.zeros(100))
+    assert store.set(twin.id, client_key, twin).is_ok()
+
+    metadata = store.get_metadata(twin.id, client_key).ok()
+    assert metadata.is_twin
+    assert metadata.object_type == type(twin.private_obj).__name__
+    assert metadata.private_obj_id == twin.private_obj_id
+    assert metadata.mock_obj_id == twin.mock_obj_id
+
+    mock = store.get_mock(twin.id, client_key).ok()
+    assert mock.id == twin.id
+    assert (mock.syft_action_data == np.zeros(100)).all()
+    private = store.get_private(twin.id, client_key).ok()
+    assert private.id == twin.id
+    assert (private.syft_action_data == np.arange(100)).all()
+
+    restored = store.get(twin.id, client_key).ok()
+    assert isinstance(restored, TwinObject)
+    assert restored.private_obj_id == twin.private_obj_id
+    assert (restored.mock.syft_action_data == np.zeros(100)).all()
+
+    assert store.get_mock(twin.id, hacker_key).is_err()
+    assert store.get_metadata(twin.id, hacker_key).is_err()
+
+    # plain objects are their own private and mock side
+    obj = ActionObject.from_obj(np.ones(3))
+    assert store.set(obj.id, client_key, obj).is_ok()
+    assert not store.get_metadata(obj.id, client_key).ok().is_twin
+    assert (store.get_mock(obj.id, client_key).ok().syft_action_data == 1).all()
+
+    assert store.delete(twin.id, client_key).is_ok()
+    assert twin.id not in store.mock
+    assert twin.id not in store.metadata
+
+
+def test_action_store_pointer_skips_private(dict_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    twin = TwinObject(private_obj=np.arange(100), mock_obj=np.zeros(100))
+    assert dict_action_store.set(twin.id, client_key, twin).is_ok()
+
+    private_entries = dict(dict_action_store.data)
+    dict_action_store.data = UnreadableStore(private_entries)
+
+    pointer = dict_action_store.get_pointer(twin.id, client_key, node_uid=UID())
+    assert pointer.is_ok()
+    assert (pointer.ok().syft_action_data == np.zeros(100)).all()
+    assert dict_action_store.get_mock(twin.id, client_key).is_ok()
+    assert dict_action_store.get_metadata(twin.id, client_key).is_ok()
+
+
+def test_action_store_pointer_permissions(dict_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+    obj = ActionObject.from_obj(np.arange(10))
+    twin = TwinObject(private_obj=np.arange(10), mock_obj=np.zeros(10))
+    assert dict_action_store.set(obj.id, client_key, obj).is_ok()
+    assert dict_action_store.set(twin.id, client_key, twin).is_ok()
+
+    # plain objects need READ, the mock of a twin is public
+    assert dict_action_store.get_pointer(obj.id, client_key, UID()).is_ok()
+    assert dict_action_store.get_pointer(obj.id, hacker_key, UID()).is_err()
+    pointer = dict_action_store.get_pointer(twin.id, hacker_key, UID())
+    assert (pointer.ok().syft_action_data == np.zeros(10)).all()
+
+    # a plain object written over a twin is not mistaken for its mock
+    plain = ActionObject.from_obj(np.ones(10))
+    plain.id = twin.id
+    assert dict_action_store.set(twin.id, client_key, plain).is_ok()
+    assert twin.id not in dict_action_store.mock
+    assert dict_action_store.get_pointer(twin.id, hacker_key, UID()).is_err()
+
+
+def test_action_store_blob_storage(sqlite_action_store: Any, tmp_path: Path):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    blob_storage = BlobStorageConfig(path=tmp_path, threshold=8192, gc_grace_period=0)
+    store_config = sqlite_action_store.store_config.copy(
+        update={"blob_storage": blob_storage, "payload_dedup": True}
+    )
+    store = SQLiteActionStore(
+        store_config=store_config, root_verify_key=sqlite_action_store.root_verify_key
+    )
+
+    # large payloads go to blob files, small ones stay inline
+    twin = TwinObject(private_obj=np.arange(10_000), mock_obj=np.zeros(2))
+    assert store.set(twin.id, client_key, twin).is_ok()
+    private_ref = store.data[twin.id].syft_action_data
+    mock_ref = store.mock[twin.id].syft_action_data
+    assert isinstance(store.payloads[payload_uid(private_ref.digest)], BlobRef)
+    assert not isinstance(store.payloads[payload_uid(mock_ref.digest)], BlobRef)
+    assert len(store.blob_store.digests()) == 1
+
+    private = store.get_private(twin.id, client_key).ok()
+    assert (private.syft_action_data == np.arange(10_000)).all()
+    restored = store.get(twin.id, client_key).ok()
+    assert (restored.private.syft_action_data == np.arange(10_000)).all()
+
+    # identical payloads share a file, which is kept while referenced
+    copy = ActionObject.from_obj(np.arange(10_000))
+    assert store.set(copy.id, client_key, copy).is_ok()
+    assert len(store.blob_store.digests()) == 1
+
+    assert store.delete(twin.id, client_key).is_ok()
+    assert store.collect_garbage().ok() == 0
+    assert len(store.blob_store.digests()) == 1
+
+    assert store.delete(copy.id, client_key).is_ok()
+    assert store.collect_garbage().ok() == 1
+    assert len(store.blob_store.digests()) == 0
+
+
+def test_blob_store_dump(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    blob_store = FileBlobStore(BlobStorageConfig(path=tmp_path, threshold=8192))
+    serialized = []
+
+    def serialize(obj: Any, to_bytes: bool = False) -> Any:
+        serialized.append(obj)
+        return _serialize(obj, to_bytes=to_bytes)
+
+    monkeypatch.setattr(blob_store_module, "_serialize", serialize)
+
+    # small objects are left to the backing store without serializing them
+    small = np.arange(10)
+    assert blob_store.dump(small) is small
+    assert len(serialized) == 0
+
+    ref = blob_store.dump(np.arange(10_000))
+    assert isinstance(ref, BlobRef)
+    assert len(serialized) == 1
+    assert (blob_store.load(ref) == np.arange(10_000)).all()
+
+
+def test_action_store_cache(sqlite_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+    store = SQLiteActionStore(
+        store_config=sqlite_action_store.store_config,
+        root_verify_key=sqlite_action_store.root_verify_key,
+        action_config=ActionConfig(cache=ActionCacheConfig(max_bytes=100_000)),
+    )
+
+    obj = ActionObject.from_obj(np.arange(1000))
+    assert store.set(obj.id, client_key, obj).is_ok()
+    assert store.get(obj.id, client_key).is_ok()
+    first = store.get(obj.id, client_key).ok()
+    assert (first.syft_action_data == np.arange(1000)).all()
+    assert store.cache_stats()["hits"] == 1
+    assert store.cache_stats()["misses"] == 1
+
+    # callers get copies, changing them doesn't change the cache
+    first.id = UID()
+    first.syft_action_data += 1
+    cached = store.get(obj.id, client_key).ok()
+    assert cached.id == obj.id
+    assert (cached.syft_action_data == np.arange(1000)).all()
+
+    # a cached payload still needs the read permission
+    assert store.get(obj.id, hacker_key).is_err()
+    assert store.cache_stats()["hits"] == 2
+
+    # writes invalidate
+    updated = ActionObject.from_obj(np.arange(5))
+    updated.id = obj.id
+    assert store.set(obj.id, client_key, updated).is_ok()
+    assert (store.get(obj.id, client_key).ok().syft_action_data == np.arange(5)).all()
+    assert store.cache_stats()["invalidations"] == 1
+
+    # bounded by bytes
+    for _ in range(20):
+        other = ActionObject.from_obj(np.zeros(2000))
+        assert store.set(other.id, client_key, other).is_ok()
+        assert store.get(other.id, client_key).is_ok()
+    stats = store.cache_stats()
+    assert stats["bytes"] <= 100_000
+    assert stats["evictions"] > 0
+
+    assert store.delete(obj.id, client_key).is_ok()
+    assert store.get(obj.id, client_key).is_err()
+
+
+def test_action_store_lifecycle(sqlite_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+    store = SQLiteActionStore(
+        store_config=sqlite_action_store.store_config,
+        root_verify_key=sqlite_action_store.root_verify_key,
+        action_config=ActionConfig(
+            lifecycle=ActionLifecycleConfig(ttl=3600, batch_size=2)
+        ),
+    )
+
+    uploaded = ActionObject.from_obj(np.arange(3))
+    assert store.set(uploaded.id, client_key, uploaded).is_ok()
+    results = [ActionObject.from_obj(np.arange(i)) for i in range(5)]
+    for result in results:
+        assert store.set(result.id, client_key, result).is_ok()
+        store.track(result.id, client_key)
+
+    # referenced results and uploads are kept
+    assert store.collect_unreachable().ok() == 0
+
+    assert store.retain(results[0].id, client_key).is_ok()
+    assert store.release([results[0].id], hacker_key).is_err()
+
+    # readers can only drop the references they hold
+    store.add_permission(ActionObjectREAD(uid=results[1].id, credentials=hacker_key))
+    assert store.release([results[1].id], hacker_key).is_ok()
+    assert store.leases[results[1].id].refcount == 1
+    released = [result.id for result in results]
+    assert store.release(released, client_key).is_ok()
+
+    collector = ActionGarbageCollector(store)
+    assert collector.collect().ok() == 4
+    assert not store.exists(results[1].id)
+    assert results[1].id not in store.permissions
+    assert store.exists(results[0].id)
+    assert store.exists(uploaded.id)
+
+    # expired leases are collected even if still referenced
+    store.track(results[0].id, client_key, ttl=-1)
+    assert collector.collect().ok() == 1
+    assert not store.exists(results[0].id)
+    assert store.exists(uploaded.id)
+    assert len(store.leases) == 0
+
+
+def test_pointer_release_tracker():
+    tracker = PointerReleaseTracker()
+    node_uid, uid = UID(), UID()
+    first = ActionObject.from_obj(1)
+    second = ActionObject.from_obj(1)
+    tracker.track(first, node_uid=node_uid, uid=uid)
+    tracker.track(second, node_uid=node_uid, uid=uid)
+
+    tracker.drop(first)
+    assert tracker.pending() == {}
+    tracker.drop(second)
+    assert tracker.pending() == {node_uid: [uid]}
+
+
+def test_action_store_payload_dedup(sqlite_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+    store_config = sqlite_action_store.store_config.copy(update={"payload_dedup": True})
+    store = SQLiteActionStore(
+        store_config=store_config, root_verify_key=sqlite_action_store.root_verify_key
+    )
+
+    mock = np.zeros(1000)
+    first = TwinObject(private_obj=np.arange(1000), mock_obj=mock)
+    second = TwinObject(private_obj=np.arange(1000) * 2, mock_obj=mock)
+    assert store.set(first.id, client_key, first).is_ok()
+    assert store.set(second.id, client_key, second).is_ok()
+
+    # the shared mock is stored once
+    assert len(store.payloads) == 3
+    mock_ref = store.mock[first.id].syft_action_data
+    assert mock_ref.digest == store.mock[second.id].syft_action_data.digest
+    assert len(store.payload_refs[payload_uid(mock_ref.digest)]) == 2
+
+    # a known payload can be referenced instead of uploaded, by its readers only
+    digest = store.data[first.id].syft_action_data.digest
+    assert store.has_payloads([digest, "00" * 32], client_key) == [digest]
+    assert store.has_payloads([digest], hacker_key) == []
+    reference = ActionObject.from_obj(np.arange(3))
+    reference.syft_action_data = ActionPayloadRef(digest=digest)
+    assert store.set(reference.id, hacker_key, reference).is_err()
+    assert store.set(reference.id, client_key, reference).is_ok()
+    restored = store.get(reference.id, client_key).ok()
+    assert (restored.syft_action_data == np.arange(1000)).all()
+
+    # payloads are deleted with their last reference
+    assert store.delete(first.id, client_key).is_ok()
+    assert len(store.payloads) == 3
+    assert store.delete(second.id, client_key).is_ok()
+    assert len(store.payloads) == 1
+    assert store.delete(reference.id, client_key).is_ok()
+    assert len(store.payloads) == 0
+    assert len(store.payload_refs) == 0
+
+    # payloads keep their exact type
+    scalar = ActionObject.from_obj(np.int64(7))
+    assert store.set(scalar.id, client_key, scalar).is_ok()
+    restored = store.get(scalar.id, client_key).ok()
+    assert type(restored.syft_action_data) is np.int64
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_action_store"),
+        pytest.lazy_fixture("sqlite_action_store"),
+    ],
+)
+def test_action_store_payload_dedup_disabled(store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    obj = ActionObject.from_obj(np.arange(10))
+    assert store.set(obj.id, client_key, obj).is_ok()
+
+    # objects are stored whole, in-memory stores keep the object itself
+    assert not isinstance(store.data[obj.id].syft_action_data, ActionPayloadRef)
+    assert len(store.payloads) == 0
+    digest = serialize_payload(obj.syft_action_data)[0]
+    assert store.has_payloads([digest], client_key) == []
+    if isinstance(store, DictActionStore):
+        assert store.data[obj.id] is obj
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_action_store"),
+        pytest.lazy_fixture("sqlite_action_store"),
+        pytest.lazy_fixture("lmdb_action_store"),
+        pytest.lazy_fixture("redis_action_store"),
+        pytest.lazy_fixture("sharded_sqlite_action_store"),
+    ],
+)
+def test_action_store_get_many(store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    hacker_key = SyftVerifyKey.from_string(test_verify_key_string_hacker)
+
+    objs = [ActionObject.from_obj(np.full(3, idx)) for idx in range(20)]
+    for obj in objs:
+        assert store.set(obj.id, client_key, obj).is_ok()
+    twin = TwinObject(private_obj=np.arange(10), mock_obj=np.zeros(10))
+    assert store.set(twin.id, client_key, twin).is_ok()
+
+    uids = [obj.id for obj in objs] + [twin.id, objs[0].id]
+    result = store.get_many(uids, client_key).ok()
+    assert list(result) == uids[:-1]
+    for idx, obj in enumerate(objs):
+        assert (result[obj.id].syft_action_data == idx).all()
+    assert isinstance(result[twin.id], TwinObject)
+    assert (result[twin.id].private.syft_action_data == np.arange(10)).all()
+    assert (result[twin.id].mock.syft_action_data == 0).all()
+
+    # one unreadable or missing object fails the whole batch
+    store.add_permission(ActionObjectREAD(uid=objs[0].id, credentials=hacker_key))
+    assert store.get_many([objs[0].id], hacker_key).is_ok()
+    assert store.get_many([objs[0].id, objs[1].id], hacker_key).is_err()
+    assert store.get_many([objs[0].id, UID()], client_key).is_err()
+
+
+def test_action_store_lock_writes(dict_action_store: Any):
+    client_key = SyftVerifyKey.from_string(test_verify_key_string_client)
+    store = dict_action_store
+    writing = Event()
+    release = Event()
+
+    def _slow_write() -> None:
+        with store._write_lock.shared():
+            writing.set()
+            release.wait(5)
+
+    # a write in progress doesn't block the others
+    slow = Thread(target=_slow_write)
+    slow.start()
+    assert writing.wait(5)
+    assert store.set(UID(), client_key, MockSyftObject(data=1)).is_ok()
+    release.set()
+    slow.join()
+
+    data_uid = UID()
+    written = Event()
+
+    def _write() -> None:
+        store.set(data_uid, client_key, MockSyftObject(data=2))
+        written.set()
+
+    with store.lock_writes():
+        writer = Thread(target=_write)
+        writer.start()
+        assert not written.wait(0.2)
+        assert not store.exists(data_uid)
+    writer.join()
+    assert store.exists(data_uid)
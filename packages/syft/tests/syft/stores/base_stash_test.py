@@ -385,3 +385,68 @@ def test_basestash_cannot_query_non_searchable(
     assert base_stash.query_all(
         QueryKeys(qks=[qk, UIDPartitionKey.with_obj(obj.id)])
     ).is_err()
+
+
+def test_basestash_set_many(
+    base_stash: MockStash, mock_objects: List[MockObject]
+) -> None:
+    assert base_stash.set_many(mock_objects).is_ok()
+    assert len(base_stash.get_all().ok()) == len(mock_objects)
+
+    assert base_stash.set_many(mock_objects[:1]).is_err()
+    assert base_stash.set_many(mock_objects[:1], ignore_duplicates=True).is_ok()
+    assert len(base_stash.get_all().ok()) == len(mock_objects)
+
+
+def test_basestash_upsert(
+    base_stash: MockStash, mock_object: MockObject, faker: Faker
+) -> None:
+    assert base_stash.upsert(mock_object).is_ok()
+    assert base_stash.get_by_uid(mock_object.id).ok() == mock_object
+
+    updated = MockObject(id=mock_object.id, **object_kwargs(faker))
+    assert base_stash.upsert(updated).is_ok()
+    assert len(base_stash.get_all().ok()) == 1
+    assert base_stash.get_by_uid(mock_object.id).ok().name == updated.name
+
+
+def test_basestash_query_fields(
+    base_stash: MockStash, mock_objects: List[MockObject]
+) -> None:
+    for obj in mock_objects:
+        base_stash.set(obj)
+
+    obj = random.choice(mock_objects)
+    rows = base_stash.query_fields(
+        UIDPartitionKey.with_obj(obj.id), fields=["name", "value"]
+    )
+    assert rows.ok() == [{"name": obj.name, "value": obj.value}]
+
+    ValuePartitionKey = PartitionKey(key="value", type_=int)
+    assert base_stash.query_fields(ValuePartitionKey.with_obj(1), ["name"]).is_err()
+
+
+@pytest.mark.asyncio
+async def test_basestash_async_api(
+    base_stash: MockStash, mock_objects: List[MockObject]
+) -> None:
+    # stores without an async driver are bridged to their sync API
+    for obj in mock_objects:
+        assert (await base_stash.async_set(obj)).is_ok()
+    assert (await base_stash.async_set(mock_objects[0])).is_err()
+    assert (await base_stash.async_set("not a MockObject")).is_err()
+
+    assert len((await base_stash.async_get_all()).ok()) == len(mock_objects)
+
+    obj = random.choice(mock_objects)
+    assert (await base_stash.async_get_by_uid(obj.id)).ok() == obj
+    assert (await base_stash.async_find_one(name=obj.name)).ok() == obj
+    assert (await base_stash.async_find_all(value=obj.value)).is_err()
+
+    updated = (await base_stash.async_update_fields(obj.id, {"desc": "new"})).ok()
+    assert updated.desc == "new"
+    assert base_stash.get_by_uid(obj.id).ok().desc == "new"
+
+    qk = base_stash.partition.store_query_key(obj)
+    assert (await base_stash.async_delete(qk)).is_ok()
+    assert (await base_stash.async_get_by_uid(obj.id)).ok() is None
@@ -0,0 +1,216 @@
+# stdlib
+import sys
+from threading import Event
+from threading import Thread
+import time
+from typing import Any
+from typing import Tuple
+
+# third party
+import pytest
+
+# syft absolute
+from syft.core.node.new.change_feed import ChangeType
+from syft.core.node.new.change_feed import RingBufferChangeFeed
+from syft.core.node.new.queue_stash import QueueItem
+from syft.core.node.new.uid import UID
+
+# relative
+from .store_fixtures_test import sqlite_store_partition_fn
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 5
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_store_partition"),
+        pytest.lazy_fixture("sqlite_store_partition"),
+        pytest.lazy_fixture("sharded_sqlite_store_partition"),
+        pytest.lazy_fixture("mongo_store_partition"),
+    ],
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_change_feed_events(store: Any) -> None:
+    subscription = store.subscribe()
+    first_offset = store.change_feed.latest_offset
+
+    obj = MockSyftObject(data=1)
+    assert store.set(obj, ignore_duplicates=False).is_ok()
+    # rejected writes are not part of the feed
+    assert store.set(obj, ignore_duplicates=False).is_err()
+
+    qk = store.settings.store_key.with_obj(obj)
+    assert store.update(qk, MockSyftObject(data=2)).is_ok()
+    assert store.delete(qk).is_ok()
+
+    events = store.change_feed.read(first_offset)
+    assert events.is_ok(), events
+    events = events.ok()
+
+    assert [event.change_type for event in events] == [
+        ChangeType.INSERT,
+        ChangeType.UPDATE,
+        ChangeType.DELETE,
+    ]
+    assert all(event.uid == obj.id for event in events)
+    assert events[0].obj.data == 1
+    assert events[1].obj.data == 2
+    assert events[2].obj is None
+
+    offsets = [event.offset for event in events]
+    assert offsets == sorted(set(offsets))
+    assert store.change_feed.latest_offset > offsets[-1]
+    subscription.close()
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_store_partition"),
+        pytest.lazy_fixture("sqlite_store_partition"),
+    ],
+)
+def test_change_feed_objects_only_kept_for_subscribers(store: Any) -> None:
+    first_offset = store.change_feed.latest_offset
+    assert store.set(MockSyftObject(data=1)).is_ok()
+
+    subscription = store.subscribe()
+    assert store.set(MockSyftObject(data=2)).is_ok()
+    subscription.close()
+    assert store.set(MockSyftObject(data=3)).is_ok()
+
+    # every write has an event, only the one made while subscribed has the object
+    events = store.change_feed.read(first_offset).ok()
+    assert [event.change_type for event in events] == [ChangeType.INSERT] * 3
+    assert [event.obj.data if event.obj else None for event in events] == [
+        None,
+        2,
+        None,
+    ]
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_store_partition"),
+        pytest.lazy_fixture("sqlite_store_partition"),
+        pytest.lazy_fixture("mongo_store_partition"),
+    ],
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_change_feed_subscribe_resume(store: Any) -> None:
+    subscription = store.subscribe()
+    for idx in range(REPEATS):
+        assert store.set(MockSyftObject(data=idx)).is_ok()
+
+    events = subscription.poll(limit=2)
+    assert events.is_ok(), events
+    assert [event.obj.data for event in events.ok()] == [0, 1]
+    resume_offset = subscription.offset
+    subscription.close()
+
+    # a new subscription picks up where the previous one stopped
+    subscription = store.subscribe(from_offset=resume_offset)
+    events = subscription.poll()
+    assert [event.obj.data for event in events.ok()] == list(range(2, REPEATS))
+
+    # nothing new
+    assert subscription.poll(timeout=0.1).ok() == []
+    subscription.close()
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_store_partition"),
+        pytest.lazy_fixture("sqlite_store_partition"),
+    ],
+)
+def test_change_feed_push(store: Any) -> None:
+    received = []
+    done = Event()
+
+    def _callback(event: Any) -> None:
+        received.append(event)
+        if len(received) == REPEATS:
+            done.set()
+
+    subscription = store.subscribe(callback=_callback)
+    for idx in range(REPEATS):
+        assert store.set(MockSyftObject(data=idx)).is_ok()
+
+    assert done.wait(timeout=5)
+    subscription.close()
+    assert [event.obj.data for event in received] == list(range(REPEATS))
+
+
+def test_sqlite_change_feed_other_connection(
+    sqlite_workspace: Tuple,
+) -> None:
+    reader = sqlite_store_partition_fn(sqlite_workspace)
+    subscription = reader.subscribe()
+
+    def _write() -> None:
+        # a separate partition object stands in for another process, the only
+        # thing shared is the database file
+        writer = sqlite_store_partition_fn(sqlite_workspace)
+        time.sleep(0.1)
+        writer.set(MockSyftObject(data="remote"))
+
+    thread = Thread(target=_write)
+    thread.start()
+    events = subscription.poll(timeout=5)
+    thread.join()
+    subscription.close()
+
+    assert events.is_ok(), events
+    assert [event.obj.data for event in events.ok()] == ["remote"]
+
+
+def test_ring_buffer_change_feed_eviction() -> None:
+    feed = RingBufferChangeFeed(name="test", capacity=2)
+    uids = [UID() for _ in range(3)]
+    for uid in uids:
+        feed.record(ChangeType.INSERT, uid)
+
+    assert feed.oldest_offset == 2
+    assert feed.latest_offset == 4
+    assert feed.read(0).is_err()
+    assert [event.uid for event in feed.read(2).ok()] == uids[1:]
+    assert feed.read(4).ok() == []
+
+
+@pytest.mark.parametrize(
+    "queue",
+    [
+        pytest.lazy_fixture("dict_queue_stash"),
+        pytest.lazy_fixture("sqlite_queue_stash"),
+    ],
+)
+def test_queue_stash_wait_for(queue: Any) -> None:
+    item = QueueItem(id=UID(), node_uid=UID(), resolved=True, result=1)
+
+    res = queue.wait_for(item.id, timeout=0.1)
+    assert res.is_ok()
+    assert res.ok() is None
+
+    # the node caps the time a call is held
+    queue.max_wait_timeout = 0.1
+    start = time.monotonic()
+    assert queue.wait_for(item.id, timeout=3600).ok() is None
+    assert time.monotonic() - start < 5
+    del queue.max_wait_timeout
+
+    def _resolve() -> None:
+        time.sleep(0.1)
+        queue.set_result(item)
+
+    thread = Thread(target=_resolve)
+    thread.start()
+    res = queue.wait_for(item.id, timeout=5)
+    thread.join()
+
+    assert res.is_ok()
+    assert res.ok().result == 1
@@ -1,8 +1,12 @@
 # stdlib
+from pathlib import Path
 from threading import Thread
 
 # syft absolute
+from syft.core.node.new.dict_document_store import DictStoreClientConfig
+from syft.core.node.new.dict_document_store import DictStoreConfig
 from syft.core.node.new.dict_document_store import DictStorePartition
+from syft.core.node.new.document_store import PartitionSettings
 from syft.core.node.new.document_store import QueryKeys
 
 # relative
@@ -225,3 +229,115 @@ def test_dict_store_partition_set_delete_multithreaded(
     assert execution_err is None
     stored_cnt = len(dict_store_partition.all().ok())
     assert stored_cnt == 0
+
+
+def persistent_dict_store_partition_fn(
+    path: Path, snapshot_interval: int = 1000
+) -> DictStorePartition:
+    client_config = DictStoreClientConfig(
+        path=path, snapshot_interval=snapshot_interval, fsync=False
+    )
+    store_config = DictStoreConfig(client_config=client_config)
+    settings = PartitionSettings(name="test", object_type=MockObjectType)
+
+    return DictStorePartition(settings=settings, store_config=store_config)
+
+
+def test_dict_store_partition_persistence(tmp_path: Path) -> None:
+    dict_store_partition = persistent_dict_store_partition_fn(tmp_path)
+
+    objs = []
+    for idx in range(10):
+        obj = MockSyftObject(data=idx)
+        res = dict_store_partition.set(obj, ignore_duplicates=False)
+        assert res.is_ok()
+        objs.append(obj)
+
+    key = dict_store_partition.settings.store_key.with_obj(objs[0])
+    assert dict_store_partition.delete(key).is_ok()
+
+    key = dict_store_partition.settings.store_key.with_obj(objs[1])
+    assert dict_store_partition.update(key, MockSyftObject(data="updated")).is_ok()
+
+    # a new partition on the same path replays the log
+    restored = persistent_dict_store_partition_fn(tmp_path)
+    assert len(restored.all().ok()) == 9
+
+    stored = restored.get_all_from_store(QueryKeys(qks=[key]))
+    assert stored.ok()[0].data == "updated"
+
+    # the unique keys are restored as well
+    res = restored.set(objs[2], ignore_duplicates=False)
+    assert res.is_err()
+
+
+def test_dict_store_partition_persistence_compaction(tmp_path: Path) -> None:
+    dict_store_partition = persistent_dict_store_partition_fn(
+        tmp_path, snapshot_interval=5
+    )
+
+    for idx in range(12):
+        obj = MockSyftObject(data=idx)
+        assert dict_store_partition.set(obj, ignore_duplicates=False).is_ok()
+
+    assert (tmp_path / "test_data.snapshot").exists()
+    assert dict_store_partition.data.journal._records < 5
+
+    restored = persistent_dict_store_partition_fn(tmp_path, snapshot_interval=5)
+    assert len(restored.all().ok()) == 12
+
+
+def test_dict_store_partition_persistence_torn_write(tmp_path: Path) -> None:
+    dict_store_partition = persistent_dict_store_partition_fn(tmp_path)
+
+    obj = MockSyftObject(data=1)
+    assert dict_store_partition.set(obj, ignore_duplicates=False).is_ok()
+
+    # simulate a crash in the middle of appending a record
+    log_path = tmp_path / "test_data.wal"
+    log_size = log_path.stat().st_size
+    with open(log_path, "ab") as log:
+        log.write(b"\x01\xff\xff")
+
+    restored = persistent_dict_store_partition_fn(tmp_path)
+    assert len(restored.all().ok()) == 1
+    assert log_path.stat().st_size == log_size
+
+    obj2 = MockSyftObject(data=2)
+    assert restored.set(obj2, ignore_duplicates=False).is_ok()
+    assert len(persistent_dict_store_partition_fn(tmp_path).all().ok()) == 2
+
+
+def test_dict_store_partition_persistence_prune(tmp_path: Path) -> None:
+    dict_store_partition = persistent_dict_store_partition_fn(tmp_path)
+
+    obj = MockSyftObject(data=1)
+    assert dict_store_partition.set(obj, ignore_duplicates=False).is_ok()
+
+    dict_store_partition.prune()
+    assert len(dict_store_partition.all().ok()) == 0
+    assert len(persistent_dict_store_partition_fn(tmp_path).all().ok()) == 0
+
+
+def test_dict_store_partition_persistence_column_deltas(tmp_path: Path) -> None:
+    dict_store_partition = persistent_dict_store_partition_fn(tmp_path)
+    log_path = tmp_path / "test_unique_keys.wal"
+
+    sizes = []
+    for idx in range(20):
+        obj = MockSyftObject(data=idx)
+        assert dict_store_partition.set(obj, ignore_duplicates=False).is_ok()
+        sizes.append(log_path.stat().st_size)
+
+    # each write logs its own index entries, not the whole column
+    growth = [after - before for before, after in zip(sizes, sizes[1:])]
+    assert max(growth) == min(growth)
+
+    key = dict_store_partition.settings.store_key.with_obj(obj)
+    assert dict_store_partition.delete(key).is_ok()
+
+    restored = persistent_dict_store_partition_fn(tmp_path)
+    assert len(restored.all().ok()) == 19
+    assert restored.set(obj, ignore_duplicates=False).is_ok()
+    res = restored.set(MockSyftObject(id=obj.id, data=0), ignore_duplicates=False)
+    assert res.is_err()
@@ -1,6 +1,7 @@
 # stdlib
 from copy import copy
 from threading import Thread
+import time
 
 # third party
 import pytest
@@ -9,8 +10,11 @@ import pytest
 from syft.core.node.new.document_store import PartitionSettings
 from syft.core.node.new.document_store import QueryKeys
 from syft.core.node.new.kv_document_store import KeyValueStorePartition
+from syft.core.node.new.locks import ThreadingLockingConfig
+from syft.core.node.new.uid import UID
 
 # relative
+from .base_stash_test import MockObject
 from .store_mocks_test import MockObjectType
 from .store_mocks_test import MockStoreConfig
 from .store_mocks_test import MockSyftObject
@@ -248,3 +252,83 @@ def test_kv_store_partition_set_delete_multithreaded(
     assert execution_err is None
     stored_cnt = len(kv_store_partition.all().ok())
     assert stored_cnt == 0
+
+
+def test_kv_store_partition_key_locks() -> None:
+    locking_config = ThreadingLockingConfig(lock_name="kv_key_locks", timeout=1)
+    store_config = MockStoreConfig(locking_config=locking_config)
+    settings = PartitionSettings(name="test", object_type=MockObjectType)
+    store = KeyValueStorePartition(settings=settings, store_config=store_config)
+    assert store.init_store().is_ok()
+
+    obj = MockSyftObject(data=0)
+    key = store.settings.store_key.with_obj(obj)
+    assert store.set(obj).is_ok()
+
+    def _kv_cbk(tid: int) -> None:
+        for repeat in range(50):
+            assert store.update(key, MockSyftObject(data=repeat)).is_ok()
+
+    tids = [Thread(target=_kv_cbk, args=(tid,)) for tid in range(5)]
+    for thread in tids:
+        thread.start()
+    for thread in tids:
+        thread.join()
+    assert store.key_locks.metrics.to_dict()["acquired"] == 251
+
+    # writers of a held key time out, other keys aren't blocked
+    other = MockSyftObject(data=1)
+    while store.key_locks.stripe(other.id) == store.key_locks.stripe(key.value):
+        other = MockSyftObject(data=1)
+    with store.lock(key.value):
+        assert store.set(other).is_ok()
+        res = store.delete(key)
+        assert res.is_err()
+        assert "Timeout" in res.err()
+    assert store.delete(key).is_ok()
+    assert store.key_locks.metrics.to_dict()["timeouts"] == 1
+
+
+def test_kv_store_partition_unique_keys_race(monkeypatch) -> None:
+    locking_config = ThreadingLockingConfig(lock_name="kv_unique_race", timeout=5)
+    store_config = MockStoreConfig(locking_config=locking_config)
+    settings = PartitionSettings(name="test", object_type=MockObject)
+    store = KeyValueStorePartition(settings=settings, store_config=store_config)
+    assert store.init_store().is_ok()
+
+    validate = store._validate_partition_keys
+
+    def _slow_validate(*args, **kwargs):
+        result = validate(*args, **kwargs)
+        # widen the window between the unique key check and the index write
+        time.sleep(0.05)
+        return result
+
+    monkeypatch.setattr(store, "_validate_partition_keys", _slow_validate)
+
+    results = []
+
+    def _set() -> None:
+        obj = MockObject(id=UID(), name="same", desc="", importance=0, value=0)
+        results.append(store.set(obj).is_ok())
+
+    tids = [Thread(target=_set) for _ in range(5)]
+    for thread in tids:
+        thread.start()
+    for thread in tids:
+        thread.join()
+
+    # different keys, the same unique name: a single writer wins
+    assert results.count(True) == 1
+    assert len(store.all().ok()) == 1
+
+
+def test_kv_store_partition_locks_by_default(
+    kv_store_partition: KeyValueStorePartition,
+) -> None:
+    locking_config = kv_store_partition.store_config.locking_config
+    assert isinstance(locking_config, ThreadingLockingConfig)
+    assert not kv_store_partition.key_locks.passthrough
+
+    assert kv_store_partition.set(MockSyftObject(data=0)).is_ok()
+    assert kv_store_partition.key_locks.metrics.to_dict()["acquired"] == 1
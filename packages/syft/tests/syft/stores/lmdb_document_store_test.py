@@ -0,0 +1,160 @@
+# stdlib
+from threading import Thread
+from typing import Tuple
+
+# syft absolute
+from syft.core.node.new.document_store import QueryKeys
+from syft.core.node.new.lmdb_document_store import LMDBStorePartition
+
+# relative
+from .store_fixtures_test import lmdb_store_partition_fn
+from .store_mocks_test import MockObjectType
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 20
+
+
+def test_lmdb_store_partition_sanity(
+    lmdb_store_partition: LMDBStorePartition,
+) -> None:
+    assert hasattr(lmdb_store_partition, "data")
+    assert hasattr(lmdb_store_partition, "unique_keys")
+    assert hasattr(lmdb_store_partition, "searchable_keys")
+
+
+def test_lmdb_store_partition_set(
+    lmdb_store_partition: LMDBStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    res = lmdb_store_partition.set(obj, ignore_duplicates=False)
+
+    assert res.is_ok()
+    assert res.ok() == obj
+    assert len(lmdb_store_partition.all().ok()) == 1
+
+    res = lmdb_store_partition.set(obj, ignore_duplicates=False)
+    assert res.is_err()
+    assert len(lmdb_store_partition.all().ok()) == 1
+
+    res = lmdb_store_partition.set(obj, ignore_duplicates=True)
+    assert res.is_ok()
+    assert len(lmdb_store_partition.all().ok()) == 1
+
+    obj2 = MockSyftObject(data=2)
+    res = lmdb_store_partition.set(obj2, ignore_duplicates=False)
+    assert res.is_ok()
+    assert res.ok() == obj2
+    assert len(lmdb_store_partition.all().ok()) == 2
+
+
+def test_lmdb_store_partition_delete(
+    lmdb_store_partition: LMDBStorePartition,
+) -> None:
+    objs = []
+    for v in range(REPEATS):
+        obj = MockSyftObject(data=v)
+        lmdb_store_partition.set(obj, ignore_duplicates=False)
+        objs.append(obj)
+
+    assert len(lmdb_store_partition.all().ok()) == len(objs)
+
+    # random object
+    obj = MockSyftObject(data="bogus")
+    key = lmdb_store_partition.settings.store_key.with_obj(obj)
+    res = lmdb_store_partition.delete(key)
+    assert res.is_err()
+    assert len(lmdb_store_partition.all().ok()) == len(objs)
+
+    # cleanup store
+    for idx, v in enumerate(objs):
+        key = lmdb_store_partition.settings.store_key.with_obj(v)
+        res = lmdb_store_partition.delete(key)
+        assert res.is_ok()
+        assert len(lmdb_store_partition.all().ok()) == len(objs) - idx - 1
+
+        res = lmdb_store_partition.delete(key)
+        assert res.is_err()
+
+    assert len(lmdb_store_partition.all().ok()) == 0
+
+
+def test_lmdb_store_partition_update(
+    lmdb_store_partition: LMDBStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    lmdb_store_partition.set(obj, ignore_duplicates=False)
+    assert len(lmdb_store_partition.all().ok()) == 1
+
+    # fail to update missing keys
+    rand_obj = MockSyftObject(data="bogus")
+    key = lmdb_store_partition.settings.store_key.with_obj(rand_obj)
+    res = lmdb_store_partition.update(key, obj)
+    assert res.is_err()
+
+    for v in range(REPEATS):
+        key = lmdb_store_partition.settings.store_key.with_obj(obj)
+        obj_new = MockSyftObject(data=v)
+
+        res = lmdb_store_partition.update(key, obj_new)
+        assert res.is_ok()
+
+        assert len(lmdb_store_partition.all().ok()) == 1
+        assert lmdb_store_partition.all().ok()[0].id == obj.id
+        assert lmdb_store_partition.all().ok()[0].data == v
+
+        stored = lmdb_store_partition.get_all_from_store(QueryKeys(qks=[key]))
+        assert stored.ok()[0].data == v
+
+
+def test_lmdb_store_partition_keys_roundtrip(
+    lmdb_store_partition: LMDBStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    lmdb_store_partition.set(obj, ignore_duplicates=False)
+
+    # keys are stored serialized, so they come back with their original type
+    assert list(lmdb_store_partition.data.keys()) == [obj.id]
+    assert obj.id in lmdb_store_partition.data
+    assert "id" in lmdb_store_partition.unique_keys
+
+    lmdb_store_partition.data.clear()
+    assert len(lmdb_store_partition.data) == 0
+
+
+def test_lmdb_store_partition_set_threading(
+    sqlite_workspace: Tuple,
+) -> None:
+    thread_cnt = 3
+    repeats = REPEATS
+
+    execution_err = None
+
+    def _kv_cbk(tid: int) -> None:
+        nonlocal execution_err
+
+        lmdb_store_partition = lmdb_store_partition_fn(sqlite_workspace)
+        for idx in range(repeats):
+            obj = MockObjectType(data=idx)
+            res = lmdb_store_partition.set(obj, ignore_duplicates=False)
+
+            if res.is_err():
+                execution_err = res
+            assert res.is_ok(), res
+
+        return execution_err
+
+    tids = []
+    for tid in range(thread_cnt):
+        thread = Thread(target=_kv_cbk, args=(tid,))
+        thread.start()
+
+        tids.append(thread)
+
+    for thread in tids:
+        thread.join()
+
+    assert execution_err is None
+
+    lmdb_store_partition = lmdb_store_partition_fn(sqlite_workspace)
+    stored_cnt = len(lmdb_store_partition.all().ok())
+    assert stored_cnt == thread_cnt * repeats
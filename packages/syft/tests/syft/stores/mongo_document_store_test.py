@@ -1,21 +1,29 @@
 # stdlib
 import sys
 from threading import Thread
+from typing import List
 from typing import Tuple
 
 # third party
 from joblib import Parallel
 from joblib import delayed
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
 import pytest
 
 # syft absolute
+from syft.core.node.new.document_store import PartitionKey
 from syft.core.node.new.document_store import PartitionSettings
 from syft.core.node.new.document_store import QueryKeys
 from syft.core.node.new.mongo_client import MongoStoreClientConfig
+from syft.core.node.new.mongo_document_store import MongoDocumentStore
 from syft.core.node.new.mongo_document_store import MongoStoreConfig
 from syft.core.node.new.mongo_document_store import MongoStorePartition
+from syft.core.node.new.mongo_document_store import SEARCH_INDEX_SUFFIX
 
 # relative
+from .base_stash_test import MockObject
+from .base_stash_test import MockStash
 from .store_constants_test import generate_db_name
 from .store_fixtures_test import mongo_store_partition_fn
 from .store_mocks_test import MockObjectType
@@ -407,3 +415,132 @@ def test_mongo_store_partition_set_delete_joblib(
     )
     stored_cnt = len(mongo_store_partition.all().ok())
     assert stored_cnt == 0
+
+
+def _mock_objects(n: int, desc: str = "bulk") -> List[MockObject]:
+    return [
+        MockObject(name=f"{desc} {idx}", desc=desc, importance=idx, value=idx)
+        for idx in range(n)
+    ]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_mongo_store_partition_search_indexes(
+    mongo_document_store: MongoDocumentStore,
+) -> None:
+    stash = MockStash(store=mongo_document_store)
+    collection = stash.partition.collection.ok()
+
+    # `id` is the first key of the unique index, the other searchable keys get
+    # their own index
+    search_indexes = {
+        index["key"][0][0]
+        for name, index in collection.index_information().items()
+        if name.endswith(SEARCH_INDEX_SUFFIX)
+    }
+    assert search_indexes == {"name", "desc", "importance"}
+    assert stash.partition._uses_index({"desc": "bulk"})
+
+    # stale search indexes are dropped
+    collection.create_index("value", name=f"value{SEARCH_INDEX_SUFFIX}")
+    assert stash.partition.init_store().is_ok()
+    assert f"value{SEARCH_INDEX_SUFFIX}" not in collection.index_information()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_mongo_store_partition_set_many(
+    mongo_document_store: MongoDocumentStore,
+) -> None:
+    stash = MockStash(store=mongo_document_store)
+    objs = _mock_objects(REPEATS)
+
+    assert stash.set_many(objs).is_ok()
+    assert len(stash.find_all(desc="bulk").ok()) == REPEATS
+
+    extra = MockObject(name="extra", desc="bulk", importance=0, value=0)
+    assert stash.set_many([objs[0], extra]).is_err()
+    assert stash.set_many([objs[0], extra], ignore_duplicates=True).is_ok()
+    assert len(stash.find_all(desc="bulk").ok()) == REPEATS + 1
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_mongo_store_partition_upsert(
+    mongo_document_store: MongoDocumentStore,
+) -> None:
+    stash = MockStash(store=mongo_document_store)
+    obj, other = _mock_objects(2)
+    assert stash.set(obj).is_ok()
+
+    changed = obj.copy(update={"desc": "changed", "importance": 10})
+    assert stash.upsert_many([changed, other]).is_ok()
+
+    assert len(stash.get_all().ok()) == 2
+    stored = stash.get_by_uid(obj.id).ok()
+    assert (stored.desc, stored.importance) == ("changed", 10)
+    assert [found.id for found in stash.find_all(desc="changed").ok()] == [obj.id]
+    assert stash.get_by_uid(other.id).ok() == other
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_mongo_store_partition_project(
+    mongo_document_store: MongoDocumentStore,
+) -> None:
+    stash = MockStash(store=mongo_document_store)
+    objs = _mock_objects(3)
+    assert stash.set_many(objs).is_ok()
+
+    # `value` isn't indexed and is projected from the stored object
+    DescPartitionKey = PartitionKey(key="desc", type_=str)
+    rows = stash.query_fields(DescPartitionKey.with_obj("bulk"), ["name", "value"])
+    assert sorted(rows.ok(), key=lambda row: row["value"]) == [
+        {"name": obj.name, "value": obj.value} for obj in objs
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+async def test_mongo_store_partition_async(mongo_server_mock) -> None:
+    mongo_kwargs = mongo_server_mock.pmr_credentials.as_mongo_kwargs()
+    mongo_config = MongoStoreClientConfig(
+        client=MongoClient(**mongo_kwargs),
+        async_client=AsyncIOMotorClient(**mongo_kwargs),
+    )
+    store = MongoDocumentStore(
+        store_config=MongoStoreConfig(
+            client_config=mongo_config, db_name=generate_db_name()
+        )
+    )
+    stash = MockStash(store=store)
+    obj, other = _mock_objects(2)
+
+    assert (await stash.async_set(obj)).is_ok()
+    assert (await stash.async_set(obj)).is_err()
+    assert (await stash.async_set(obj, ignore_duplicates=True)).is_ok()
+    assert (await stash.async_set(other)).is_ok()
+
+    # the sync and async APIs share the collection
+    assert len(stash.get_all().ok()) == 2
+    assert (await stash.async_get_by_uid(obj.id)).ok() == obj
+    assert len((await stash.async_find_all(desc="bulk")).ok()) == 2
+
+    changed = obj.copy(update={"desc": "changed"})
+    assert (await stash.async_update(changed)).is_ok()
+    assert stash.find_one(desc="changed").ok().id == obj.id
+    assert (await stash.async_update_fields(obj.id, {"importance": 10})).is_ok()
+    assert (await stash.async_find_one(importance=10)).ok().id == obj.id
+
+    qk = stash.partition.store_query_key(other)
+    assert (await stash.async_delete(qk)).is_ok()
+    assert (await stash.async_get_by_uid(other.id)).ok() is None
+    # the awaited calls are measured like the sync ones
+    assert stash.partition.metrics.to_dict()["query"]["index_hits"] > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+async def test_mongo_store_partition_async_needs_client(
+    mongo_document_store: MongoDocumentStore,
+) -> None:
+    # a reused sync client doesn't tell how to open the async one
+    stash = MockStash(store=mongo_document_store)
+    assert (await stash.async_get_all()).is_err()
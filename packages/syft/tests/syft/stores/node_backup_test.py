@@ -0,0 +1,270 @@
+# stdlib
+import io
+import json
+from pathlib import Path
+import sys
+import tarfile
+from threading import Thread
+import time
+from typing import Tuple
+
+# third party
+import pytest
+
+# syft absolute
+from syft.core.node.new.credentials import SyftSigningKey
+from syft.core.node.new.dict_document_store import DictStoreConfig
+from syft.core.node.new.document_store import PartitionSettings
+from syft.core.node.new.node_backup import NodeBackup
+from syft.core.node.new.node_backup import SQLiteStoreBackup
+from syft.core.node.new.response import SyftError
+from syft.core.node.new.response import SyftSuccess
+from syft.core.node.new.sqlite_document_store import SQLiteStoreClientConfig
+from syft.core.node.new.sqlite_document_store import SQLiteStoreConfig
+from syft.core.node.new.uid import UID
+from syft.core.node.worker import Worker
+
+# relative
+from .store_constants_test import generate_db_name
+from .store_fixtures_test import mongo_document_store_fn
+from .store_fixtures_test import sqlite_document_store_fn
+from .store_mocks_test import MockObjectType
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 20
+
+
+def _sqlite_config(workspace: Path, filename: str) -> SQLiteStoreConfig:
+    return SQLiteStoreConfig(
+        client_config=SQLiteStoreClientConfig(filename=filename, path=workspace)
+    )
+
+
+def _mock_settings() -> PartitionSettings:
+    return PartitionSettings(name="test", object_type=MockObjectType)
+
+
+def _populate(worker: Worker) -> UID:
+    guest_client = worker.root_client.guest()
+    guest_client.register(name="Alice", email="alice@caltech.edu", password="abc123")
+
+    uid = UID()
+    res = worker.action_store.set(
+        uid=uid,
+        credentials=worker.signing_key.verify_key,
+        syft_object=MockSyftObject(data=1),
+    )
+    assert res.is_ok()
+    return uid
+
+
+def _user_emails(worker: Worker) -> list:
+    return sorted(
+        user.email for user in worker.document_store.partitions["User"].all().ok()
+    )
+
+
+def _backup_and_restore(source: Worker, target: Worker, compress: bool) -> None:
+    uid = _populate(source)
+
+    archive = io.BytesIO()
+    assert isinstance(source.backup(archive, compress=compress), SyftSuccess)
+    archive.seek(0)
+    assert isinstance(target.restore(archive), SyftSuccess)
+
+    assert _user_emails(target) == _user_emails(source)
+    assert "alice@caltech.edu" in _user_emails(target)
+
+    obj = target.action_store.get(uid=uid, credentials=target.signing_key.verify_key)
+    assert obj.is_ok()
+    assert obj.ok().data == 1
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_node_backup_restore_dict(compress: bool) -> None:
+    signing_key = SyftSigningKey.generate()
+    source = Worker(
+        name="backup-source",
+        signing_key=signing_key,
+        document_store_config=DictStoreConfig(),
+        action_store_config=DictStoreConfig(),
+    )
+    target = Worker(
+        name="backup-target",
+        signing_key=signing_key,
+        document_store_config=DictStoreConfig(),
+        action_store_config=DictStoreConfig(),
+    )
+    _backup_and_restore(source, target, compress=compress)
+
+
+def test_node_backup_restore_sqlite(sqlite_workspace: Tuple) -> None:
+    workspace, db_name = sqlite_workspace
+    signing_key = SyftSigningKey.generate()
+
+    # the document and the action store share a file, like the node defaults
+    source = Worker(
+        name="backup-source",
+        signing_key=signing_key,
+        document_store_config=_sqlite_config(workspace, f"{db_name}.source"),
+        action_store_config=_sqlite_config(workspace, f"{db_name}.source"),
+    )
+    target = Worker(
+        name="backup-target",
+        signing_key=signing_key,
+        document_store_config=_sqlite_config(workspace, f"{db_name}.target"),
+        action_store_config=_sqlite_config(workspace, f"{db_name}.target"),
+    )
+    _backup_and_restore(source, target, compress=False)
+
+
+def test_node_backup_sqlite_concurrent_writes(sqlite_workspace: Tuple) -> None:
+    document_store = sqlite_document_store_fn(sqlite_workspace)
+    partition = document_store.partition(_mock_settings())
+    for idx in range(REPEATS):
+        assert partition.set(MockSyftObject(data=idx)).is_ok()
+
+    node_backup = NodeBackup(
+        node_id=UID(),
+        document_store=document_store,
+        document_store_config=document_store.store_config,
+        action_store=Worker(name="backup-actions").action_store,
+        action_store_config=DictStoreConfig(),
+    )
+
+    # keep writing from another thread while the backup runs
+    def _write() -> None:
+        for idx in range(REPEATS):
+            partition.set(MockSyftObject(data=REPEATS + idx))
+
+    thread = Thread(target=_write)
+    thread.start()
+    archive = io.BytesIO()
+    res = node_backup.backup(archive)
+    thread.join()
+    assert res.is_ok(), res
+
+    # the backup holds at least the objects written before it started
+    for obj in partition.all().ok():
+        assert partition.delete(partition.settings.store_key.with_obj(obj)).is_ok()
+    archive.seek(0)
+    assert node_backup.restore(archive).is_ok()
+
+    restored = sorted(obj.data for obj in partition.all().ok())
+    assert restored[:REPEATS] == list(range(REPEATS))
+    assert restored == sorted(set(restored))
+
+
+def test_node_backup_blocks_writers(sqlite_workspace: Tuple, monkeypatch) -> None:
+    document_store = sqlite_document_store_fn(sqlite_workspace)
+    partition = document_store.partition(_mock_settings())
+    assert partition.set(MockSyftObject(data=0)).is_ok()
+    worker = Worker(name="backup-actions")
+    action_store = worker.action_store
+
+    node_backup = NodeBackup(
+        node_id=UID(),
+        document_store=document_store,
+        document_store_config=document_store.store_config,
+        action_store=action_store,
+        action_store_config=DictStoreConfig(),
+    )
+
+    uid = UID()
+    results = {}
+
+    def _write_document() -> None:
+        results["document"] = partition.set(MockSyftObject(data=1)).is_ok()
+
+    def _write_action() -> None:
+        results["action"] = action_store.set(
+            uid=uid,
+            credentials=worker.signing_key.verify_key,
+            syft_object=MockSyftObject(data=1),
+        ).is_ok()
+
+    threads = [Thread(target=_write_document), Thread(target=_write_action)]
+    copy = SQLiteStoreBackup.copy
+
+    def _copy(self, source: Path, target: Path) -> None:
+        # the writers of both stores wait for the copies
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        assert all(thread.is_alive() for thread in threads)
+        copy(self, source, target)
+
+    monkeypatch.setattr(SQLiteStoreBackup, "copy", _copy)
+    archive = io.BytesIO()
+    res = node_backup.backup(archive)
+    for thread in threads:
+        thread.join()
+    assert res.is_ok(), res
+    assert results == {"document": True, "action": True}
+
+    # neither write made it into the backup
+    archive.seek(0)
+    assert node_backup.restore(archive).is_ok()
+    assert [obj.data for obj in partition.all().ok()] == [0]
+    assert not action_store.exists(uid)
+
+
+def test_node_backup_version_check() -> None:
+    worker = Worker(name="backup-version")
+
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        manifest = json.dumps(
+            {"format": "syft-node-backup", "version": 999, "stores": {}}
+        ).encode("utf-8")
+        info = tarfile.TarInfo(name="manifest.json")
+        info.size = len(manifest)
+        tar.addfile(info, io.BytesIO(manifest))
+    archive.seek(0)
+
+    res = worker.restore(archive)
+    assert isinstance(res, SyftError)
+    assert "999" in res.message
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_node_backup_restore_mongo(mongo_server_mock) -> None:
+    mongo_kwargs = mongo_server_mock.pmr_credentials.as_mongo_kwargs()
+    source_store = mongo_document_store_fn(
+        mongo_db_name=generate_db_name(), **mongo_kwargs
+    )
+    target_store = mongo_document_store_fn(
+        mongo_db_name=generate_db_name(), **mongo_kwargs
+    )
+
+    settings = _mock_settings()
+    source = source_store.partition(settings)
+    for idx in range(REPEATS):
+        assert source.set(MockSyftObject(data=idx)).is_ok()
+    target = target_store.partition(settings)
+    assert target.set(MockSyftObject(data="stale")).is_ok()
+
+    action_store = Worker(name="backup-actions").action_store
+
+    archive = io.BytesIO()
+    res = NodeBackup(
+        node_id=UID(),
+        document_store=source_store,
+        document_store_config=source_store.store_config,
+        action_store=action_store,
+        action_store_config=DictStoreConfig(),
+    ).backup(archive)
+    assert res.is_ok(), res
+
+    archive.seek(0)
+    res = NodeBackup(
+        node_id=UID(),
+        document_store=target_store,
+        document_store_config=target_store.store_config,
+        action_store=action_store,
+        action_store_config=DictStoreConfig(),
+    ).restore(archive)
+    assert res.is_ok(), res
+
+    restored = sorted(obj.data for obj in target.all().ok())
+    assert restored == list(range(REPEATS))
@@ -21,6 +21,9 @@ REPEATS = 20
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -36,6 +39,9 @@ def test_queue_stash_sanity(queue: Any) -> None:
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -77,6 +83,9 @@ def test_queue_stash_set_get(queue: Any) -> None:
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -107,6 +116,9 @@ def test_queue_stash_update(queue: Any) -> None:
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -146,6 +158,9 @@ def test_queue_set_existing_queue_threading(queue: Any) -> None:
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -186,6 +201,9 @@ def test_queue_update_existing_queue_threading(queue: Any) -> None:
     [
         pytest.lazy_fixture("dict_queue_stash"),
         pytest.lazy_fixture("sqlite_queue_stash"),
+        pytest.lazy_fixture("lmdb_queue_stash"),
+        pytest.lazy_fixture("redis_queue_stash"),
+        pytest.lazy_fixture("sharded_sqlite_queue_stash"),
         pytest.lazy_fixture("mongo_queue_stash"),
     ],
 )
@@ -0,0 +1,221 @@
+# stdlib
+from collections import defaultdict
+from threading import Thread
+
+# third party
+import fakeredis
+
+# syft absolute
+from syft.core.node.new.document_store import QueryKeys
+from syft.core.node.new.redis_document_store import RedisHashColumn
+from syft.core.node.new.redis_document_store import RedisStorePartition
+
+# relative
+from .store_fixtures_test import redis_store_partition_fn
+from .store_mocks_test import MockObjectType
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 20
+
+
+def test_redis_store_partition_sanity(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    assert hasattr(redis_store_partition, "data")
+    assert hasattr(redis_store_partition, "unique_keys")
+    assert hasattr(redis_store_partition, "searchable_keys")
+
+    # index columns live in their own hashes
+    assert isinstance(redis_store_partition.unique_keys["id"], RedisHashColumn)
+
+
+def test_redis_store_partition_set(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    res = redis_store_partition.set(obj, ignore_duplicates=False)
+
+    assert res.is_ok()
+    assert res.ok() == obj
+    assert len(redis_store_partition.all().ok()) == 1
+
+    res = redis_store_partition.set(obj, ignore_duplicates=False)
+    assert res.is_err()
+    assert len(redis_store_partition.all().ok()) == 1
+
+    res = redis_store_partition.set(obj, ignore_duplicates=True)
+    assert res.is_ok()
+    assert len(redis_store_partition.all().ok()) == 1
+
+    obj2 = MockSyftObject(data=2)
+    res = redis_store_partition.set(obj2, ignore_duplicates=False)
+    assert res.is_ok()
+    assert res.ok() == obj2
+    assert len(redis_store_partition.all().ok()) == 2
+
+    assert redis_store_partition.unique_keys["id"][obj.id] == obj.id
+
+
+def test_redis_store_partition_delete(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    objs = []
+    for v in range(REPEATS):
+        obj = MockSyftObject(data=v)
+        redis_store_partition.set(obj, ignore_duplicates=False)
+        objs.append(obj)
+
+    assert len(redis_store_partition.all().ok()) == len(objs)
+
+    # random object
+    obj = MockSyftObject(data="bogus")
+    key = redis_store_partition.settings.store_key.with_obj(obj)
+    res = redis_store_partition.delete(key)
+    assert res.is_err()
+    assert len(redis_store_partition.all().ok()) == len(objs)
+
+    for idx, v in enumerate(objs):
+        key = redis_store_partition.settings.store_key.with_obj(v)
+        res = redis_store_partition.delete(key)
+        assert res.is_ok()
+        assert len(redis_store_partition.all().ok()) == len(objs) - idx - 1
+
+        res = redis_store_partition.delete(key)
+        assert res.is_err()
+
+    assert len(redis_store_partition.all().ok()) == 0
+
+
+def test_redis_store_partition_update(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    redis_store_partition.set(obj, ignore_duplicates=False)
+    assert len(redis_store_partition.all().ok()) == 1
+
+    # fail to update missing keys
+    rand_obj = MockSyftObject(data="bogus")
+    key = redis_store_partition.settings.store_key.with_obj(rand_obj)
+    res = redis_store_partition.update(key, obj)
+    assert res.is_err()
+
+    for v in range(REPEATS):
+        key = redis_store_partition.settings.store_key.with_obj(obj)
+        obj_new = MockSyftObject(data=v)
+
+        res = redis_store_partition.update(key, obj_new)
+        assert res.is_ok()
+
+        assert len(redis_store_partition.all().ok()) == 1
+        assert redis_store_partition.all().ok()[0].id == obj.id
+        assert redis_store_partition.all().ok()[0].data == v
+
+        stored = redis_store_partition.get_all_from_store(QueryKeys(qks=[key]))
+        assert stored.ok()[0].data == v
+
+
+def test_redis_hash_column_ops(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    searchable_keys = redis_store_partition.searchable_keys
+    searchable_keys["column"] = {}
+
+    column = searchable_keys["column"]
+    column["key"] = 1
+    assert searchable_keys["column"]["key"] == 1
+    assert column.pop("key") == 1
+    assert column.pop("key", None) is None
+    assert "key" not in searchable_keys["column"]
+
+    # fetched values are copies, edits go through the column ops
+    searchable_keys["list_column"] = defaultdict(list, {"key": [1]})
+    column = searchable_keys["list_column"]
+    column["key"].append(2)
+    searchable_keys["list_column"] = column
+    assert searchable_keys["list_column"]["key"] == [1]
+
+    searchable_keys.append_to_column("list_column", "key", 2)
+    searchable_keys.append_to_column("list_column", "other", 3)
+    assert searchable_keys["list_column"]["key"] == [1, 2]
+    assert searchable_keys["list_column"]["other"] == [3]
+
+    searchable_keys.set_in_column("list_column", "key", [4])
+    assert searchable_keys["list_column"]["key"] == [4]
+    searchable_keys.delete_from_column("list_column", "key")
+    searchable_keys.delete_from_column("list_column", "key")
+    assert "key" not in searchable_keys["list_column"]
+
+    del searchable_keys["list_column"]
+    assert "list_column" not in searchable_keys
+
+
+def test_redis_append_to_column_threading(
+    redis_store_partition: RedisStorePartition,
+) -> None:
+    thread_cnt = 3
+    searchable_keys = redis_store_partition.searchable_keys
+    searchable_keys["column"] = defaultdict(list)
+
+    def _append(tid: int) -> None:
+        for idx in range(REPEATS):
+            searchable_keys.append_to_column("column", "key", (tid, idx))
+
+    threads = [Thread(target=_append, args=(tid,)) for tid in range(thread_cnt)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(searchable_keys["column"]["key"]) == thread_cnt * REPEATS
+
+
+def test_redis_store_partition_namespaces(
+    redis_server_fake: fakeredis.FakeServer,
+) -> None:
+    store_a = redis_store_partition_fn(redis_server_fake, namespace="a")
+    store_b = redis_store_partition_fn(redis_server_fake, namespace="b")
+
+    obj = MockSyftObject(data=1)
+    assert store_a.set(obj, ignore_duplicates=False).is_ok()
+
+    assert len(store_a.all().ok()) == 1
+    assert len(store_b.all().ok()) == 0
+
+
+def test_redis_store_partition_set_threading(
+    redis_server_fake: fakeredis.FakeServer,
+) -> None:
+    thread_cnt = 3
+    repeats = REPEATS
+
+    execution_err = None
+
+    def _kv_cbk(tid: int) -> None:
+        nonlocal execution_err
+
+        redis_store_partition = redis_store_partition_fn(redis_server_fake)
+        for idx in range(repeats):
+            obj = MockObjectType(data=idx)
+            res = redis_store_partition.set(obj, ignore_duplicates=False)
+
+            if res.is_err():
+                execution_err = res
+            assert res.is_ok(), res
+
+        return execution_err
+
+    tids = []
+    for tid in range(thread_cnt):
+        thread = Thread(target=_kv_cbk, args=(tid,))
+        thread.start()
+
+        tids.append(thread)
+
+    for thread in tids:
+        thread.join()
+
+    assert execution_err is None
+
+    redis_store_partition = redis_store_partition_fn(redis_server_fake)
+    stored_cnt = len(redis_store_partition.all().ok())
+    assert stored_cnt == thread_cnt * repeats
@@ -0,0 +1,170 @@
+# stdlib
+import sys
+from typing import Any
+from typing import List
+from typing import Tuple
+
+# third party
+import pytest
+
+# syft absolute
+from syft.core.node.new.document_store import BaseUIDStoreStash
+from syft.core.node.new.document_store import DocumentStore
+from syft.core.node.new.document_store import PartitionSettings
+from syft.core.node.new.schema_migration import SchemaMigration
+from syft.core.node.new.serializable import serializable
+from syft.core.node.new.syft_object import SYFT_OBJECT_VERSION_1
+from syft.core.node.new.syft_object import SYFT_OBJECT_VERSION_2
+from syft.core.node.new.syft_object import SyftObject
+from syft.core.node.new.transforms import make_set_default
+from syft.core.node.new.transforms import transform
+from syft.core.node.new.uid import UID
+
+REPEATS = 5
+
+
+@serializable(recursive_serde=True)
+class MigrationMockObjectV1(SyftObject):
+    __canonical_name__ = "migration_mock_object_type"
+    __version__ = SYFT_OBJECT_VERSION_1
+
+    id: UID
+    name: str
+    value: int
+
+    __attr_searchable__ = ["name", "value"]
+    __attr_unique__ = ["name"]
+
+
+@serializable(recursive_serde=True)
+class MigrationMockObject(SyftObject):
+    __canonical_name__ = "migration_mock_object_type"
+    __version__ = SYFT_OBJECT_VERSION_2
+
+    id: UID
+    name: str
+    value: int
+    label: str
+
+    __attr_searchable__ = ["name", "value", "label"]
+    __attr_unique__ = ["name"]
+
+
+@transform(MigrationMockObjectV1, MigrationMockObject)
+def upgrade_migration_mock_object():
+    return [make_set_default("label", "migrated")]
+
+
+class MigrationMockStashV1(BaseUIDStoreStash):
+    object_type = MigrationMockObjectV1
+    settings = PartitionSettings(
+        name=MigrationMockObjectV1.__canonical_name__,
+        object_type=MigrationMockObjectV1,
+    )
+
+
+class MigrationMockStash(BaseUIDStoreStash):
+    object_type = MigrationMockObject
+    settings = PartitionSettings(
+        name=MigrationMockObject.__canonical_name__,
+        object_type=MigrationMockObject,
+    )
+
+
+def _upgraded_store(store: DocumentStore) -> Tuple[DocumentStore, List[UID]]:
+    # objects written before the upgrade, read back by a restarted node
+    stash = MigrationMockStashV1(store=store)
+    ids = []
+    for idx in range(REPEATS):
+        obj = MigrationMockObjectV1(name=f"object {idx}", value=idx)
+        assert stash.set(obj).is_ok()
+        ids.append(obj.id)
+    return type(store)(store_config=store.store_config), ids
+
+
+PERSISTENT_STORES = [
+    pytest.lazy_fixture("sqlite_document_store"),
+    pytest.lazy_fixture("lmdb_document_store"),
+    pytest.lazy_fixture("redis_document_store"),
+    pytest.lazy_fixture("mongo_document_store"),
+]
+
+
+@pytest.mark.parametrize("store", PERSISTENT_STORES)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_schema_migration_upgrades_objects(store: Any) -> None:
+    store, ids = _upgraded_store(store)
+    stash = MigrationMockStash(store=store)
+    assert all(
+        type(obj) is MigrationMockObjectV1 for obj in stash.get_all().ok()
+    ), "objects are only upgraded by the migration"
+
+    migration = SchemaMigration(store=store, batch_size=2, duty_cycle=1.0)
+    assert migration.run().is_ok()
+
+    progress = migration.progress_stash.get_by_partition(stash.settings.name).ok()
+    assert progress.completed
+    assert progress.error is None
+    assert (progress.scanned, progress.migrated) == (REPEATS, REPEATS)
+
+    objs = stash.get_all().ok()
+    assert sorted(obj.id for obj in objs) == sorted(ids)
+    assert all(type(obj) is MigrationMockObject for obj in objs)
+    assert all(obj.label == "migrated" for obj in objs)
+    # the keys added by the new version are indexed
+    assert len(stash.find_all(label="migrated").ok()) == REPEATS
+    assert stash.find_one(name="object 1").ok().value == 1
+
+    # a completed partition isn't read again
+    assert migration.run().is_ok()
+    progress = migration.progress_stash.get_by_partition(stash.settings.name).ok()
+    assert progress.scanned == REPEATS
+
+
+def test_schema_migration_resumes(sqlite_document_store: Any) -> None:
+    store, _ = _upgraded_store(sqlite_document_store)
+    stash = MigrationMockStash(store=store)
+
+    migration = SchemaMigration(store=store, batch_size=2, duty_cycle=1.0)
+    # interrupted after the first batch
+    migration._throttle = lambda elapsed: migration._stop.set()
+    assert migration.run().is_ok()
+
+    progress = migration.progress_stash.get_by_partition(stash.settings.name).ok()
+    assert not progress.completed
+    assert (progress.scanned, progress.migrated) == (2, 2)
+    assert progress.last_key is not None
+
+    # a restarted node continues after the last batch written back
+    restarted_store = type(store)(store_config=store.store_config)
+    MigrationMockStash(store=restarted_store)
+    resumed = SchemaMigration(store=restarted_store, duty_cycle=1.0)
+    assert resumed.run().is_ok()
+    progress = resumed.progress_stash.get_by_partition(stash.settings.name).ok()
+    assert progress.completed
+    assert (progress.scanned, progress.migrated) == (REPEATS, REPEATS)
+    assert all(type(obj) is MigrationMockObject for obj in stash.get_all().ok())
+
+
+def test_schema_migration_throttle(dict_document_store: Any) -> None:
+    migration = SchemaMigration(store=dict_document_store, duty_cycle=0.25)
+    pauses = []
+    migration._stop.wait = pauses.append
+
+    migration._throttle(0.1)
+    assert pauses == [pytest.approx(0.3)]
+
+    with pytest.raises(ValueError):
+        SchemaMigration(store=dict_document_store, duty_cycle=0)
+
+
+def test_schema_migration_background(sqlite_document_store: Any) -> None:
+    store, _ = _upgraded_store(sqlite_document_store)
+    stash = MigrationMockStash(store=store)
+
+    migration = SchemaMigration(store=store, batch_size=1)
+    migration.start()
+    migration.join(timeout=30)
+
+    assert all(progress.completed for progress in migration.progress().ok())
+    assert all(type(obj) is MigrationMockObject for obj in stash.get_all().ok())
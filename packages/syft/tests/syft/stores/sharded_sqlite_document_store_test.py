@@ -0,0 +1,267 @@
+# stdlib
+import sqlite3
+from threading import Thread
+from typing import Tuple
+
+# third party
+import pytest
+from result import Err
+
+# syft absolute
+from syft.core.node.new.document_store import QueryKeys
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteDocumentStore
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteStoreConfig
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteStorePartition
+from syft.core.node.new.sharded_sqlite_document_store import shard_index
+from syft.core.node.new.sqlite_document_store import SQLiteStoreClientConfig
+from syft.core.node.new.sqlite_document_store import SQLiteStoreConfig
+
+# relative
+from .base_stash_test import MockObject
+from .base_stash_test import MockStash
+from .store_fixtures_test import sharded_sqlite_store_partition_fn
+from .store_mocks_test import MockObjectType
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 20
+
+
+def test_sharded_sqlite_store_partition_sanity(
+    sharded_sqlite_store_partition: ShardedSQLiteStorePartition,
+) -> None:
+    assert len(sharded_sqlite_store_partition.shards) == 3
+    assert hasattr(sharded_sqlite_store_partition, "index")
+
+    # every shard lives in its own file
+    files = {
+        shard.store_config.client_config.filename
+        for shard in sharded_sqlite_store_partition.shards
+    }
+    assert len(files) == 3
+
+    # and is a plain SQLite store with the settings of the sharded store
+    for shard in sharded_sqlite_store_partition.shards:
+        assert type(shard.store_config) is SQLiteStoreConfig
+        assert (
+            shard.store_config.locking_config
+            == sharded_sqlite_store_partition.store_config.locking_config
+        )
+
+
+def test_sharded_sqlite_store_partition_set(
+    sharded_sqlite_store_partition: ShardedSQLiteStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    res = sharded_sqlite_store_partition.set(obj, ignore_duplicates=False)
+
+    assert res.is_ok()
+    assert res.ok() == obj
+    assert len(sharded_sqlite_store_partition.all().ok()) == 1
+
+    res = sharded_sqlite_store_partition.set(obj, ignore_duplicates=False)
+    assert res.is_err()
+    assert len(sharded_sqlite_store_partition.all().ok()) == 1
+
+    res = sharded_sqlite_store_partition.set(obj, ignore_duplicates=True)
+    assert res.is_ok()
+    assert len(sharded_sqlite_store_partition.all().ok()) == 1
+
+    obj2 = MockSyftObject(data=2)
+    res = sharded_sqlite_store_partition.set(obj2, ignore_duplicates=False)
+    assert res.is_ok()
+    assert res.ok() == obj2
+    assert len(sharded_sqlite_store_partition.all().ok()) == 2
+
+
+def test_sharded_sqlite_store_partition_spread(
+    sharded_sqlite_store_partition: ShardedSQLiteStorePartition,
+) -> None:
+    objs = [MockSyftObject(data=v) for v in range(REPEATS)]
+    for obj in objs:
+        assert sharded_sqlite_store_partition.set(obj).is_ok()
+
+    shards = sharded_sqlite_store_partition.shards
+    for obj in objs:
+        owner = shard_index(obj.id, len(shards))
+        for idx, shard in enumerate(shards):
+            assert (obj.id in shard.data) == (idx == owner)
+
+    assert sum(len(shard) for shard in shards) == REPEATS
+    assert len(sharded_sqlite_store_partition) == REPEATS
+
+
+def test_sharded_sqlite_store_partition_delete(
+    sharded_sqlite_store_partition: ShardedSQLiteStorePartition,
+) -> None:
+    objs = []
+    for v in range(REPEATS):
+        obj = MockSyftObject(data=v)
+        sharded_sqlite_store_partition.set(obj, ignore_duplicates=False)
+        objs.append(obj)
+
+    assert len(sharded_sqlite_store_partition.all().ok()) == len(objs)
+
+    # random object
+    obj = MockSyftObject(data="bogus")
+    key = sharded_sqlite_store_partition.settings.store_key.with_obj(obj)
+    res = sharded_sqlite_store_partition.delete(key)
+    assert res.is_err()
+    assert len(sharded_sqlite_store_partition.all().ok()) == len(objs)
+
+    for idx, v in enumerate(objs):
+        key = sharded_sqlite_store_partition.settings.store_key.with_obj(v)
+        res = sharded_sqlite_store_partition.delete(key)
+        assert res.is_ok()
+        assert len(sharded_sqlite_store_partition.all().ok()) == len(objs) - idx - 1
+
+        res = sharded_sqlite_store_partition.delete(key)
+        assert res.is_err()
+
+    assert len(sharded_sqlite_store_partition.all().ok()) == 0
+
+    # the unique keys were released with the objects
+    for obj in objs:
+        assert sharded_sqlite_store_partition.set(obj).is_ok()
+
+
+def test_sharded_sqlite_store_partition_update(
+    sharded_sqlite_store_partition: ShardedSQLiteStorePartition,
+) -> None:
+    obj = MockSyftObject(data=1)
+    sharded_sqlite_store_partition.set(obj, ignore_duplicates=False)
+    assert len(sharded_sqlite_store_partition.all().ok()) == 1
+
+    # fail to update missing keys
+    rand_obj = MockSyftObject(data="bogus")
+    key = sharded_sqlite_store_partition.settings.store_key.with_obj(rand_obj)
+    res = sharded_sqlite_store_partition.update(key, obj)
+    assert res.is_err()
+
+    for v in range(REPEATS):
+        key = sharded_sqlite_store_partition.settings.store_key.with_obj(obj)
+        obj_new = MockSyftObject(data=v)
+
+        res = sharded_sqlite_store_partition.update(key, obj_new)
+        assert res.is_ok()
+
+        assert len(sharded_sqlite_store_partition.all().ok()) == 1
+        assert sharded_sqlite_store_partition.all().ok()[0].id == obj.id
+        assert sharded_sqlite_store_partition.all().ok()[0].data == v
+
+        stored = sharded_sqlite_store_partition.get_all_from_store(QueryKeys(qks=[key]))
+        assert stored.ok()[0].data == v
+
+
+def test_sharded_sqlite_store_partition_update_rollback(
+    sqlite_workspace: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    workspace, db_name = sqlite_workspace
+    store_config = ShardedSQLiteStoreConfig(
+        client_config=SQLiteStoreClientConfig(filename=db_name, path=workspace),
+        shard_count=3,
+    )
+    stash = MockStash(store=ShardedSQLiteDocumentStore(store_config=store_config))
+    obj = stash.set(MockObject(name="first", desc="d", importance=1, value=1)).ok()
+
+    shard = stash.partition.shard_for(obj.id)
+    monkeypatch.setattr(shard, "update", lambda qk, obj: Err("The shard is down"))
+    renamed = MockObject(id=obj.id, name="renamed", desc="d", importance=1, value=1)
+    assert stash.update(renamed).is_err()
+    monkeypatch.undo()
+
+    # the failed update gave the new name back and kept the old one claimed
+    assert stash.set(
+        MockObject(name="renamed", desc="d", importance=1, value=1)
+    ).is_ok()
+    assert stash.set(MockObject(name="first", desc="d", importance=1, value=1)).is_err()
+    stash.partition.close()
+
+
+def test_sharded_sqlite_store_partition_update_locks_index(
+    sqlite_workspace: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    workspace, db_name = sqlite_workspace
+    store_config = ShardedSQLiteStoreConfig(
+        client_config=SQLiteStoreClientConfig(filename=db_name, path=workspace),
+        shard_count=3,
+    )
+    stash = MockStash(store=ShardedSQLiteDocumentStore(store_config=store_config))
+    obj = stash.set(MockObject(name="first", desc="d", importance=1, value=1)).ok()
+
+    shard = stash.partition.shard_for(obj.id)
+    update = shard.update
+    index_path = stash.partition.index.store_config.client_config.file_path
+
+    def _update(qk, obj):
+        # other writers of the index, e.g. other processes, wait for the shard
+        other = sqlite3.connect(index_path, timeout=0, isolation_level=None)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.execute("BEGIN IMMEDIATE")
+        other.close()
+        return update(qk=qk, obj=obj)
+
+    monkeypatch.setattr(shard, "update", _update)
+    renamed = MockObject(id=obj.id, name="renamed", desc="d", importance=1, value=1)
+    assert stash.update(renamed).is_ok()
+    monkeypatch.undo()
+
+    assert stash.set(MockObject(name="first", desc="d", importance=1, value=1)).is_ok()
+    assert stash.set(
+        MockObject(name="renamed", desc="d", importance=1, value=1)
+    ).is_err()
+    stash.partition.close()
+
+
+def test_sharded_sqlite_store_partition_reopen(
+    sqlite_workspace: Tuple,
+) -> None:
+    store = sharded_sqlite_store_partition_fn(sqlite_workspace)
+    objs = [MockSyftObject(data=v) for v in range(REPEATS)]
+    for obj in objs:
+        assert store.set(obj).is_ok()
+    store.commit()
+
+    store = sharded_sqlite_store_partition_fn(sqlite_workspace)
+    assert sorted(obj.data for obj in store.all().ok()) == list(range(REPEATS))
+
+    # the coordinator index still knows about the stored keys
+    assert store.set(objs[0], ignore_duplicates=False).is_err()
+
+
+def test_sharded_sqlite_store_partition_set_threading(
+    sqlite_workspace: Tuple,
+) -> None:
+    thread_cnt = 3
+    repeats = REPEATS
+
+    execution_err = None
+
+    def _kv_cbk(tid: int) -> None:
+        nonlocal execution_err
+
+        store = sharded_sqlite_store_partition_fn(sqlite_workspace)
+        for idx in range(repeats):
+            obj = MockObjectType(data=idx)
+            res = store.set(obj, ignore_duplicates=False)
+
+            if res.is_err():
+                execution_err = res
+            assert res.is_ok(), res
+
+        return execution_err
+
+    tids = []
+    for tid in range(thread_cnt):
+        thread = Thread(target=_kv_cbk, args=(tid,))
+        thread.start()
+
+        tids.append(thread)
+
+    for thread in tids:
+        thread.join()
+
+    assert execution_err is None
+
+    store = sharded_sqlite_store_partition_fn(sqlite_workspace)
+    stored_cnt = len(store.all().ok())
+    assert stored_cnt == thread_cnt * repeats
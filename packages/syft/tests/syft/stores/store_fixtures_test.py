@@ -4,23 +4,37 @@ from typing import Generator
 from typing import Tuple
 
 # third party
+import fakeredis
 from pymongo import MongoClient
 import pytest
 from pytest_mock_resources import create_mongo_fixture
 
 # syft absolute
 from syft.core.node.new.action_store import DictActionStore
+from syft.core.node.new.action_store import LMDBActionStore
+from syft.core.node.new.action_store import RedisActionStore
 from syft.core.node.new.action_store import SQLiteActionStore
 from syft.core.node.new.credentials import SyftVerifyKey
 from syft.core.node.new.dict_document_store import DictDocumentStore
 from syft.core.node.new.dict_document_store import DictStoreConfig
 from syft.core.node.new.dict_document_store import DictStorePartition
 from syft.core.node.new.document_store import PartitionSettings
+from syft.core.node.new.lmdb_document_store import LMDBDocumentStore
+from syft.core.node.new.lmdb_document_store import LMDBStoreClientConfig
+from syft.core.node.new.lmdb_document_store import LMDBStoreConfig
+from syft.core.node.new.lmdb_document_store import LMDBStorePartition
 from syft.core.node.new.mongo_client import MongoStoreClientConfig
 from syft.core.node.new.mongo_document_store import MongoDocumentStore
 from syft.core.node.new.mongo_document_store import MongoStoreConfig
 from syft.core.node.new.mongo_document_store import MongoStorePartition
 from syft.core.node.new.queue_stash import QueueStash
+from syft.core.node.new.redis_document_store import RedisDocumentStore
+from syft.core.node.new.redis_document_store import RedisStoreClientConfig
+from syft.core.node.new.redis_document_store import RedisStoreConfig
+from syft.core.node.new.redis_document_store import RedisStorePartition
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteDocumentStore
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteStoreConfig
+from syft.core.node.new.sharded_sqlite_document_store import ShardedSQLiteStorePartition
 from syft.core.node.new.sqlite_document_store import SQLiteDocumentStore
 from syft.core.node.new.sqlite_document_store import SQLiteStoreClientConfig
 from syft.core.node.new.sqlite_document_store import SQLiteStoreConfig
@@ -105,6 +119,94 @@ def sqlite_action_store(sqlite_workspace: Tuple[Path, str]):
     return SQLiteActionStore(store_config=store_config, root_verify_key=ver_key)
 
 
+def sharded_sqlite_store_partition_fn(
+    sqlite_workspace: Tuple[Path, str], shard_count: int = 3
+):
+    workspace, db_name = sqlite_workspace
+    sqlite_config = SQLiteStoreClientConfig(filename=db_name, path=workspace)
+    store_config = ShardedSQLiteStoreConfig(
+        client_config=sqlite_config, shard_count=shard_count
+    )
+    settings = PartitionSettings(name="test", object_type=MockObjectType)
+
+    store = ShardedSQLiteStorePartition(settings=settings, store_config=store_config)
+
+    res = store.init_store()
+    assert res.is_ok()
+
+    return store
+
+
+@pytest.fixture(scope="function")
+def sharded_sqlite_store_partition(sqlite_workspace: Tuple[Path, str]):
+    return sharded_sqlite_store_partition_fn(sqlite_workspace)
+
+
+@pytest.fixture(scope="function")
+def sharded_sqlite_queue_stash(sqlite_workspace: Tuple[Path, str]):
+    workspace, db_name = sqlite_workspace
+    sqlite_config = SQLiteStoreClientConfig(filename=db_name, path=workspace)
+    store_config = ShardedSQLiteStoreConfig(client_config=sqlite_config, shard_count=3)
+    return QueueStash(store=ShardedSQLiteDocumentStore(store_config=store_config))
+
+
+@pytest.fixture(scope="function")
+def sharded_sqlite_action_store(sqlite_workspace: Tuple[Path, str]):
+    workspace, db_name = sqlite_workspace
+
+    sqlite_config = SQLiteStoreClientConfig(filename=db_name, path=workspace)
+    store_config = ShardedSQLiteStoreConfig(client_config=sqlite_config, shard_count=3)
+    ver_key = SyftVerifyKey.from_string(test_verify_key_string_root)
+    return SQLiteActionStore(store_config=store_config, root_verify_key=ver_key)
+
+
+def lmdb_store_partition_fn(sqlite_workspace: Tuple[Path, str]):
+    workspace, db_name = sqlite_workspace
+    lmdb_config = LMDBStoreClientConfig(filename=f"{db_name}.lmdb", path=workspace)
+    store_config = LMDBStoreConfig(client_config=lmdb_config)
+    settings = PartitionSettings(name="test", object_type=MockObjectType)
+
+    store = LMDBStorePartition(settings=settings, store_config=store_config)
+
+    res = store.init_store()
+    assert res.is_ok()
+
+    return store
+
+
+@pytest.fixture(scope="function")
+def lmdb_store_partition(sqlite_workspace: Tuple[Path, str]):
+    return lmdb_store_partition_fn(sqlite_workspace)
+
+
+def lmdb_document_store_fn(sqlite_workspace: Tuple[Path, str]):
+    workspace, db_name = sqlite_workspace
+    lmdb_config = LMDBStoreClientConfig(filename=f"{db_name}.lmdb", path=workspace)
+    store_config = LMDBStoreConfig(client_config=lmdb_config)
+    return LMDBDocumentStore(store_config=store_config)
+
+
+@pytest.fixture(scope="function")
+def lmdb_document_store(sqlite_workspace: Tuple[Path, str]):
+    return lmdb_document_store_fn(sqlite_workspace)
+
+
+@pytest.fixture(scope="function")
+def lmdb_queue_stash(sqlite_workspace: Tuple[Path, str]):
+    store = lmdb_document_store_fn(sqlite_workspace)
+    return QueueStash(store=store)
+
+
+@pytest.fixture(scope="function")
+def lmdb_action_store(sqlite_workspace: Tuple[Path, str]):
+    workspace, db_name = sqlite_workspace
+
+    lmdb_config = LMDBStoreClientConfig(filename=f"{db_name}.lmdb", path=workspace)
+    store_config = LMDBStoreConfig(client_config=lmdb_config)
+    ver_key = SyftVerifyKey.from_string(test_verify_key_string_root)
+    return LMDBActionStore(store_config=store_config, root_verify_key=ver_key)
+
+
 def mongo_store_partition_fn(mongo_db_name: str = "mongo_db", **mongo_kwargs):
     mongo_client = MongoClient(**mongo_kwargs)
 
@@ -161,6 +263,63 @@ def mongo_queue_stash(mongo_server_mock):
     return mongo_queue_stash_fn(store)
 
 
+@pytest.fixture(scope="function")
+def redis_server_fake() -> Generator:
+    server = fakeredis.FakeServer()
+    yield server
+    fakeredis.FakeStrictRedis(server=server).flushall()
+
+
+def redis_store_config_fn(
+    redis_server_fake: fakeredis.FakeServer, namespace: str = "syft"
+) -> RedisStoreConfig:
+    redis_client = fakeredis.FakeStrictRedis(server=redis_server_fake)
+    redis_config = RedisStoreClientConfig(client=redis_client)
+    return RedisStoreConfig(client_config=redis_config, namespace=namespace)
+
+
+def redis_store_partition_fn(
+    redis_server_fake: fakeredis.FakeServer, namespace: str = "syft"
+):
+    store_config = redis_store_config_fn(redis_server_fake, namespace=namespace)
+    settings = PartitionSettings(name="test", object_type=MockObjectType)
+
+    store = RedisStorePartition(settings=settings, store_config=store_config)
+
+    res = store.init_store()
+    assert res.is_ok()
+
+    return store
+
+
+@pytest.fixture(scope="function")
+def redis_store_partition(redis_server_fake: fakeredis.FakeServer):
+    return redis_store_partition_fn(redis_server_fake)
+
+
+def redis_document_store_fn(redis_server_fake: fakeredis.FakeServer):
+    store_config = redis_store_config_fn(redis_server_fake)
+    return RedisDocumentStore(store_config=store_config)
+
+
+@pytest.fixture(scope="function")
+def redis_document_store(redis_server_fake: fakeredis.FakeServer):
+    return redis_document_store_fn(redis_server_fake)
+
+
+@pytest.fixture(scope="function")
+def redis_queue_stash(redis_server_fake: fakeredis.FakeServer):
+    store = redis_document_store_fn(redis_server_fake)
+    return QueueStash(store=store)
+
+
+@pytest.fixture(scope="function")
+def redis_action_store(redis_server_fake: fakeredis.FakeServer):
+    store_config = redis_store_config_fn(redis_server_fake)
+    ver_key = SyftVerifyKey.from_string(test_verify_key_string_root)
+    return RedisActionStore(store_config=store_config, root_verify_key=ver_key)
+
+
 def dict_store_partition_fn():
     store_config = DictStoreConfig()
     settings = PartitionSettings(name="test", object_type=MockObjectType)
@@ -0,0 +1,170 @@
+# stdlib
+import sys
+from typing import Any
+
+# third party
+import pytest
+
+# syft absolute
+from syft.core.node.new.document_store import QueryKeys
+from syft.core.node.new.document_store import UIDPartitionKey
+from syft.core.node.new.store_metrics import LatencyHistogram
+from syft.core.node.new.store_metrics import PartitionMetrics
+from syft.core.node.new.store_metrics import SlowQuery
+from syft.core.node.new.store_metrics import record_scan
+from syft.core.node.worker import Worker
+
+# relative
+from .store_mocks_test import MockSyftObject
+
+REPEATS = 5
+
+
+def _query_by_uid(store: Any, uid: Any) -> Any:
+    return store.find_index_or_search_keys(
+        index_qks=QueryKeys(qks=[UIDPartitionKey.with_obj(uid)]),
+        search_qks=QueryKeys(qks=[]),
+    )
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_store_partition"),
+        pytest.lazy_fixture("sqlite_store_partition"),
+        pytest.lazy_fixture("sharded_sqlite_store_partition"),
+        pytest.lazy_fixture("mongo_store_partition"),
+    ],
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_store_metrics_operations(store: Any) -> None:
+    objs = [MockSyftObject(data=idx) for idx in range(REPEATS)]
+    for obj in objs:
+        assert store.set(obj).is_ok()
+
+    res = _query_by_uid(store, objs[0].id)
+    assert res.is_ok()
+    assert [obj.data for obj in res.ok()] == [0]
+    assert len(store.all().ok()) == REPEATS
+
+    metrics = store.metrics.to_dict()
+    assert metrics["set"]["latency"]["count"] == REPEATS
+    assert metrics["set"]["errors"] == 0
+    assert sum(metrics["set"]["latency"]["buckets"].values()) == REPEATS
+
+    # a lookup by store key is answered by an index, listing everything is a scan
+    assert metrics["query"]["latency"]["count"] == 1
+    assert metrics["query"]["index_hits"] >= 1
+    assert metrics["query"]["scans"] == 0
+    assert metrics["all"]["scans"] >= 1
+    assert metrics["all"]["rows_scanned"] >= REPEATS
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("sqlite_store_partition"),
+        pytest.lazy_fixture("mongo_store_partition"),
+    ],
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_store_metrics_bytes_deserialized(store: Any) -> None:
+    obj = MockSyftObject(data="x" * 1000)
+    assert store.set(obj).is_ok()
+    assert _query_by_uid(store, obj.id).is_ok()
+
+    metrics = store.metrics.to_dict()["query"]
+    assert metrics["rows_deserialized"] >= 1
+    assert metrics["bytes_deserialized"] >= 1000
+
+
+def test_store_metrics_errors(dict_store_partition: Any) -> None:
+    obj = MockSyftObject(data=1)
+    assert dict_store_partition.set(obj).is_ok()
+    assert dict_store_partition.set(obj, ignore_duplicates=False).is_err()
+
+    metrics = dict_store_partition.metrics.to_dict()
+    assert metrics["set"]["latency"]["count"] == 2
+    assert metrics["set"]["errors"] == 1
+
+
+def test_store_metrics_slow_query_log(dict_store_partition: Any) -> None:
+    obj = MockSyftObject(data=1)
+    assert dict_store_partition.set(obj).is_ok()
+    assert dict_store_partition.metrics.get_slow_queries() == []
+
+    dict_store_partition.metrics.slow_query_threshold = 0
+    assert _query_by_uid(dict_store_partition, obj.id).is_ok()
+
+    slow_queries = dict_store_partition.metrics.get_slow_queries()
+    assert len(slow_queries) == 1
+    slow_query = slow_queries[0]
+    assert isinstance(slow_query, SlowQuery)
+    assert slow_query.partition == dict_store_partition.settings.name
+    assert slow_query.operation == "query"
+    assert slow_query.query == {"id": repr(obj.id)}
+    assert slow_query.index_hits >= 1
+
+    dict_store_partition.metrics.slow_query_threshold = None
+    assert _query_by_uid(dict_store_partition, obj.id).is_ok()
+    assert len(dict_store_partition.metrics.get_slow_queries()) == 1
+
+    dict_store_partition.metrics.reset()
+    assert dict_store_partition.metrics.get_slow_queries() == []
+    assert dict_store_partition.metrics.to_dict() == {}
+
+
+def test_store_metrics_disabled(dict_store_partition: Any) -> None:
+    dict_store_partition.metrics.enabled = False
+    assert dict_store_partition.set(MockSyftObject(data=1)).is_ok()
+    assert dict_store_partition.metrics.to_dict() == {}
+
+
+def test_store_metrics_nested_partitions() -> None:
+    outer = PartitionMetrics(name="outer")
+    inner = PartitionMetrics(name="inner")
+    with outer.measure("update"):
+        # the lookup of the update itself counts towards the update
+        with outer.measure("get") as nested:
+            assert nested is None
+            record_scan(1)
+        # another partition measures its own calls
+        with inner.measure("get") as query:
+            assert query is not None
+            record_scan(3)
+
+    assert list(outer.to_dict().keys()) == ["update"]
+    assert outer.to_dict()["update"]["rows_scanned"] == 1
+    assert inner.to_dict()["get"]["latency"]["count"] == 1
+    assert inner.to_dict()["get"]["rows_scanned"] == 3
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in [0.05, 0.05, 0.5, 2.0]:
+        histogram.observe(seconds)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.75) == 1.0
+    assert histogram.quantile(1.0) == 2.0
+    assert histogram.to_dict()["buckets"] == {"0.1": 2, "1.0": 1, "+Inf": 1}
+
+
+def test_store_metrics_service() -> None:
+    worker = Worker(name="metrics-worker")
+    worker.document_store.partitions["User"].metrics.slow_query_threshold = 0
+
+    guest_client = worker.root_client.guest()
+    guest_client.register(name="Alice", email="alice@caltech.edu", password="abc123")
+
+    metrics = worker.root_client.api.services.metrics.partitions(name="User")
+    assert list(metrics.keys()) == ["User"]
+    assert metrics["User"]["set"]["latency"]["count"] >= 1
+
+    slow_queries = worker.root_client.api.services.metrics.slow_queries(name="User")
+    assert len(slow_queries) > 0
+    assert all(slow_query.partition == "User" for slow_query in slow_queries)
+
+    worker.root_client.api.services.metrics.reset()
+    assert worker.document_store.slow_queries() == []
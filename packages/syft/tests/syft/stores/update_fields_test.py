@@ -0,0 +1,115 @@
+# stdlib
+import sys
+from threading import Thread
+from typing import Any
+
+# third party
+import pytest
+
+# syft absolute
+from syft.core.node.new.uid import UID
+
+# relative
+from .base_stash_test import MockObject
+from .base_stash_test import MockStash
+
+REPEATS = 20
+
+
+def _mock_object(name: str, desc: str = "shared") -> MockObject:
+    return MockObject(name=name, desc=desc, importance=1, value=1)
+
+
+KV_STORES = [
+    pytest.lazy_fixture("dict_document_store"),
+    pytest.lazy_fixture("sqlite_document_store"),
+    pytest.lazy_fixture("lmdb_document_store"),
+    pytest.lazy_fixture("redis_document_store"),
+]
+
+
+@pytest.mark.parametrize(
+    "store", KV_STORES + [pytest.lazy_fixture("mongo_document_store")]
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_update_fields_reindexes_changed_keys(store: Any) -> None:
+    stash = MockStash(store=store)
+    first = stash.set(_mock_object("first")).ok()
+    second = stash.set(_mock_object("second")).ok()
+
+    res = stash.update_fields(first.id, {"desc": "changed", "value": 2})
+    assert res.is_ok(), res
+    assert res.ok().desc == "changed"
+    assert res.ok().value == 2
+    assert res.ok().name == "first"
+
+    stored = stash.get_by_uid(first.id).ok()
+    assert (stored.desc, stored.value, stored.importance) == ("changed", 2, 1)
+
+    assert [obj.id for obj in stash.find_all(desc="changed").ok()] == [first.id]
+    # the other object sharing the previous value keeps its index entry
+    assert [obj.id for obj in stash.find_all(desc="shared").ok()] == [second.id]
+
+
+# Mongo enforces the unique keys together, as a single compound index
+@pytest.mark.parametrize("store", KV_STORES)
+def test_update_fields_unique_keys(store: Any) -> None:
+    stash = MockStash(store=store)
+    first = stash.set(_mock_object("first")).ok()
+    stash.set(_mock_object("second"))
+
+    assert stash.update_fields(first.id, {"name": "second"}).is_err()
+    assert stash.get_by_uid(first.id).ok().name == "first"
+
+    assert stash.update_fields(first.id, {"name": "renamed"}).is_ok()
+    assert stash.find_one(name="renamed").ok().id == first.id
+    assert stash.find_one(name="first").ok() is None
+    # the previous value is free again
+    assert stash.set(_mock_object("first")).is_ok()
+
+
+@pytest.mark.parametrize(
+    "store", KV_STORES + [pytest.lazy_fixture("mongo_document_store")]
+)
+@pytest.mark.skipif(sys.platform != "linux", reason="Testing Mongo only on Linux")
+def test_update_fields_validation(store: Any) -> None:
+    stash = MockStash(store=store)
+    obj = stash.set(_mock_object("first")).ok()
+
+    assert stash.update_fields(obj.id, {"missing": 1}).is_err()
+    assert stash.update_fields(obj.id, {"id": UID()}).is_err()
+    assert stash.update_fields(obj.id, {"importance": "not a number"}).is_err()
+    assert stash.update_fields(UID(), {"desc": "changed"}).is_err()
+    assert stash.get_by_uid(obj.id).ok() == obj
+
+
+@pytest.mark.parametrize(
+    "store",
+    [
+        pytest.lazy_fixture("dict_document_store"),
+        pytest.lazy_fixture("sqlite_document_store"),
+        pytest.lazy_fixture("lmdb_document_store"),
+    ],
+)
+def test_update_fields_concurrent(store: Any) -> None:
+    stash = MockStash(store=store)
+    obj = stash.set(_mock_object("first")).ok()
+
+    # two writers changing different fields of the same object don't lose updates
+    def _update(field: str) -> None:
+        for idx in range(REPEATS):
+            assert stash.update_fields(obj.id, {field: idx}).is_ok()
+
+    threads = [
+        Thread(target=_update, args=(field,)) for field in ["importance", "value"]
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = stash.get_by_uid(obj.id).ok()
+    assert (stored.importance, stored.value) == (REPEATS - 1, REPEATS - 1)
+    assert [found.id for found in stash.find_all(importance=REPEATS - 1).ok()] == [
+        obj.id
+    ]
@@ -1,25 +1,51 @@
 # stdlib
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from typing import Any
 from typing import Dict
 
 # third party
 from nacl.exceptions import BadSignatureError
 import numpy as np
+import pandas as pd
 import pytest
+from result import Err
+from result import Ok
 
 # syft absolute
 import syft as sy
+from syft.core.node.new.action_batch import DeferredActions
+from syft.core.node.new.action_config import ActionConfig
+from syft.core.node.new.action_lifecycle import ActionLifecycleConfig
+from syft.core.node.new.action_memo import ActionMemoConfig
 from syft.core.node.new.action_object import ActionObject
+from syft.core.node.new.action_service import ActionService
+from syft.core.node.new.action_service import TwinMode
+from syft.core.node.new.action_store import ActionObjectREAD
 from syft.core.node.new.action_store import DictActionStore
+from syft.core.node.new.action_store import SQLiteActionStore
+from syft.core.node.new.api import APIRegistry
 from syft.core.node.new.api import SignedSyftAPICall
 from syft.core.node.new.api import SyftAPICall
 from syft.core.node.new.context import AuthedServiceContext
 from syft.core.node.new.credentials import SIGNING_KEY_FOR
 from syft.core.node.new.credentials import SyftSigningKey
 from syft.core.node.new.credentials import SyftVerifyKey
+from syft.core.node.new.dataset_service import DatasetService
+from syft.core.node.new.ingest import IngestOptions
 from syft.core.node.new.queue_stash import QueueItem
 from syft.core.node.new.response import SyftAttributeError
 from syft.core.node.new.response import SyftError
+from syft.core.node.new.response import SyftException
+from syft.core.node.new.response import SyftSuccess
+from syft.core.node.new.sqlite_document_store import SQLiteStoreClientConfig
+from syft.core.node.new.sqlite_document_store import SQLiteStoreConfig
+from syft.core.node.new.transfer import chunk_digest
+from syft.core.node.new.transfer_service import TransferService
+from syft.core.node.new.twin_evaluation import TwinEvaluationConfig
+from syft.core.node.new.twin_evaluation import TwinEvaluator
+from syft.core.node.new.twin_object import TwinObject
+from syft.core.node.new.uid import LineageID
 from syft.core.node.new.uid import UID
 from syft.core.node.new.user import User
 from syft.core.node.new.user import UserCreate
@@ -185,6 +211,17 @@ def test_worker() -> None:
     assert worker
 
 
+def test_worker_stops_action_gc() -> None:
+    worker = Worker(action_config=ActionConfig(lifecycle=ActionLifecycleConfig()))
+    thread = worker.action_gc._thread
+    assert thread.is_alive()
+
+    worker.get_service(ActionService).twin_evaluator.pool
+    worker.stop()
+    assert not thread.is_alive()
+    assert worker.get_service(ActionService).twin_evaluator._pool is None
+
+
 def test_action_object_add() -> None:
     raw_data = np.array([1, 2, 3])
     action_object = ActionObject.from_obj(raw_data)
@@ -221,6 +258,35 @@ def test_action_object_hooks() -> None:
     action_object._syft_post_hooks__["__add__"] = []
 
 
+def test_action_object_hook_dispatch() -> None:
+    raw_data = np.array([1, 2, 3])
+    action_object = ActionObject.from_obj(raw_data)
+    assert ((action_object + action_object).syft_action_data == raw_data * 2).all()
+
+    def post_add(context: Any, name: str, new_result: Any) -> Any:
+        return sum(new_result)
+
+    # the cached dispatch of __add__ sees hooks added after it was built
+    action_object._syft_post_hooks__.add("__add__", post_add)
+    try:
+        assert (action_object + action_object).syft_action_data == 12
+        assert (action_object * action_object).syft_action_data.tolist() == [1, 4, 9]
+    finally:
+        del action_object._syft_post_hooks__["__add__"]
+    assert ((action_object + action_object).syft_action_data == raw_data * 2).all()
+
+    # hooks run once even when added again
+    action_object._syft_post_hooks__.add("__add__", post_add)
+    action_object._syft_post_hooks__.add("__add__", post_add)
+    try:
+        assert (action_object + action_object).syft_action_data == 12
+    finally:
+        del action_object._syft_post_hooks__["__add__"]
+
+    # the dtype of a numpy array is never wrapped
+    assert action_object.dtype == raw_data.dtype
+
+
 def test_worker_serde() -> None:
     worker = Worker()
     ser = sy.serialize(worker, to_bytes=True)
@@ -360,3 +426,451 @@ def test_worker_handle_api_response(
         assert isinstance(result, QueueItem)
     else:
         assert not isinstance(result, SyftError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, kwargs",
+    [
+        # async service methods
+        ("dataset.get_all", {}),
+        ("dataset.search", {"name": "test"}),
+        # sync service methods, run in the executor
+        ("data_subject.get_all", {}),
+        ("metadata", {}),
+    ],
+)
+async def test_worker_async_handle_api_call(path: str, kwargs: Dict) -> None:
+    test_signing_key = SyftSigningKey.from_string(test_signing_key_string)
+    node_uid = UID()
+    worker = Worker(name="test-domain-1", id=node_uid, signing_key=test_signing_key)
+    root_client = worker.root_client
+
+    call = SyftAPICall(node_uid=node_uid, path=path, args=[], kwargs=kwargs)
+    signed_api_call = call.sign(root_client.credentials)
+
+    signed_result = await worker.async_handle_api_call(signed_api_call)
+    assert isinstance(signed_result, SignedSyftAPICall)
+    result = signed_result.message.data
+    assert not isinstance(result, SyftError)
+
+    # the sync API bridges to the async service methods
+    sync_result = worker.handle_api_call(signed_api_call).message.data
+    assert type(sync_result) is type(result)
+
+    # unsigned calls are rejected like on the sync path
+    result = (await worker.async_handle_api_call(call)).message.data
+    assert isinstance(result, SyftError)
+
+
+def test_transfer_service() -> None:
+    worker = Worker()
+    transfer_service = worker.get_service(TransferService)
+    context = AuthedServiceContext(
+        node=worker, credentials=worker.signing_key.verify_key
+    )
+
+    obj = ActionObject.from_obj(np.arange(10_000))
+    blob = sy.serialize(obj, to_bytes=True)
+    chunk_size = 4096
+    session = transfer_service.begin_upload(
+        context,
+        object_id=obj.id,
+        size=len(blob),
+        digest=chunk_digest(blob),
+        chunk_size=chunk_size,
+    )
+    chunks = [
+        blob[start : start + chunk_size]  # noqa: E203
+        for start in range(0, len(blob), chunk_size)
+    ]
+    assert session.chunk_count == len(chunks) > 2
+
+    first = transfer_service.put_chunk(
+        context, session.id, 0, chunks[0], chunk_digest(chunks[0])
+    )
+    assert isinstance(first, SyftSuccess)
+    corrupted = transfer_service.put_chunk(
+        context, session.id, 1, chunks[0], chunk_digest(chunks[1])
+    )
+    assert isinstance(corrupted, SyftError)
+
+    # beginning again resumes after the received chunks
+    resumed = transfer_service.begin_upload(
+        context,
+        object_id=obj.id,
+        size=len(blob),
+        digest=chunk_digest(blob),
+        chunk_size=chunk_size,
+    )
+    assert resumed.id == session.id
+    assert resumed.received == [0]
+    assert isinstance(transfer_service.commit_upload(context, session.id), SyftError)
+
+    for index, chunk in enumerate(chunks[1:], start=1):
+        transfer_service.put_chunk(
+            context, session.id, index, chunk, chunk_digest(chunk)
+        )
+    uploaded = transfer_service.commit_upload(context, session.id)
+    assert (uploaded.syft_action_data == np.arange(10_000)).all()
+
+    download = transfer_service.begin_download(context, uid=obj.id)
+    data = b"".join(
+        transfer_service.get_chunk(context, download.id, offset, download.chunk_size)
+        for offset in range(0, download.size, download.chunk_size)
+    )
+    assert chunk_digest(data) == download.digest
+    downloaded = sy.deserialize(data, from_bytes=True)
+    assert (downloaded.syft_action_data == np.arange(10_000)).all()
+    assert isinstance(transfer_service.end_transfer(context, download.id), SyftSuccess)
+    assert isinstance(
+        transfer_service.get_chunk(context, download.id, 0, chunk_size), SyftError
+    )
+
+
+def test_transfer_service_quotas() -> None:
+    worker = Worker()
+    transfer_service = worker.get_service(TransferService)
+    transfer_service.max_sessions = 2
+    transfer_service.max_session_bytes = 1000
+    context = AuthedServiceContext(
+        node=worker, credentials=worker.signing_key.verify_key
+    )
+
+    def begin(size: int) -> Any:
+        return transfer_service.begin_upload(
+            context, object_id=UID(), size=size, digest=UID().to_string()
+        )
+
+    assert isinstance(begin(2000), SyftError)
+    first = begin(600)
+    assert not isinstance(first, SyftError)
+    assert isinstance(begin(600), SyftError)
+    assert not isinstance(begin(400), SyftError)
+    assert isinstance(begin(0), SyftError)
+
+    # ended and idle uploads free their share
+    assert isinstance(transfer_service.end_transfer(context, first.id), SyftSuccess)
+    assert not isinstance(begin(100), SyftError)
+    transfer_service.upload_idle_ttl = -1
+    assert not isinstance(begin(1000), SyftError)
+
+
+def test_dataset_ingest(tmp_path, monkeypatch) -> None:
+    (tmp_path / "ingest").mkdir()
+    worker = Worker(ingest_root=tmp_path / "ingest")
+    dataset_service = worker.get_service(DatasetService)
+    transfer_service = worker.get_service(TransferService)
+    action_service = worker.get_service(ActionService)
+    context = AuthedServiceContext(
+        node=worker, credentials=worker.signing_key.verify_key
+    )
+
+    df = pd.DataFrame(
+        {
+            "age": np.arange(1_000) % 90,
+            "score": np.linspace(0, 1, 1_000),
+            "city": ["a", "b", None, "d"] * 250,
+        }
+    )
+    csv_path = tmp_path / "ingest" / "people.csv"
+    df.to_csv(csv_path, index=False)
+
+    asset = dataset_service.ingest(
+        context,
+        dataset_name="people",
+        asset_name="csv",
+        path=str(csv_path),
+        options=IngestOptions(column_types={"age": "int16"}, mock_seed=0),
+    )
+    assert asset.shape == (1_000, 3)
+    twin = action_service.get(context, asset.action_id, TwinMode.NONE).ok()
+    data = twin.private_obj.syft_action_data
+    assert data.equals(df.astype({"age": "int16"}))
+
+    mock = twin.mock_obj.syft_action_data
+    assert (mock.dtypes == data.dtypes).all()
+    assert mock["age"].between(0, 89).all()
+    assert set(mock["city"].dropna()) <= {"city_0", "city_1", "city_2"}
+    assert not mock.equals(data)
+
+    parquet_path = tmp_path / "people.parquet"
+    df.to_parquet(parquet_path)
+    blob = parquet_path.read_bytes()
+    session = transfer_service.begin_upload(
+        context, object_id=UID(), size=len(blob), digest=chunk_digest(blob)
+    )
+    transfer_service.put_chunk(context, session.id, 0, blob, chunk_digest(blob))
+    staged = dataset_service.ingest(
+        context,
+        dataset_name="people",
+        asset_name="parquet",
+        session_id=session.id,
+        options=IngestOptions(format="parquet", columns=["age", "city"]),
+    )
+    assert staged.shape == (1_000, 2)
+    dataset = dataset_service.stash.get_by_name("people").ok()
+    assert list(dataset.assets.keys()) == ["csv", "parquet"]
+
+    duplicate = dataset_service.ingest(
+        context, dataset_name="people", asset_name="csv", path=str(csv_path)
+    )
+    assert isinstance(duplicate, SyftError)
+    assert isinstance(
+        dataset_service.ingest(
+            context, dataset_name="people", asset_name="x", path="/no/such/file.csv"
+        ),
+        SyftError,
+    )
+
+    # only files inside the ingest root are read
+    outside = tmp_path / "outside.csv"
+    df.to_csv(outside, index=False)
+    for path in [str(outside), "../outside.csv"]:
+        result = dataset_service.ingest(
+            context, dataset_name="people", asset_name="x", path=path
+        )
+        assert isinstance(result, SyftError)
+        assert "outside" in result.message
+    relative = dataset_service.ingest(
+        context, dataset_name="people", asset_name="relative", path="people.csv"
+    )
+    assert relative.shape == (1_000, 3)
+
+    # the twin of an asset which couldn't be added is deleted
+    stored = len(action_service.store.data)
+    monkeypatch.setattr(
+        dataset_service.stash, "update_fields", lambda *args: Err("failed")
+    )
+    failed = dataset_service.ingest(
+        context, dataset_name="people", asset_name="failed", path="people.csv"
+    )
+    assert isinstance(failed, SyftError)
+    assert len(action_service.store.data) == stored
+
+
+def test_dataset_ingest_concurrent(tmp_path) -> None:
+    worker = Worker(ingest_root=tmp_path)
+    dataset_service = worker.get_service(DatasetService)
+    context = AuthedServiceContext(
+        node=worker, credentials=worker.signing_key.verify_key
+    )
+    pd.DataFrame({"x": np.arange(10)}).to_csv(tmp_path / "x.csv", index=False)
+
+    def ingest(idx: int) -> Any:
+        return dataset_service.ingest(
+            context, dataset_name="many", asset_name=f"x{idx}", path="x.csv"
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(ingest, range(8)))
+    assert not any(isinstance(result, SyftError) for result in results)
+    dataset = dataset_service.stash.get_by_name("many").ok()
+    assert len(dataset.assets) == 8
+
+
+def test_action_execute_batch() -> None:
+    worker = Worker()
+    action_service = worker.get_service(ActionService)
+    context = AuthedServiceContext(
+        node=worker, credentials=worker.signing_key.verify_key
+    )
+
+    x = ActionObject.from_obj(np.array([1, 2, 3]))
+    y = ActionObject.from_obj(np.array([4, 5, 6]))
+    action_service.set(context, x)
+    action_service.set(context, y)
+
+    add = x.syft_make_method_action(op="__add__", args=[y])
+    total = x.syft_make_method_action(op="sum")
+    total.remote_self = LineageID(add.result_id)
+    # dependencies run first whatever the order of the batch
+    pointers = action_service.execute_batch(
+        context, actions=[total, add], outputs=[total.result_id]
+    ).ok()
+    assert [pointer.id for pointer in pointers] == [total.result_id.id]
+    result = action_service.get(context, total.result_id.id).ok()
+    assert result.syft_action_data == 21
+    # the intermediate stayed in memory
+    assert not action_service.store.exists(add.result_id.id)
+
+    cycle = x.syft_make_method_action(op="__add__", args=[LineageID(total.result_id)])
+    total.remote_self = LineageID(cycle.result_id)
+    assert action_service.execute_batch(
+        context, actions=[total, cycle], outputs=[]
+    ).is_err()
+
+
+def test_deferred_actions(worker) -> None:
+    root_client = worker.root_client
+    x = root_client.api.services.action.set(ActionObject.from_obj(np.arange(10)))
+
+    with sy.deferred() as batch:
+        doubled = x + x
+        total = (doubled * x).sum()
+        pending = batch.pending()[worker.id]
+        assert [action.op for action in pending] == ["__add__", "__mul__", "sum"]
+
+    assert batch.pending() == {}
+    action_service = worker.get_service(ActionService)
+    assert action_service.store.exists(doubled.id)
+    assert action_service.store.exists(total.id)
+    # the result of `doubled * x` had no pointer left, it was never stored
+    assert len(action_service.store.data) == 3
+    assert root_client.api.services.action.get(total.id).syft_action_data == 570
+
+
+def test_deferred_actions_failures(worker, monkeypatch) -> None:
+    root_client = worker.root_client
+    x = root_client.api.services.action.set(ActionObject.from_obj(np.arange(10)))
+
+    def unreachable(node_uid: UID) -> Any:
+        raise ConnectionError("node unreachable")
+
+    # batches that don't reach the node are queued again
+    with monkeypatch.context() as m:
+        m.setattr(APIRegistry, "api_for", unreachable)
+        with pytest.raises(SyftException):
+            with sy.deferred() as batch:
+                doubled = x + x
+    assert len(batch.pending()[worker.id]) == 1
+    assert [output.id for output in batch.flush()] == [doubled.id]
+    assert batch.pending() == {}
+
+    # batches the node rejects are kept and reported
+    with pytest.raises(SyftException):
+        with sy.deferred() as batch:
+            missing = ActionObject.from_obj(np.arange(10))
+            missing.syft_point_to(worker.id)
+            result = x + missing
+    failed = batch.failed()[worker.id]
+    assert [action.result_id.id for action in failed] == [result.id]
+    batch.discard()
+    assert batch.failed() == {}
+
+
+def test_deferred_actions_per_thread() -> None:
+    deferred_actions = DeferredActions()
+    enabled = []
+    with deferred_actions.deferred():
+        thread = threading.Thread(
+            target=lambda: enabled.append(deferred_actions.enabled)
+        )
+        thread.start()
+        thread.join()
+        assert deferred_actions.enabled
+    assert enabled == [False]
+    assert not deferred_actions.enabled
+
+
+def test_action_memo(tmp_path) -> None:
+    worker = Worker()
+    root_key = worker.signing_key.verify_key
+    store = DictActionStore(
+        root_verify_key=root_key, action_config=ActionConfig(memo=ActionMemoConfig())
+    )
+    action_service = ActionService(store)
+    context = AuthedServiceContext(node=worker, credentials=root_key)
+
+    x = ActionObject.from_obj(np.array([1, 2, 3]))
+    action_service.set(context, x)
+    first = x.syft_make_method_action(op="sum")
+    assert action_service.execute(context, first).is_ok()
+    again = x.syft_make_method_action(op="sum")
+    assert action_service.execute(context, again).is_ok()
+    assert action_service.memo.hits == 1
+    assert store.get(again.result_id.id, root_key).ok().syft_action_data == 6
+
+    # the earlier result isn't reused for a user who can't read it
+    other_key = SyftSigningKey.generate().verify_key
+    store.add_permission(ActionObjectREAD(uid=x.id, credentials=other_key))
+    other_context = AuthedServiceContext(node=worker, credentials=other_key)
+    other = x.syft_make_method_action(op="sum")
+    assert action_service.execute(other_context, other).is_ok()
+    assert action_service.memo.hits == 1
+
+    # writing an input drops the results computed from it
+    action_service.set(context, ActionObject.from_obj(np.array([4, 5, 6]), id=x.id))
+    rewritten = x.syft_make_method_action(op="sum")
+    assert action_service.execute(context, rewritten).is_ok()
+    assert store.get(rewritten.result_id.id, root_key).ok().syft_action_data == 15
+    assert action_service.memo.hits == 1
+
+    # writes of other processes sharing a backend don't invalidate the memo
+    client_config = SQLiteStoreClientConfig(filename="memo.sqlite", path=tmp_path)
+    shared_store = SQLiteActionStore(
+        store_config=SQLiteStoreConfig(client_config=client_config),
+        action_config=ActionConfig(memo=ActionMemoConfig()),
+    )
+    with pytest.raises(ValueError):
+        ActionService(shared_store)
+
+
+def test_twin_evaluation() -> None:
+    worker = Worker()
+    root_key = worker.signing_key.verify_key
+    action_service = ActionService(DictActionStore(root_verify_key=root_key))
+    context = AuthedServiceContext(node=worker, credentials=root_key)
+
+    twin = TwinObject(private_obj=np.array([1, 2, 3]), mock_obj=np.array([1, 1, 1]))
+    action_service.set(context, twin)
+    total = twin.mock.syft_make_method_action(op="sum")
+    assert action_service.execute(context, total).is_ok()
+    result = action_service.get(context, total.result_id.id, TwinMode.NONE).ok()
+    assert result.private_obj.syft_action_data == 6
+    assert result.mock_obj.syft_action_data == 3
+
+    # the mock side is skipped when only the private result is needed
+    private_total = twin.mock.syft_make_method_action(op="sum")
+    assert action_service.execute(
+        context, private_total, twin_mode=TwinMode.PRIVATE
+    ).is_ok()
+    result = action_service.get(context, private_total.result_id.id, TwinMode.NONE)
+    assert not isinstance(result.ok(), TwinObject)
+    assert result.ok().syft_action_data == 6
+
+    # a failing mock side doesn't lose the private result
+    matrix = TwinObject(
+        private_obj=np.array([[1, 2], [3, 4]]), mock_obj=np.array([1, 2, 3])
+    )
+    action_service.set(context, matrix)
+    trace = matrix.mock.syft_make_method_action(op="trace")
+    assert action_service.execute(context, trace).is_ok()
+    result = action_service.get(context, trace.result_id.id, TwinMode.NONE).ok()
+    assert result.private_obj.syft_action_data == 5
+    assert isinstance(result.mock_obj.syft_action_data, SyftError)
+
+    sequential = TwinEvaluator(TwinEvaluationConfig(policy="sequential"))
+    assert sequential.evaluate(private=lambda: 1, mock=None) == (Ok(1), None)
+    with pytest.raises(ValueError):
+        TwinEvaluator(TwinEvaluationConfig(policy="fork"))
+
+
+def test_twin_evaluation_isolates_sides() -> None:
+    worker = Worker()
+    root_key = worker.signing_key.verify_key
+    action_service = ActionService(DictActionStore(root_verify_key=root_key))
+    context = AuthedServiceContext(node=worker, credentials=root_key)
+
+    # each side changes its own copy of an object that isn't a twin
+    plain = ActionObject.from_obj(np.array([3, 1, 2]))
+    action_service.set(context, plain)
+    kth = TwinObject(private_obj=np.array([0]), mock_obj=np.array([2]))
+    action_service.set(context, kth)
+    partition = plain.syft_make_method_action(op="partition", args=[kth.mock])
+    assert action_service.execute(context, partition).is_ok()
+    stored = action_service.get(context, plain.id, TwinMode.NONE).ok()
+    assert (stored.syft_action_data == np.array([3, 1, 2])).all()
+
+    # ops known to change their inputs in place are rejected on twins
+    iadd = plain.syft_make_method_action(op="__iadd__", args=[kth.mock])
+    assert "in place" in action_service.execute(context, iadd)
+
+    # the evaluator isn't serialized, a copy creates its own
+    action_service.twin_evaluator.pool
+    copied = sy.deserialize(
+        sy.serialize(action_service, to_bytes=True), from_bytes=True
+    )
+    assert copied.twin_evaluator is not action_service.twin_evaluator
+    action_service.shutdown()
+    assert action_service.twin_evaluator._pool is None